@@ -43,27 +43,146 @@ def timestamp_to_ms(internal_timestamp):
     return int(internal_timestamp)
 
 
-def ts_mono_to_np(array, only_if_needed=True):
+def ms_to_timestamp_np(dates_ms):
+    """
+    Vectorized conversion to internal timestamps: numpy.int64 array (see ms_to_timestamp)
+
+    Float dates are rounded to the nearest millisecond.
+    No copy is made when dates_ms is already a numpy array of int64.
+
+    :param dates_ms: dates in milliseconds
+    :type dates_ms: numpy array or list
+    :return: conversion
+    :rtype: numpy array of numpy.int64
+    """
+    array = numpy.asarray(dates_ms)
+    if array.dtype == numpy.int64:
+        return array
+    if array.dtype.kind in 'iub':
+        return array.astype(numpy.int64)
+    # float or object arrays
+    return numpy.rint(array.astype(numpy.float64)).astype(numpy.int64)
+
+
+def values_to_float_np(values):
+    """
+    Vectorized conversion of point values to the resource client format: numpy.float64 array
+    (see value_to_float_resource_client)
+
+    No copy is made when values is already a numpy array of float64.
+
+    :param values: values to be converted
+    :type values: numpy array or list
+    :return: conversion
+    :rtype: numpy array of numpy.float64
+    """
+    return numpy.asarray(values, dtype=numpy.float64)
+
+
+def is_ts_mono_np(array):
+    """
+    Check that the whole array is already in the standard numpy format of resource client:
+    numpy 2D array (nb_points, 2) whose dtype is numpy.int64 or numpy.float64
+
+    :param array: array to check
+    :type array: any
+    :return: True if array is in the standard format
+    :rtype: bool
+    """
+    return isinstance(array, numpy.ndarray) and \
+        array.ndim == 2 and \
+        array.shape[1] == 2 and \
+        array.dtype in (numpy.int64, numpy.float64)
+
+
+def ts_mono_to_np(array, only_if_needed=True, in_place=False):
     """
     Convert array defining a TS mono-valued to standard numpy array used by resource client
 
-    Note: values are converted to float64
+    Note: values are converted to float64, timestamps are rounded to the nearest millisecond
 
     :param array:array to be converted
         required:  shape equivalent of ( nb_points, 2) AND nb_points > 0
     :type array: an array (python or numpy ...)
-    :param only_if_needed: when true: no conversion is made if first date is already converted, and array is returned
+    :param only_if_needed: when true: no conversion is made if the whole array is already a numpy array of
+      int64 or float64 (see is_ts_mono_np), and array is returned
     :type only_if_needed: bool
+    :param in_place: when true and array is a numpy array of float64: the timestamps are rounded inside array,
+      which is returned (no copy), whatever only_if_needed
+    :type in_place: bool
     :return: conversion
     :rtype: conversion to numpy array whose timestamps are converted to int64 / float64
     """
     assert (len(array) > 0), "Empty Timeseries"
-    if only_if_needed:
-        if type(array[0][0]) == numpy.float64 or type(array[0][0]) == numpy.int64:
-            return array
+    # in_place is checked first: the float64 timestamps are rounded even when no conversion is needed
+    if in_place and is_ts_mono_np(array) and array.dtype == numpy.float64:
+        numpy.rint(array[:, 0], out=array[:, 0])
+        return array
+
+    if only_if_needed and is_ts_mono_np(array):
+        return array
+
+    np_array = numpy.asarray(array)
+    result = numpy.empty((len(np_array), 2), dtype=numpy.float64)
+    result[:, 0] = ms_to_timestamp_np(np_array[:, 0])
+    result[:, 1] = values_to_float_np(np_array[:, 1])
+    return result
+
+
+def ts_to_csv_chunks(array, chunk_size=100000):
+    """
+    Vectorized encoder of a TS mono-valued into the CSV format imported by the Temporal Data Manager:
+
+       | timestamp;value
+       | 2015-01-01T01:23:45.000;3.0
+       | ...
+
+    The CSV is generated chunk by chunk (header included in first chunk): the whole text is never built in memory.
+    Timestamps are rounded to the nearest millisecond (see ms_to_timestamp_np).
+
+    :param array: TS mono-valued: shape equivalent of (nb_points, 2)
+    :type array: numpy array or list
+    :param chunk_size: optional, default 100000: number of points encoded per chunk
+    :type chunk_size: int
+    :return: generator of the encoded chunks
+    :rtype: generator of bytes
+    """
+    np_array = numpy.asarray(array)
+    yield b"timestamp;value\n"
+    for start in range(0, len(np_array), chunk_size):
+        chunk = np_array[start:start + chunk_size]
+        dates = numpy.datetime_as_string(ms_to_timestamp_np(chunk[:, 0]).astype('datetime64[ms]')).tolist()
+        yield "".join(["%s;%s\n" % point for point in zip(dates, chunk[:, 1].tolist())]).encode('utf-8')
+
+
+def array_to_csv_chunks(array, delimiter=";", chunk_size=100000):
+    """
+    Vectorized encoder of an array-like value into CSV lines, without header:
+    same content than numpy.savetxt(..., delimiter=delimiter, fmt="%s"), without temporary file.
+
+    Each column of a chunk is converted at once to str, then the columns are joined.
+    The CSV is generated chunk by chunk: the whole text is never built in memory.
+
+    :param array: the array: 1D (one value per line) or 2D
+    :type array: numpy array or list
+    :param delimiter: optional, default ";": separator of the columns
+    :type delimiter: str
+    :param chunk_size: optional, default 100000: number of lines encoded per chunk
+    :type chunk_size: int
+    :return: generator of the encoded chunks
+    :rtype: generator of bytes
+    :raises ValueError: array with more than 2 dimensions
+    """
+    np_array = numpy.asarray(array)
+    if np_array.ndim == 1:
+        np_array = np_array.reshape(-1, 1)
+    elif np_array.ndim != 2:
+        raise ValueError("Expecting an array with 1 or 2 dimensions (got shape %s)" % (np_array.shape,))
 
-    return numpy.array([[ms_to_timestamp(point[0]),
-                         value_to_float_resource_client(point[1])] for point in array])
+    for start in range(0, len(np_array), chunk_size):
+        chunk = np_array[start:start + chunk_size]
+        columns = [chunk[:, index].astype(str).tolist() for index in range(chunk.shape[1])]
+        yield "".join([delimiter.join(line) + "\n" for line in zip(*columns)]).encode('utf-8')
 
 
 def value_to_float_resource_client(value):
@@ -79,20 +198,22 @@ def value_to_float_resource_client(value):
 
 def to_timestamps_resource_client(array, only_if_needed=True):
     """
+    Convert timestamps to the resource client format (see ms_to_timestamp_np)
 
-    :param array:
-    :type array:
-    :param only_if_needed: if True: lazy conversion
+    :param array: timestamps to be converted
+    :type array: numpy array or list
+    :param only_if_needed: if True: lazy conversion: array is returned when it is already
+      a numpy array of int64
     :type only_if_needed: bool
     :return: converted timestamps
     :rtype: numpy array of numpy.int64
     """
 
     if only_if_needed:
-        if isinstance(array[0], numpy.int64):
+        if isinstance(array, numpy.ndarray) and array.dtype == numpy.int64:
             return array
 
-    return numpy.array([ms_to_timestamp(date) for date in array])
+    return ms_to_timestamp_np(array)
 
 
 def get_std_float(internal_value):
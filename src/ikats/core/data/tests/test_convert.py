@@ -15,8 +15,11 @@ limitations under the License.
 
 """
 from logging import StreamHandler
+import io
 import logging
+import os
 import sys
+import time
 import unittest
 
 import numpy
@@ -159,6 +162,84 @@ class TestConvert(unittest.TestCase):
             LOGGER.exception(err)
             raise err
 
+    def test_ts_mono_to_np_object_array(self):
+        """
+        Tests the conversion of an array of python objects (as built by resource client)
+        """
+        array = numpy.array([[x[0], float(x[1])] for x in SAMPLE_UNFORMATED_TS_2], dtype=object)
+
+        t_converted = tmod.ts_mono_to_np(array)
+        self.assertEqual(t_converted.dtype, numpy.float64)
+        self.check_numpy_array_equals(t_converted, REF_CONVERTED, "from numpy array of objects")
+
+        # Whole array is checked: a python list starting with numpy types is converted
+        mixed = [[numpy.float64(100), 0.0], [120.4, 1.0]]
+        t_converted = tmod.ts_mono_to_np(mixed)
+        self.assertIsInstance(t_converted, numpy.ndarray)
+        self.assertEqual(t_converted[1][0], 120)
+
+    def test_no_copy(self):
+        """
+        Tests that no copy is made when the arrays are already in the expected format
+        """
+        self.assertIs(tmod.ts_mono_to_np(SAMPLE_UNFORMATED_TS_4), SAMPLE_UNFORMATED_TS_4)
+        self.assertIs(tmod.to_timestamps_resource_client(REF_TIMESTAMPS), REF_TIMESTAMPS)
+        self.assertIs(tmod.ms_to_timestamp_np(REF_TIMESTAMPS), REF_TIMESTAMPS)
+
+        values = numpy.array([1.0, 2.0])
+        self.assertIs(tmod.values_to_float_np(values), values)
+
+        # In place rounding of float timestamps
+        array = SAMPLE_UNFORMATED_TS_3.copy()
+        t_converted = tmod.ts_mono_to_np(array, only_if_needed=False, in_place=True)
+        self.assertIs(t_converted, array)
+        self.check_numpy_array_equals(t_converted, REF_CONVERTED, "in place rounding")
+
+        # In place rounding with the default only_if_needed
+        array = SAMPLE_UNFORMATED_TS_3.copy()
+        t_converted = tmod.ts_mono_to_np(array, in_place=True)
+        self.assertIs(t_converted, array)
+        self.check_numpy_array_equals(t_converted, REF_CONVERTED, "in place rounding, only if needed")
+
+    def test_ts_to_csv_chunks(self):
+        """
+        Tests the CSV encoding of a TS, chunk by chunk
+        """
+        array = numpy.array([[1420075425000.4, 3], [1420075426000, 12564.5], [1420075427000, -0.1]])
+
+        chunks = list(tmod.ts_to_csv_chunks(array, chunk_size=2))
+
+        # header + 2 chunks
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(b"".join(chunks),
+                         b"timestamp;value\n"
+                         b"2015-01-01T01:23:45.000;3.0\n"
+                         b"2015-01-01T01:23:46.000;12564.5\n"
+                         b"2015-01-01T01:23:47.000;-0.1\n")
+
+        # Object arrays (format provided by resource client)
+        self.assertEqual(b"".join(tmod.ts_to_csv_chunks(array.astype(object))), b"".join(chunks))
+
+    def test_array_to_csv_chunks(self):
+        """
+        Tests the CSV encoding of an array, chunk by chunk: same content than numpy.savetxt with fmt="%s"
+        """
+        array = numpy.array([[1.5, -2, 1e-7], [numpy.nan, 3, 4.25], [0.1, 0, 1]])
+
+        chunks = list(tmod.array_to_csv_chunks(array, chunk_size=2))
+
+        self.assertEqual(len(chunks), 2)
+        expected = io.BytesIO()
+        numpy.savetxt(expected, array, delimiter=';', fmt="%s")
+        self.assertEqual(b"".join(chunks), expected.getvalue())
+
+        # One value per line, and mixed types
+        self.assertEqual(b"".join(tmod.array_to_csv_chunks([1, 2])), b"1\n2\n")
+        self.assertEqual(b"".join(tmod.array_to_csv_chunks([["a", 1], ["b", 2]], delimiter=",")), b"a,1\nb,2\n")
+
+        with self.assertRaises(ValueError):
+            list(tmod.array_to_csv_chunks(numpy.zeros((2, 2, 2))))
+
     def check_numpy_array_equals(self, result_numpy_array, expected_numpy_array, test_info=""):
         """
         Checks both numpy arrays containing timeseries data are equal
@@ -215,5 +296,63 @@ class TestConvert(unittest.TestCase):
             raise err
 
 
+@unittest.skipIf(int(os.environ.get('SKIP_LONG_TEST', 0)), "Long test skipped (SKIP_LONG_TEST)")
+class TestConvertBenchmark(unittest.TestCase):
+    """
+    Benchmark of the timeseries converters on large arrays
+    """
+
+    NB_POINTS = 10000000
+
+    def test_benchmark_ts_mono_to_np(self):
+        """
+        Measures the conversion of a 10M points TS
+        """
+        timestamps = numpy.arange(1000000000000, 1000000000000 + self.NB_POINTS, dtype=numpy.float64) + 0.4
+        values = numpy.random.RandomState(0).random_sample(self.NB_POINTS)
+
+        for label, array in [("float64", numpy.column_stack((timestamps, values))),
+                             ("object", numpy.column_stack((timestamps, values)).astype(object))]:
+            start = time.time()
+            t_converted = tmod.ts_mono_to_np(array, only_if_needed=False)
+            duration = time.time() - start
+            LOGGER.info("ts_mono_to_np (%s, %s points): %.3fs (%.0f points/s)",
+                        label, self.NB_POINTS, duration, self.NB_POINTS / duration)
+
+            self.assertEqual(t_converted.shape, (self.NB_POINTS, 2))
+            self.assertEqual(t_converted[-1][0], 1000000000000 + self.NB_POINTS - 1)
+
+    def test_benchmark_to_timestamps(self):
+        """
+        Measures the conversion of 10M timestamps
+        """
+        timestamps = numpy.arange(1000000000000, 1000000000000 + self.NB_POINTS, dtype=numpy.float64)
+
+        start = time.time()
+        dates_convert = tmod.to_timestamps_resource_client(timestamps)
+        duration = time.time() - start
+        LOGGER.info("to_timestamps_resource_client (%s points): %.3fs (%.0f points/s)",
+                    self.NB_POINTS, duration, self.NB_POINTS / duration)
+
+        self.assertEqual(dates_convert.dtype, numpy.int64)
+        self.assertEqual(len(dates_convert), self.NB_POINTS)
+
+    def test_benchmark_ts_to_csv_chunks(self):
+        """
+        Measures the CSV encoding of a 1M points TS (import into the Temporal Data Manager)
+        """
+        nb_points = self.NB_POINTS // 10
+        array = numpy.column_stack((numpy.arange(1000000000000, 1000000000000 + nb_points, dtype=numpy.float64),
+                                    numpy.random.RandomState(0).random_sample(nb_points)))
+
+        start = time.time()
+        size = sum(len(chunk) for chunk in tmod.ts_to_csv_chunks(array))
+        duration = time.time() - start
+        LOGGER.info("ts_to_csv_chunks (%s points): %.3fs (%.0f points/s, %.1f MB/s)",
+                    nb_points, duration, nb_points / duration, size / duration / 1e6)
+
+        self.assertGreater(size, nb_points * len("2001-09-09T01:46:40.000;0.0\n"))
+
+
 if __name__ == "__main__":
     unittest.main()
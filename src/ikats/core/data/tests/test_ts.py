@@ -0,0 +1,105 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+from unittest import TestCase
+
+import numpy as np
+
+from ikats.core.data.ts import TimestampedMonoVal
+
+
+class TestTimestampedMonoVal(TestCase):
+    """
+    Test of the TimestampedMonoVal class
+    """
+
+    def test_init(self):
+        """
+        Tests the columnar layout built from the different formats provided by the resource client
+        """
+        expected_timestamps = np.array([1000, 2000, 3000], dtype=np.int64)
+        expected_values = np.array([1.5, -2.0, 3.25])
+
+        for array in [[[1000, 1.5], [2000, -2.0], [3000, 3.25]],
+                      np.array([[1000, 1.5], [2000, -2.0], [3000, 3.25]]),
+                      np.array([[1000, 1.5], [2000, -2.0], [3000, 3.25]], dtype=object)]:
+            ts = TimestampedMonoVal(array)
+            self.assertEqual(ts.timestamps.dtype, np.int64)
+            self.assertEqual(ts.values.dtype, np.float64)
+            self.assertTrue(ts.timestamps.flags['C_CONTIGUOUS'])
+            self.assertTrue(ts.values.flags['C_CONTIGUOUS'])
+            np.testing.assert_array_equal(ts.timestamps, expected_timestamps)
+            np.testing.assert_array_equal(ts.values, expected_values)
+
+        with self.assertRaises(AssertionError):
+            TimestampedMonoVal(np.empty((0, 2)))
+
+    def test_accessors(self):
+        """
+        Tests the point accessors
+        """
+        ts = TimestampedMonoVal(np.array([[1000, 1.5], [2000, -2.0], [3000, 3.25]]))
+
+        self.assertEqual(len(ts), 3)
+        self.assertEqual(ts.get_first_date_std(), 1000)
+        self.assertEqual(ts.get_last_date_std(), 3000)
+        self.assertEqual(ts.get_point_std(1), [2000, -2.0])
+        self.assertIs(type(ts.get_point_std(1)[0]), int)
+        np.testing.assert_array_equal(ts.get_point(2), [3000, 3.25])
+        self.assertEqual(ts.get_value_float_std(0), 1.5)
+        np.testing.assert_array_equal(ts.data, [[1000, 1.5], [2000, -2.0], [3000, 3.25]])
+        self.assertEqual(ts.data.shape, (3, 2))
+
+        # data is built once: the changes made through it are kept
+        self.assertIs(ts.data, ts.data)
+        ts.data[0, 1] = 0.5
+        self.assertEqual(ts.data[0, 1], 0.5)
+
+    def test_no_copy(self):
+        """
+        Tests that the columns are shared (zero-copy) between timeseries
+        """
+        timestamps = np.arange(0, 10000, 1000, dtype=np.int64)
+        values = np.arange(10, dtype=np.float64)
+        ts = TimestampedMonoVal.from_columns(timestamps, values)
+        self.assertIs(ts.timestamps, timestamps)
+        self.assertIs(ts.values, values)
+
+        other = TimestampedMonoVal(ts)
+        self.assertIs(other.timestamps, ts.timestamps)
+        self.assertIs(other.values, ts.values)
+
+        with self.assertRaises(ValueError):
+            TimestampedMonoVal.from_columns(timestamps, values[:5])
+
+        # Compact layout: no instance dictionary
+        self.assertFalse(hasattr(ts, '__dict__'))
+
+    def test_slice_by_time(self):
+        """
+        Tests the time range selection
+        """
+        ts = TimestampedMonoVal.from_columns(np.arange(0, 10000, 1000), np.arange(10.0))
+
+        part = ts.slice_by_time(2000, 4500)
+        np.testing.assert_array_equal(part.timestamps, [2000, 3000, 4000])
+        np.testing.assert_array_equal(part.values, [2.0, 3.0, 4.0])
+        self.assertTrue(np.shares_memory(part.values, ts.values))
+
+        self.assertEqual(len(ts.slice_by_time(ed=0)), 1)
+        self.assertEqual(len(ts.slice_by_time(sd=8500)), 1)
+        self.assertEqual(len(ts.slice_by_time(20000, 30000)), 0)
+        self.assertEqual(len(ts.slice_by_time()), 10)
@@ -16,7 +16,9 @@ limitations under the License.
 """
 from abc import abstractmethod
 
-from ikats.core.data.convert import ts_mono_to_np, get_std_millisec, get_std_float
+import numpy as np
+
+from ikats.core.data.convert import get_std_millisec, get_std_float, ms_to_timestamp_np, values_to_float_np
 
 
 class AbstractTs(object):
@@ -28,6 +30,9 @@ class AbstractTs(object):
     adapted to algorithms in ikats_pre library or other
     """
 
+    # Empty slots: let the subclasses define a compact layout (subclasses without __slots__ keep a __dict__)
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -59,61 +64,131 @@ class TimestampedMonoVal(AbstractTs):
         * one timestamp (the date associated to the point)
         * one value
 
-    Internal implementation: is compatible with the resource package of ikats_core
-    (numpy array: format defined from extract services on the TemporalDataMgr)
+    Internal implementation: columnar layout, compatible with the resource package of ikats_core
+        * timestamps: contiguous numpy array of int64 (milliseconds)
+        * values: contiguous numpy array of float64
+
+    Prefer the vectorized accessors (timestamps, values, slice_by_time) to the per-index accessors
+    in order to avoid python loops on large timeseries.
     """
 
+    __slots__ = ('__timestamps', '__values', '__data')
+
     def __init__(self, numpy_array_client):
         """
         This constructor sets TimestampedMonoVal with numpy array, which should be compatible with resource client.
 
-        Note: a conversion is applied only if needed, to guarantee compatibility:
-          - See: the ikats.core.data.convert function: ts_mono_to_np,
-                 with option only_if_needed=True
+        Note: the array is converted into the columnar layout (timestamps are rounded to int64, values are converted
+        to float64). No copy is made from another TimestampedMonoVal (the columns are shared).
+          - See: the ikats.core.data.convert functions: ms_to_timestamp_np, values_to_float_np
 
         :param numpy_array_client: see numpy format defined from extract services on the TemporalDataMgr
-        :type numpy_array_client: numpy: array. this
+                                   (2D array: first column is timestamp, second is value), or another TimestampedMonoVal
+        :type numpy_array_client: numpy: array, or TimestampedMonoVal
         """
         super(TimestampedMonoVal, self).__init__()
-        if type(numpy_array_client) == TimestampedMonoVal:
-            self.__numpy_array = numpy_array_client
+        # 2D array built on first access to data
+        self.__data = None
+        if isinstance(numpy_array_client, TimestampedMonoVal):
+            self.__timestamps = numpy_array_client.timestamps
+            self.__values = numpy_array_client.values
         else:
-            self.__numpy_array = ts_mono_to_np(array=numpy_array_client, only_if_needed=True)
+            assert (len(numpy_array_client) > 0), "Empty Timeseries"
+            array = np.asarray(numpy_array_client)
+            self.__timestamps = np.ascontiguousarray(ms_to_timestamp_np(array[:, 0]))
+            self.__values = np.ascontiguousarray(values_to_float_np(array[:, 1]))
+
+    @classmethod
+    def from_columns(cls, timestamps, values):
+        """
+        Build a TimestampedMonoVal from the timestamps and values columns.
+        No copy is made when the columns are already contiguous arrays of int64 and float64.
+
+        :param timestamps: timestamps in milliseconds
+        :param values: values of the points
+
+        :type timestamps: numpy array or list
+        :type values: numpy array or list
+
+        :return: the timeseries
+        :rtype: TimestampedMonoVal
+
+        :raises ValueError: if the columns have different lengths
+        """
+        timestamps = np.ascontiguousarray(ms_to_timestamp_np(timestamps))
+        values = np.ascontiguousarray(values_to_float_np(values))
+        if timestamps.shape != values.shape or timestamps.ndim != 1:
+            raise ValueError("timestamps and values shall be 1D arrays of same length (got %s and %s)" %
+                             (timestamps.shape, values.shape))
+
+        ts = cls.__new__(cls)
+        ts.__timestamps = timestamps
+        ts.__values = values
+        ts.__data = None
+        return ts
 
     @property
     def data(self):
         """
-        Get the numpy array
+        Get the numpy array: 2D array of float64 (first column is timestamp, second is value)
+
+        Note: this array is a copy of the columns, built on first call then kept by the timeseries
+        (doubling its memory): prefer timestamps and values properties.
+        Changes made in place through this array are kept by data, but they are not seen by the columns,
+        nor by the other accessors (get_value, slice_by_time, ...): build a new timeseries instead
+        (see from_columns).
         """
-        return self.__numpy_array
+        if self.__data is None:
+            self.__data = np.column_stack((self.__timestamps, self.__values))
+        return self.__data
 
     @property
     def timestamps(self):
         """
-        Get all the timestamps as one array
+        Get all the timestamps as one array (int64, no copy)
         """
-        return self.__numpy_array[:, 0]
+        return self.__timestamps
 
     @property
     def values(self):
         """
-        Get all values as one array
+        Get all values as one array (float64, no copy)
         """
-        return self.__numpy_array[:, 1]
+        return self.__values
 
     def __len__(self):
         """
         Return the length of the data data
         """
-        return int(self.__numpy_array.shape[0])
+        return int(self.__timestamps.shape[0])
+
+    def slice_by_time(self, sd=None, ed=None):
+        """
+        Get the points within the time range [sd, ed] (bounds included).
+        The timestamps are assumed sorted: the range is located by binary search, and the
+        resulting timeseries shares the columns of this one (no copy).
+
+        :param sd: optional, default None: start date in milliseconds (None: from first point)
+        :param ed: optional, default None: end date in milliseconds (None: until last point)
+
+        :type sd: int or None
+        :type ed: int or None
+
+        :return: the points in time range (possibly empty)
+        :rtype: TimestampedMonoVal
+        """
+        start_index = 0 if sd is None else int(np.searchsorted(self.__timestamps, sd, side='left'))
+        end_index = len(self) if ed is None else int(np.searchsorted(self.__timestamps, ed, side='right'))
+        return TimestampedMonoVal.from_columns(self.__timestamps[start_index:end_index],
+                                               self.__values[start_index:end_index])
 
     def get_first_date(self):
         """
         Gets the internal timestamp of first point
         :return: timestamp of first point
-        :rtype: numpy.datetime64
+        :rtype: numpy.int64
         """
-        return self.__numpy_array[0][0]
+        return self.__timestamps[0]
 
     def get_first_date_std(self):
         """
@@ -127,9 +202,9 @@ class TimestampedMonoVal(AbstractTs):
         """
         Gets the internal timestamp of last point
         :return: timestamp of last point
-        :rtype: numpy.datetime64
+        :rtype: numpy.int64
         """
-        return self.__numpy_array[-1][0]
+        return self.__timestamps[-1]
 
     def get_last_date_std(self):
         """
@@ -145,17 +220,16 @@ class TimestampedMonoVal(AbstractTs):
         :param index:
         :type index:
         """
-        internal_point = self.__numpy_array[index]
-        return [get_std_millisec(internal_point[0]),
-                get_std_float(internal_point[1])]
+        return [get_std_millisec(self.__timestamps[index]),
+                get_std_float(self.__values[index])]
 
     def get_point(self, index):
         """
-        Get numpy point (internal format: provided by resource client)
+        Get numpy point (format provided by resource client: numpy array [timestamp, value] of float64)
         :param index:
         :type index: int
         """
-        return self.__numpy_array[index]
+        return np.array([self.__timestamps[index], self.__values[index]], dtype=np.float64)
 
     def get_timestamp_millisec(self, index):
         """
@@ -163,9 +237,9 @@ class TimestampedMonoVal(AbstractTs):
         :param index: index of point
         :type index: int
         :return: internal timestamp in milliseconds
-        :rtype: internal numpy type
+        :rtype: numpy.int64
         """
-        return self.__numpy_array[index][0]
+        return self.__timestamps[index]
 
     def get_timestamp_millisec_std(self, index):
         """
@@ -175,7 +249,7 @@ class TimestampedMonoVal(AbstractTs):
         :return: converted timestamp in milliseconds
         :rtype: int
         """
-        return get_std_millisec(self.__numpy_array[index][0])
+        return get_std_millisec(self.__timestamps[index])
 
     def get_value(self, index):
         """
@@ -183,9 +257,9 @@ class TimestampedMonoVal(AbstractTs):
         :param index: index of point
         :type index: int
         :return: internal value
-        :rtype: internal numpy type
+        :rtype: numpy.float64
         """
-        return self.__numpy_array[index][1]
+        return self.__values[index]
 
     def get_value_float_std(self, index):
         """
@@ -195,4 +269,4 @@ class TimestampedMonoVal(AbstractTs):
         :return: converted value
         :rtype: float type
         """
-        return get_std_float(self.__numpy_array[index][1])
+        return get_std_float(self.__values[index])
@@ -0,0 +1,336 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import base64
+import lzma
+import pickle
+import struct
+import zlib
+
+from ikats.core.library.exception import IkatsException
+
+"""
+Streamed encoding of the python objects saved in the process data blobs.
+
+Blob layout:
+  - MAGIC (4 bytes) + compression code (1 byte): not compressed
+  - then the compressed stream of:
+     - header: number of out-of-band buffers (uint32), size of the pickle payload (uint64)
+     - the pickle payload
+     - for each out-of-band buffer: size (uint64), then the raw bytes
+
+With pickle protocol 5 (python >= 3.8), the data of the contiguous numpy arrays are out-of-band buffers:
+they are compressed and sent without intermediate copy. With older protocols, every data is in the payload:
+pickle.dumps() builds the whole payload in memory before its compression, which is done by chunks.
+
+The decoding works on chunks: the memory required beyond the decoded object is about the chunk size,
+plus the pickle payload.
+
+The process data API expects the blob encoded in base64 (see encode_base64()): the encoded chunks are
+streamed as well.
+"""
+
+MAGIC = b"IKB1"
+
+# Compressions: name => code saved in the blob
+COMPRESSIONS = {'none': 0, 'zlib': 1, 'lzma': 2}
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Size of the base64 lines, once decoded: multiple of 3, as codecs.encode(..., "base64")
+BASE64_LINE_SIZE = 57
+
+# Protocol 5 handles the out-of-band buffers
+PICKLE_PROTOCOL = min(pickle.HIGHEST_PROTOCOL, 5)
+
+_HEADER = struct.Struct("<IQ")
+_SIZE = struct.Struct("<Q")
+
+
+class BlobError(IkatsException):
+    """
+    Error raised when a blob cannot be decoded
+    """
+
+    def __init__(self, msg, cause=None):
+        super(BlobError, self).__init__(msg, cause)
+
+
+def is_encoded_blob(content):
+    """
+    Tests if the content starts like a blob produced by encode_blob()
+
+    :param content: the content, or its first bytes
+    :type content: bytes
+    :return: True if the content starts with MAGIC
+    :rtype: bool
+    """
+    return isinstance(content, (bytes, bytearray)) and bytes(content[:len(MAGIC)]) == MAGIC
+
+
+class _NoCompressor(object):
+    """
+    Compressor/decompressor of the compression 'none'
+    """
+
+    def __init__(self):
+        self.__tail = b""
+
+    @staticmethod
+    def compress(data):
+        return bytes(data)
+
+    @staticmethod
+    def flush():
+        return b""
+
+    @property
+    def needs_input(self):
+        return len(self.__tail) == 0
+
+    @property
+    def eof(self):
+        # no end marker without compression
+        return True
+
+    def decompress(self, data, max_length):
+        data = self.__tail + data
+        self.__tail = data[max_length:]
+        return data[:max_length]
+
+
+class _ZlibDecompressor(object):
+    """
+    zlib decompressor with the interface of lzma.LZMADecompressor: needs_input, eof, decompress(data, max_length)
+    """
+
+    def __init__(self):
+        self.__decompressor = zlib.decompressobj()
+
+    @property
+    def needs_input(self):
+        return len(self.__decompressor.unconsumed_tail) == 0
+
+    @property
+    def eof(self):
+        return self.__decompressor.eof
+
+    def decompress(self, data, max_length):
+        return self.__decompressor.decompress(self.__decompressor.unconsumed_tail + data, max_length)
+
+
+def _new_compressor(compression, level):
+    if compression == 'zlib':
+        return zlib.compressobj(6 if level is None else level)
+    elif compression == 'lzma':
+        return lzma.LZMACompressor(preset=level)
+    return _NoCompressor()
+
+
+def _new_decompressor(code):
+    if code == COMPRESSIONS['zlib']:
+        return _ZlibDecompressor()
+    elif code == COMPRESSIONS['lzma']:
+        return lzma.LZMADecompressor()
+    elif code == COMPRESSIONS['none']:
+        return _NoCompressor()
+    raise BlobError("Unknown compression code=%s in blob" % code)
+
+
+def encode_blob(value, compression='zlib', chunk_size=DEFAULT_CHUNK_SIZE, level=None):
+    """
+    Encode the value: generator of the chunks of the blob, to be streamed
+
+    Note: below protocol 5, the pickle payload is built in memory before its compression
+
+    :param value: the python object, which can be pickled
+    :type value: any
+    :param compression: optional, default 'zlib': one of COMPRESSIONS keys
+    :type compression: str
+    :param chunk_size: optional, default DEFAULT_CHUNK_SIZE: maximum size of the yielded chunks, in bytes
+    :type chunk_size: int
+    :param level: optional, default None: compression level (zlib) or preset (lzma), None for the default one
+    :type level: int or None
+    :return: the chunks
+    :rtype: generator of bytes
+    :raises ValueError: unknown compression
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError("Unknown compression=%s: expecting one of %s" % (compression, sorted(COMPRESSIONS)))
+
+    buffers = []
+    if PICKLE_PROTOCOL >= 5:
+        payload = pickle.dumps(value, protocol=PICKLE_PROTOCOL, buffer_callback=buffers.append)
+    else:
+        payload = pickle.dumps(value, protocol=PICKLE_PROTOCOL)
+
+    yield MAGIC + bytes([COMPRESSIONS[compression]])
+
+    compressor = _new_compressor(compression, level)
+    pieces = [_HEADER.pack(len(buffers), len(payload)), payload]
+    for buffer in buffers:
+        raw = buffer.raw()
+        pieces.extend([_SIZE.pack(raw.nbytes), raw])
+
+    pending = bytearray()
+    for piece in pieces:
+        view = memoryview(piece)
+        for offset in range(0, len(view), chunk_size):
+            pending += compressor.compress(view[offset:offset + chunk_size])
+            while len(pending) >= chunk_size:
+                yield bytes(pending[:chunk_size])
+                del pending[:chunk_size]
+
+    pending += compressor.flush()
+    for offset in range(0, len(pending), chunk_size):
+        yield bytes(pending[offset:offset + chunk_size])
+
+
+def encode_base64(chunks, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Encode the chunks in base64, like codecs.encode(b"".join(chunks), "base64"), without joining them:
+    the bytes are encoded by pieces aligned on BASE64_LINE_SIZE, so that the encoded pieces can be
+    concatenated
+
+    :param chunks: the chunks of the blob: any split is accepted
+    :type chunks: iterable of bytes
+    :param chunk_size: optional, default DEFAULT_CHUNK_SIZE: approximate size of the encoded pieces, in bytes
+    :type chunk_size: int
+    :return: the encoded pieces
+    :rtype: generator of bytes
+    """
+    aligned_size = max(1, chunk_size // BASE64_LINE_SIZE) * BASE64_LINE_SIZE
+    pending = bytearray()
+    for chunk in chunks:
+        pending += chunk
+        if len(pending) >= aligned_size:
+            encoded_size = len(pending) - len(pending) % BASE64_LINE_SIZE
+            yield base64.encodebytes(pending[:encoded_size])
+            del pending[:encoded_size]
+    if pending:
+        yield base64.encodebytes(pending)
+
+
+class _BlobReader(object):
+    """
+    Reader of the decompressed stream of a blob, fed by the chunks of the blob
+    """
+
+    def __init__(self, chunks, chunk_size):
+        self.__chunks = iter(chunks)
+        self.__chunk_size = chunk_size
+        self.__input = b""
+        self.__output = memoryview(b"")
+
+        header = self.__read_raw(len(MAGIC) + 1)
+        if header[:len(MAGIC)] != MAGIC:
+            raise BlobError("Unexpected blob: missing magic header")
+        self.__decompressor = _new_decompressor(header[len(MAGIC)])
+
+    def __read_raw(self, size):
+        """
+        Read the first bytes of the blob, not compressed
+        """
+        while len(self.__input) < size:
+            chunk = next(self.__chunks, None)
+            if chunk is None:
+                raise BlobError("Unexpected blob: truncated header")
+            self.__input += chunk
+        read, self.__input = self.__input[:size], self.__input[size:]
+        return read
+
+    def __next_input(self):
+        """
+        Get the next compressed bytes for the decompressor: empty while it has pending input
+        """
+        if self.__input:
+            data, self.__input = self.__input, b""
+            return data
+        elif self.__decompressor.needs_input:
+            data = b""
+            while not data:
+                data = next(self.__chunks, None)
+                if data is None:
+                    raise BlobError("Unexpected blob: truncated content")
+            return data
+        return b""
+
+    def __fill(self):
+        """
+        Decompress the next bytes
+        """
+        while len(self.__output) == 0:
+            self.__output = memoryview(self.__decompressor.decompress(self.__next_input(), self.__chunk_size))
+            if len(self.__output) == 0 and self.__decompressor.eof:
+                raise BlobError("Unexpected blob: truncated content")
+
+    def check_end(self):
+        """
+        Check that the compressed stream is complete: its end marker and checksum are read
+        """
+        while not self.__decompressor.eof:
+            if self.__decompressor.decompress(self.__next_input(), self.__chunk_size):
+                raise BlobError("Unexpected blob: trailing content")
+
+    def read(self, size):
+        """
+        Read exactly size decompressed bytes
+
+        :param size: number of bytes
+        :type size: int
+        :return: the bytes
+        :rtype: bytearray
+        """
+        read = bytearray(size)
+        view = memoryview(read)
+        filled = 0
+        while filled < size:
+            self.__fill()
+            count = min(size - filled, len(self.__output))
+            view[filled:filled + count] = self.__output[:count]
+            self.__output = self.__output[count:]
+            filled += count
+        return read
+
+
+def decode_blob(chunks, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Decode the blob produced by encode_blob(), from its chunks
+
+    :param chunks: the chunks of the blob: any split is accepted
+    :type chunks: iterable of bytes
+    :param chunk_size: optional, default DEFAULT_CHUNK_SIZE: maximum size of the decompressed pieces, in bytes
+    :type chunk_size: int
+    :return: the decoded python object
+    :rtype: any
+    :raises BlobError: unexpected blob content
+    """
+    reader = _BlobReader(chunks, chunk_size)
+
+    try:
+        buffer_count, payload_size = _HEADER.unpack(reader.read(_HEADER.size))
+        payload = reader.read(payload_size)
+        buffers = [reader.read(_SIZE.unpack(reader.read(_SIZE.size))[0]) for _ in range(buffer_count)]
+        reader.check_end()
+    except (zlib.error, lzma.LZMAError, EOFError) as error:
+        raise BlobError("Failed to decompress the blob content", error)
+
+    try:
+        if buffers:
+            return pickle.loads(payload, buffers=buffers)
+        return pickle.loads(payload)
+    except Exception as error:
+        raise BlobError("Failed to unpickle the blob content", error)
@@ -0,0 +1,274 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import logging
+import threading
+import time
+
+from ikats.core.library.exception import IkatsException
+
+"""
+Cooperative cancellation of the running algorithms.
+
+The execution engine installs a CancelToken for the current thread (see set_cancel_token()). The token is
+cancelled on request, or when the wall-clock budget of the execution is exceeded (see CancelToken.start_timer()):
+  - the engine checks the token between the phases of the execution
+  - long algorithms may check it themselves, with check_cancelled()
+  - the code which can be interrupted from another thread (ex: a Spark job group, a worker process) registers
+    a callback on the token (see CancelToken.add_callback())
+  - the conditions which cannot signal the token themselves (ex: a request saved by another process) are
+    polled by the checks of the token (see CancelToken.add_poll())
+
+Example:
+
+    from ikats.core.library.cancellation import check_cancelled
+
+    def my_algo(ts_list):
+        for tsuid in ts_list:
+            check_cancelled()
+            ...
+"""
+
+LOGGER = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class CancelledError(IkatsException):
+    """
+    Error raised when the execution has been cancelled
+    """
+
+    def __init__(self, msg, cause=None):
+        """
+        Constructor
+        :param msg: error message
+        :type msg: str
+        """
+        super(CancelledError, self).__init__(msg, cause)
+
+
+class CancelToken(object):
+    """
+    Cancellation token of one execution: cancelled once, from any thread.
+
+    The polls registered with add_poll() are called by is_cancelled() and check(), in the calling thread.
+    """
+
+    def __init__(self, name):
+        """
+        Constructor
+        :param name: name of the token, used by the logs, and as Spark job group
+        :type name: str
+        """
+        self.__name = name
+        self.__event = threading.Event()
+        self.__lock = threading.Lock()
+        self.__reason = None
+        self.__callbacks = {}
+        self.__timer = None
+        self.__polls = {}
+        self.__poll_lock = threading.Lock()
+
+    @property
+    def name(self):
+        """
+        :return: the name of the token
+        :rtype: str
+        """
+        return self.__name
+
+    @property
+    def reason(self):
+        """
+        :return: the reason of the cancellation, or None while not cancelled
+        :rtype: str or None
+        """
+        return self.__reason
+
+    def __run_polls(self):
+        """
+        Call the polls whose interval has elapsed: skipped while another thread is polling
+        """
+        if not self.__polls or self.__event.is_set() or not self.__poll_lock.acquire(False):
+            return
+        try:
+            now = time.time()
+            for key, (poll, interval, next_date) in list(self.__polls.items()):
+                if now < next_date:
+                    continue
+                self.__polls[key] = (poll, interval, now + interval)
+                try:
+                    reason = poll()
+                except Exception as error:
+                    LOGGER.error("CancelToken %s: failed poll %s", self.__name, key)
+                    LOGGER.exception(error)
+                    continue
+                if reason:
+                    self.cancel(reason)
+                    return
+        finally:
+            self.__poll_lock.release()
+
+    def is_cancelled(self):
+        """
+        :return: True when the token is cancelled: the polls are called first, see add_poll()
+        :rtype: bool
+        """
+        self.__run_polls()
+        return self.__event.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Wait for the cancellation
+
+        :param timeout: optional, default None: maximum waiting time in seconds, None for no limit
+        :type timeout: float or None
+        :return: True when the token is cancelled
+        :rtype: bool
+        """
+        return self.__event.wait(timeout)
+
+    def check(self):
+        """
+        :raises CancelledError: if the token is cancelled: the polls are called first, see add_poll()
+        """
+        self.__run_polls()
+        if self.__event.is_set():
+            raise CancelledError("Execution %s cancelled: %s" % (self.__name, self.__reason))
+
+    def cancel(self, reason="cancelled by request"):
+        """
+        Cancel the token, and call the registered callbacks: ignored if already cancelled
+
+        :param reason: optional, default "cancelled by request": the reason of the cancellation
+        :type reason: str
+        :return: True if the token has been cancelled by this call
+        :rtype: bool
+        """
+        with self.__lock:
+            if self.__event.is_set():
+                return False
+            self.__reason = reason
+            self.__event.set()
+            callbacks = list(self.__callbacks.values())
+
+        LOGGER.info("CancelToken %s: %s", self.__name, reason)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as error:
+                LOGGER.error("CancelToken %s: failed callback %s", self.__name, callback)
+                LOGGER.exception(error)
+        return True
+
+    def add_callback(self, key, callback):
+        """
+        Register the callback called on cancellation: called at once if the token is already cancelled.
+        A callback registered again with the same key replaces the previous one.
+
+        :param key: identifier of the callback
+        :type key: hashable
+        :param callback: function called without argument
+        :type callback: callable
+        """
+        with self.__lock:
+            cancelled = self.__event.is_set()
+            if not cancelled:
+                self.__callbacks[key] = callback
+        if cancelled:
+            callback()
+
+    def remove_callback(self, key):
+        """
+        Unregister the callback, if registered
+
+        :param key: identifier of the callback
+        :type key: hashable
+        """
+        with self.__lock:
+            self.__callbacks.pop(key, None)
+
+    def add_poll(self, key, poll, interval):
+        """
+        Register a condition of cancellation, polled by is_cancelled() and check(): at the first check, then
+        at most once every interval seconds. A poll registered again with the same key replaces the previous one.
+
+        :param key: identifier of the poll
+        :type key: hashable
+        :param poll: function called without argument: returns the reason of the cancellation, or None
+        :type poll: callable
+        :param interval: minimum interval between two calls, in seconds
+        :type interval: float
+        """
+        with self.__poll_lock:
+            self.__polls[key] = (poll, interval, 0)
+
+    def start_timer(self, timeout):
+        """
+        Cancel the token after timeout seconds, unless stop_timer() is called before
+
+        :param timeout: the wall-clock budget in seconds, None for no limit
+        :type timeout: float or None
+        """
+        if timeout is None:
+            return
+        self.stop_timer()
+        self.__timer = threading.Timer(timeout, self.cancel,
+                                       kwargs={'reason': "exceeded the time limit of %s s" % timeout})
+        self.__timer.daemon = True
+        self.__timer.start()
+
+    def stop_timer(self):
+        """
+        Stop the timer started by start_timer(), if any
+        """
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+
+
+def set_cancel_token(token):
+    """
+    Install the token of the current thread: called by the execution engine
+
+    :param token: the token, or None to remove it
+    :type token: CancelToken or None
+    :return: the previous token of the current thread, or None
+    :rtype: CancelToken or None
+    """
+    previous = getattr(_local, 'token', None)
+    _local.token = token
+    return previous
+
+
+def get_cancel_token():
+    """
+    :return: the token of the current thread, or None
+    :rtype: CancelToken or None
+    """
+    return getattr(_local, 'token', None)
+
+
+def check_cancelled():
+    """
+    Check the token of the current thread: no effect without token
+
+    :raises CancelledError: if the execution is cancelled
+    """
+    token = getattr(_local, 'token', None)
+    if token is not None:
+        token.check()
@@ -0,0 +1,95 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import threading
+
+"""
+Lazy values: the inputs of an algorithm which are only read when the algorithm uses them.
+
+The execution engine may pass a LazyValue instead of the value of a large input (see the setting
+IKATS_EXEC_PREFETCH['LAZY_INPUTS']): the algorithm gets the value with materialize(), which accepts
+both the lazy and the plain values.
+
+Example:
+
+    from ikats.core.library.lazy import materialize
+
+    def my_algo(model, data):
+        if not required(model):
+            return None
+        return apply(model, materialize(data))
+"""
+
+
+class LazyValue(object):
+    """
+    Value loaded on first call of get(), at most once, from any thread
+    """
+
+    def __init__(self, loader, name=None):
+        """
+        Constructor
+        :param loader: function called without argument, returning the value
+        :type loader: callable
+        :param name: optional, default None: name of the value, used by the logs
+        :type name: str or None
+        """
+        self.__loader = loader
+        self.__name = name
+        self.__lock = threading.Lock()
+        self.__loaded = False
+        self.__value = None
+
+    @property
+    def is_loaded(self):
+        """
+        :return: True once the value is loaded
+        :rtype: bool
+        """
+        return self.__loaded
+
+    def get(self):
+        """
+        Get the value: loaded on first call. When the loader raises an error, the next call loads again.
+
+        :return: the value
+        :rtype: any
+        """
+        if not self.__loaded:
+            with self.__lock:
+                if not self.__loaded:
+                    self.__value = self.__loader()
+                    self.__loaded = True
+                    # the loader may hold resources: released once loaded
+                    self.__loader = None
+        return self.__value
+
+    def __repr__(self):
+        return "LazyValue(name=%s, loaded=%s)" % (self.__name, self.__loaded)
+
+
+def materialize(value):
+    """
+    Get the value of an input, lazy or not
+
+    :param value: the input: a LazyValue, or the value itself
+    :type value: LazyValue or any
+    :return: the value
+    :rtype: any
+    """
+    if isinstance(value, LazyValue):
+        return value.get()
+    return value
@@ -0,0 +1,348 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import importlib
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import signal
+import threading
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:
+    # Not available on every platform: the memory limits are then ignored
+    resource = None
+
+from ikats.core.library.cancellation import CancelledError
+from ikats.core.library.exception import IkatsException
+
+LOGGER = logging.getLogger(__name__)
+
+# Interval in seconds between two checks of the cancel token during a call: see ProcessPool.run()
+CANCEL_POLL_INTERVAL = 0.1
+
+
+class WorkerError(IkatsException):
+    """
+    Error raised in a worker process which cannot be sent back as is (not picklable)
+    """
+
+    def __init__(self, msg, cause=None):
+        """
+        Constructor
+        :param msg: error message
+        :type msg: str
+        """
+        super(WorkerError, self).__init__(msg, cause)
+
+
+class WorkerTimeoutError(IkatsException):
+    """
+    Error raised when a function exceeds its time limit: the worker process has been killed
+    """
+
+    def __init__(self, msg, cause=None):
+        """
+        Constructor
+        :param msg: error message
+        :type msg: str
+        """
+        super(WorkerTimeoutError, self).__init__(msg, cause)
+
+
+class WorkerCrashError(IkatsException):
+    """
+    Error raised when a worker process died during the call of a function (ex: killed by the system)
+    """
+
+    def __init__(self, msg, cause=None):
+        """
+        Constructor
+        :param msg: error message
+        :type msg: str
+        """
+        super(WorkerCrashError, self).__init__(msg, cause)
+
+
+def resolve_function(function_path):
+    """
+    Evaluate the function defined by its path
+
+    :param function_path: <module path>::<function name>, ex: "math::cos"
+    :type function_path: str
+    :return: the function
+    :rtype: callable
+    :raises ValueError: if the function path is not well formed
+    """
+    parsed_path = function_path.split("::")
+    if len(parsed_path) != 2:
+        raise ValueError("Unexpected function path %s: expecting <module path>::<function name>" % function_path)
+
+    my_module = importlib.import_module(parsed_path[0])
+    my_function = my_module
+    for attribute in parsed_path[1].split("."):
+        my_function = getattr(my_function, attribute)
+    return my_function
+
+
+def _worker_main(connection, preload):
+    """
+    Main loop of a worker process: calls the functions received on connection, and sends back the results
+
+    :param connection: worker side of the pipe
+    :type connection: multiprocessing.connection.Connection
+    :param preload: modules imported when the worker starts
+    :type preload: list of str
+    """
+    for module in preload:
+        importlib.import_module(module)
+
+    # Functions already evaluated by this worker
+    functions = {}
+
+    while True:
+        try:
+            job = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if job is None:
+            return
+
+        function_path, args, memory_limit = job
+        previous_limit = None
+        try:
+            if function_path not in functions:
+                functions[function_path] = resolve_function(function_path)
+
+            if memory_limit is not None and resource is not None:
+                previous_limit = resource.getrlimit(resource.RLIMIT_AS)
+                resource.setrlimit(resource.RLIMIT_AS, (memory_limit, previous_limit[1]))
+
+            reply = (True, functions[function_path](*args))
+        except BaseException as error:
+            reply = (False, error, traceback.format_exc())
+        finally:
+            if previous_limit is not None:
+                resource.setrlimit(resource.RLIMIT_AS, previous_limit)
+
+        try:
+            # The reply is checked before being sent: an unpicklable reply would be lost
+            data = pickle.dumps(reply)
+            if reply[0] is False:
+                pickle.loads(data)
+        except Exception as error:
+            if reply[0] is True:
+                message = "Unpicklable result from %s: %s" % (function_path, error)
+            else:
+                message = "Error raised by %s: %r" % (function_path, reply[1])
+            data = pickle.dumps((False, WorkerError(message), reply[2] if len(reply) > 2 else None))
+        connection.send_bytes(data)
+
+
+class _Worker(object):
+    """
+    Worker process with the parent side of its pipe
+    """
+
+    def __init__(self, context, preload):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_connection, preload), daemon=True)
+        self.process.start()
+        child_connection.close()
+
+    def kill(self):
+        """
+        Kill the worker process
+        """
+        self.connection.close()
+        if self.process.is_alive():
+            # Process.kill() is not available before python 3.7
+            os.kill(self.process.pid, signal.SIGKILL)
+        self.process.join()
+
+
+class ProcessPool(object):
+    """
+    Pool of pre-forked worker processes calling functions defined by their path "<module path>::<function name>".
+
+    The worker processes are started by the constructor, with the modules of preload already imported, and are
+    reused between calls: they are warm (imported modules, evaluated functions).
+    A worker is killed and replaced when a call exceeds its time limit, or when it dies during a call.
+
+    The function path and the arguments are sent to the worker: they, and the result, must be picklable.
+
+    Usage:
+        pool = ProcessPool(workers=2, preload=['numpy'])
+        result = pool.run("math::cos", args=(0.0,), timeout=60, memory_limit=2 * 1024 ** 3)
+    """
+
+    def __init__(self, workers=2, preload=None, start_method='forkserver'):
+        """
+        Constructor: starts the worker processes
+
+        :param workers: optional, default 2: number of worker processes
+        :type workers: int
+        :param preload: optional, default None: modules imported by the workers before any call
+        :type preload: list of str or None
+        :param start_method: optional, default 'forkserver': multiprocessing start method.
+          With 'forkserver', the preload modules are imported once by the fork server,
+          and the workers don't inherit the state of the calling process (threads, connections ...)
+        :type start_method: str
+        :raises ValueError: if workers is not positive
+        """
+        if workers < 1:
+            raise ValueError("Unexpected workers=%s: at least one worker is expected" % workers)
+
+        self.__preload = list(preload or [])
+        self.__context = multiprocessing.get_context(start_method)
+        if start_method == 'forkserver' and self.__preload:
+            self.__context.set_forkserver_preload(self.__preload)
+
+        self.__idle = queue.Queue()
+        for _ in range(workers):
+            self.__idle.put(_Worker(self.__context, self.__preload))
+        # Number of workers: decreased when a killed worker can't be replaced
+        self.__workers = workers
+        self.__lock = threading.Lock()
+
+        LOGGER.info("ProcessPool started with %s workers, preload=%s", workers, self.__preload)
+
+    def run(self, function_path, args=(), timeout=None, memory_limit=None, cancel_token=None):
+        """
+        Call the function in one worker process, waiting for a free worker
+
+        :param function_path: <module path>::<function name>, ex: "math::cos"
+        :type function_path: str
+        :param args: optional, default (): positional arguments of the function
+        :type args: tuple
+        :param timeout: optional, default None: maximum duration of the call in seconds, None for unlimited
+        :type timeout: float or None
+        :param memory_limit: optional, default None: maximum address space of the worker during the call in bytes,
+          None for unlimited. Exceeding it raises MemoryError in the function
+        :type memory_limit: int or None
+        :param cancel_token: optional, default None: token checked during the call: the worker is killed
+          when it is cancelled
+        :type cancel_token: ikats.core.library.cancellation.CancelToken or None
+        :return: the result of the function
+        :raises WorkerTimeoutError: if the call exceeds timeout
+        :raises CancelledError: if cancel_token is cancelled during the call
+        :raises WorkerCrashError: if the worker died during the call, or if the pool has no more worker
+        :raises WorkerError: if the error raised by the function can't be sent back
+        :raises Exception: the error raised by the function
+        """
+        worker = self.__get_idle_worker(function_path)
+        # False once the worker is killed, or dead
+        alive = True
+        try:
+            worker.connection.send((function_path, args, memory_limit))
+
+            if not self.__wait_reply(worker, timeout, cancel_token):
+                alive = False
+                if cancel_token is not None and cancel_token.is_cancelled():
+                    raise CancelledError("Call of %s cancelled (%s): worker killed" %
+                                         (function_path, cancel_token.reason))
+                raise WorkerTimeoutError("Call of %s exceeded the time limit of %s s: worker killed" %
+                                         (function_path, timeout))
+            reply = pickle.loads(worker.connection.recv_bytes())
+
+        except (EOFError, OSError) as error:
+            alive = False
+            raise WorkerCrashError("Worker process died during the call of %s" % function_path, error)
+        finally:
+            self.__release(worker, alive)
+
+        if reply[0] is True:
+            return reply[1]
+
+        LOGGER.error("Error raised in worker process by %s:\n%s", function_path, reply[2])
+        raise reply[1]
+
+    @staticmethod
+    def __wait_reply(worker, timeout, cancel_token):
+        """
+        Wait for the reply of the worker, checking the cancel token
+
+        :return: True when the reply is available, False after timeout or cancellation
+        :rtype: bool
+        """
+        if cancel_token is None:
+            return worker.connection.poll(timeout)
+
+        deadline = None if timeout is None else time.time() + timeout
+        while not cancel_token.is_cancelled():
+            interval = CANCEL_POLL_INTERVAL if deadline is None else min(CANCEL_POLL_INTERVAL, deadline - time.time())
+            if worker.connection.poll(max(interval, 0)):
+                return True
+            if deadline is not None and time.time() >= deadline:
+                return False
+        return False
+
+    def __get_idle_worker(self, function_path):
+        """
+        Wait for a free worker
+
+        :raises WorkerCrashError: if the pool has no more worker
+        """
+        while True:
+            with self.__lock:
+                if self.__workers == 0:
+                    raise WorkerCrashError("No worker process available to call %s" % function_path)
+            try:
+                return self.__idle.get(timeout=1.0)
+            except queue.Empty:
+                pass
+
+    def __release(self, worker, alive):
+        """
+        Give the worker back to the pool when it is alive. Otherwise, kill it and start another one:
+        if the new worker can't be started, the pool shrinks
+        """
+        if alive:
+            self.__idle.put(worker)
+            return
+
+        LOGGER.warning("ProcessPool: replacing the worker process pid=%s", worker.process.pid)
+        worker.kill()
+        try:
+            replacement = _Worker(self.__context, self.__preload)
+        except Exception as error:
+            with self.__lock:
+                self.__workers -= 1
+                workers = self.__workers
+            LOGGER.error("ProcessPool: failed to start a worker process, the pool shrinks to %s workers", workers)
+            LOGGER.exception(error)
+            return
+        self.__idle.put(replacement)
+
+    def shutdown(self):
+        """
+        Stop the worker processes, once the current calls are ended
+        """
+        with self.__lock:
+            workers = self.__workers
+        for _ in range(workers):
+            worker = self.__idle.get()
+            try:
+                worker.connection.send(None)
+            except OSError:
+                pass
+            worker.process.join()
+            worker.connection.close()
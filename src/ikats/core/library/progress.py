@@ -0,0 +1,71 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import threading
+
+"""
+Progress reported by the algorithms during their execution.
+
+An algorithm calls report_progress() as often as it wants: the report is forwarded to the sink installed
+for the current thread by the execution engine (see set_progress_sink()), which is in charge of the rate
+limitation. Without sink (ex: algorithm called outside IKATS, or in a worker process), the report is ignored.
+
+Example:
+
+    from ikats.core.library.progress import report_progress
+
+    def my_algo(ts_list):
+        for index, tsuid in enumerate(ts_list):
+            ...
+            report_progress(progress=(index + 1) / len(ts_list), message="processed %s" % tsuid)
+"""
+
+_local = threading.local()
+
+
+def set_progress_sink(sink):
+    """
+    Install the sink receiving the reports of the current thread: called by the execution engine
+
+    :param sink: function called with the keyword arguments progress, message and partial_result,
+      or None to remove the sink
+    :type sink: callable or None
+    :return: the previous sink of the current thread, or None
+    :rtype: callable or None
+    """
+    previous = getattr(_local, 'sink', None)
+    _local.sink = sink
+    return previous
+
+
+def report_progress(progress=None, message=None, partial_result=None):
+    """
+    Report the progress of the running algorithm
+
+    :param progress: optional, default None: the progress, from 0.0 to 1.0
+    :type progress: float or None
+    :param message: optional, default None: information about the current step
+    :type message: str or None
+    :param partial_result: optional, default None: partial result, which can be encoded in JSON
+    :type partial_result: object
+    :return: True when the report has been forwarded to a sink
+    :rtype: bool
+    """
+    sink = getattr(_local, 'sink', None)
+    if sink is None:
+        return False
+    sink(progress=progress, message=message, partial_result=partial_result)
+    return True
@@ -19,12 +19,17 @@ import numpy as np
 
 from ikats.core.config.ConfigReader import ConfigReader
 
+from ikats.core.library.cancellation import get_cancel_token
 from ikats.core.library.exception import IkatsException
+from ikats.core.library.stats import StatsSummary, QuantileSketch, DistinctCountSketch
 
 from ikats.core.resource.api import IkatsApi
-from ikats.core.resource.client import TemporalDataMgr
+from ikats.core.resource.client import ClientRegistry, TemporalDataMgr
 from ikats.core.resource.client.non_temporal_data_mgr import NonTemporalDataMgr
+from ikats.core.resource.client.temporal_data_mgr import DTYPE
 from ikats.core.resource.interface import ResourceLocator
+from ikats.core.resource.opentsdb.HttpClient import HttpClient
+from ikats.core.resource.opentsdb.wrapper import Wrapper
 
 from pyspark import SparkContext
 
@@ -276,11 +281,34 @@ class SSessionManager(object):
         """
         Get a spark context from a spark session if exists or create a new one.
 
+        When an execution is running in the current thread (see ikats.core.library.cancellation), the next
+        jobs of the thread are submitted in the job group named by its cancel token: the cancellation of the
+        execution cancels the job group.
+
         :return: The spark context
         :rtype: SparkContext
         """
 
-        return SSessionManager.get().sparkContext
+        spark_context = SSessionManager.get().sparkContext
+        SSessionManager.bind_cancel_token(spark_context)
+        return spark_context
+
+    @staticmethod
+    def bind_cancel_token(spark_context):
+        """
+        Submit the next jobs of the current thread in the job group of the cancel token of the thread, if any:
+        the job group is cancelled with the token (interrupting the tasks).
+
+        :param spark_context: the spark context
+        :type spark_context: SparkContext
+        """
+        token = get_cancel_token()
+        if token is None:
+            return
+
+        group_id = "ikats-%s" % token.name
+        spark_context.setJobGroup(group_id, "IKATS execution %s" % token.name, interruptOnCancel=True)
+        token.add_callback(('spark', group_id), lambda: spark_context.cancelJobGroup(group_id))
 
     @staticmethod
     def stop():
@@ -702,6 +730,10 @@ class SparkUtils:
         :rtype: str
 
         :raises IkatsException: if TS couldn't be created
+
+        .. note::
+           To save many chunks, prefer `save_rdd` which resolves the TS references once and writes the metadata
+           once, instead of calling this method for each chunk.
         """
 
         if not data:
@@ -713,6 +745,183 @@ class SparkUtils:
         else:
             raise IkatsException("TS %s couldn't be created" % fid)
 
+    @staticmethod
+    def save_rdd(rdd, fid_list=None, generate_metadata=True):
+        """
+        Saves the time series points distributed in a RDD: each partition is written by the executor hosting it.
+
+        Compared to a call to `save_data` for each chunk:
+          * the TS references (tsuid, metric, tags) are resolved once, on the driver, then broadcast
+          * each partition sends all its points through one pooled HTTP session
+          * the metadata are aggregated with an accumulator (TsImportAccumulatorParam)
+            and written at the end, by the driver: no metadata request is sent by the partitions
+          * funcId is written for all the TS with one bulk CSV request (see TemporalDataMgr.import_meta_data_bulk).
+            The CSV import does not define the data types: the generated metadata (typed date and number)
+            are still written with one request per TS and per metadata
+
+        :param rdd: chunks of points to save: one element per chunk, formatted as (fid, data)
+                    where data is the array of points (first column is timestamp (EPOCH ms), second is value)
+        :param fid_list: optional, default None: list of the functional identifiers present in the rdd.
+                         If None, the list is computed from the rdd (additional spark job)
+        :param generate_metadata: Indicates if the following metadata shall be generated (True:default) or not:
+                                    qual_nb_points
+                                    ikats_start_date
+                                    ikats_end_date
+
+        :type rdd: pyspark.rdd.RDD
+        :type fid_list: list or None
+        :type generate_metadata: bool
+
+        :return: the TSUID of each saved TS, by functional identifier
+        :rtype: dict
+
+        :raises IkatsException: if the metadata couldn't be written
+        """
+
+        sc = rdd.context
+
+        if fid_list is None:
+            fid_list = rdd.keys().distinct().collect()
+
+        # 1/ Resolve the TS references once, on the driver
+        # ----------------------------------------------------------------------
+        # Format: {fid: (tsuid, metric, tags), ...}
+        ts_refs = {fid: Wrapper.get_ts_ref(fid=fid) for fid in fid_list}
+        bc_ts_refs = sc.broadcast(ts_refs)
+
+        # Import information, by tsuid: {tsuid: [start_date, end_date, nb_success, nb_failed], ...}
+        import_acc = sc.accumulator(dict(), TsImportAccumulatorParam())
+
+        # 2/ Write the points of each partition
+        # ----------------------------------------------------------------------
+        def __save_partition(partition):
+            """
+            Send all the chunks of one partition through the session shared by the python worker,
+            then add the import information of the partition to the accumulator
+
+            :param partition: iterator on the chunks of the partition: (fid, data)
+            :type partition: iterator
+            """
+            acc_param = TsImportAccumulatorParam()
+            partition_info = acc_param.zero(None)
+            # the pooled connections of the python worker are reused by its partitions
+            client = HttpClient(session=ClientRegistry.get_session())
+            for fid, data in partition:
+                if len(data) == 0:
+                    continue
+                tsuid, metric, tags = bc_ts_refs.value[fid]
+                result = client.send_http(metric=metric, tags=tags, data_points=data)
+                acc_param.addInPlace(partition_info, {
+                    tsuid: [int(data[0][0]), int(data[-1][0]), result.success, result.failed]
+                })
+            import_acc.add(partition_info)
+
+        rdd.foreachPartition(__save_partition)
+        bc_ts_refs.unpersist()
+        import_info = import_acc.value
+
+        # 3/ Write the metadata once
+        # ----------------------------------------------------------------------
+        tdm = ClientRegistry.get_tdm()
+        existing_md = {}
+        if generate_metadata and import_info:
+            existing_md = tdm.get_meta_data(list(import_info.keys()))
+
+        meta_data = {}
+        for fid, (tsuid, _, _) in ts_refs.items():
+            # Backward compatibility, store funcId as metadata
+            meta_data[tsuid] = {'funcId': fid}
+
+            if tsuid not in import_info:
+                continue
+
+            start_date, end_date, nb_success, nb_failed = import_info[tsuid]
+            if nb_failed:
+                ScManager.log.error("Only %d/%d points have been saved to %s",
+                                    nb_success, nb_success + nb_failed, fid)
+
+            if generate_metadata:
+                # Keep the widest range between the existing metadata and the imported points
+                metadata = existing_md.get(tsuid, {})
+                if 'ikats_start_date' in metadata:
+                    start_date = min(start_date, int(metadata['ikats_start_date']))
+                if 'ikats_end_date' in metadata:
+                    end_date = max(end_date, int(metadata['ikats_end_date']))
+                meta_data[tsuid].update({
+                    'ikats_start_date': start_date,
+                    'ikats_end_date': end_date,
+                    'qual_nb_points': nb_success
+                })
+
+        if not tdm.import_meta_data_bulk(meta_data=meta_data,
+                                         data_types={'funcId': DTYPE.string,
+                                                     'ikats_start_date': DTYPE.date,
+                                                     'ikats_end_date': DTYPE.date,
+                                                     'qual_nb_points': DTYPE.number}):
+            raise IkatsException("Metadata of TS %s couldn't be saved" % list(ts_refs.keys()))
+
+        return {fid: ts_refs[fid][0] for fid in ts_refs}
+
+    @staticmethod
+    def compute_stats(rdd, quantiles=False, distinct=False):
+        """
+        Computes the statistics of the values of several TS in one distributed pass, without collecting the points:
+        partial statistics of each partition are merged by accumulators.
+
+        :param rdd: chunks of points: one element per chunk, formatted as (tsuid, data)
+                    where data is the array of points (first column is timestamp, second is value)
+        :param quantiles: True to also compute a quantile sketch of each TS (QuantileSketch)
+        :param distinct: True to also compute a distinct values count sketch of each TS (DistinctCountSketch)
+
+        :type rdd: pyspark.rdd.RDD
+        :type quantiles: bool
+        :type distinct: bool
+
+        :return: the statistics of each TS:
+            | {
+            |     'TS1': {'summary': StatsSummary, 'quantiles': QuantileSketch, 'distinct': DistinctCountSketch},
+            |     ...
+            | }
+            (only 'summary' is defined if quantiles and distinct are False)
+            Number of points (qual_nb_points) is summary.count
+        :rtype: dict
+        """
+        sc = rdd.context
+
+        # Accumulators, by kind of statistics
+        params = {'summary': SummaryAccumulatorParam()}
+        if quantiles:
+            params['quantiles'] = QuantileAccumulatorParam()
+        if distinct:
+            params['distinct'] = DistinctCountAccumulatorParam()
+        accumulators = {kind: sc.accumulator(dict(), param) for kind, param in params.items()}
+
+        def __stats_partition(partition):
+            """
+            Compute the statistics of all the chunks of one partition,
+            then add them to the accumulators (once per partition)
+
+            :param partition: iterator on the chunks of the partition: (tsuid, data)
+            :type partition: iterator
+            """
+            partition_stats = {kind: param.zero(None) for kind, param in params.items()}
+            for tsuid, data in partition:
+                if len(data) == 0:
+                    continue
+                values = np.asarray(data)[:, 1].astype(np.float64)
+                for kind, param in params.items():
+                    param.addInPlace(partition_stats[kind], {tsuid: param.new_sketch().update(values)})
+            for kind, accumulator in accumulators.items():
+                accumulator.add(partition_stats[kind])
+
+        rdd.foreachPartition(__stats_partition)
+
+        results = {}
+        for kind, accumulator in accumulators.items():
+            for tsuid, sketch in accumulator.value.items():
+                results.setdefault(tsuid, {})[kind] = sketch
+        return results
+
 
 class ListAccumulatorParam(AccumulatorParam):
     """
@@ -739,3 +948,118 @@ class ListAccumulatorParam(AccumulatorParam):
         """
         v1.update(v2)
         return v1
+
+
+class TsImportAccumulatorParam(AccumulatorParam):
+    """
+    Accumulator of the import information of several TS, as dict:
+        {tsuid: [start_date, end_date, nb_points_success, nb_points_failed], ...}
+    inherited from Spark, justify the PEP8 errors
+    """
+
+    def zero(self, initial_value):
+        """
+        Init the internal variable. initial_value is ignored here
+           :param initial_value:
+           :type initial_value: any
+        """
+        return dict()
+
+    def addInPlace(self, v1, v2):
+        """
+            Merge the import information of v2 into v1:
+            the dates range is extended and the points counts are summed for each TS
+
+            :param v1: import information to update
+            :param v2: import information to merge into v1
+        """
+        for tsuid, info in v2.items():
+            if tsuid in v1:
+                current = v1[tsuid]
+                v1[tsuid] = [min(current[0], info[0]),
+                             max(current[1], info[1]),
+                             current[2] + info[2],
+                             current[3] + info[3]]
+            else:
+                v1[tsuid] = list(info)
+        return v1
+
+
+class SketchAccumulatorParam(AccumulatorParam):
+    """
+    Accumulator of mergeable statistics (see ikats.core.library.stats), as dict:
+        {key: sketch, ...}
+    where each sketch is an instance of the sketch class of the accumulator.
+    Sketches having the same key are merged: partial statistics computed by each task
+    are combined without collecting the data to the driver.
+    inherited from Spark, justify the PEP8 errors
+    """
+
+    def __init__(self, sketch_class, **sketch_kwargs):
+        """
+        :param sketch_class: class of the sketches accumulated (providing update() and merge() methods)
+        :param sketch_kwargs: arguments used to build a new sketch (see new_sketch())
+
+        :type sketch_class: type
+        """
+        self.sketch_class = sketch_class
+        self.sketch_kwargs = sketch_kwargs
+
+    def new_sketch(self):
+        """
+        :return: a new empty sketch of the accumulated type
+        """
+        return self.sketch_class(**self.sketch_kwargs)
+
+    def zero(self, initial_value):
+        """
+        Init the internal variable. initial_value is ignored here
+           :param initial_value:
+           :type initial_value: any
+        """
+        return dict()
+
+    def addInPlace(self, v1, v2):
+        """
+            Merge the sketches of v2 into the sketches of v1, key by key
+
+            :param v1: sketches to update
+            :param v2: sketches to merge into v1
+
+            :raises TypeError: if a sketch is not of the accumulated type
+        """
+        for key, sketch in v2.items():
+            if type(sketch) is not self.sketch_class:
+                raise TypeError("Sketch of %s is %s, %s expected" % (key, type(sketch), self.sketch_class))
+            if key in v1:
+                v1[key].merge(sketch)
+            else:
+                v1[key] = sketch
+        return v1
+
+
+class SummaryAccumulatorParam(SketchAccumulatorParam):
+    """
+    Accumulator of count/min/max/sum/sum of squares statistics (StatsSummary), by key
+    """
+
+    def __init__(self):
+        super(SummaryAccumulatorParam, self).__init__(StatsSummary)
+
+
+class QuantileAccumulatorParam(SketchAccumulatorParam):
+    """
+    Accumulator of t-digest-like quantile sketches (QuantileSketch), by key
+    """
+
+    def __init__(self, compression=200):
+        super(QuantileAccumulatorParam, self).__init__(QuantileSketch, compression=compression)
+
+
+class DistinctCountAccumulatorParam(SketchAccumulatorParam):
+    """
+    Accumulator of HyperLogLog-like distinct count sketches (DistinctCountSketch), by key
+    """
+
+    def __init__(self, precision=14):
+        super(DistinctCountAccumulatorParam, self).__init__(DistinctCountSketch, precision=precision)
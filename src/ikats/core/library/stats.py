@@ -0,0 +1,453 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import hashlib
+
+import numpy as np
+
+# Constants of the splitmix64 finalizer used to hash numerical values
+_SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_SPLITMIX_MUL_1 = np.uint64(0xBF58476D1CE4E5B9)
+_SPLITMIX_MUL_2 = np.uint64(0x94D049BB133111EB)
+
+
+class StatsSummary(object):
+    """
+    Mergeable elementary statistics of a set of values:
+      * count
+      * min
+      * max
+      * sum
+      * sum of squares
+
+    The mean, variance and standard deviation are deduced from these statistics.
+
+    Each partial summary (computed on a chunk of points) can be merged into another one:
+    the statistics of a whole TS are computed in one distributed pass.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.sum = 0.0
+        self.sum_sq = 0.0
+
+    def update(self, values):
+        """
+        Add the values to the summary
+
+        :param values: values to add (NaN values are ignored)
+        :type values: np.array or list
+
+        :return: the updated summary
+        :rtype: StatsSummary
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+
+        self.count += int(values.size)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sum += float(values.sum())
+        self.sum_sq += float(np.dot(values, values))
+        return self
+
+    def merge(self, other):
+        """
+        Merge another summary into this one
+
+        :param other: the summary to merge
+        :type other: StatsSummary
+
+        :return: the updated summary
+        :rtype: StatsSummary
+
+        :raises TypeError: if other is not a StatsSummary
+        """
+        if type(other) is not StatsSummary:
+            raise TypeError("Can't merge %s into StatsSummary" % type(other))
+
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sum += other.sum
+        self.sum_sq += other.sum_sq
+        return self
+
+    @property
+    def mean(self):
+        """
+        Mean of the values (None if no value)
+        """
+        if self.count == 0:
+            return None
+        return self.sum / self.count
+
+    @property
+    def variance(self):
+        """
+        Population variance of the values (None if no value)
+        """
+        if self.count == 0:
+            return None
+        # Protect against negative values due to rounding errors
+        return max(0.0, self.sum_sq / self.count - self.mean ** 2)
+
+    @property
+    def std(self):
+        """
+        Population standard deviation of the values (None if no value)
+        """
+        if self.count == 0:
+            return None
+        return self.variance ** 0.5
+
+    def to_dict(self):
+        """
+        :return: the statistics as dict (count, min, max, sum, sum_sq, mean, variance)
+        :rtype: dict
+        """
+        return {
+            'count': self.count,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'sum': self.sum,
+            'sum_sq': self.sum_sq,
+            'mean': self.mean,
+            'variance': self.variance
+        }
+
+
+class QuantileSketch(object):
+    """
+    Mergeable approximation of the distribution of a set of values, in the manner of the t-digest:
+    the values are summarized by weighted centroids, smaller near the tails of the distribution,
+    which gives accurate extreme quantiles with a bounded memory.
+
+    The centroids are built with the k1 scale function: each centroid covers at most one unit of
+    k(q) = compression / (2.pi) * asin(2q - 1), so that about compression/2 centroids are kept.
+    The compression is vectorized (sorting and reduction of runs with numpy).
+    """
+
+    def __init__(self, compression=200):
+        """
+        :param compression: number driving the number of centroids kept (accuracy versus size)
+        :type compression: int
+
+        :raises ValueError: if compression is not strictly positive
+        """
+        if compression <= 0:
+            raise ValueError("compression shall be strictly positive (got %s)" % compression)
+        self.compression = compression
+        self.count = 0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self._means = np.empty(0, dtype=np.float64)
+        self._weights = np.empty(0, dtype=np.float64)
+
+    @property
+    def centroids(self):
+        """
+        Get the centroids as a 2-column array: mean, weight
+        """
+        return np.column_stack((self._means, self._weights))
+
+    def update(self, values):
+        """
+        Add the values to the sketch
+
+        :param values: values to add (NaN values are ignored)
+        :type values: np.array or list
+
+        :return: the updated sketch
+        :rtype: QuantileSketch
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+
+        self.count += int(values.size)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(values, np.ones(values.size, dtype=np.float64))
+        return self
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one
+
+        :param other: the sketch to merge
+        :type other: QuantileSketch
+
+        :return: the updated sketch
+        :rtype: QuantileSketch
+
+        :raises TypeError: if other is not a QuantileSketch
+        """
+        if type(other) is not QuantileSketch:
+            raise TypeError("Can't merge %s into QuantileSketch" % type(other))
+        if other.count == 0:
+            return self
+
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(other._means, other._weights)
+        return self
+
+    def _scale(self, quantiles):
+        """
+        k1 scale function
+
+        :param quantiles: quantiles in [0, 1]
+        :type quantiles: np.array
+
+        :return: the scale of each quantile
+        :rtype: np.array
+        """
+        return self.compression / (2 * np.pi) * np.arcsin(2 * np.clip(quantiles, 0, 1) - 1)
+
+    def _compress(self, means, weights):
+        """
+        Merge new weighted points into the centroids
+
+        :param means: means of the new points
+        :param weights: weights of the new points
+
+        :type means: np.array
+        :type weights: np.array
+        """
+        means = np.concatenate((self._means, means))
+        weights = np.concatenate((self._weights, weights))
+
+        order = np.argsort(means, kind='mergesort')
+        means = means[order]
+        weights = weights[order]
+
+        # Quantile at the left edge of each point, then index of the scale unit containing it
+        cum_weights = np.cumsum(weights)
+        q_left = (cum_weights - weights) / cum_weights[-1]
+        units = np.floor(self._scale(q_left)).astype(np.int64)
+
+        # Points are sorted: units are non decreasing, each run of the same unit becomes a centroid
+        starts = np.flatnonzero(np.r_[True, units[1:] != units[:-1]])
+        self._weights = np.add.reduceat(weights, starts)
+        self._means = np.add.reduceat(means * weights, starts) / self._weights
+
+    def quantile(self, quantiles):
+        """
+        Estimate the value(s) at the quantile(s) provided
+
+        :param quantiles: quantile or list of quantiles, in [0, 1]
+        :type quantiles: float or list
+
+        :return: the estimated value(s) (None if the sketch is empty)
+        :rtype: float or np.array
+
+        :raises ValueError: if a quantile is not in [0, 1]
+        """
+        q = np.asarray(quantiles, dtype=np.float64)
+        if np.any((q < 0) | (q > 1)):
+            raise ValueError("quantiles shall be within [0, 1] (got %s)" % quantiles)
+        if self.count == 0:
+            return None
+
+        # Interpolation between the centre of the centroids, bounded by the exact min and max
+        cum_weights = np.cumsum(self._weights)
+        q_centers = (cum_weights - self._weights / 2) / cum_weights[-1]
+        result = np.interp(q,
+                           np.r_[0.0, q_centers, 1.0],
+                           np.r_[self.min, self._means, self.max])
+        if result.ndim == 0:
+            return float(result)
+        return result
+
+    def cdf(self, value):
+        """
+        Estimate the fraction of values lower or equal to the value provided
+
+        :param value: value to locate
+        :type value: float
+
+        :return: the estimated fraction, in [0, 1] (None if the sketch is empty)
+        :rtype: float
+        """
+        if self.count == 0:
+            return None
+        cum_weights = np.cumsum(self._weights)
+        q_centers = (cum_weights - self._weights / 2) / cum_weights[-1]
+        return float(np.interp(value,
+                               np.r_[self.min, self._means, self.max],
+                               np.r_[0.0, q_centers, 1.0]))
+
+
+def _digest_64(content):
+    """
+    64 bits digest of the content: blake2b when available (python >= 3.6), otherwise the first bytes of sha1
+    """
+    if hasattr(hashlib, 'blake2b'):
+        return hashlib.blake2b(content, digest_size=8).digest()
+    return hashlib.sha1(content).digest()[:8]
+
+
+class DistinctCountSketch(object):
+    """
+    Mergeable estimation of the number of distinct values, in the manner of HyperLogLog:
+    each value is hashed on 64 bits, the first bits select a register which keeps the maximum
+    rank (position of the first set bit) of the remaining bits.
+
+    Relative standard error is about 1.04 / sqrt(2 ** precision), for 2 ** precision bytes of memory.
+
+    Numerical values are hashed in a vectorized way (splitmix64 on the float64 representation),
+    other values (str, bytes) are hashed with blake2b (sha1 before python 3.6). Both hashes are deterministic
+    between the processes running the same python version.
+    """
+
+    def __init__(self, precision=14):
+        """
+        :param precision: number of bits selecting the register, within [4, 18]
+        :type precision: int
+
+        :raises ValueError: if precision is out of range
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision shall be within [4, 18] (got %s)" % precision)
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @staticmethod
+    def _hash_numbers(values):
+        """
+        Hash numerical values on 64 bits
+
+        :param values: numerical values
+        :type values: np.array
+
+        :return: the hashes
+        :rtype: np.array of np.uint64
+        """
+        # Adding 0.0 normalizes -0.0 to 0.0
+        hashes = (values.astype(np.float64) + 0.0).view(np.uint64)
+        with np.errstate(over='ignore'):
+            hashes = hashes + _SPLITMIX_GAMMA
+            hashes = (hashes ^ (hashes >> np.uint64(30))) * _SPLITMIX_MUL_1
+            hashes = (hashes ^ (hashes >> np.uint64(27))) * _SPLITMIX_MUL_2
+        return hashes ^ (hashes >> np.uint64(31))
+
+    @staticmethod
+    def _hash_objects(values):
+        """
+        Hash any str/bytes values on 64 bits
+
+        :param values: values
+        :type values: iterable
+
+        :return: the hashes
+        :rtype: np.array of np.uint64
+        """
+        hashes = [int.from_bytes(_digest_64(value if type(value) is bytes else str(value).encode('utf-8')), 'big')
+                  for value in values]
+        return np.array(hashes, dtype=np.uint64)
+
+    @staticmethod
+    def _bit_length(values):
+        """
+        Vectorized number of bits needed to represent each value
+
+        :param values: the values
+        :type values: np.array of np.uint64
+
+        :return: the bit lengths
+        :rtype: np.array of np.int64
+        """
+        lengths = np.zeros(values.shape, dtype=np.int64)
+        for shift in (32, 16, 8, 4, 2, 1):
+            mask = values >= (np.uint64(1) << np.uint64(shift))
+            lengths[mask] += shift
+            values = np.where(mask, values >> np.uint64(shift), values)
+        return lengths + (values > 0)
+
+    def update(self, values):
+        """
+        Add the values to the sketch
+
+        :param values: values to add (numbers, str or bytes)
+        :type values: np.array or list
+
+        :return: the updated sketch
+        :rtype: DistinctCountSketch
+        """
+        array = np.asarray(values)
+        if array.size == 0:
+            return self
+
+        # The hash only depends on the dtype kind, never on the content of the batch:
+        # '1' is hashed as a str whatever the other values of its batch
+        if array.dtype.kind in 'biuf':
+            hashes = self._hash_numbers(array.ravel())
+        else:
+            hashes = self._hash_objects(array.ravel())
+
+        # First bits select the register, the rank is computed on the remaining bits
+        remaining_bits = 64 - self.precision
+        indexes = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+        remaining = hashes & np.uint64((1 << remaining_bits) - 1)
+        ranks = (remaining_bits - self._bit_length(remaining) + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, indexes, ranks)
+        return self
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one
+
+        :param other: the sketch to merge
+        :type other: DistinctCountSketch
+
+        :return: the updated sketch
+        :rtype: DistinctCountSketch
+
+        :raises TypeError: if other is not a DistinctCountSketch
+        :raises ValueError: if the precisions are different
+        """
+        if type(other) is not DistinctCountSketch:
+            raise TypeError("Can't merge %s into DistinctCountSketch" % type(other))
+        if other.precision != self.precision:
+            raise ValueError("Can't merge sketches of different precisions (%s and %s)" %
+                             (self.precision, other.precision))
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """
+        Estimate the number of distinct values
+
+        :return: the estimated number of distinct values
+        :rtype: int
+        """
+        nb_registers = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / nb_registers)
+        estimate = alpha * nb_registers ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+
+        nb_zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * nb_registers and nb_zeros > 0:
+            # Small range correction: linear counting
+            estimate = nb_registers * np.log(nb_registers / nb_zeros)
+        return int(round(estimate))
@@ -26,6 +26,8 @@ class State(IntEnum):
     ALGO_OK = 2
     ALGO_KO = 3
     ENGINE_KO = 4
+    QUEUED = 5
+    CANCELLED = 6
 
     @classmethod
     def parse(cls, number):
@@ -46,4 +48,6 @@ STATES = ("Initializing",
           "Running",
           "Finished wit success",
           "Finished with errors raised by algo",
-          "Finished with errors in engine implementation")
+          "Finished with errors in engine implementation",
+          "Queued, waiting for an available worker",
+          "Cancelled by request, or by its time limit")
@@ -0,0 +1,102 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+from unittest import TestCase
+
+import codecs
+
+import numpy as np
+
+from ikats.core.library.blob import BlobError, decode_blob, encode_base64, encode_blob, \
+    is_encoded_blob
+
+
+class TestBlob(TestCase):
+    """
+    Test of the streamed encoding of the process data blobs
+    """
+
+    def test_round_trip(self):
+        """
+        Tests the decoding of the encoded values, for each compression
+        """
+        matrix = np.random.RandomState(0).normal(size=(300, 200))
+        value = {'matrix': matrix, 'columns': ['c%s' % x for x in range(200)], 'transposed': matrix.T}
+
+        for compression in ['none', 'zlib', 'lzma']:
+            chunks = list(encode_blob(value, compression=compression, chunk_size=4096))
+
+            self.assertTrue(is_encoded_blob(chunks[0]))
+            self.assertTrue(all(len(x) <= 4096 for x in chunks))
+
+            decoded = decode_blob(chunks, chunk_size=4096)
+            np.testing.assert_array_equal(decoded['matrix'], matrix)
+            np.testing.assert_array_equal(decoded['transposed'], matrix.T)
+            self.assertEqual(decoded['columns'], value['columns'])
+
+    def test_compression(self):
+        """
+        Tests that the compressible values are compressed
+        """
+        value = np.zeros(100000)
+        plain_size = sum(len(x) for x in encode_blob(value, compression='none'))
+        compressed_size = sum(len(x) for x in encode_blob(value, compression='zlib'))
+
+        self.assertGreater(plain_size, value.nbytes)
+        self.assertLess(compressed_size, plain_size / 100)
+
+    def test_split_chunks(self):
+        """
+        Tests that the decoding accepts any split of the blob
+        """
+        value = {'values': np.arange(1000), 'name': "split"}
+        blob = b"".join(encode_blob(value, compression='zlib'))
+
+        decoded = decode_blob(blob[x:x + 3] for x in range(0, len(blob), 3))
+        np.testing.assert_array_equal(decoded['values'], value['values'])
+        self.assertEqual(decoded['name'], "split")
+
+    def test_errors(self):
+        """
+        Tests the unexpected blobs and arguments
+        """
+        blob = b"".join(encode_blob([1, 2, 3]))
+
+        with self.assertRaises(BlobError):
+            decode_blob([b"not a blob"])
+
+        with self.assertRaises(BlobError):
+            decode_blob([blob[:len(blob) - 4]])
+
+        with self.assertRaises(ValueError):
+            list(encode_blob([1, 2, 3], compression='unknown'))
+
+        self.assertFalse(is_encoded_blob(b"\x80\x03"))
+
+    def test_base64(self):
+        """
+        Tests that the base64 pieces are the encoding of the whole blob, whatever the split of the chunks
+        """
+        blob = b"".join(encode_blob(np.arange(10000), compression='none'))
+        expected = codecs.encode(blob, "base64")
+
+        for size in [1, 100, 4096]:
+            chunks = [blob[x:x + size] for x in range(0, len(blob), size)]
+            pieces = list(encode_base64(chunks, chunk_size=1000))
+            self.assertEqual(b"".join(pieces), expected)
+            self.assertGreater(len(pieces), 1)
+
+        self.assertEqual(list(encode_base64([])), [])
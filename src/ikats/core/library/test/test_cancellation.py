@@ -0,0 +1,118 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import threading
+from unittest import TestCase
+
+from ikats.core.library.cancellation import CancelToken, CancelledError, check_cancelled, get_cancel_token, \
+    set_cancel_token
+
+
+class TestCancellation(TestCase):
+    """
+    Test of the cooperative cancellation
+    """
+
+    def test_cancel(self):
+        """
+        Tests the cancellation of a token, and its callbacks
+        """
+        called = []
+        token = CancelToken("test_cancel")
+        token.add_callback("first", lambda: called.append("first"))
+        token.add_callback("first", lambda: called.append("replaced"))
+        token.add_callback("removed", lambda: called.append("removed"))
+        token.remove_callback("removed")
+        token.check()
+
+        self.assertTrue(token.cancel("stop"))
+        self.assertFalse(token.cancel("again"))
+        self.assertTrue(token.is_cancelled())
+        self.assertEqual(token.reason, "stop")
+        self.assertEqual(called, ["replaced"])
+        with self.assertRaises(CancelledError):
+            token.check()
+
+        # already cancelled: called at once
+        token.add_callback("late", lambda: called.append("late"))
+        self.assertEqual(called, ["replaced", "late"])
+
+    def test_timer(self):
+        """
+        Tests the cancellation by the time limit
+        """
+        token = CancelToken("test_timer")
+        token.start_timer(0.1)
+        self.assertTrue(token.wait(5))
+        self.assertIn("time limit", token.reason)
+
+        stopped = CancelToken("test_stopped")
+        stopped.start_timer(0.1)
+        stopped.stop_timer()
+        self.assertFalse(stopped.wait(0.3))
+
+    def test_poll(self):
+        """
+        Tests the cancellation by a polled condition
+        """
+        calls = []
+        requested = []
+
+        def poll():
+            calls.append(1)
+            return "cancelled by request" if requested else None
+
+        def failure():
+            raise IOError("unavailable")
+
+        token = CancelToken("test_poll")
+        token.add_poll("failure", failure, 0)
+        token.add_poll("request", poll, 10.0)
+        self.assertFalse(token.is_cancelled())
+        token.check()
+        self.assertEqual(len(calls), 1)
+
+        # polled again once the interval has elapsed
+        requested.append(True)
+        token.add_poll("request", poll, 0)
+        with self.assertRaises(CancelledError):
+            token.check()
+        self.assertEqual(token.reason, "cancelled by request")
+
+        # no more poll once cancelled
+        self.assertTrue(token.is_cancelled())
+        self.assertEqual(len(calls), 2)
+
+    def test_current_token(self):
+        """
+        Tests the token of the current thread
+        """
+        check_cancelled()
+        token = CancelToken("test_current")
+        previous = set_cancel_token(token)
+        try:
+            token.cancel()
+            with self.assertRaises(CancelledError):
+                check_cancelled()
+
+            other_thread = []
+            thread = threading.Thread(target=lambda: other_thread.append(get_cancel_token()))
+            thread.start()
+            thread.join()
+            self.assertEqual(other_thread, [None])
+        finally:
+            set_cancel_token(previous)
+        self.assertIsNone(get_cancel_token())
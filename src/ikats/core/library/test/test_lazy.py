@@ -0,0 +1,69 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import threading
+from unittest import TestCase
+
+from ikats.core.library.lazy import LazyValue, materialize
+
+
+class TestLazy(TestCase):
+    """
+    Test of the lazy values
+    """
+
+    def test_materialize(self):
+        """
+        Tests that the value is loaded once, on first use
+        """
+        calls = []
+
+        def loader():
+            calls.append(threading.current_thread().name)
+            return [1, 2, 3]
+
+        lazy = LazyValue(loader, name="data")
+        self.assertFalse(lazy.is_loaded)
+        self.assertEqual(calls, [])
+
+        threads = [threading.Thread(target=lazy.get) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(materialize(lazy), [1, 2, 3])
+        self.assertTrue(lazy.is_loaded)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(materialize("plain"), "plain")
+
+    def test_failed_load(self):
+        """
+        Tests that a failed load is retried on next use
+        """
+        results = [IOError("unavailable"), "loaded"]
+
+        def loader():
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        lazy = LazyValue(loader)
+        with self.assertRaises(IOError):
+            lazy.get()
+        self.assertFalse(lazy.is_loaded)
+        self.assertEqual(lazy.get(), "loaded")
@@ -0,0 +1,106 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+from unittest import TestCase, mock
+
+import numpy as np
+
+from ikats.core.library.cancellation import CancelToken, CancelledError
+from ikats.core.library.process_pool import ProcessPool, WorkerTimeoutError, WorkerCrashError, resolve_function
+
+
+class TestProcessPool(TestCase):
+    """
+    Test of the ProcessPool class
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ProcessPool(workers=1, preload=['numpy'])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_run(self):
+        """
+        Tests the nominal calls, in the same warm worker
+        """
+        self.assertEqual(self.pool.run("math::cos", args=(0.0,)), 1.0)
+        np.testing.assert_array_equal(self.pool.run("numpy::cumsum", args=(np.arange(4),)), [0, 1, 3, 6])
+
+        pid = self.pool.run("os::getpid")
+        self.assertEqual(self.pool.run("os::getpid"), pid)
+
+    def test_errors(self):
+        """
+        Tests the errors raised by the functions
+        """
+        with self.assertRaises(ValueError):
+            self.pool.run("math::sqrt", args=(-1,))
+        with self.assertRaises(ImportError):
+            self.pool.run("unknown_module::function")
+        with self.assertRaises(ValueError):
+            resolve_function("math.cos")
+
+    def test_limits(self):
+        """
+        Tests that the worker is replaced when a call exceeds the limits, or dies
+        """
+        pid = self.pool.run("os::getpid")
+
+        with self.assertRaises(WorkerTimeoutError):
+            self.pool.run("time::sleep", args=(10,), timeout=0.5)
+        self.assertNotEqual(self.pool.run("os::getpid"), pid)
+
+        with self.assertRaises(WorkerCrashError):
+            self.pool.run("os::_exit", args=(1,))
+        self.assertEqual(self.pool.run("math::cos", args=(0.0,)), 1.0)
+
+        with self.assertRaises(MemoryError):
+            self.pool.run("numpy::ones", args=(2 * 1024 ** 3,), memory_limit=1024 ** 3)
+        # The limit applies only to the call
+        self.assertEqual(len(self.pool.run("numpy::ones", args=(10 ** 7,))), 10 ** 7)
+
+    def test_cancel(self):
+        """
+        Tests that the worker is killed when the call is cancelled
+        """
+        pid = self.pool.run("os::getpid")
+
+        token = CancelToken("test_cancel")
+        token.start_timer(0.3)
+        with self.assertRaises(CancelledError):
+            self.pool.run("time::sleep", args=(10,), timeout=5, cancel_token=token)
+        self.assertNotEqual(self.pool.run("os::getpid"), pid)
+
+        # not cancelled: nominal call
+        self.assertEqual(self.pool.run("math::cos", args=(0.0,), cancel_token=CancelToken("other")), 1.0)
+
+    def test_replacement_failure(self):
+        """
+        Tests that a killed worker is not given back to the pool when it can't be replaced: the pool shrinks
+        """
+        pool = ProcessPool(workers=1)
+        try:
+            with mock.patch('ikats.core.library.process_pool._Worker', side_effect=OSError("spawn failed")):
+                with self.assertRaises(WorkerTimeoutError):
+                    pool.run("time::sleep", args=(10,), timeout=0.5)
+
+            with self.assertRaises(WorkerCrashError):
+                pool.run("math::cos", args=(0.0,))
+        finally:
+            pool.shutdown()
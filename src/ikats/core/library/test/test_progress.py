@@ -0,0 +1,49 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import threading
+from unittest import TestCase
+
+from ikats.core.library.progress import report_progress, set_progress_sink
+
+
+class TestProgress(TestCase):
+    """
+    Test of the progress reported by the algorithms
+    """
+
+    def test_report(self):
+        """
+        Tests that the reports are forwarded to the sink of the current thread only
+        """
+        received = []
+        other_thread = []
+
+        self.assertFalse(report_progress(progress=0.1))
+
+        previous = set_progress_sink(lambda **kwargs: received.append(kwargs))
+        try:
+            self.assertTrue(report_progress(progress=0.5, message="half"))
+
+            thread = threading.Thread(target=lambda: other_thread.append(report_progress(progress=0.6)))
+            thread.start()
+            thread.join()
+        finally:
+            set_progress_sink(previous)
+
+        self.assertEqual(received, [{'progress': 0.5, 'message': "half", 'partial_result': None}])
+        self.assertEqual(other_thread, [False])
+        self.assertFalse(report_progress(progress=1.0))
@@ -15,7 +15,7 @@ limitations under the License.
 
 """
 from ikats.core.library.spark import *
-from unittest import TestCase
+from unittest import TestCase, mock
 import logging
 from ikats.core.resource.api import IkatsApi
 
@@ -44,6 +44,50 @@ def gen_ts(ts_id):
         raise NotImplementedError
 
 
+class FakeAccumulator(object):
+    """
+    Accumulator of FakeRdd: the values are merged in the driver process
+    """
+
+    def __init__(self, value, accum_param):
+        self.value = value
+        self.accum_param = accum_param
+
+    def add(self, term):
+        """
+        Adds a term to the accumulator
+        """
+        self.value = self.accum_param.addInPlace(self.value, term)
+
+
+class FakeRdd(object):
+    """
+    RDD whose partitions are processed in the driver process, one after the other: used to test the functions
+    of the partitions without spark
+    """
+
+    def __init__(self, partitions, partition_probe):
+        """
+        :param partitions: the chunks of each partition
+        :type partitions: list of list
+        :param partition_probe: function called after each partition
+        :type partition_probe: function
+        """
+        self.partitions = partitions
+        self.partition_probe = partition_probe
+        self.context = mock.Mock()
+        self.context.broadcast.side_effect = lambda value: mock.Mock(value=value)
+        self.context.accumulator.side_effect = FakeAccumulator
+
+    def foreachPartition(self, func):
+        """
+        Applies func to each partition
+        """
+        for partition in self.partitions:
+            func(iter(partition))
+            self.partition_probe()
+
+
 class TestSpark(TestCase):
     """
     Test of the ikats.core.library.spark module
@@ -162,3 +206,75 @@ class TestSpark(TestCase):
 
         msg = "SSessionManager.get_ts_by_chunks_as_df, result is not correct."
         self.assertEqual(data, df_as_list, msg=msg)
+
+    def test_TsImportAccumulatorParam(self):
+        """
+        Test the merge of import information done by TsImportAccumulatorParam
+        """
+        acc_param = TsImportAccumulatorParam()
+        info = acc_param.zero(None)
+
+        acc_param.addInPlace(info, {'TS1': [1000, 2000, 10, 0]})
+        acc_param.addInPlace(info, {'TS1': [500, 1500, 5, 1], 'TS2': [3000, 4000, 2, 0]})
+
+        self.assertEqual(info, {'TS1': [500, 2000, 15, 1], 'TS2': [3000, 4000, 2, 0]})
+
+    def test_SketchAccumulatorParam(self):
+        """
+        Test the merge of sketches by key done by SketchAccumulatorParam
+        """
+        acc_param = SummaryAccumulatorParam()
+        stats = acc_param.zero(None)
+
+        acc_param.addInPlace(stats, {'TS1': acc_param.new_sketch().update([1, 2, 3])})
+        acc_param.addInPlace(stats, {'TS1': acc_param.new_sketch().update([4]),
+                                     'TS2': acc_param.new_sketch().update([10])})
+
+        self.assertEqual(stats['TS1'].count, 4)
+        self.assertEqual(stats['TS1'].max, 4)
+        self.assertEqual(stats['TS2'].mean, 10)
+
+        with self.assertRaises(TypeError):
+            acc_param.addInPlace(stats, {'TS1': DistinctCountSketch()})
+
+    def test_SparkUtils_save_rdd(self):
+        """
+        Tests that the metadata are written by the driver, not by the partitions of SparkUtils.save_rdd
+        """
+
+        def chunk(start, nb_points):
+            return np.array([[start + x * 1000, x] for x in range(nb_points)])
+
+        partitions = [[("FID1", chunk(0, 10)), ("FID2", chunk(0, 5))],
+                      [("FID1", chunk(10000, 10)), ("FID3", chunk(0, 3))]]
+
+        tdm = mock.Mock()
+        tdm.get_meta_data.return_value = {}
+        tdm.import_meta_data_bulk.return_value = True
+        metadata_calls = []
+
+        with mock.patch('ikats.core.library.spark.ClientRegistry') as registry, \
+                mock.patch('ikats.core.library.spark.HttpClient') as http_client, \
+                mock.patch('ikats.core.library.spark.Wrapper') as wrapper:
+            registry.get_tdm.return_value = tdm
+            wrapper.get_ts_ref.side_effect = lambda fid: ("TSUID_" + fid, "metric", {})
+            http_client.return_value.send_http.side_effect = \
+                lambda metric, tags, data_points: mock.Mock(success=len(data_points), failed=0)
+
+            rdd = FakeRdd(partitions, partition_probe=lambda: metadata_calls.append(len(tdm.mock_calls)))
+            result = SparkUtils.save_rdd(rdd, fid_list=["FID1", "FID2", "FID3"])
+
+        self.assertEqual(result, {"FID1": "TSUID_FID1", "FID2": "TSUID_FID2", "FID3": "TSUID_FID3"})
+
+        # no metadata request sent by the partitions
+        self.assertEqual(metadata_calls, [0, 0])
+
+        # the metadata are read once, then written with one bulk call
+        tdm.get_meta_data.assert_called_once()
+        tdm.import_meta_data_bulk.assert_called_once()
+        meta_data = tdm.import_meta_data_bulk.call_args[1]['meta_data']
+        self.assertEqual(meta_data["TSUID_FID1"], {'funcId': "FID1",
+                                                   'ikats_start_date': 0,
+                                                   'ikats_end_date': 19000,
+                                                   'qual_nb_points': 20})
+        self.assertEqual(meta_data["TSUID_FID3"]['qual_nb_points'], 3)
@@ -0,0 +1,157 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import pickle
+from unittest import TestCase
+
+import numpy as np
+
+from ikats.core.library.stats import StatsSummary, QuantileSketch, DistinctCountSketch
+
+
+class TestStatsSummary(TestCase):
+    """
+    Test of the StatsSummary class
+    """
+
+    def test_merge(self):
+        """
+        Tests the statistics computed by merging partial summaries
+        """
+        values = np.random.RandomState(0).normal(size=1000)
+
+        summary = StatsSummary()
+        for chunk in np.array_split(values, 7):
+            summary.merge(StatsSummary().update(chunk))
+
+        self.assertEqual(summary.count, 1000)
+        self.assertEqual(summary.min, values.min())
+        self.assertEqual(summary.max, values.max())
+        self.assertAlmostEqual(summary.mean, values.mean())
+        self.assertAlmostEqual(summary.variance, values.var())
+
+    def test_empty(self):
+        """
+        Tests the statistics of an empty summary
+        """
+        summary = StatsSummary().update([])
+        self.assertEqual(summary.count, 0)
+        self.assertIsNone(summary.mean)
+        self.assertIsNone(summary.to_dict()['min'])
+
+    def test_nan(self):
+        """
+        Tests that the NaN values are ignored
+        """
+        summary = StatsSummary().update([1.0, np.nan, 3.0])
+        self.assertEqual(summary.count, 2)
+        self.assertEqual(summary.min, 1.0)
+        self.assertEqual(summary.max, 3.0)
+        self.assertEqual(summary.mean, 2.0)
+
+        self.assertEqual(StatsSummary().update([np.nan]).count, 0)
+
+    def test_merge_bad_type(self):
+        """
+        Tests the merge of another type of sketch
+        """
+        with self.assertRaises(TypeError):
+            StatsSummary().merge(QuantileSketch())
+
+
+class TestQuantileSketch(TestCase):
+    """
+    Test of the QuantileSketch class
+    """
+
+    def test_quantiles(self):
+        """
+        Tests the quantiles estimated by merging partial sketches
+        """
+        values = np.random.RandomState(0).uniform(0, 100, size=100000)
+
+        sketch = QuantileSketch()
+        for chunk in np.array_split(values, 10):
+            sketch.merge(QuantileSketch().update(chunk))
+
+        self.assertEqual(sketch.count, 100000)
+        self.assertLessEqual(len(sketch.centroids), sketch.compression)
+
+        quantiles = [0, 0.01, 0.25, 0.5, 0.75, 0.99, 1]
+        np.testing.assert_allclose(sketch.quantile(quantiles), np.percentile(values, [q * 100 for q in quantiles]),
+                                   atol=0.5)
+        self.assertAlmostEqual(sketch.cdf(50), 0.5, delta=0.01)
+
+    def test_pickle(self):
+        """
+        Tests the sketch is kept as is when serialized (sent between spark executors)
+        """
+        sketch = QuantileSketch().update(np.arange(1000))
+        copy = pickle.loads(pickle.dumps(sketch))
+        self.assertEqual(copy.quantile(0.5), sketch.quantile(0.5))
+
+    def test_errors(self):
+        """
+        Tests the errors raised
+        """
+        self.assertIsNone(QuantileSketch().quantile(0.5))
+        with self.assertRaises(ValueError):
+            QuantileSketch().update([1, 2]).quantile(1.5)
+        with self.assertRaises(ValueError):
+            QuantileSketch(compression=0)
+
+
+class TestDistinctCountSketch(TestCase):
+    """
+    Test of the DistinctCountSketch class
+    """
+
+    def test_count(self):
+        """
+        Tests the distinct count estimated by merging partial sketches
+        """
+        sketch = DistinctCountSketch().update(np.arange(200000))
+        sketch.merge(DistinctCountSketch().update(np.arange(100000, 300000, dtype=np.float64)))
+
+        self.assertAlmostEqual(sketch.count(), 300000, delta=300000 * 0.03)
+
+    def test_small_count(self):
+        """
+        Tests the distinct count of few values, including str values
+        """
+        self.assertEqual(DistinctCountSketch().update([1, 2, 2, 3, 3, 3]).count(), 3)
+        self.assertEqual(DistinctCountSketch().update(['TS1', 'TS2', 'TS1']).count(), 2)
+
+    def test_merge_str_batches(self):
+        """
+        Tests that the hash of a str value doesn't depend on the other values of its batch
+        """
+        sketch = DistinctCountSketch().update(['1', '2'])
+        sketch.merge(DistinctCountSketch().update(['1', 'x']))
+        self.assertEqual(sketch.count(), 3)
+
+        sketch = DistinctCountSketch().update(np.array(['1.5', '2'], dtype=object))
+        sketch.merge(DistinctCountSketch().update(np.array(['1.5', 'x'], dtype=object)))
+        self.assertEqual(sketch.count(), 3)
+
+    def test_merge_errors(self):
+        """
+        Tests the merge of incompatible sketches
+        """
+        with self.assertRaises(ValueError):
+            DistinctCountSketch(precision=10).merge(DistinctCountSketch(precision=12))
+        with self.assertRaises(TypeError):
+            DistinctCountSketch().merge(StatsSummary())
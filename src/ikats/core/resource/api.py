@@ -17,8 +17,10 @@ limitations under the License.
 import logging
 
 from ikats.core.library.exception import IkatsException, IkatsNotFoundError
-from ikats.core.resource.client import TemporalDataMgr, NonTemporalDataMgr
+from ikats.core.resource.client import ClientRegistry, ProcessDataBatchReader
+from ikats.core.resource.client.batch_reader import iter_download
 from ikats.core.resource.client.temporal_data_mgr import DTYPE
+from ikats.core.resource.dataset_reader import DatasetReader
 from ikats.core.resource.opentsdb.wrapper import Wrapper
 
 
@@ -87,7 +89,7 @@ class IkatsProcessData(IkatsGenericApiEndPoint):
         """
         Create a process data
 
-        :param data: data to store
+        :param data: data to store: an iterator of bytes chunks is streamed (see ikats.core.library.blob)
         :param process_id: id of the process to bind this data to
         :param name: name of the process data
         :param data_type: data_type (deprecated) of the data to store
@@ -103,7 +105,7 @@ class IkatsProcessData(IkatsGenericApiEndPoint):
         :raise TypeError: data content type is not handled
         """
 
-        ntdm = NonTemporalDataMgr()
+        ntdm = ClientRegistry.get_ntdm()
         return ntdm.add_data(data=data, process_id=process_id, data_type=data_type, name=name)
 
     @staticmethod
@@ -124,7 +126,7 @@ class IkatsProcessData(IkatsGenericApiEndPoint):
 
         :rtype: list
         """
-        ntdm = NonTemporalDataMgr()
+        ntdm = ClientRegistry.get_ntdm()
         return ntdm.get_data(process_id=process_id)
 
     @staticmethod
@@ -142,7 +144,7 @@ class IkatsProcessData(IkatsGenericApiEndPoint):
         """
         response = None
         try:
-            ntdm = NonTemporalDataMgr()
+            ntdm = ClientRegistry.get_ntdm()
             response = ntdm.download_data(process_data_id)
 
             if response.status == 200:
@@ -165,6 +167,56 @@ class IkatsProcessData(IkatsGenericApiEndPoint):
             msg = "IkatsProcessData::read({}) failed : unexpected error. got response={}"
             raise IkatsException(msg.format(exception, response))
 
+    @staticmethod
+    def read_chunks(process_data_id, chunk_size=1024 * 1024, byte_range=None):
+        """
+        Reads the data blob content by chunks, without loading the whole blob in memory:
+        for the unique process_data row identified by id.
+
+        :param process_data_id: the id key of the raw process_data to get data from
+        :type process_data_id: str
+        :param chunk_size: optional, default 1MB: maximum size of the chunks, in bytes
+        :type chunk_size: int
+        :param byte_range: optional, default None: (first, last) positions of the read bytes, last included,
+          or (first, None) up to the end: partial read of a large blob
+        :type byte_range: tuple or None
+
+        :return: the chunks of the content, once the download is started
+        :rtype: generator of bytes
+
+        :raise IkatsNotFoundError: no resource identified by ID
+        :raise IkatsException: failed to read
+        """
+        return iter_download(ClientRegistry.get_ntdm(), process_data_id, chunk_size=chunk_size, byte_range=byte_range)
+
+    @staticmethod
+    def read_batch(process_data_ids, directory=None, workers=8, byte_range=None):
+        """
+        Reads the data blob contents of many process_data rows, downloaded concurrently over pooled connections:
+        see ikats.core.resource.client.ProcessDataBatchReader
+
+        :param process_data_ids: the id keys of the raw process_data to get data from: ex: the ids listed by list()
+        :type process_data_ids: list of str
+        :param directory: optional, default None: directory where the contents are written, in files named by the
+          ids; None to read the contents in memory
+        :type directory: str or None
+        :param workers: optional, default 8: number of concurrent downloads
+        :type workers: int
+        :param byte_range: optional, default None: (first, last) positions of the read bytes of each blob,
+          last included, or (first, None) up to the end
+        :type byte_range: tuple or None
+
+        :return: by id: the raw content (bytes), or the path of the written file
+        :rtype: dict
+
+        :raise IkatsNotFoundError: no resource identified by one of the ids
+        :raise IkatsException: failed to read
+        """
+        with ProcessDataBatchReader(workers=workers) as reader:
+            if directory is None:
+                return reader.read(process_data_ids, byte_range=byte_range)
+            return reader.download(process_data_ids, directory, byte_range=byte_range)
+
     @staticmethod
     def delete(process_id):
         """
@@ -176,7 +228,7 @@ class IkatsProcessData(IkatsGenericApiEndPoint):
         :return: the status of deletion (True=deleted, False otherwise)
         :rtype: bool
         """
-        ntdm = NonTemporalDataMgr()
+        ntdm = ClientRegistry.get_ntdm()
         ntdm.remove_data(process_id=process_id)
 
 
@@ -208,7 +260,7 @@ class IkatsTable(IkatsGenericApiEndPoint):
             data['table_desc']['name'] = name
         if description is not None:
             data['table_desc']['desc'] = description
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.create_table(data=data)
 
     @staticmethod
@@ -227,7 +279,7 @@ class IkatsTable(IkatsGenericApiEndPoint):
         :return: the list of tables matching the requirements
         :rtype: list
         """
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.list_tables(name=name, strict=strict)
 
     @staticmethod
@@ -245,7 +297,7 @@ class IkatsTable(IkatsGenericApiEndPoint):
         :raise IkatsException: any other error
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.read_table(name=name)
 
     @staticmethod
@@ -259,7 +311,7 @@ class IkatsTable(IkatsGenericApiEndPoint):
         :return: the status of deletion (True=deleted, False otherwise)
         :rtype: bool
         """
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.delete_table(name=name)
 
     @staticmethod
@@ -402,7 +454,7 @@ class IkatsTimeseries(IkatsGenericApiEndPoint):
 
         :raises TypeError: if *tsuid_list* is neither a list nor a string
         """
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.get_ts(tsuid_list=tsuid_list, sd=sd, ed=ed)
 
     @staticmethod
@@ -425,7 +477,7 @@ class IkatsTimeseries(IkatsGenericApiEndPoint):
         :raises IkatsConflictError: if *tsuid* belongs to -at least- one dataset
         :raises SystemError: if any other unhandled error occurred
         """
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         try:
             tdm.remove_ts(tsuid=tsuid)
         except Exception:
@@ -443,7 +495,7 @@ class IkatsTimeseries(IkatsGenericApiEndPoint):
         :rtype: list
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.get_ts_list()
 
     @staticmethod
@@ -471,7 +523,7 @@ class IkatsTimeseries(IkatsGenericApiEndPoint):
         :raises TypeError: if *constraint* is not a dict
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.get_ts_from_meta_data(constraint=constraint)
 
     @staticmethod
@@ -489,7 +541,7 @@ class IkatsTimeseries(IkatsGenericApiEndPoint):
         :raises ServerError: http answer with status : 500 <= status < 600
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.get_func_id_from_tsuid(tsuid=tsuid)
 
     @staticmethod
@@ -538,7 +590,7 @@ class IkatsFunctionalIdentifier(IkatsGenericApiEndPoint):
         :raises SystemError: if another issue occurs
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         tdm.import_fid(tsuid=tsuid, fid=fid)
 
     @staticmethod
@@ -554,7 +606,7 @@ class IkatsFunctionalIdentifier(IkatsGenericApiEndPoint):
         :raises ValueError: if *tsuid* doesn't have a FID
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.get_fid(tsuid=tsuid)
 
     @staticmethod
@@ -570,7 +622,7 @@ class IkatsFunctionalIdentifier(IkatsGenericApiEndPoint):
         :raises ValueError: if FID not deleted
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         tdm.delete_fid(tsuid=tsuid)
 
     @staticmethod
@@ -589,7 +641,7 @@ class IkatsFunctionalIdentifier(IkatsGenericApiEndPoint):
         :raises ServerError: http status for server errors: 500 <= status < 600
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.get_tsuid_from_func_id(func_id=fid)
 
     @staticmethod
@@ -615,7 +667,7 @@ class IkatsFunctionalIdentifier(IkatsGenericApiEndPoint):
           - ServerError: http status for server errors: 500 <= status < 600
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.search_functional_identifiers(criterion_type=criterion_type, criteria_list=criteria_list)
 
 
@@ -656,7 +708,7 @@ class IkatsMetadata(IkatsGenericApiEndPoint):
         :raises ValueError: if *value* is empty
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         result = tdm.import_meta_data(tsuid=tsuid, name=name, value=value, data_type=data_type,
                                       force_update=force_update)
         if not result:
@@ -696,7 +748,7 @@ class IkatsMetadata(IkatsGenericApiEndPoint):
         :raises TypeError: if *ts_list* is neither a str nor a list
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         if with_type:
             return tdm.get_typed_meta_data(ts_list=ts_list)
         else:
@@ -732,7 +784,7 @@ class IkatsMetadata(IkatsGenericApiEndPoint):
         :raises ValueError: if *value* is empty
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.update_meta_data(tsuid=tsuid, name=name, value=value, data_type=data_type, force_create=force_create)
 
 
@@ -761,7 +813,7 @@ class IkatsDataset(IkatsGenericApiEndPoint):
         :raises TypeError: if *tsuid_list* is not a list
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.import_data_set(data_set_id=ds_name, description=description, tsuid_list=tsuid_list)
 
     @staticmethod
@@ -781,9 +833,41 @@ class IkatsDataset(IkatsGenericApiEndPoint):
         :raises TypeError: if data_set is not a str
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.get_data_set(data_set=ds_name)
 
+    @staticmethod
+    def read_data(ds_name, sd=None, ed=None, columns=None, aligned=False, workers=8):
+        """
+        Read the metadata and the points of the timeseries of a data set, requested concurrently:
+        see ikats.core.resource.dataset_reader.DatasetReader
+
+        :param ds_name: name of the data set
+        :type ds_name: str
+        :param sd: optional, default None: start date (timestamp in ms from epoch),
+          None for the start date of each TS
+        :type sd: int or None
+        :param ed: optional, default None: end date (timestamp in ms from epoch),
+          None for the end date of each TS
+        :type ed: int or None
+        :param columns: optional, default None: the TS read, selected by functional identifier or TSUID,
+          None to read all the TS of the data set
+        :type columns: list of str or None
+        :param aligned: optional, default False: True to align the TS on the union of their timestamps
+        :type aligned: bool
+        :param workers: optional, default 8: maximum number of concurrent requests
+        :type workers: int
+
+        :return: the columnar container of the TS, labelled by functional identifier
+        :rtype: ikats.core.resource.dataset_reader.DatasetData
+
+        :raises TypeError: if *ds_name* is not a str
+        :raises ValueError: if a requested column is not in the data set
+        :raises IkatsException: if a request fails
+        """
+
+        return DatasetReader(workers=workers).read(ds_name=ds_name, sd=sd, ed=ed, columns=columns, aligned=aligned)
+
     @staticmethod
     def delete(ds_name, deep=False):
         """
@@ -805,7 +889,7 @@ class IkatsDataset(IkatsGenericApiEndPoint):
         :raises TypeError: if *data_set* is not a str
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.remove_data_set(data_set=ds_name, deep=deep)
 
     @staticmethod
@@ -817,7 +901,7 @@ class IkatsDataset(IkatsGenericApiEndPoint):
         :rtype: list of dict
         """
 
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         return tdm.get_data_set_list()
 
 
@@ -23,10 +23,14 @@ limitations under the License.
 
 from pkgutil import extend_path
 
-from ikats.core.resource.client.utils import build_json_files, is_url_valid, TEMPLATES, close_files
+from ikats.core.resource.client.utils import build_json_files, is_url_valid, TEMPLATES, close_files, \
+    build_multipart_stream
 from ikats.core.resource.client.exceptions import ServerError
+from ikats.core.resource.client.io_counter import IoCounter
 from ikats.core.resource.client.rest_client import RestClient
 from ikats.core.resource.client.non_temporal_data_mgr import NonTemporalDataMgr
 from ikats.core.resource.client.temporal_data_mgr import TemporalDataMgr
+from ikats.core.resource.client.batch_reader import ProcessDataBatchReader
+from ikats.core.resource.client.registry import ClientRegistry
 
 __path__ = extend_path(__path__, __name__)
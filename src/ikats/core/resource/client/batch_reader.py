@@ -0,0 +1,263 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+
+import requests
+
+from ikats.core.library.exception import IkatsException, IkatsInputError, IkatsNotFoundError
+from ikats.core.resource.client.io_counter import IoCounter
+from ikats.core.resource.client.non_temporal_data_mgr import NonTemporalDataMgr
+
+"""
+Concurrent download of the process data blobs, over the pooled connections of one session.
+"""
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def _slice_chunks(chunks, first, last):
+    """
+    Keep the bytes from first to last (included, None: up to the end) of the chunks
+    """
+    position = 0
+    for chunk in chunks:
+        start = max(first - position, 0)
+        stop = len(chunk) if last is None else min(last + 1 - position, len(chunk))
+        position += len(chunk)
+        if start < stop:
+            yield chunk[start:stop]
+        if last is not None and position > last:
+            return
+
+
+def iter_download(ntdm, process_data_id, chunk_size=DEFAULT_CHUNK_SIZE, byte_range=None):
+    """
+    Read the blob of one process data by chunks, optionally a range of its bytes
+
+    :param ntdm: the client sending the request
+    :type ntdm: NonTemporalDataMgr
+    :param process_data_id: the id of the process data
+    :type process_data_id: str
+    :param chunk_size: optional, default DEFAULT_CHUNK_SIZE: maximum size of the chunks, in bytes
+    :type chunk_size: int
+    :param byte_range: optional, default None: (first, last) positions of the read bytes, last included,
+      or (first, None) up to the end. The range is applied on client side if the server ignores it.
+    :type byte_range: tuple or None
+    :return: the chunks, once the download is started
+    :rtype: generator of bytes
+    :raises IkatsNotFoundError: no process data identified by process_data_id
+    :raises IkatsException: failed to read
+    """
+    response = ntdm.download_data(process_data_id, stream=True, byte_range=byte_range)
+    try:
+        if response.status == 404:
+            msg = "Process data {} not found : HTTP response={}"
+            raise IkatsNotFoundError(msg.format(process_data_id, response))
+        elif response.status not in [200, 206]:
+            msg = "Download of process data {} failed : HTTP response={}"
+            raise IkatsException(msg.format(process_data_id, response))
+
+        chunks = response.iter_content(chunk_size)
+        if byte_range is not None and response.status == 200:
+            # whole content: Range header not supported
+            chunks = _slice_chunks(chunks, byte_range[0], byte_range[1])
+
+        for chunk in chunks:
+            if chunk:
+                yield chunk
+    finally:
+        response.close()
+
+
+class ProcessDataBatchReader(object):
+    """
+    Reader of many process data blobs: the blobs are downloaded concurrently by a pool of threads, over the
+    pooled connections of one requests session, into memory or to files.
+    The bytes read by the threads are counted in the calling thread (see IoCounter).
+
+    Usage:
+        with ProcessDataBatchReader(workers=8) as reader:
+            paths = reader.download(process_data_ids, directory="/tmp/results")
+            contents = reader.read_process(process_id)
+    """
+
+    def __init__(self, workers=8, chunk_size=DEFAULT_CHUNK_SIZE, host=None, port=None):
+        """
+        Constructor
+        :param workers: optional, default 8: number of concurrent downloads
+        :type workers: int
+        :param chunk_size: optional, default DEFAULT_CHUNK_SIZE: size of the chunks written to the files, in bytes
+        :type chunk_size: int
+        :param host: optional, default None: host of the server, None for the configured one
+        :type host: str or None
+        :param port: optional, default None: port of the server, None for the configured one
+        :type port: int or None
+        :raises ValueError: if workers is not positive
+        """
+        if workers < 1:
+            raise ValueError("Unexpected workers=%s: at least one worker is expected" % workers)
+
+        self.__chunk_size = chunk_size
+        self.__session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.__session.mount("http://", adapter)
+        self.__session.mount("https://", adapter)
+        self.__ntdm = NonTemporalDataMgr(host=host, port=port, session=self.__session)
+        self.__executor = ThreadPoolExecutor(max_workers=workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Stop the threads and close the connections
+        """
+        self.__executor.shutdown(wait=True)
+        self.__session.close()
+
+    def list(self, process_id):
+        """
+        List the process data of the process: see IkatsProcessData.list()
+
+        :param process_id: the process id
+        :type process_id: str or int
+        :return: the resources matching the process_id, without content
+        :rtype: list of dict
+        """
+        return self.__ntdm.get_data(process_id=str(process_id))
+
+    def __read_one(self, process_data_id, byte_range):
+        """
+        Task of the threads: read in memory
+        """
+        return b"".join(iter_download(self.__ntdm, process_data_id, self.__chunk_size, byte_range))
+
+    def __download_one(self, process_data_id, directory, byte_range):
+        """
+        Task of the threads: write the chunks to a temporary file, renamed once complete
+        """
+        path = os.path.join(directory, process_data_id)
+        temporary_path = path + ".part"
+        try:
+            with open(temporary_path, 'wb') as opened_file:
+                for chunk in iter_download(self.__ntdm, process_data_id, self.__chunk_size, byte_range):
+                    opened_file.write(chunk)
+            os.replace(temporary_path, path)
+        except Exception:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        return path
+
+    @staticmethod
+    def __counted(task, *args):
+        """
+        Run the task in a thread, and measure its read bytes
+        """
+        read_before = IoCounter.get_counts()[0]
+        result = task(*args)
+        return result, IoCounter.get_counts()[0] - read_before
+
+    def __run_all(self, task, process_data_ids, *args):
+        """
+        Run the task once for each distinct process data: the first error cancels the pending tasks, and is raised
+        """
+        unique_ids = OrderedDict.fromkeys(str(x) for x in process_data_ids)
+        futures = [(x, self.__executor.submit(self.__counted, task, x, *args)) for x in unique_ids]
+        results = {}
+        try:
+            for process_data_id, future in futures:
+                results[process_data_id], read = future.result()
+                IoCounter.add_read(read)
+        except Exception:
+            for _, future in futures:
+                future.cancel()
+            raise
+        return results
+
+    def read(self, process_data_ids, byte_range=None):
+        """
+        Read the blobs in memory
+
+        :param process_data_ids: the ids of the process data
+        :type process_data_ids: list of str
+        :param byte_range: optional, default None: range of the bytes read in each blob: see iter_download()
+        :type byte_range: tuple or None
+        :return: the raw content of each blob, by process data id
+        :rtype: dict
+        :raises IkatsNotFoundError: a process data is not found
+        :raises IkatsException: failed to read
+        """
+        return self.__run_all(self.__read_one, process_data_ids, byte_range)
+
+    def download(self, process_data_ids, directory, byte_range=None):
+        """
+        Write the blobs to files named by the process data id: the memory used by each download is
+        about the chunk size
+
+        :param process_data_ids: the ids of the process data
+        :type process_data_ids: list of str
+        :param directory: the directory of the files, created if needed
+        :type directory: str
+        :param byte_range: optional, default None: range of the bytes read in each blob: see iter_download()
+        :type byte_range: tuple or None
+        :return: the path of each file, by process data id
+        :rtype: dict
+        :raises IkatsInputError: an id cannot be used as file name: path separator, '.' or '..'
+        :raises IkatsNotFoundError: a process data is not found
+        :raises IkatsException: failed to read
+        """
+        separators = [x for x in [os.sep, os.altsep] if x]
+        for process_data_id in [str(x) for x in process_data_ids]:
+            if process_data_id in ['', '.', '..'] or any(x in process_data_id for x in separators):
+                raise IkatsInputError("Unexpected process data id [%s]: not a file name" % process_data_id)
+
+        os.makedirs(directory, exist_ok=True)
+        return self.__run_all(self.__download_one, process_data_ids, directory, byte_range)
+
+    def read_process(self, process_id, directory=None, byte_range=None):
+        """
+        Read all the process data of one process: listed, then downloaded concurrently
+
+        :param process_id: the process id
+        :type process_id: str or int
+        :param directory: optional, default None: the directory of the files, None to read in memory
+        :type directory: str or None
+        :param byte_range: optional, default None: range of the bytes read in each blob: see iter_download()
+        :type byte_range: tuple or None
+        :return: the resources of the process (see list()), completed with the entry 'content' (in memory)
+          or 'path' (written to directory)
+        :rtype: list of dict
+        """
+        resources = self.list(process_id)
+        process_data_ids = [str(x['id']) for x in resources]
+        if directory is None:
+            key, results = 'content', self.read(process_data_ids, byte_range)
+        else:
+            key, results = 'path', self.download(process_data_ids, directory, byte_range)
+
+        for resource in resources:
+            resource[key] = results[str(resource['id'])]
+        return resources
@@ -0,0 +1,96 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import threading
+
+
+class IoCounter(object):
+    """
+    Counters of the bytes exchanged with the IKATS servers by the RestClient requests: bodies of the
+    requests (written) and of the responses (read).
+
+    The counters are kept per thread: the difference between two get_counts() measures the traffic of the
+    work done by the current thread in between (ex: one execution of an algorithm).
+    """
+
+    __local = threading.local()
+
+    @classmethod
+    def __get_local_counts(cls):
+        counts = getattr(cls.__local, 'counts', None)
+        if counts is None:
+            counts = [0, 0]
+            cls.__local.counts = counts
+        return counts
+
+    @classmethod
+    def add_read(cls, size):
+        """
+        Count bytes read by the current thread
+
+        :param size: number of bytes
+        :type size: int
+        """
+        cls.__get_local_counts()[0] += size
+
+    @classmethod
+    def add_written(cls, size):
+        """
+        Count bytes written by the current thread
+
+        :param size: number of bytes
+        :type size: int
+        """
+        cls.__get_local_counts()[1] += size
+
+    @classmethod
+    def get_counts(cls):
+        """
+        Get the counters of the current thread
+
+        :return: total number of bytes read, total number of bytes written
+        :rtype: tuple (int, int)
+        """
+        read, written = cls.__get_local_counts()
+        return read, written
+
+    @classmethod
+    def count_read(cls, chunks):
+        """
+        Count the chunks read by the current thread, as they are consumed
+
+        :param chunks: the chunks
+        :type chunks: iterable of bytes
+        :return: the same chunks
+        :rtype: generator of bytes
+        """
+        for chunk in chunks:
+            cls.add_read(len(chunk))
+            yield chunk
+
+    @classmethod
+    def count_written(cls, chunks):
+        """
+        Count the chunks written by the current thread, as they are consumed
+
+        :param chunks: the chunks
+        :type chunks: iterable of bytes
+        :return: the same chunks
+        :rtype: generator of bytes
+        """
+        for chunk in chunks:
+            cls.add_written(len(chunk))
+            yield chunk
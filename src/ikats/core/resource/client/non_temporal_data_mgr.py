@@ -16,7 +16,10 @@ limitations under the License.
 """
 import os
 
-from ikats.core.resource.client import RestClient
+import numpy as np
+
+from ikats.core.data.convert import array_to_csv_chunks
+from ikats.core.resource.client import RestClient, build_multipart_stream
 
 
 class NonTemporalDataMgr(RestClient):
@@ -38,7 +41,9 @@ class NonTemporalDataMgr(RestClient):
         :param data_type: data format: "JSON","CSV"
         :type data_type: str or None
         :param process_id: process id to store information to
-        :param data: data to store
+        :param data: data to store. With data_type None: bytes, str, or iterator of bytes chunks,
+          streamed with a chunked transfer encoding. With data_type "CSV": path of the CSV file,
+          or array-like value encoded in memory (see ikats.core.data.convert.array_to_csv_chunks)
         :param name: name of the json to store (only used for json)
         :return: execution status: dict with entries:
           - 'status': True with success (HTTP Code 200 returned); False otherwise
@@ -52,6 +57,7 @@ class NonTemporalDataMgr(RestClient):
         filename = None
         json_data = None
         headers = None
+        csv_chunks = None
 
         if data_type == "JSON":
             template = "add_process_data_json"
@@ -71,7 +77,15 @@ class NonTemporalDataMgr(RestClient):
         elif data_type == "CSV":
             template = 'add_process_data'
 
-            if type(data) is str:
+            if isinstance(data, (np.ndarray, list, tuple)):
+                # The CSV is encoded in memory, without temporary file, chunk by chunk:
+                # a first pass computes the fileSize expected before the content, the second pass is streamed
+                csv_chunks = array_to_csv_chunks(data)
+                post_data = {
+                    "fileType": data_type,
+                    "fileSize": sum(len(chunk) for chunk in array_to_csv_chunks(data)),
+                }
+            elif type(data) is str:
                 if not os.path.isfile(data):
                     self.logger.error("The file [%s] doesn't exists", data)
                     raise FileNotFoundError("The file [%s] doesn't exists" % data)
@@ -83,8 +97,8 @@ class NonTemporalDataMgr(RestClient):
                     "fileSize": os.path.getsize(filename),
                 }
             else:
-                self.logger.error("'data' must be a valid file path (got: %s %s)", type(data), data)
-                raise TypeError("'data' must be a valid file path (got: %s %s)" % (type(data), data))
+                self.logger.error("'data' must be a valid file path or an array (got: %s %s)", type(data), data)
+                raise TypeError("'data' must be a valid file path or an array (got: %s %s)" % (type(data), data))
 
         elif data_type is None:
             # Newer way to store any blob information.
@@ -102,6 +116,13 @@ class NonTemporalDataMgr(RestClient):
 
         result = {'status': False}
 
+        if csv_chunks is not None:
+            # multipart body streamed from the encoded chunks
+            content_type, post_data = build_multipart_stream(fields=post_data,
+                                                             filename="%s.csv" % (name or "data"),
+                                                             chunks=csv_chunks)
+            headers = {'Content-Type': content_type}
+
         response = self._send(
             verb=RestClient.VERB.POST,
             template=template,
@@ -117,11 +138,17 @@ class NonTemporalDataMgr(RestClient):
         result['id'] = response.text
         return result
 
-    def download_data(self, data_id):
+    def download_data(self, data_id, stream=False, byte_range=None):
         """
         Request to find a data
 
         :param data_id:
+        :param stream: optional, default False: True to read the data by chunks: see RestClientResponse.iter_content()
+        :type stream: bool
+        :param byte_range: optional, default None: (first, last) positions of the requested bytes, last included,
+          or (first, None) up to the end: sent as a Range header. Note: a server ignoring the Range header replies
+          with the status 200 and the whole data, instead of 206
+        :type byte_range: tuple or None
         :return: data + execution status
         """
         # Checks inputs
@@ -134,10 +161,17 @@ class NonTemporalDataMgr(RestClient):
             'id': data_id
         }
 
+        headers = None
+        if byte_range is not None:
+            first, last = byte_range
+            headers = {'Range': "bytes=%s-%s" % (first, "" if last is None else last)}
+
         response = self._send(
             verb=RestClient.VERB.GET,
             template='download_process_data',
-            uri_params=uri_params)
+            uri_params=uri_params,
+            headers=headers,
+            stream=stream)
         return response
 
     def remove_data(self, process_id):
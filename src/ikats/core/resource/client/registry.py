@@ -0,0 +1,195 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import logging
+import os
+import threading
+
+import requests
+
+from ikats.core.config.ConfigReader import ConfigReader
+from ikats.core.resource.client.non_temporal_data_mgr import NonTemporalDataMgr
+from ikats.core.resource.client.temporal_data_mgr import TemporalDataMgr
+
+"""
+Registry of the resource clients shared by the process, and of the pooled connections they use.
+"""
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ClientRegistry(object):
+    """
+    Registry of the clients of the resource managers shared by the process:
+      - one TemporalDataMgr and one NonTemporalDataMgr are created by server (host, port), on first request
+      - all the clients send their requests through one requests.Session: the connections are kept alive,
+        in a pool sized by the optional configuration 'cluster' / 'client.pool.size'
+        (default DEFAULT_POOL_SIZE connections by server)
+      - the responses are counted: see get_stats()
+
+    The registry is fork-safe: the connections of a parent process must not be used by its child
+    (gunicorn workers, spark python workers): the session and the clients are dropped in the child process,
+    and created again on first request. The fork is detected by os.register_at_fork when available
+    (python >= 3.7), and otherwise by the process id, checked on each request.
+
+    Usage:
+
+        tdm = ClientRegistry.get_tdm()
+        tdm.get_ts_meta(...)
+
+    The clients are thread-safe: they hold no state other than their configuration.
+    Since they are shared, the callers must not change it (ex: the host and port setters of RestClient):
+    a client of another server is requested with its host and port.
+    """
+
+    DEFAULT_POOL_SIZE = 10
+
+    __lock = threading.Lock()
+
+    # Process owning the session and the clients
+    __pid = None
+    __session = None
+    # Clients by (class, host, port)
+    __clients = {}
+    __stats = {}
+
+    @classmethod
+    def get_tdm(cls, host=None, port=None):
+        """
+        Get the shared TemporalDataMgr of a server
+        :param host: optional, default None: host of the server, None for the configured one
+        :type host: str or None
+        :param port: optional, default None: port of the server, None for the configured one
+        :type port: int or None
+        :return: the client
+        :rtype: TemporalDataMgr
+        """
+        return cls.__get_client(TemporalDataMgr, host, port)
+
+    @classmethod
+    def get_ntdm(cls, host=None, port=None):
+        """
+        Get the shared NonTemporalDataMgr of a server
+        :param host: optional, default None: host of the server, None for the configured one
+        :type host: str or None
+        :param port: optional, default None: port of the server, None for the configured one
+        :type port: int or None
+        :return: the client
+        :rtype: NonTemporalDataMgr
+        """
+        return cls.__get_client(NonTemporalDataMgr, host, port)
+
+    @classmethod
+    def get_session(cls):
+        """
+        Get the session shared by the process: useful for the requests sent to other servers
+        (ex: opentsdb), which share the pool and the statistics
+        :return: the session
+        :rtype: requests.Session
+        """
+        cls.__check_pid()
+        with cls.__lock:
+            if cls.__session is None:
+                cls.__session = cls.__create_session()
+            return cls.__session
+
+    @classmethod
+    def get_stats(cls):
+        """
+        Get the statistics of the responses received by the process since its start (or its fork)
+        :return: the numbers of responses: 'requests' in total, 'client_errors' (4xx), 'server_errors' (5xx),
+          and the number of 'clients' created
+        :rtype: dict
+        """
+        cls.__check_pid()
+        with cls.__lock:
+            stats = dict(cls.__stats)
+            stats['clients'] = len(cls.__clients)
+            return stats
+
+    @classmethod
+    def reset(cls):
+        """
+        Drop the session, the clients and the statistics: they are created again on next request.
+        Called in the child process after a fork.
+        """
+        # The lock may have been held by another thread of the parent process during the fork
+        cls.__lock = threading.Lock()
+        cls.__pid = os.getpid()
+        cls.__session = None
+        cls.__clients = {}
+        cls.__stats = {'requests': 0, 'client_errors': 0, 'server_errors': 0}
+
+    @classmethod
+    def __check_pid(cls):
+        """
+        Reset the registry inherited from the parent process: fallback for the forks not notified by
+        os.register_at_fork (ex: python < 3.7, or fork without calling os.fork())
+        """
+        if cls.__pid != os.getpid():
+            LOGGER.debug("ClientRegistry: resetting the connections inherited by process %s", os.getpid())
+            cls.reset()
+
+    @classmethod
+    def __get_client(cls, client_class, host, port):
+        """
+        Get or create the client
+        """
+        cls.__check_pid()
+        key = (client_class, host, port)
+        with cls.__lock:
+            client = cls.__clients.get(key, None)
+            if client is None:
+                if cls.__session is None:
+                    cls.__session = cls.__create_session()
+                client = client_class(host=host, port=port, session=cls.__session)
+                cls.__clients[key] = client
+                LOGGER.debug("ClientRegistry: created %s for %s:%s", client_class.__name__, client.host, client.port)
+            return client
+
+    @classmethod
+    def __create_session(cls):
+        """
+        Create the session (called with the lock acquired)
+        """
+        try:
+            pool_size = int(ConfigReader().get('cluster', 'client.pool.size'))
+        except KeyError:
+            pool_size = cls.DEFAULT_POOL_SIZE
+
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.hooks['response'].append(cls.__count_response)
+        return session
+
+    @classmethod
+    def __count_response(cls, response, *args, **kwargs):
+        """
+        Hook of the session counting the responses
+        """
+        with cls.__lock:
+            cls.__stats['requests'] += 1
+            if 400 <= response.status_code < 500:
+                cls.__stats['client_errors'] += 1
+            elif response.status_code >= 500:
+                cls.__stats['server_errors'] += 1
+
+
+ClientRegistry.reset()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=ClientRegistry.reset)
@@ -25,6 +25,7 @@ import requests
 from ikats.core.config.ConfigReader import ConfigReader
 from ikats.core.resource.client import ServerError
 from ikats.core.resource.client import is_url_valid, build_json_files, TEMPLATES, close_files
+from ikats.core.resource.client.io_counter import IoCounter
 
 
 class RestClientResponse(object):
@@ -42,10 +43,13 @@ class RestClientResponse(object):
       - raw
 
     You can use get_appropriate_content() in order to have the specified type of content
+
+    For a streamed response (see RestClient._send(stream=True)), the body is not read:
+    text and content are None, and the body is read by chunks with iter_content().
     """
     DEFAULT_JSON_INIT = "{}"
 
-    def __init__(self, result):
+    def __init__(self, result, stream=False):
 
         # The user ought to know which field to use
         #
@@ -61,9 +65,9 @@ class RestClientResponse(object):
         self.content_type = self.headers.get('Content-type', None)
         self.url = result.url
         self.__json = None
-        self.text = result.text
+        self.text = None if stream else result.text
         self.raw = result.raw
-        self.content = result.content
+        self.content = None if stream else result.content
         self.__result = result
 
     def get_json(self):
@@ -86,6 +90,23 @@ class RestClientResponse(object):
                 pass
         return self.__json
 
+    def iter_content(self, chunk_size):
+        """
+        Iterates over the body of the response: useful for a streamed response
+
+        :param chunk_size: maximum size of the chunks, in bytes
+        :type chunk_size: int
+        :return: the chunks
+        :rtype: generator of bytes
+        """
+        return IoCounter.count_read(self.__result.iter_content(chunk_size=chunk_size))
+
+    def close(self):
+        """
+        Releases the connection of a streamed response, whose body is not fully read
+        """
+        self.__result.close()
+
     def __str__(self):
         msg = "url={} content_type={} headers={} status_code={}"
         return msg.format(self.url,
@@ -141,12 +162,15 @@ class RestClient(object):
         PUT = 2
         DELETE = 3
 
-    def __init__(self, host=None, port=None):
+    def __init__(self, host=None, port=None, session=None):
         """
         Initializer
 
         :param host: host to connect to
         :param port: port to use for connection
+        :param session: optional, default None: the requests session sending the requests, reusing its pooled
+          connections. By default, each request opens its own connection.
+        :type session: requests.Session or None
         """
 
         # Create the logger object
@@ -169,6 +193,9 @@ class RestClient(object):
         else:
             self.port = int(self.config_reader.get('cluster', 'tdm.port'))
 
+        # Sender of the requests: the requests module, or a session
+        self._session = session
+
     @property
     def host(self):
         """
@@ -226,7 +253,8 @@ class RestClient(object):
               files=None,
               data=None,
               json_data=None,
-              headers=None):
+              headers=None,
+              stream=False):
         """
         Generic call command that should not be called directly
 
@@ -245,14 +273,18 @@ class RestClient(object):
         :type verb: IkatsRest.VERB
         :param q_params: optional, default None: list of query parameters
         :type q_params: dict or None
-        :param files: optional, default None: files full path to attach to request
-        :type files: str or list or None
+        :param files: optional, default None: files full path to attach to request,
+          or tuple (filename, content) to attach an in-memory content
+        :type files: str or list or tuple or None
         :param data: optional, default None: data input consumed by request
             -note: when data is not None, json must be None
         :type data: object
         :param json_data: optional, default None: json input consumed by request
             -note: when json is not None, data must be None
         :type json_data: object
+        :param stream: optional, default False: True when the body of the response is not read at once:
+          see RestClientResponse.iter_content(). Note: a request body is streamed when data is an iterator.
+        :type stream: bool
         :return: the response as a anonymous class containing the following attributes:
             class Result:
                 url = *url of the request performed*
@@ -302,31 +334,38 @@ class RestClient(object):
         # Converts file to 'requests' module format
         json_file = build_json_files(files)
 
+        # Streamed request body: counted as it is sent (see IoCounter)
+        if data is not None and hasattr(data, '__next__'):
+            data = IoCounter.count_written(data)
+
         # Dispatch method
+        http = requests if self._session is None else self._session
         try:
             if verb == RestClient.VERB.POST:
-                result = requests.post(url,
-                                       data=data,
-                                       json=json_data,
-                                       files=json_file,
-                                       params=q_params,
-                                       timeout=600,
-                                       headers=headers)
+                result = http.post(url,
+                                   data=data,
+                                   json=json_data,
+                                   files=json_file,
+                                   params=q_params,
+                                   timeout=600,
+                                   headers=headers,
+                                   stream=stream)
             elif verb == RestClient.VERB.GET:
-                result = requests.get(url,
-                                      params=q_params,
-                                      timeout=600,
-                                      headers=headers)
+                result = http.get(url,
+                                  params=q_params,
+                                  timeout=600,
+                                  headers=headers,
+                                  stream=stream)
             elif verb == RestClient.VERB.PUT:
-                result = requests.put(url,
-                                      params=q_params,
-                                      timeout=600,
-                                      headers=headers)
+                result = http.put(url,
+                                  params=q_params,
+                                  timeout=600,
+                                  headers=headers)
             elif verb == RestClient.VERB.DELETE:
-                result = requests.delete(url,
-                                         params=q_params,
-                                         timeout=600,
-                                         headers=headers)
+                result = http.delete(url,
+                                     params=q_params,
+                                     timeout=600,
+                                     headers=headers)
             else:
                 self.logger.error("Verb [%s] is unknown, shall be one defined by VERB Enumerate", verb)
                 raise RuntimeError("Verb [%s] is unknown, shall be one defined by VERB Enumerate" % verb)
@@ -334,6 +373,12 @@ class RestClient(object):
             # Format output encoding
             result.encoding = 'utf-8'
 
+            # Count the exchanged bytes: see IoCounter
+            if isinstance(result.request.body, (bytes, str)):
+                IoCounter.add_written(len(result.request.body))
+            if not stream:
+                IoCounter.add_read(len(result.content))
+
             # Debug information
             if result.status_code == 400 or result.status_code >= 500:
                 self.logger.debug("Sending request:")
@@ -353,4 +398,4 @@ class RestClient(object):
             self.logger.error('%s Server Error: %s', result.status_code, result.reason)
             raise ServerError('%s Server Error: %s %s %s' % (result.status_code, verb, url, result.text))
 
-        return RestClientResponse(result)
+        return RestClientResponse(result, stream=stream)
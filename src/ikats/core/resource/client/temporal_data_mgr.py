@@ -15,6 +15,8 @@ limitations under the License.
 
 """
 
+import csv
+import io
 import os.path
 import uuid
 from time import time
@@ -23,7 +25,8 @@ from enum import Enum
 import numpy as np
 
 from ikats.core.library.exception import IkatsNotFoundError, IkatsConflictError, IkatsException, IkatsInputError
-from ikats.core.resource.client import RestClient
+from ikats.core.data.convert import ts_to_csv_chunks
+from ikats.core.resource.client import RestClient, build_multipart_stream
 
 
 class DTYPE(Enum):
@@ -101,20 +104,8 @@ class TemporalDataMgr(RestClient):
             raise ValueError('Functional id must not be None')
 
         if type(data) is np.ndarray:
-            # Build a CSV based on array content and open it
-
-            # Generate a temporary and unique filename
-            filename = '/tmp/%s.csv' % str(uuid.uuid4())
-
-            self.logger.debug("Creating file: %s", filename)
-            with open(filename, 'w') as opened_file:
-                # Write headers
-                opened_file.write("timestamp;value\n")
-                # Write content
-                lines = "".join("%s;%s\n" % (str(np.datetime64(int(data[index][0]), 'ms')), data[index][1])
-                                for index in range(len(data)))
-                opened_file.write(lines)
-
+            # The CSV is streamed from the array content (no temporary file)
+            filename = None
         elif type(data) is str:
             if not os.path.isfile(data):
                 self.logger.error("The file [%s] doesn't exists", data)
@@ -144,16 +135,23 @@ class TemporalDataMgr(RestClient):
         # Different templates to use depending on the presence of data_set
         template = 'import_data'
 
-        response = self._send(
-            verb=RestClient.VERB.POST,
-            template=template,
-            uri_params=uri_params,
-            data=tags,
-            files=filename)
-
-        # In case the data was an array, remove the temporary file previously created
-        if type(data) is np.ndarray:
-            os.remove(filename)
+        if filename is None:
+            content_type, body = build_multipart_stream(fields=tags,
+                                                        filename='%s.csv' % str(uuid.uuid4()),
+                                                        chunks=ts_to_csv_chunks(data))
+            response = self._send(
+                verb=RestClient.VERB.POST,
+                template=template,
+                uri_params=uri_params,
+                data=body,
+                headers={'Content-Type': content_type})
+        else:
+            response = self._send(
+                verb=RestClient.VERB.POST,
+                template=template,
+                uri_params=uri_params,
+                data=tags,
+                files=filename)
 
         if response.status == 200:
             result['status'] = True
@@ -1142,6 +1140,80 @@ class TemporalDataMgr(RestClient):
             "TSUID [%s] - MetaData not updated %s=%s. Received status:%s", tsuid, name, value, response.status)
         return False
 
+    def import_meta_data_bulk(self, meta_data, data_types=None):
+        """
+        Create or update several meta data of several TS in a single request
+
+        Corresponding web app resource operation: **importMetaDataFile**
+
+        The meta data typed DTYPE.string are sent as an in-memory CSV content (no temporary file),
+        the fields being quoted when they contain the separator, a quote or a new line:
+           | tsuid;name;value
+           | TS1;funcId;FID1
+           | ...
+
+        The CSV import does not define the data types: the other meta data (see *data_types*) are written
+        one by one using *update_meta_data* (with force_create), like all the meta data when the server
+        rejects the bulk request.
+
+        :param meta_data: meta data to write for each TS
+            | {
+            |     'TS1': {'param1':'value1', 'param2':'value2'},
+            |     'TS2': {'param1':'value1', 'param2':'value2'}
+            | }
+        :param data_types: optional, default None: data type of the meta data, by name
+                           (DTYPE.string is used for the meta data not listed)
+        :type meta_data: dict
+        :type data_types: dict or None
+
+        :return: execution status, True if all meta data were written, False otherwise
+        :rtype: bool
+
+        :raises TypeError: if *meta_data* is not a dict
+        """
+
+        if type(meta_data) is not dict:
+            self.logger.error("meta_data must be a dict (got %s)", type(meta_data))
+            raise TypeError("meta_data must be a dict (got %s)" % type(meta_data))
+
+        if data_types is None:
+            data_types = {}
+
+        # (tsuid, name, value) written by the CSV import, and one by one
+        bulk_items = []
+        single_items = []
+        for tsuid in meta_data:
+            for name, value in meta_data[tsuid].items():
+                if data_types.get(name, DTYPE.string) == DTYPE.string:
+                    bulk_items.append((tsuid, name, value))
+                else:
+                    single_items.append((tsuid, name, value))
+
+        if bulk_items:
+            content = io.StringIO()
+            writer = csv.writer(content, delimiter=';', lineterminator='\n')
+            writer.writerow(['tsuid', 'name', 'value'])
+            writer.writerows(bulk_items)
+
+            response = self._send(
+                verb=RestClient.VERB.POST,
+                template='import_meta_data_file',
+                files=('metadata.csv', content.getvalue()))
+
+            if 200 <= response.status < 300:
+                self.logger.info("MetaData created for %s TS", len(meta_data))
+            else:
+                self.logger.warning("Bulk MetaData import not performed (got %s), importing one by one",
+                                    response.status)
+                single_items = bulk_items + single_items
+
+        status = True
+        for tsuid, name, value in single_items:
+            status &= self.update_meta_data(tsuid=tsuid, name=name, value=value,
+                                            data_type=data_types.get(name, DTYPE.string),
+                                            force_create=True)
+        return status
+
     def get_meta_data(self, ts_list):
         """
         Request for metadata of a TS or a list of TS
@@ -0,0 +1,133 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import os
+import tempfile
+from unittest import TestCase
+
+import httpretty
+
+from ikats.core.config.ConfigReader import ConfigReader
+from ikats.core.library.exception import IkatsInputError, IkatsNotFoundError
+from ikats.core.resource.client import IoCounter, ProcessDataBatchReader
+
+CONFIG_READER = ConfigReader()
+TEST_HOST = CONFIG_READER.get('cluster', 'tdm.ip')
+TEST_PORT = int(CONFIG_READER.get('cluster', 'tdm.port'))
+
+ROOT_URL = 'http://%s:%s/TemporalDataManagerWebApp/webapi/processdata' % (TEST_HOST, TEST_PORT)
+
+CONTENTS = {"1": b"first blob content", "2": b"second" * 1000, "3": b""}
+
+
+def register_blobs():
+    """
+    Fake answers: the listing of the process "exec4", and the blobs of CONTENTS
+    """
+    httpretty.register_uri(
+        httpretty.GET,
+        ROOT_URL + '/exec4',
+        body='[{"id":1,"processId":"exec4","name":"a"},{"id":2,"processId":"exec4","name":"b"}]',
+        status=200,
+        content_type='text/json'
+    )
+    for process_data_id, content in CONTENTS.items():
+        httpretty.register_uri(
+            httpretty.GET,
+            ROOT_URL + '/id/download/%s' % process_data_id,
+            body=content,
+            status=200,
+            content_type='application/octet-stream'
+        )
+    httpretty.register_uri(httpretty.GET, ROOT_URL + '/id/download/404', status=404)
+
+
+class TestProcessDataBatchReader(TestCase):
+    """
+    Tests the concurrent download of process data
+    """
+
+    @httpretty.activate
+    def test_read(self):
+        """
+        Tests the reading in memory, and the count of the read bytes in the calling thread
+        """
+        register_blobs()
+        read_before = IoCounter.get_counts()[0]
+        with ProcessDataBatchReader(workers=3, chunk_size=1000) as reader:
+            contents = reader.read(["1", "2", "3"])
+
+        self.assertEqual(contents, CONTENTS)
+        self.assertEqual(IoCounter.get_counts()[0] - read_before, sum(len(x) for x in CONTENTS.values()))
+
+    @httpretty.activate
+    def test_download(self):
+        """
+        Tests the writing to files, and the listing of a process
+        """
+        register_blobs()
+        with tempfile.TemporaryDirectory() as directory:
+            with ProcessDataBatchReader(workers=2, chunk_size=1000) as reader:
+                resources = reader.read_process("exec4", directory=os.path.join(directory, "results"))
+
+            self.assertEqual([x['name'] for x in resources], ["a", "b"])
+            for resource in resources:
+                with open(resource['path'], 'rb') as opened_file:
+                    self.assertEqual(opened_file.read(), CONTENTS[str(resource['id'])])
+            self.assertEqual(sorted(os.listdir(os.path.join(directory, "results"))), ["1", "2"])
+
+    @httpretty.activate
+    def test_duplicated_and_invalid_ids(self):
+        """
+        Tests that a duplicated id is downloaded once, and that an id which is not a file name is rejected
+        """
+        register_blobs()
+        with tempfile.TemporaryDirectory() as directory:
+            with ProcessDataBatchReader(workers=2, chunk_size=1000) as reader:
+                read_before = IoCounter.get_counts()[0]
+                paths = reader.download(["1", "1", 1], directory)
+                self.assertEqual(paths, {"1": os.path.join(directory, "1")})
+                self.assertEqual(IoCounter.get_counts()[0] - read_before, len(CONTENTS["1"]))
+
+                for process_data_id in ["../1", "a/b", "..", ""]:
+                    with self.assertRaises(IkatsInputError):
+                        reader.download([process_data_id], directory)
+            self.assertEqual(os.listdir(directory), ["1"])
+
+    @httpretty.activate
+    def test_byte_range(self):
+        """
+        Tests the partial reads: the range is applied on client side when the server ignores it
+        """
+        register_blobs()
+        with ProcessDataBatchReader(workers=2, chunk_size=7) as reader:
+            self.assertEqual(reader.read(["1", "2"], byte_range=(6, 9)), {"1": b"blob", "2": b"seco"})
+            self.assertEqual(reader.read(["1"], byte_range=(6, None)), {"1": CONTENTS["1"][6:]})
+
+        self.assertEqual(httpretty.last_request().headers['Range'], "bytes=6-")
+
+    @httpretty.activate
+    def test_not_found(self):
+        """
+        Tests that a missing process data fails the batch
+        """
+        register_blobs()
+        with ProcessDataBatchReader(workers=2) as reader:
+            with self.assertRaises(IkatsNotFoundError):
+                reader.read(["1", "404"])
+
+        with self.assertRaises(ValueError):
+            ProcessDataBatchReader(workers=0)
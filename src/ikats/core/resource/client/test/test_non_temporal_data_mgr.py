@@ -15,10 +15,12 @@ limitations under the License.
 
 """
 import logging
-from unittest import TestCase
+from unittest import TestCase, mock
+
+import numpy as np
 
 from ikats.core.config.ConfigReader import ConfigReader
-from ikats.core.resource.client import NonTemporalDataMgr
+from ikats.core.resource.client import IoCounter, NonTemporalDataMgr
 import httpretty
 
 # Flag to set to True to use the real servers (setting it to False will use a fake local server)
@@ -93,6 +95,24 @@ class TestNonTemporalDataMgr(TestCase):
         if not results['status']:
             self.fail()
 
+    def test_add_data_csv_array(self):
+        """
+        Test add process data encoded in CSV from an array, without temporary file
+        """
+        ntdm = NonTemporalDataMgr()
+        with mock.patch.object(ntdm, '_send', return_value=mock.Mock(status=200, text='OK')) as send:
+            results = ntdm.add_data(np.array([[1, 2.5], [3, 4.5]]), "exec4", "CSV", name="matrix")
+        self.assertTrue(results['status'])
+
+        # streamed multipart body
+        kwargs = send.call_args[1]
+        self.assertIsNone(kwargs['files'])
+        self.assertTrue(kwargs['headers']['Content-Type'].startswith('multipart/form-data; boundary='))
+        body = b"".join(kwargs['data'])
+        self.assertIn(b'name="fileSize"\r\n\r\n16\r\n', body)
+        self.assertIn(b'filename="matrix.csv"', body)
+        self.assertIn(b"1.0;2.5\n3.0;4.5\n", body)
+
     @fake_server
     def test_add_data_json(self):
         """
@@ -158,6 +178,58 @@ class TestNonTemporalDataMgr(TestCase):
         ntdm = NonTemporalDataMgr()
         ntdm.download_data("1")
 
+    @fake_server
+    def test_add_data_any_streamed(self):
+        """
+        Test add process data sent by chunks
+        """
+
+        # Fake answer definition
+        httpretty.register_uri(
+            httpretty.POST,
+            'http://%s:%s/TemporalDataManagerWebApp/webapi/processdata' % (TEST_HOST, TEST_PORT),
+            body='13',
+            status=200
+        )
+
+        ntdm = NonTemporalDataMgr()
+
+        chunks = (chunk for chunk in [b"first chunk ", b"second chunk"])
+
+        _, written_before = IoCounter.get_counts()
+        results = ntdm.add_data(data=chunks, data_type=None, name="Name_of_data", process_id=42)
+
+        # the streamed body is counted as it is sent
+        self.assertEqual(IoCounter.get_counts()[1] - written_before, len(b"first chunk second chunk"))
+
+        self.assertTrue(results['status'])
+        self.assertEqual(results['id'], '13')
+
+    @fake_server
+    def test_download_data_streamed(self):
+        """
+        Test download process data read by chunks
+        """
+
+        # Fake answer definition
+        httpretty.register_uri(
+            httpretty.GET,
+            'http://%s:%s/TemporalDataManagerWebApp/webapi/processdata/id/download/1' % (TEST_HOST, TEST_PORT),
+            body=b"0123456789",
+            status=200,
+            content_type='application/octet-stream'
+        )
+        ntdm = NonTemporalDataMgr()
+        response = ntdm.download_data("1", stream=True)
+
+        read_before, _ = IoCounter.get_counts()
+        self.assertIsNone(response.content)
+        self.assertEqual(b"".join(response.iter_content(4)), b"0123456789")
+        response.close()
+
+        # the streamed body is counted as it is read
+        self.assertEqual(IoCounter.get_counts()[0] - read_before, 10)
+
     @staticmethod
     @fake_server
     def test_remove_data():
@@ -0,0 +1,102 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import os
+from unittest import TestCase, mock
+
+import httpretty
+
+from ikats.core.config.ConfigReader import ConfigReader
+from ikats.core.library.singleton import Singleton
+from ikats.core.resource.client import ClientRegistry, NonTemporalDataMgr, ServerError, TemporalDataMgr
+from ikats.core.resource.interface import ResourceLocator
+
+CONFIG_READER = ConfigReader()
+TEST_HOST = CONFIG_READER.get('cluster', 'tdm.ip')
+TEST_PORT = int(CONFIG_READER.get('cluster', 'tdm.port'))
+
+ROOT_URL = 'http://%s:%s/TemporalDataManagerWebApp/webapi/processdata' % (TEST_HOST, TEST_PORT)
+
+
+class TestClientRegistry(TestCase):
+    """
+    Tests the registry of the clients shared by the process
+    """
+
+    def setUp(self):
+        ClientRegistry.reset()
+
+    def tearDown(self):
+        ClientRegistry.reset()
+
+    def test_shared_clients(self):
+        """
+        The clients are created once by server, and share one session
+        """
+        tdm = ClientRegistry.get_tdm()
+        self.assertIsInstance(tdm, TemporalDataMgr)
+        self.assertIs(tdm, ClientRegistry.get_tdm())
+        self.assertEqual((tdm.host, tdm.port), (TEST_HOST, TEST_PORT))
+
+        ntdm = ClientRegistry.get_ntdm()
+        self.assertIsInstance(ntdm, NonTemporalDataMgr)
+        self.assertIs(ntdm, ClientRegistry.get_ntdm())
+
+        other_tdm = ClientRegistry.get_tdm("127.0.0.2", 8088)
+        self.assertIsNot(other_tdm, tdm)
+        self.assertEqual((other_tdm.host, other_tdm.port), ("127.0.0.2", 8088))
+
+        self.assertEqual(ClientRegistry.get_stats()['clients'], 3)
+
+        # the implicit ResourceLocator provides the shared clients
+        Singleton._instances.pop(ResourceLocator, None)
+        try:
+            self.assertIs(ResourceLocator().tdm, tdm)
+            self.assertIs(ResourceLocator().ntdm, ntdm)
+        finally:
+            del Singleton._instances[ResourceLocator]
+
+    def test_fork(self):
+        """
+        The clients and the session inherited from a parent process are not reused
+        """
+        tdm = ClientRegistry.get_tdm()
+        session = ClientRegistry.get_session()
+
+        with mock.patch('os.getpid', return_value=os.getpid() + 1):
+            self.assertIsNot(ClientRegistry.get_session(), session)
+            self.assertIsNot(ClientRegistry.get_tdm(), tdm)
+            self.assertIs(ClientRegistry.get_tdm(), ClientRegistry.get_tdm())
+
+    @httpretty.activate
+    def test_stats(self):
+        """
+        The responses received through the shared session are counted
+        """
+        httpretty.register_uri(httpretty.DELETE, ROOT_URL + '/exec1', status=204)
+        httpretty.register_uri(httpretty.DELETE, ROOT_URL + '/exec2', status=404)
+        httpretty.register_uri(httpretty.DELETE, ROOT_URL + '/exec3', status=500)
+
+        ntdm = ClientRegistry.get_ntdm()
+        ntdm.remove_data("exec1")
+        ntdm.remove_data("exec2")
+        with self.assertRaises(ServerError):
+            ntdm.remove_data("exec3")
+
+        stats = ClientRegistry.get_stats()
+        self.assertEqual(stats['requests'], 3)
+        self.assertEqual(stats['client_errors'], 1)
+        self.assertEqual(stats['server_errors'], 1)
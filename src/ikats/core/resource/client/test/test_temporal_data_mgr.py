@@ -24,6 +24,7 @@ from unittest import TestCase
 import httpretty
 import mock
 import numpy as np
+import requests
 
 from ikats.core.config.ConfigReader import ConfigReader
 from ikats.core.resource.client import TemporalDataMgr
@@ -297,6 +298,138 @@ class TestTemporalDataMgr(TestCase):
         result = tdm.import_meta_data(tsuid='TSUID', name='test_meta_data', value='value_of_meta_data')
         self.assertFalse(result)
 
+    @fake_server
+    def test_import_md_bulk(self):
+        """
+        Tests the import of several meta data in a single request
+        """
+
+        # Fake answer definition
+        httpretty.register_uri(
+            httpretty.POST,
+            '%s/metadata/import/file' % ROOT_URL,
+            body='OK',
+            status=200
+        )
+
+        tdm = TemporalDataMgr(TEST_HOST, TEST_PORT)
+
+        result = tdm.import_meta_data_bulk(meta_data={
+            'TSUID1': {'qual_nb_points': 3, 'funcId': 'FID1'},
+            'TSUID2': {'qual_nb_points': 5}
+        })
+        self.assertTrue(result)
+
+        # Check the in-memory CSV content sent
+        body = httpretty.last_request().body.decode('utf-8')
+        self.assertIn("tsuid;name;value\n", body)
+        self.assertIn("TSUID1;qual_nb_points;3\n", body)
+        self.assertIn("TSUID1;funcId;FID1\n", body)
+        self.assertIn("TSUID2;qual_nb_points;5\n", body)
+
+    @fake_server
+    def test_import_md_bulk_typed(self):
+        """
+        Tests the import of several meta data: the typed ones are written one by one, with their type,
+        and the CSV fields are quoted
+        """
+
+        # Fake answer definition
+        httpretty.register_uri(
+            httpretty.POST,
+            '%s/metadata/import/file' % ROOT_URL,
+            body='OK',
+            status=200
+        )
+        httpretty.register_uri(
+            httpretty.PUT,
+            '%s/metadata/TSUID1/qual_nb_points/3' % ROOT_URL,
+            body='OK',
+            status=200
+        )
+
+        tdm = TemporalDataMgr(TEST_HOST, TEST_PORT)
+
+        result = tdm.import_meta_data_bulk(meta_data={'TSUID1': {'qual_nb_points': 3, 'comment': 'a;b\nc'}},
+                                           data_types={'qual_nb_points': DTYPE.number})
+        self.assertTrue(result)
+
+        requests = httpretty.latest_requests()
+        body = requests[-2].body.decode('utf-8')
+        self.assertIn('TSUID1;comment;"a;b\nc"\n', body)
+        self.assertNotIn("qual_nb_points", body)
+        self.assertEqual(requests[-1].method, 'PUT')
+
+    @fake_server
+    def test_import_md_bulk_fallback(self):
+        """
+        Tests the import of several meta data when the bulk request is rejected
+        """
+
+        # Fake answer definition
+        httpretty.register_uri(
+            httpretty.POST,
+            '%s/metadata/import/file' % ROOT_URL,
+            body='KO',
+            status=400
+        )
+        httpretty.register_uri(
+            httpretty.PUT,
+            '%s/metadata/TSUID1/qual_nb_points/3' % ROOT_URL,
+            body='OK',
+            status=200
+        )
+
+        tdm = TemporalDataMgr(TEST_HOST, TEST_PORT)
+
+        result = tdm.import_meta_data_bulk(meta_data={'TSUID1': {'qual_nb_points': 3}},
+                                           data_types={'qual_nb_points': DTYPE.number})
+        self.assertTrue(result)
+        self.assertEqual(httpretty.last_request().method, 'PUT')
+
+    @fake_server
+    def test_import_ts_data_array(self):
+        """
+        Tests the import of points provided as numpy array (CSV streamed without temporary file)
+        """
+
+        # Fake answer definition
+        httpretty.register_uri(
+            httpretty.POST,
+            '%s/ts/put/test_metric' % ROOT_URL,
+            body='{"errors": {}, "numberOfSuccess": 2, "summary": "", "tsuid": "TSUID", "funcId": "FID"}',
+            status=200
+        )
+
+        tdm = TemporalDataMgr(TEST_HOST, TEST_PORT)
+
+        # The fake server doesn't gather a chunked body: the streamed body is joined before being sent
+        real_post = requests.post
+
+        def joined_post(url, data=None, **kwargs):
+            """
+            Consume the streamed body and send it in one part
+            """
+            return real_post(url, data=b"".join(data), **kwargs)
+
+        with mock.patch('ikats.core.resource.client.rest_client.requests.post', side_effect=joined_post):
+            result = tdm.import_ts_data(metric='test_metric',
+                                        data=np.array([[1420075425000, 3], [1420075426000, 12564.5]]),
+                                        fid='FID',
+                                        tags={'flight': '1'})
+        self.assertTrue(result['status'])
+        self.assertEqual(result['tsuid'], 'TSUID')
+
+        # Check the multipart content sent
+        request = httpretty.last_request()
+        self.assertTrue(request.headers['Content-Type'].startswith('multipart/form-data; boundary='))
+        body = request.body.decode('utf-8')
+        self.assertIn('name="funcId"\r\n\r\nFID\r\n', body)
+        self.assertIn('name="flight"\r\n\r\n1\r\n', body)
+        self.assertIn("timestamp;value\n"
+                      "2015-01-01T01:23:45.000;3.0\n"
+                      "2015-01-01T01:23:46.000;12564.5\n", body)
+
     def test_import_md_wrong_data_type(self):
         """
         Tests the import of meta data with a wrong data type
@@ -17,6 +17,7 @@ limitations under the License.
 import logging
 import mimetypes
 import socket
+import uuid
 
 UTILS_LOGGER = logging.getLogger(__name__)
 
@@ -201,20 +202,56 @@ def close_files(json):
     """
 
     if type(json) is dict:
-        # One file to handle
-        json['file'].close()
+        # One file to handle (in-memory contents are provided as tuple: nothing to close)
+        if type(json['file']) is not tuple:
+            json['file'].close()
     elif type(json) is list:
         # Multiple files
         for i in json:
             json[i][1][1].close()
 
 
+def build_multipart_stream(fields, filename, chunks):
+    """
+    Build a multipart/form-data body streamed from the chunks of a file content:
+    the body is sent with chunked transfer encoding, without temporary file nor full copy in memory.
+
+    :param fields: form fields to send before the file
+    :type fields: dict
+    :param filename: name of the file field content (its MIME type is guessed from extension)
+    :type filename: str
+    :param chunks: content of the file
+    :type chunks: iterable of bytes
+
+    :return: the Content-Type header (including the boundary) and the generator of the body
+    :rtype: tuple (str, generator of bytes)
+    """
+    boundary = uuid.uuid4().hex
+    mime = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    def body():
+        """
+        Generator of the multipart body
+        """
+        for name, value in fields.items():
+            yield ('--%s\r\nContent-Disposition: form-data; name="%s"\r\n\r\n%s\r\n' %
+                   (boundary, name, value)).encode('utf-8')
+        yield ('--%s\r\nContent-Disposition: form-data; name="file"; filename="%s"\r\n'
+               'Content-Type: %s\r\n\r\n' % (boundary, filename, mime)).encode('utf-8')
+        for chunk in chunks:
+            yield chunk
+        yield ('\r\n--%s--\r\n' % boundary).encode('utf-8')
+
+    return 'multipart/form-data; boundary=%s' % boundary, body()
+
+
 def build_json_files(files):
     """
     Build the json files format to provide when sending files in a request
 
-    :param files: file or list of files to use for building json format
-    :type files: str OR list
+    :param files: file or list of files to use for building json format,
+                  or a tuple (filename, content) for an in-memory content (no file opened)
+    :type files: str OR list OR tuple
 
     :return: the json to pass to request object
     :rtype: dict
@@ -259,6 +296,10 @@ def build_json_files(files):
             results.append(('file', (working_file, open(working_file, 'rb'), mime)))
         return results
 
+    elif type(files) is tuple:
+        # In-memory content is provided as (filename, content): sent as is, without filesystem access
+        return {'file': files}
+
     elif files is None:
         # No file is provided -> No treatment
         return None
@@ -0,0 +1,350 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+import logging
+import time
+
+import numpy as np
+
+from ikats.core.library.cancellation import check_cancelled
+from ikats.core.library.exception import IkatsException
+from ikats.core.library.progress import report_progress
+from ikats.core.resource.client.io_counter import IoCounter
+from ikats.core.resource.client.registry import ClientRegistry
+
+"""
+Concurrent reading of a whole dataset: metadata and points of its timeseries, gathered in a columnar container.
+"""
+
+LOGGER = logging.getLogger(__name__)
+
+# Number of TSUID by metadata request: see TemporalDataMgr.get_meta_data()
+MD_CHUNK_SIZE = 100
+
+
+class DatasetData(object):
+    """
+    Columnar container of the timeseries of a dataset, returned by DatasetReader.read().
+    The columns are labelled by the functional identifiers of the timeseries (or their TSUID when the
+    functional identifier is unknown), or by the names requested with the columns argument.
+
+      - ragged container (default): each column keeps its own timestamps,
+        data[column] is the numpy array of its points [[timestamp, value], ...]
+      - aligned container: the columns share the timestamps array (union of the timestamps of the columns),
+        values is a 2D numpy array (one row by timestamp, one column by timeseries), with NaN
+        where a timeseries has no point. data[column] is the column of values.
+
+    Usage:
+
+        data = IkatsApi.ds.read_data("my_dataset", aligned=True)
+        for column in data:
+            print(column, data.tsuids[column], data.metadata[column]['qual_nb_points'])
+        matrix = data.values
+    """
+
+    def __init__(self, ds_name, columns, tsuids, metadata, points, aligned=False, stats=None):
+        """
+        Constructor
+        :param ds_name: name of the dataset
+        :type ds_name: str
+        :param columns: labels of the columns, ordered
+        :type columns: list of str
+        :param tsuids: TSUID by column
+        :type tsuids: dict
+        :param metadata: metadata by column
+        :type metadata: dict
+        :param points: points by column: numpy arrays [[timestamp, value], ...]
+        :type points: dict
+        :param aligned: optional, default False: True to align the columns on the union of their timestamps
+        :type aligned: bool
+        :param stats: optional, default None: statistics of the reading, see DatasetReader.read()
+        :type stats: dict or None
+        """
+        self.ds_name = ds_name
+        self.columns = list(columns)
+        self.tsuids = tsuids
+        self.metadata = metadata
+        self.stats = stats or {}
+        self.__aligned = aligned
+        self.__points = None
+        self.timestamps = None
+        self.values = None
+        if aligned:
+            self.__align(points)
+        else:
+            self.__points = points
+
+    @property
+    def aligned(self):
+        """
+        True when the columns share the timestamps
+        """
+        return self.__aligned
+
+    def __align(self, points):
+        """
+        Build the timestamps and values arrays of the aligned container
+        """
+        all_timestamps = [points[column][:, 0].astype(np.int64) for column in self.columns
+                          if len(points[column]) > 0]
+        if all_timestamps:
+            self.timestamps = np.unique(np.concatenate(all_timestamps))
+        else:
+            self.timestamps = np.array([], dtype=np.int64)
+
+        self.values = np.full((len(self.timestamps), len(self.columns)), np.nan)
+        for index, column in enumerate(self.columns):
+            column_points = points[column]
+            if len(column_points) > 0:
+                rows = np.searchsorted(self.timestamps, column_points[:, 0].astype(np.int64))
+                self.values[rows, index] = column_points[:, 1].astype(np.float64)
+
+    def __getitem__(self, column):
+        """
+        Get the points of a column (ragged container), or its values (aligned container)
+        :raises KeyError: if the column is unknown
+        """
+        if column not in self.tsuids:
+            raise KeyError(column)
+        if self.__aligned:
+            return self.values[:, self.columns.index(column)]
+        return self.__points[column]
+
+    def __contains__(self, column):
+        return column in self.tsuids
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __str__(self):
+        return "DatasetData(ds_name=%s, columns=%s, aligned=%s)" % (self.ds_name, len(self.columns), self.__aligned)
+
+
+def _read_counted(function, *args):
+    """
+    Call function(*args) in a worker thread, measuring the bytes read
+    :return: the result, and the number of bytes read
+    :rtype: tuple
+    """
+    read_before, _ = IoCounter.get_counts()
+    result = function(*args)
+    read_after, _ = IoCounter.get_counts()
+    return result, read_after - read_before
+
+
+class DatasetReader(object):
+    """
+    Reader of a whole dataset, replacing the sequence IkatsApi.ds.read(), IkatsApi.md.read(),
+    then IkatsApi.ts.read() called for each timeseries:
+      1. plan: the TSUID of the dataset are read, then their functional identifiers and their metadata,
+         by chunks of MD_CHUNK_SIZE requested concurrently, giving the columns and the time range read
+         for each timeseries
+      2. load: the points of the timeseries are requested concurrently
+
+    At most workers requests are sent at the same time, through the connections shared by the process
+    (see ClientRegistry). The progress and the throughput of the load are reported with
+    ikats.core.library.progress.report_progress(), and the load stops when the current execution is
+    cancelled (see ikats.core.library.cancellation).
+
+    Unlike IkatsApi.ts.read(), the missing dates metadata are not computed and saved: the whole timeseries
+    is read.
+    """
+
+    def __init__(self, workers=8, tdm=None):
+        """
+        Constructor
+        :param workers: optional, default 8: maximum number of concurrent requests
+        :type workers: int
+        :param tdm: optional, default None: the client of the TemporalDataManager,
+          None for the one of the ClientRegistry
+        :type tdm: TemporalDataMgr or None
+        :raises ValueError: if workers is not positive
+        """
+        if workers < 1:
+            raise ValueError("Unexpected workers=%s: at least one worker is expected" % workers)
+        self.__workers = workers
+        self.__tdm = tdm if tdm is not None else ClientRegistry.get_tdm()
+
+    def read(self, ds_name, sd=None, ed=None, columns=None, aligned=False):
+        """
+        Read the dataset
+
+        :param ds_name: name of the dataset
+        :type ds_name: str
+        :param sd: optional, default None: start date (timestamp in ms from epoch), None for the start date
+          of each timeseries (metadata ikats_start_date)
+        :type sd: int or None
+        :param ed: optional, default None: end date (timestamp in ms from epoch), None for the end date
+          of each timeseries (metadata ikats_end_date)
+        :type ed: int or None
+        :param columns: optional, default None: the timeseries read, selected by functional identifier or TSUID,
+          and labelled by these names, None to read all the timeseries of the dataset
+        :type columns: list of str or None
+        :param aligned: optional, default False: True to align the columns on the union of their timestamps,
+          see DatasetData
+        :type aligned: bool
+        :return: the columnar container, with the statistics of the reading in its stats attribute:
+          'timeseries', 'points', 'bytes_read', 'duration' (in seconds)
+        :rtype: DatasetData
+        :raises TypeError: if ds_name is not a str
+        :raises ValueError: if a requested column is not in the dataset
+        :raises IkatsException: if a request fails
+        :raises CancelledError: if the current execution is cancelled
+        """
+        start = time.time()
+        read_before, _ = IoCounter.get_counts()
+        # bytes read by the workers
+        bytes_read = [0]
+
+        with ThreadPoolExecutor(max_workers=self.__workers) as executor:
+            # 1/ Plan the load
+            # ----------------------------------------------------------------------
+            tsuid_list = self.__tdm.get_data_set(data_set=ds_name)['ts_list']
+            chunks = [tsuid_list[i:i + MD_CHUNK_SIZE] for i in range(0, len(tsuid_list), MD_CHUNK_SIZE)]
+            plan_requests = [(self.__tdm.get_meta_data, chunk) for chunk in chunks] + \
+                            [(self.__get_fids, chunk) for chunk in chunks]
+            results = self.__run_all(executor, lambda item: item[0](item[1]), plan_requests, bytes_read,
+                                     "metadata of dataset %s" % ds_name)
+            metadata = {}
+            for chunk_md in results[:len(chunks)]:
+                metadata.update(chunk_md)
+            fids = {}
+            for chunk_fids in results[len(chunks):]:
+                fids.update(chunk_fids)
+
+            plan = self.__plan(tsuid_list, fids, metadata, columns)
+            LOGGER.debug("DatasetReader: reading %s timeseries of dataset %s", len(plan), ds_name)
+
+            # 2/ Load the points
+            # ----------------------------------------------------------------------
+            ranges = [(tsuid, self.__get_range(tsuid, metadata[tsuid], sd, ed)) for _, tsuid in plan]
+            loaded = self.__run_all(executor, lambda item: self.__tdm.get_ts_by_tsuid(item[0], *item[1]),
+                                    ranges, bytes_read, "points of dataset %s" % ds_name, start=start)
+
+        # The bytes read by the workers are counted for the caller
+        IoCounter.add_read(bytes_read[0])
+
+        points = {column: ts_points for (column, _), ts_points in zip(plan, loaded)}
+        duration = time.time() - start
+        stats = {
+            'timeseries': len(plan),
+            'points': sum(len(ts_points) for ts_points in loaded),
+            'bytes_read': IoCounter.get_counts()[0] - read_before,
+            'duration': duration
+        }
+        LOGGER.info("DatasetReader: read %s points of %s timeseries of dataset %s in %.3f s (%.1f points/s)",
+                    stats['points'], stats['timeseries'], ds_name, duration,
+                    stats['points'] / duration if duration > 0 else 0.0)
+
+        return DatasetData(ds_name=ds_name,
+                           columns=[column for column, _ in plan],
+                           tsuids=dict(plan),
+                           metadata={column: metadata[tsuid] for column, tsuid in plan},
+                           points=points,
+                           aligned=aligned,
+                           stats=stats)
+
+    def __get_fids(self, tsuid_list):
+        """
+        Get the functional identifiers of the timeseries, as IkatsApi.fid.read() does
+        :return: the functional identifier by TSUID, for the timeseries having one
+        :rtype: dict
+        """
+        try:
+            found = self.__tdm.search_functional_identifiers(criterion_type='tsuids', criteria_list=tsuid_list)
+        except ValueError:
+            # no functional identifier among these timeseries
+            return {}
+        return {x['tsuid']: x['funcId'] for x in found}
+
+    @staticmethod
+    def __plan(tsuid_list, fids, metadata, columns):
+        """
+        Select and label the read timeseries
+        :return: the columns: (label, tsuid)
+        :rtype: list of tuple
+        """
+        by_fid = {}
+        for tsuid in tsuid_list:
+            metadata.setdefault(tsuid, {})
+            if tsuid in fids:
+                by_fid[fids[tsuid]] = tsuid
+
+        if columns is None:
+            return [(fids.get(tsuid, tsuid), tsuid) for tsuid in tsuid_list]
+
+        plan = []
+        for column in columns:
+            tsuid = by_fid.get(column, column)
+            if tsuid not in metadata:
+                raise ValueError("Unexpected column %s: no timeseries with this functional identifier or TSUID "
+                                 "in the dataset" % column)
+            plan.append((column, tsuid))
+        return plan
+
+    @staticmethod
+    def __get_range(tsuid, ts_metadata, sd, ed):
+        """
+        Get the time range read for a timeseries, as IkatsApi.ts.read() does
+        :return: the start and end dates
+        :rtype: tuple
+        """
+        used_sd = sd
+        if used_sd is None:
+            if 'ikats_start_date' in ts_metadata:
+                used_sd = int(ts_metadata['ikats_start_date'])
+            else:
+                LOGGER.warning("no 'ikats_start_date' meta data for ts %s", tsuid)
+                # the minimum allowed date (1 = 1970-01-01T00:00:00Z)
+                used_sd = 1
+        used_ed = ed
+        if used_ed is None and 'ikats_end_date' in ts_metadata:
+            used_ed = int(ts_metadata['ikats_end_date'])
+        # None is interpreted as 'now'
+        return used_sd, used_ed
+
+    @staticmethod
+    def __run_all(executor, function, items, bytes_read, description, start=None):
+        """
+        Call function on each item concurrently, reporting the progress when start is defined
+        :return: the results, ordered like items
+        :rtype: list
+        :raises IkatsException: if a call fails
+        """
+        futures = [executor.submit(_read_counted, function, item) for item in items]
+        pending = set(futures)
+        try:
+            while pending:
+                check_cancelled()
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    if future.exception() is not None:
+                        raise IkatsException("Failed to read the %s" % description, future.exception())
+                    bytes_read[0] += future.result()[1]
+                if start is not None and done:
+                    duration = max(time.time() - start, 1e-6)
+                    report_progress(progress=(len(futures) - len(pending)) / len(futures),
+                                    message="read %s/%s %s (%.1f kB/s)" % (len(futures) - len(pending),
+                                                                          len(futures), description,
+                                                                          bytes_read[0] / duration / 1024))
+        finally:
+            for future in pending:
+                future.cancel()
+        return [future.result()[0] for future in futures]
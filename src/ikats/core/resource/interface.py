@@ -18,8 +18,7 @@ import logging
 from logging.handlers import RotatingFileHandler
 
 from ikats.core.library.singleton import Singleton
-from ikats.core.resource.client.non_temporal_data_mgr import NonTemporalDataMgr
-from ikats.core.resource.client.temporal_data_mgr import TemporalDataMgr
+from ikats.core.resource.client.registry import ClientRegistry
 
 
 class ResourceLocator(object, metaclass=Singleton):
@@ -57,6 +56,9 @@ class ResourceLocator(object, metaclass=Singleton):
       - and the same for all services on NonTemporalDataManager
         -  ResourceLocator().ntdm.<service>(...)
 
+    Note: with the implicit initialization, tdm and ntdm are the clients shared by the process (see ClientRegistry):
+    do not change their configuration (ex: their host and port setters).
+
     """
 
     def __init__(self, tdm=None, ntdm=None):
@@ -70,13 +72,13 @@ class ResourceLocator(object, metaclass=Singleton):
         :param ntdm: optional, default None: specific implementation for tdm.
         :type ntdm: class implementing TemporalDataManageer services
         """
-        if tdm is None and ntdm is None:
+        # the explicit initialization (for instance for mocked resources)
+        self.__tdm = tdm
+        self.__ntdm = ntdm
+        self.__implicit = tdm is None and ntdm is None
+        if self.__implicit:
             # the implicit initialization
             self.__load_from_file__()
-        else:
-            # the explicit initialization (for instance for mocked resources)
-            self.__tdm = tdm
-            self.__ntdm = ntdm
 
         self.__logs = dict()
 
@@ -85,10 +87,12 @@ class ResourceLocator(object, metaclass=Singleton):
         Load the service implementations of tdm, and ntdm from the deployed configuration file:
           - each node could have a local configuration
 
-        Note: this method is called once, inside the singleton constructor of ResourceLocator
+        Note: this method is called once, inside the singleton constructor of ResourceLocator:
+        the standard tdm and ntdm are then provided by the ClientRegistry, which re-creates them
+        in the processes forked from this one (ex: spark python workers)
         """
-        self.__tdm = TemporalDataMgr()
-        self.__ntdm = NonTemporalDataMgr()
+        ClientRegistry.get_tdm()
+        ClientRegistry.get_ntdm()
 
     @classmethod
     def get_singleton(cls):
@@ -145,6 +149,8 @@ class ResourceLocator(object, metaclass=Singleton):
         Return the Temporal Data Manager instance
         :return:
         """
+        if self.__implicit:
+            return ClientRegistry.get_tdm()
         return self.__tdm
 
     def get_ntdm(self):
@@ -152,6 +158,8 @@ class ResourceLocator(object, metaclass=Singleton):
         Return the Non Temporal Data Manager instance
         :return:
         """
+        if self.__implicit:
+            return ClientRegistry.get_ntdm()
         return self.__ntdm
 
     tdm = property(get_tdm, None, None, "")
@@ -129,7 +129,7 @@ class HttpClient(object):
     # Client logger
     LOGGER = logging.getLogger(__name__)
 
-    def __init__(self, host=None, port=None, qsize=1000, threads_count=1):
+    def __init__(self, host=None, port=None, qsize=1000, threads_count=1, session=None):
         """
         Main OpenTSDB client.
 
@@ -137,14 +137,21 @@ class HttpClient(object):
         :param port: port to connect to (overrides configuration file)
         :param qsize: Size of the send_queue to use (bigger implies big memory usage) (default:1k)
         :param threads_count: set the initial threads count (default:1 meaning, no multi-threaded)
+        :param session: optional, default None: requests session reused (connection pool) by every send
+                        in single-threaded mode. The caller is in charge of closing it.
+                        If None, a new session is opened for each send.
 
         :type host: str
         :type port: int
         :type qsize: int
         :type threads_count: int
+        :type session: requests.Session or None
         """
         self.thr_list = []
 
+        # Session shared by several sends (single-threaded mode only)
+        self.session = session
+
         # Prepare events detecting the end of an import
         self._event_done = Event()
         self._event_abort = Event()
@@ -203,6 +210,13 @@ class HttpClient(object):
             # Dequeue the results
             self.__dequeue_results(result)
 
+        elif self.session is not None:
+            # Reuse the pooled connections of the provided session
+            for _, chunk in enumerate(chunks(data_points, max_points_per_query)):
+                data = QueueItem(url=url, metric=metric, tags=tags, points=chunk)
+                local_result = self.__send_http_task_single(data=data, session=self.session)
+                result.append(local_result)
+
         else:
             with requests.Session() as session:
                 for _, chunk in enumerate(chunks(data_points, max_points_per_query)):
@@ -21,11 +21,10 @@ from datetime import datetime
 import random
 import re
 import string
-import requests
 
 from ikats.core.config.ConfigReader import ConfigReader
 from ikats.core.library.exception import IkatsConflictError
-from ikats.core.resource.client import TemporalDataMgr
+from ikats.core.resource.client import ClientRegistry
 from ikats.core.resource.client.temporal_data_mgr import DTYPE
 from ikats.core.resource.opentsdb.HttpClient import HttpClient
 
@@ -56,7 +55,7 @@ class Wrapper(object):
 
         :raises IkatsConflictError: if TSUID already exist
         """
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         try:
             # check if fid already associated to an existing tsuid
             tsuid = tdm.get_tsuid_from_func_id(func_id=fid)
@@ -78,7 +77,7 @@ class Wrapper(object):
                      ','.join([str(k) for k, v in tags.items()]),
                      ','.join([str(v) for k, v in tags.items()]))
 
-            results = requests.get(url=url).json()
+            results = ClientRegistry.get_session().get(url=url).json()
 
             # initializing tsuid with metric uid retrieved from opentsdb json response
             tsuid = cls._extract_uid_from_json(item_type='metric', value=metric, json=results)
@@ -100,6 +99,37 @@ class Wrapper(object):
 
             return tsuid
 
+    @classmethod
+    def get_ts_ref(cls, fid):
+        """
+        Get the OpenTSDB reference (tsuid, metric and tags) to use for writing points of a TS.
+        The TS reference is created if the functional identifier is unknown.
+
+        Useful to resolve the reference once before sending several chunks of points of the same TS.
+
+        :param fid: Functional Identifier of the TS in Ikats
+        :type fid: str
+
+        :return: the tsuid, the metric and the tags
+        :rtype: tuple (str, str, dict)
+
+        :raises IkatsConflictError: if TSUID already exist
+        """
+        tdm = ClientRegistry.get_tdm()
+        try:
+            tsuid = tdm.get_tsuid_from_func_id(fid)
+            # Use tsuid to find the metric and tags
+            metric, tags = cls._get_metric_tags_from_tsuid(tsuid=tsuid)
+        except ValueError:
+            # No match, we will compute the tsuid, metric and tags
+            cls.logger.info("No information for FID %s in base (will create new TS)", fid)
+            tsuid, metric, tags = cls.create_tsuid(fid=fid, show_details=True)
+
+        # Define metric and tags
+        metric, tags = cls._gen_metric_tags(metric, tags)
+
+        return tsuid, metric, tags
+
     @classmethod
     def inherit_properties(cls, tsuid, parent):
         """
@@ -108,7 +138,7 @@ class Wrapper(object):
         :type tsuid: str
         :type parent: str
         """
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
         try:
             metadata = tdm.get_meta_data([parent])[parent]
             for meta_name in metadata:
@@ -166,7 +196,7 @@ class Wrapper(object):
             raise ValueError('Functional id must be filled')
 
         # Get an instance of Temporal Data Manager
-        tdm = TemporalDataMgr()
+        tdm = ClientRegistry.get_tdm()
 
         if sparkified:
             # Force single thread if sparkified (no parallel job on paralleled tasks)
@@ -174,18 +204,8 @@ class Wrapper(object):
         # Create connection
         client = HttpClient(qsize=qsize, threads_count=threads_count)
 
-        # Check existing TSUID
-        try:
-            tsuid = tdm.get_tsuid_from_func_id(fid)
-            # Use tsuid to find the metric and tags
-            metric, tags = cls._get_metric_tags_from_tsuid(tsuid=tsuid)
-        except ValueError:
-            # No match, we will compute the tsuid, metric and tags
-            cls.logger.info("No information for FID %s in base (will create new TS)", fid)
-            tsuid, metric, tags = cls.create_tsuid(fid=fid, show_details=True)
-
-        # Define metric and tags
-        metric, tags = cls._gen_metric_tags(metric, tags)
+        # Check existing TSUID, and define metric and tags
+        tsuid, metric, tags = cls.get_ts_ref(fid=fid)
 
         # Metadata init/calc
         nb_points = len(data)
@@ -292,7 +312,7 @@ class Wrapper(object):
             metric, tag_string,
             random.random())
 
-        results = requests.get(
+        results = ClientRegistry.get_session().get(
             url=url,
             timeout=timeout
         ).json()
@@ -348,7 +368,7 @@ class Wrapper(object):
         # Send the request to get the TSUID information
         if ed is None:
             # Retrieve end date from metadata
-            tdm = TemporalDataMgr()
+            tdm = ClientRegistry.get_tdm()
             metadata = tdm.get_meta_data([tsuid])[tsuid]
             # Create or update the metadata
             ed = int(metadata['ikats_end_date'])
@@ -361,7 +381,7 @@ class Wrapper(object):
             q_ed,
             int(ed + 1),
             tsuid)
-        results = requests.get(
+        results = ClientRegistry.get_session().get(
             url=url,
             timeout=timeout
         ).json()
@@ -419,7 +439,7 @@ class Wrapper(object):
                 uid,
                 item_type)
 
-            results = requests.get(url=url)
+            results = ClientRegistry.get_session().get(url=url)
             if 200 <= results.status_code < 300:
                 try:
                     result = results.json()['name']
@@ -0,0 +1,186 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import json
+import re
+from unittest import TestCase, mock
+from urllib.parse import parse_qs, urlparse
+
+import httpretty
+import numpy as np
+
+from ikats.core.config.ConfigReader import ConfigReader
+from ikats.core.library.exception import IkatsException
+from ikats.core.library.progress import set_progress_sink
+from ikats.core.resource.api import IkatsApi
+from ikats.core.resource.client import IoCounter
+
+CONFIG_READER = ConfigReader()
+TEST_HOST = CONFIG_READER.get('cluster', 'tdm.ip')
+TEST_PORT = int(CONFIG_READER.get('cluster', 'tdm.port'))
+TEST_OPENTSDB_HOST = CONFIG_READER.get('cluster', 'opentsdb.read.ip')
+TEST_OPENTSDB_PORT = int(CONFIG_READER.get('cluster', 'opentsdb.read.port'))
+ROOT_URL = 'http://%s:%s/TemporalDataManagerWebApp/webapi' % (TEST_HOST, TEST_PORT)
+DIRECT_ROOT_URL = 'http://%s:%s/api' % (TEST_OPENTSDB_HOST, TEST_OPENTSDB_PORT)
+
+# Points of the timeseries of the fake dataset, by TSUID
+POINTS = {
+    "TSUID1": {"1000": 1.0, "2000": 2.0, "3000": 3.0},
+    "TSUID2": {"2000": 20.0, "4000": 40.0},
+    "TSUID3": {},
+}
+
+# Metadata of the fake dataset: no dates for TSUID3
+METADATA = {
+    "TSUID1": {"ikats_start_date": "1000", "ikats_end_date": "3000"},
+    "TSUID2": {"ikats_start_date": "2000", "ikats_end_date": "4000"},
+    "TSUID3": {},
+}
+
+# Functional identifiers of the fake dataset: none for TSUID3
+FIDS = {"TSUID1": "FID1", "TSUID2": "FID2"}
+
+
+def register_dataset():
+    """
+    Fake answers: the dataset "ds1", the functional identifiers, the metadata and the points of its timeseries
+    """
+    httpretty.register_uri(
+        httpretty.GET,
+        '%s/dataset/ds1' % ROOT_URL,
+        body=json.dumps({"name": "ds1", "description": "my data set", "tsuidsAsString": list(POINTS.keys())}),
+        status=200,
+        content_type='text/json'
+    )
+
+    def metadata_answer(request, uri, headers):
+        tsuids = parse_qs(urlparse(uri).query)['tsuid'][0].split(',')
+        body = [{"tsuid": tsuid, "name": name, "value": value}
+                for tsuid in tsuids for name, value in METADATA[tsuid].items()]
+        return 200, headers, json.dumps(body)
+
+    httpretty.register_uri(
+        httpretty.GET,
+        re.compile('%s/metadata/list/json.*' % ROOT_URL),
+        body=metadata_answer,
+        content_type='text/json'
+    )
+
+    def fid_answer(request, uri, headers):
+        tsuids = parse_qs(request.body.decode())['tsuids']
+        body = [{"tsuid": tsuid, "funcId": FIDS[tsuid]} for tsuid in tsuids if tsuid in FIDS]
+        return (200 if body else 404), headers, json.dumps(body)
+
+    httpretty.register_uri(
+        httpretty.POST,
+        '%s/metadata/funcId' % ROOT_URL,
+        body=fid_answer,
+        content_type='text/json'
+    )
+
+    def points_answer(request, uri, headers):
+        tsuid = parse_qs(urlparse(uri).query)['tsuid'][0].split(':')[1]
+        if tsuid == "TSUID3":
+            return 200, headers, "[]"
+        return 200, headers, json.dumps([{"tsuid": tsuid, "dps": POINTS[tsuid]}])
+
+    httpretty.register_uri(
+        httpretty.GET,
+        re.compile('%s/query.*' % DIRECT_ROOT_URL),
+        body=points_answer,
+        content_type='text/json'
+    )
+
+
+class TestDatasetReader(TestCase):
+    """
+    Tests the concurrent reading of a dataset
+    """
+
+    @httpretty.activate
+    def test_read_ragged(self):
+        """
+        Each column keeps its own points, labelled by functional identifier
+        """
+        register_dataset()
+
+        reports = []
+        read_before, _ = IoCounter.get_counts()
+        previous_sink = set_progress_sink(lambda **kwargs: reports.append(kwargs))
+        try:
+            data = IkatsApi.ds.read_data("ds1", workers=3)
+        finally:
+            set_progress_sink(previous_sink)
+
+        self.assertFalse(data.aligned)
+        self.assertEqual(data.columns, ["FID1", "FID2", "TSUID3"])
+        self.assertEqual(data.tsuids, {"FID1": "TSUID1", "FID2": "TSUID2", "TSUID3": "TSUID3"})
+        self.assertEqual(data.metadata["FID2"]["ikats_end_date"], "4000")
+        self.assertEqual(data["FID1"].tolist(), [[1000, 1.0], [2000, 2.0], [3000, 3.0]])
+        self.assertEqual(data["FID2"].tolist(), [[2000, 20.0], [4000, 40.0]])
+        self.assertEqual(len(data["TSUID3"]), 0)
+
+        self.assertEqual(data.stats['timeseries'], 3)
+        self.assertEqual(data.stats['points'], 5)
+        # the bytes read by the workers are counted for the caller
+        self.assertEqual(IoCounter.get_counts()[0] - read_before, data.stats['bytes_read'])
+        self.assertGreater(data.stats['bytes_read'], 0)
+
+        # the progress of the points reading is reported
+        self.assertEqual(reports[-1]['progress'], 1.0)
+        self.assertIn("3/3", reports[-1]['message'])
+
+    @httpretty.activate
+    def test_read_aligned(self):
+        """
+        The selected columns share the union of their timestamps
+        """
+        register_dataset()
+
+        data = IkatsApi.ds.read_data("ds1", columns=["FID2", "TSUID1"], aligned=True)
+
+        self.assertTrue(data.aligned)
+        self.assertEqual(data.columns, ["FID2", "TSUID1"])
+        self.assertEqual(data.timestamps.tolist(), [1000, 2000, 3000, 4000])
+        np.testing.assert_array_equal(data.values, [[np.nan, 1.0], [20.0, 2.0], [np.nan, 3.0], [40.0, np.nan]])
+        np.testing.assert_array_equal(data["TSUID1"], [1.0, 2.0, 3.0, np.nan])
+
+    @httpretty.activate
+    def test_read_fids_by_chunks(self):
+        """
+        The functional identifiers are searched by chunks: a chunk without any is not an error
+        """
+        register_dataset()
+
+        with mock.patch('ikats.core.resource.dataset_reader.MD_CHUNK_SIZE', 1):
+            data = IkatsApi.ds.read_data("ds1", workers=2)
+
+        self.assertEqual(data.columns, ["FID1", "FID2", "TSUID3"])
+        self.assertEqual(data.metadata["TSUID3"], {})
+
+    @httpretty.activate
+    def test_read_errors(self):
+        """
+        Unknown column, failed request
+        """
+        register_dataset()
+
+        with self.assertRaises(ValueError):
+            IkatsApi.ds.read_data("ds1", columns=["FID1", "FID4"])
+
+        httpretty.register_uri(httpretty.GET, re.compile('%s/query.*' % DIRECT_ROOT_URL), status=500)
+        with self.assertRaises(IkatsException):
+            IkatsApi.ds.read_data("ds1")
@@ -20,9 +20,9 @@ from apps.algo.execute.models import ExecutableAlgoDao
 # doesn't declare an explicit app_label and either isn't in an application in INSTALLED_APPS or
 # else was imported before its application was loaded. This will no longer be supported in Django 1.9.
 
-# Break the status of running algorithms to have ENGINE_KO
+# Break the status of running (1) and queued (5) algorithms to have ENGINE_KO
 try:
-    COUNT = ExecutableAlgoDao.objects.filter(state=1).update(state=4)
-    print("%s Running algorithms have been stopped since this new deployment" % COUNT)
+    COUNT = ExecutableAlgoDao.objects.filter(state__in=[1, 5]).update(state=4)
+    print("%s Running or queued algorithms have been stopped since this new deployment" % COUNT)
 except Exception:
     print("No algorithm to stop")
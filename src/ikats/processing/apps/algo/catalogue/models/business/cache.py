@@ -0,0 +1,115 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import logging
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CatalogueCache(object):
+    """
+    Process-wide cache of the business resources read from the catalogue and custom databases
+    (Implementation, CustomizedAlgo ...), keyed by DAO class, and by name or by primary key.
+
+    The catalogue is read-mostly: each run of an algorithm reads its Implementation, or its CustomizedAlgo,
+    whose building requires several ORM queries (profile items, algorithm, family, customized parameters).
+    The business resource is built once, then the cached object is returned.
+
+    Versioning:
+      - every write of the DAO layer (create, update, delete) calls invalidate(): the version is incremented
+        and the cache is cleared.
+      - a resource read while the version changed is not cached: a concurrent write cannot be hidden by
+        a previous read.
+
+    The cache is local to one process: the writes handled by the other processes (ex: other gunicorn workers)
+    are seen once the entries expire, after the timeout of the django setting IKATS_CATALOGUE_CACHE.
+
+    !!! The cached business objects are shared: they must not be modified by the callers !!!
+    """
+
+    # Default expiration delay of the entries, in seconds
+    DEFAULT_TIMEOUT = 60
+
+    __entries = {}
+    __version = 0
+    __lock = threading.Lock()
+
+    @classmethod
+    def get_version(cls):
+        """
+        Get the version of the catalogue, incremented by each write of the DAO layer in this process
+
+        :return: the version
+        :rtype: int
+        """
+        return cls.__version
+
+    @classmethod
+    def get_timeout(cls):
+        """
+        Get the expiration delay of the entries, from the django setting IKATS_CATALOGUE_CACHE (key TIMEOUT)
+
+        :return: the delay in seconds, None for no expiration, 0 disables the cache
+        :rtype: float or None
+        """
+        from django.conf import settings
+        return getattr(settings, 'IKATS_CATALOGUE_CACHE', {}).get('TIMEOUT', cls.DEFAULT_TIMEOUT)
+
+    @classmethod
+    def get(cls, dao_class, key_name, key_value, loader):
+        """
+        Get the cached resource, or load it
+
+        :param dao_class: the DAO class of the resource
+        :type dao_class: type
+        :param key_name: name of the key: 'name' or 'id'
+        :type key_name: str
+        :param key_value: value of the key
+        :type key_value: str or int
+        :param loader: function without argument reading the resource from the database,
+          called when the resource is not cached. Errors raised by loader are not cached.
+        :type loader: callable
+        :return: the resource: value returned by loader
+        """
+        timeout = cls.get_timeout()
+        key = (dao_class.__name__, key_name, key_value)
+
+        entry = cls.__entries.get(key)
+        if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+            return entry[1]
+
+        version = cls.__version
+        value = loader()
+
+        # Empty results are not cached: a resource created by another process is found at once
+        if timeout != 0 and value:
+            expiration = None if timeout is None else time.monotonic() + timeout
+            with cls.__lock:
+                if version == cls.__version:
+                    cls.__entries[key] = (expiration, value)
+        return value
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Clear the cache and increment the version: called after each write of the DAO layer
+        """
+        with cls.__lock:
+            cls.__version += 1
+            cls.__entries.clear()
+        LOGGER.debug("CatalogueCache: invalidated, version=%s", cls.__version)
@@ -18,6 +18,7 @@ limitations under the License.
 from django.db import models as djmodels
 
 from apps.algo.catalogue.models.business.algorithm import Algorithm
+from apps.algo.catalogue.models.business.cache import CatalogueCache
 from apps.algo.catalogue.models.orm.element import ElementDao
 from apps.algo.catalogue.models.orm.family import FunctionalFamilyDao
 
@@ -48,6 +49,13 @@ class AlgorithmDao(ElementDao):
 
         return business_algo
 
+    @classmethod
+    def query_set_with_related(cls):
+        """
+        See ElementDao.query_set_with_related(): the family is joined
+        """
+        return cls.objects.select_related('family')
+
     def __str__(self):
         if self.family:
             return "AlgorithmDao [%s] from family [%s]" % (ElementDao.__str__(self), self.family.__str__())
@@ -109,6 +117,7 @@ class AlgorithmDao(ElementDao):
 
         # save object BEFORE updating the many to many relationship !!!
         db_obj.save()
+        CatalogueCache.invalidate()
 
         # feed back to the business object: provide the created key
         return db_obj.build_business()
@@ -130,6 +139,7 @@ class AlgorithmDao(ElementDao):
             # !!! init_orm() is specific to the class, not init_elem_orm() !!!
             #
             orm_obj = cls.init_orm(business_obj, save=True)
+            CatalogueCache.invalidate()
         else:
             # assumes that orm object exists in database ...
             orm_obj = cls.objects.get(id=business_obj.db_id)
@@ -165,6 +175,7 @@ class AlgorithmDao(ElementDao):
 
         # save object BEFORE updating the many to many relationship !!!
         db_obj.save()
+        CatalogueCache.invalidate()
 
     @classmethod
     def delete(cls, business_algo):
@@ -192,3 +203,4 @@ class AlgorithmDao(ElementDao):
         """
         db_obj = cls.objects.get(id=db_id)
         db_obj.delete()
+        CatalogueCache.invalidate()
@@ -19,6 +19,7 @@ import sys
 
 from django.db import models
 
+from apps.algo.catalogue.models.business.cache import CatalogueCache
 from ikats.core.library.exception import IkatsException, IkatsInputError
 
 
@@ -76,6 +77,29 @@ class ElementDao(models.Model):
         """
         return list(cls.objects.all())
 
+    @classmethod
+    def query_set_with_related(cls):
+        """
+        Returns the QuerySet of all elements, prepared to load the related elements read by build_business()
+        with a constant number of queries (select_related, prefetch_related).
+
+        The default QuerySet has no related element: to be overridden by the subclasses having relationships.
+
+        :return: the QuerySet
+        :rtype: QuerySet
+        """
+        return cls.objects.all()
+
+    @classmethod
+    def find_all_orm_with_related(cls):
+        """
+        Returns all elements, with the related elements read by build_business() already loaded:
+        building the business objects does not query the database.
+        :return: all elements
+        :rtype: list
+        """
+        return list(cls.query_set_with_related())
+
     @classmethod
     def find_orm_accepted_by_filter(cls, filter_function):
         """
@@ -185,7 +209,7 @@ class ElementDao(models.Model):
           Ex: ImplementationDao.find_business_elem_with_key(...) may raise ImplementationDao.DoesNotExist
           with unmatching primary key
         """
-        db_obj = cls.objects.get(id=primary_key)
+        db_obj = cls.query_set_with_related().get(id=primary_key)
         if db_obj:
             return db_obj.build_business()
         else:
@@ -207,7 +231,7 @@ class ElementDao(models.Model):
 
             res = []
 
-            my_query_set = cls.objects.filter(name=name)
+            my_query_set = cls.query_set_with_related().filter(name=name)
 
             for db_obj in my_query_set:
                 res.append(db_obj.build_business())
@@ -218,6 +242,48 @@ class ElementDao(models.Model):
             raise IkatsException(msg="Failed: find business element_with_name=" + name, cause=err).with_traceback(
                 trace_back)
 
+    @classmethod
+    def find_cached_business_elem_with_key(cls, primary_key):
+        """
+        Variant of find_business_elem_with_key reading the business object from CatalogueCache:
+        the database is read only when the object is not cached.
+
+        !!! The returned object is shared: it must not be modified !!!
+
+        :param cls: subclass of ElementDao on which the finding request is applied
+        :type cls: subclass of ElementDao
+        :param primary_key: the primary key matching the instance of ElementDao
+        :type primary_key: int or str
+        :return: the business object having the primary key.
+        :rtype: cls
+        :raise cls.DoesNotExist: when the primary key did not match any record in database.
+        """
+        return CatalogueCache.get(dao_class=cls,
+                                  key_name='id',
+                                  key_value=str(primary_key),
+                                  loader=lambda: cls.find_business_elem_with_key(primary_key))
+
+    @classmethod
+    def find_cached_business_elem_with_name(cls, name):
+        """
+        Variant of find_business_elem_with_name reading the business objects from CatalogueCache:
+        the database is read only when the objects are not cached.
+
+        !!! The returned objects are shared: they must not be modified !!!
+
+        :param cls: subclass of ElementDao on which the finding request is applied
+        :type cls: subclass of ElementDao
+        :param name: name of searched resource(s)
+        :type name: str
+        :return: business objects found for given name
+        :rtype: list
+        """
+        # the cached list is copied: only its elements are shared
+        return list(CatalogueCache.get(dao_class=cls,
+                                       key_name='name',
+                                       key_value=name,
+                                       loader=lambda: cls.find_business_elem_with_name(name)))
+
     @classmethod
     def parse_dao_id(cls, element_id):
         """
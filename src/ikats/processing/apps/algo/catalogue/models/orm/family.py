@@ -15,6 +15,7 @@ limitations under the License.
 
 """
 
+from apps.algo.catalogue.models.business.cache import CatalogueCache
 from apps.algo.catalogue.models.business.family import FunctionalFamily
 from apps.algo.catalogue.models.orm.element import ElementDao
 from django.db import models as djmodels
@@ -61,6 +62,7 @@ class FunctionalFamilyDao(ElementDao):
 
         # save object BEFORE updating the many to many relationship !!!
         db_obj.save()
+        CatalogueCache.invalidate()
 
         # feed back to the business object: provide the created key
         return db_obj.build_business()
@@ -81,6 +83,7 @@ class FunctionalFamilyDao(ElementDao):
         if not business_obj.is_db_id_defined():
 
             orm_obj = cls.init_elem_orm(business_obj, save=True)
+            CatalogueCache.invalidate()
         else:
             # assumes that orm object exists in database ...
             orm_obj = cls.objects.get(id=business_obj.db_id)
@@ -124,6 +127,7 @@ class FunctionalFamilyDao(ElementDao):
         db_obj.id = business_obj.db_id
         # save object BEFORE updating the many to many relationship !!!
         db_obj.save()
+        CatalogueCache.invalidate()
 
         # feed back to the business object: provide the created key
         return db_obj.build_business()
@@ -146,3 +150,4 @@ class FunctionalFamilyDao(ElementDao):
         """
         db_obj = cls.objects.get(id=db_id)
         db_obj.delete()
+        CatalogueCache.invalidate()
@@ -16,10 +16,12 @@ limitations under the License.
 """
 import logging
 from django.db import models as djmodels
+from apps.algo.catalogue.models.business.cache import CatalogueCache
 from apps.algo.catalogue.models.business.implem import Implementation
 from apps.algo.catalogue.models.orm.algorithm import AlgorithmDao
 from apps.algo.catalogue.models.orm.element import ElementDao
 from apps.algo.catalogue.models.orm.profile import ProfileItemDao
+from ikats_processing.core.registry import CallableRegistry
 
 LOGGER = logging.getLogger(__name__)
 
@@ -94,6 +96,28 @@ class ImplementationDao(ElementDao):
 
         return biz_impl
 
+    @classmethod
+    def query_set_with_related(cls):
+        """
+        See ElementDao.query_set_with_related(): the algorithm and its family are joined,
+        the input and output profile items are prefetched
+        """
+        return cls.objects.select_related('algo__family').prefetch_related('input_desc_items', 'output_desc_items')
+
+    @classmethod
+    def __validate_paths(cls, db_obj):
+        """
+        Resolve, at catalogue loading time, the execution_plugin and the library_address
+        defined with the python syntax <module path>::<attribute>: the resolved objects are kept by
+        CallableRegistry for the executions. A path which cannot be resolved is logged, without error.
+
+        :param db_obj: the saved implementation
+        :type db_obj: ImplementationDao
+        """
+        for path in [db_obj.execution_plugin, db_obj.library_address]:
+            if path is not None and "::" in path:
+                CallableRegistry.validate(path)
+
     @classmethod
     def find_from_key(cls, primary_key):
         """
@@ -200,6 +224,9 @@ class ImplementationDao(ElementDao):
         # will save related ORMs: ProfileItemDao instances
         db_obj.save()
 
+        cls.__validate_paths(db_obj)
+        CatalogueCache.invalidate()
+
         # feed back to the business object: provide the created key
         return db_obj.build_business()
 
@@ -214,6 +241,13 @@ class ImplementationDao(ElementDao):
         """
         assert (business_obj.is_db_id_defined())
 
+        # the paths resolved before the update are removed from the cache
+        for previous_paths in ImplementationDao.objects.filter(id=business_obj.db_id).values_list(
+                'execution_plugin', 'library_address'):
+            for previous_path in previous_paths:
+                if previous_path is not None:
+                    CallableRegistry.invalidate(previous_path)
+
         db_obj = ImplementationDao()
         db_obj.id = business_obj.db_id
         # instead of ImplementationDao.objects.get(id=business_obj.db_id)
@@ -265,6 +299,9 @@ class ImplementationDao(ElementDao):
         # will save related ORMs: ProfileItemDao instances
         db_obj.save()
 
+        cls.__validate_paths(db_obj)
+        CatalogueCache.invalidate()
+
         # feed back to the business object: provide the created key(s)
         return db_obj.build_business()
 
@@ -341,5 +378,6 @@ class ImplementationDao(ElementDao):
                     LOGGER.info("- with id=%s", other_db_impl.id, )
 
         db_obj.delete()
+        CatalogueCache.invalidate()
 
         return msg
@@ -0,0 +1,82 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import unittest
+
+import mock
+from django.test.utils import override_settings
+
+from apps.algo.catalogue.models.business.cache import CatalogueCache
+
+
+class TestCatalogueCache(unittest.TestCase):
+    """
+    Tests the cache of the business resources of the catalogue
+    """
+
+    def setUp(self):
+        CatalogueCache.invalidate()
+
+    def test_get(self):
+        """
+        Tests that the resource is loaded once, and loaded again after invalidate()
+        """
+        loader = mock.Mock(return_value=["implem"])
+
+        self.assertEqual(CatalogueCache.get(unittest.TestCase, 'name', "my_implem", loader), ["implem"])
+        self.assertEqual(CatalogueCache.get(unittest.TestCase, 'name', "my_implem", loader), ["implem"])
+        self.assertEqual(loader.call_count, 1)
+
+        # other key
+        CatalogueCache.get(unittest.TestCase, 'id', "my_implem", loader)
+        self.assertEqual(loader.call_count, 2)
+
+        version = CatalogueCache.get_version()
+        CatalogueCache.invalidate()
+        self.assertEqual(CatalogueCache.get_version(), version + 1)
+        CatalogueCache.get(unittest.TestCase, 'name', "my_implem", loader)
+        self.assertEqual(loader.call_count, 3)
+
+    def test_not_cached(self):
+        """
+        Tests the results which are not cached: errors, empty results, results read during a write
+        """
+        loader = mock.Mock(side_effect=ValueError)
+        with self.assertRaises(ValueError):
+            CatalogueCache.get(unittest.TestCase, 'name', "my_implem", loader)
+
+        loader = mock.Mock(return_value=[])
+        CatalogueCache.get(unittest.TestCase, 'name', "my_implem", loader)
+        CatalogueCache.get(unittest.TestCase, 'name', "my_implem", loader)
+        self.assertEqual(loader.call_count, 2)
+
+        def concurrent_write():
+            CatalogueCache.invalidate()
+            return ["stale implem"]
+
+        CatalogueCache.get(unittest.TestCase, 'name', "my_implem", concurrent_write)
+        loader = mock.Mock(return_value=["implem"])
+        self.assertEqual(CatalogueCache.get(unittest.TestCase, 'name', "my_implem", loader), ["implem"])
+
+    @override_settings(IKATS_CATALOGUE_CACHE={'TIMEOUT': 0})
+    def test_disabled(self):
+        """
+        Tests the cache disabled by the setting
+        """
+        loader = mock.Mock(return_value=["implem"])
+        CatalogueCache.get(unittest.TestCase, 'name', "my_implem", loader)
+        CatalogueCache.get(unittest.TestCase, 'name', "my_implem", loader)
+        self.assertEqual(loader.call_count, 2)
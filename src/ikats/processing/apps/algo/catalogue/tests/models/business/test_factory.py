@@ -0,0 +1,83 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import logging
+import os
+import time
+import unittest
+
+from apps.algo.catalogue.models.business.factory import checktype_is_list_of_str, checktype_ts_selection, \
+    is_list_of_tsuid_fid_pairs
+
+LOGGER = logging.getLogger(__name__)
+
+
+class MyStr(str):
+    """
+    Subclass of str accepted by the type checks
+    """
+    pass
+
+
+class TestTypeChecking(unittest.TestCase):
+    """
+    Tests the type checking rules of the functional types
+    """
+
+    def test_list_of_str(self):
+        """
+        Tests the rule of tsuid_list
+        """
+        self.assertTrue(checktype_is_list_of_str([]))
+        self.assertTrue(checktype_is_list_of_str(["TS1", MyStr("TS2")]))
+        self.assertFalse(checktype_is_list_of_str(["TS1", 2]))
+        self.assertFalse(checktype_is_list_of_str(("TS1", "TS2")))
+        self.assertFalse(checktype_is_list_of_str("TS1"))
+
+    def test_ts_selection(self):
+        """
+        Tests the rule of ts_selection: dataset name, list of tsuids, or list of tsuid/funcId pairs
+        """
+        self.assertTrue(checktype_ts_selection("dataset"))
+        self.assertTrue(checktype_ts_selection(["TS1", "TS2"]))
+        self.assertTrue(checktype_ts_selection([{'tsuid': "TS1", 'funcId': "F1"}]))
+        self.assertTrue(is_list_of_tsuid_fid_pairs([{'tsuid': "TS1", 'funcId': "F1", 'other': 1}]))
+
+        self.assertFalse(checktype_ts_selection([{'tsuid': "TS1"}]))
+        self.assertFalse(checktype_ts_selection([{'tsuid': "TS1", 'funcId': "F1"}, "TS2"]))
+        self.assertFalse(checktype_ts_selection(None))
+
+    @unittest.skipIf(int(os.environ.get('SKIP_LONG_TEST', 0)), "Long test skipped (SKIP_LONG_TEST)")
+    def test_benchmark_tsuid_list(self):
+        """
+        Measures the checks of a 1M elements tsuid_list
+        """
+        nb_tsuids = 1000000
+        tsuids = ["TS%07d" % x for x in range(nb_tsuids)]
+        pairs = [{'tsuid': x, 'funcId': x} for x in tsuids]
+
+        for label, value in [("tsuids", tsuids), ("tsuid/funcId pairs", pairs)]:
+            start = time.time()
+            self.assertTrue(checktype_ts_selection(value))
+            duration = time.time() - start
+            LOGGER.info("checktype_ts_selection (%s %s): %.3fs", nb_tsuids, label, duration)
+
+        # short-circuit on the first item
+        tsuids[0] = None
+        start = time.time()
+        self.assertFalse(checktype_is_list_of_str(tsuids))
+        duration = time.time() - start
+        LOGGER.info("checktype_is_list_of_str (%s tsuids, first rejected): %.3fs", nb_tsuids, duration)
@@ -316,3 +316,25 @@ class TestImplementationDaoCRUD(DjTestCase, CommonsUnittest):
 
         self.assertTrue(impl_count_step2 < impl_count_step1)
         self.assertTrue(prof_count_step2 < prof_count_step1)
+
+    def test_seq7_find_cached(self):
+        created_cosinus = ImplementationDao.create(TestImplementationDaoCRUD.my_cosinus)
+
+        # the second reading is served by the cache, without database query
+        found = ImplementationDao.find_cached_business_elem_with_name(created_cosinus.name)
+        ImplementationDao.find_cached_business_elem_with_key(created_cosinus.db_id)
+        with self.assertNumQueries(0):
+            self.assertIs(ImplementationDao.find_cached_business_elem_with_name(created_cosinus.name)[0],
+                          found[0])
+            self.assertIs(ImplementationDao.find_cached_business_elem_with_key(str(created_cosinus.db_id)),
+                          ImplementationDao.find_cached_business_elem_with_key(created_cosinus.db_id))
+
+        # the update invalidates the cache
+        created_cosinus.label = "updated cosinus"
+        ImplementationDao.update(created_cosinus)
+        self.assertEqual(ImplementationDao.find_cached_business_elem_with_name(created_cosinus.name)[0].label,
+                         "updated cosinus")
+
+        # the delete invalidates the cache
+        ImplementationDao.delete_resource(created_cosinus)
+        self.assertEqual(ImplementationDao.find_cached_business_elem_with_name(created_cosinus.name), [])
@@ -16,10 +16,17 @@ limitations under the License.
 """
 import json
 
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 
+from apps.algo.catalogue.models.business.algorithm import Algorithm
+from apps.algo.catalogue.models.business.cache import CatalogueCache
+from apps.algo.catalogue.models.business.family import FunctionalFamily
 from apps.algo.catalogue.models.business.implem import Implementation
 from apps.algo.catalogue.models.business.profile import ProfileItem, Argument
+from apps.algo.catalogue.models.orm.algorithm import AlgorithmDao
+from apps.algo.catalogue.models.orm.family import FunctionalFamilyDao
 from apps.algo.catalogue.models.orm.implem import ImplementationDao
 from apps.algo.catalogue.models.ws.implem import ImplementationWs
 from apps.algo.catalogue.tests.tu_commons import CommonsCatalogueTests
@@ -54,6 +61,10 @@ class TestWsCatalogue(TestCase, CommonsCatalogueTests):
         super(TestWsCatalogue, cls).tearDownClass()
         # It is important to call superclass
 
+    def setUp(self):
+        # the cache is not cleared by the rollback of the previous test
+        CatalogueCache.invalidate()
+
     def test_to_dict(self):
         """
         Tests the json-friendly python dict produced by to_dict() method on ImplementationWs instance:
@@ -126,3 +137,82 @@ class TestWsCatalogue(TestCase, CommonsCatalogueTests):
         loaded_bizz_impl = loaded_ws_impl.model_business
 
         self.assertTrue(loaded_bizz_impl == bizz_impl)
+
+    def test_list_queries(self):
+        """
+        Tests that the number of database queries of the list services does not depend on the catalogue size
+        """
+        client = Client()
+
+        def create_implementations(start, stop):
+            for index in range(start, stop):
+                family = FunctionalFamily("TU_WS_Family_%s" % index, "family")
+                algo = Algorithm("TU_WS_Algo_%s" % index, "algo", family=family)
+                implem = Implementation("TU_WS_Implem_%s" % index, "implementation",
+                                        "apps.algo.execute.models.business.python_local_exec_engine::"
+                                        "PythonLocalExecEngine",
+                                        "math::cos",
+                                        [Argument("angle", "angle (rad)", ProfileItem.DIR.INPUT, 0)],
+                                        [Argument("result", "cos(angle)", ProfileItem.DIR.OUTPUT, 0)])
+                implem.algo = algo
+                ImplementationDao.create(implem)
+
+        def count_queries(url):
+            with CaptureQueriesContext(connection) as context:
+                http_response = client.get(url)
+            self.assertEqual(http_response.status_code, 200)
+            return len(context.captured_queries), len(json.loads(http_response.content.decode('utf-8')))
+
+        urls = ['/ikats/algo/catalogue/implementations?info_level=2',
+                '/ikats/algo/catalogue/algorithms?info_level=2',
+                '/ikats/algo/catalogue/families?info_level=2']
+
+        create_implementations(0, 2)
+        counts = [count_queries(url) for url in urls]
+
+        create_implementations(2, 10)
+        for url, (queries, size) in zip(urls, counts):
+            new_queries, new_size = count_queries(url)
+            self.assertEqual(new_size, size + 8)
+            self.assertEqual(new_queries, queries, "Number of queries depends on the catalogue size: %s" % url)
+
+    def test_list_etag(self):
+        """
+        Tests the conditional GET on the list services: status 304 while the catalogue is unchanged
+        """
+        client = Client()
+
+        # the creation of an algorithm also creates its new family (see AlgorithmDao.get_sync_orm)
+        cases = [('/ikats/algo/catalogue/implementations',
+                  lambda: ImplementationDao.create(TestWsCatalogue.my_cosinus), TestWsCatalogue.my_cosinus.name),
+                 ('/ikats/algo/catalogue/export/implementations',
+                  lambda: ImplementationDao.create(TestWsCatalogue.my_cosinus), TestWsCatalogue.my_cosinus.name),
+                 ('/ikats/algo/catalogue/families',
+                  lambda: FunctionalFamilyDao.create(FunctionalFamily("TU_WS_Etag_Family", "family")),
+                  "TU_WS_Etag_Family"),
+                 ('/ikats/algo/catalogue/algorithms',
+                  lambda: AlgorithmDao.create(Algorithm("TU_WS_Etag_Algo", "algo")),
+                  "TU_WS_Etag_Algo"),
+                 ('/ikats/algo/catalogue/families',
+                  lambda: AlgorithmDao.create(Algorithm("TU_WS_Etag_Algo_2", "algo",
+                                                        family=FunctionalFamily("TU_WS_Etag_Family_2", "family"))),
+                  "TU_WS_Etag_Family_2")]
+
+        for url, write, created_name in cases:
+            http_response = client.get(url)
+            self.assertEqual(http_response.status_code, 200)
+            etag = http_response['ETag']
+
+            http_response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(http_response.status_code, 304)
+            self.assertEqual(http_response['ETag'], etag)
+            self.assertEqual(http_response.content, b'')
+
+            # the write on the catalogue changes the content
+            created = write()
+            http_response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(http_response.status_code, 200, url)
+            self.assertNotEqual(http_response['ETag'], etag)
+            self.assertIn(created_name, http_response.content.decode('utf-8'))
+            if isinstance(created, Implementation):
+                ImplementationDao.delete_resource(created)
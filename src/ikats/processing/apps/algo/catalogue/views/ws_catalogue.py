@@ -21,6 +21,7 @@ from django.core import serializers
 from django.http.response import JsonResponse
 
 from apps.algo.catalogue.models.business.algorithm import Algorithm
+from apps.algo.catalogue.models.business.cache import CatalogueCache
 from apps.algo.catalogue.models.business.family import FunctionalFamily
 from apps.algo.catalogue.models.business.implem import Implementation
 from apps.algo.catalogue.models.orm.algorithm import AlgorithmDao
@@ -37,6 +38,27 @@ LOGGER = logging.getLogger(__name__)
 
 
 def export_all_implementations(http_request):
+    """
+    Export the whole catalogue: families, algorithms, implementations and profile items.
+
+    The encoded export is computed once, and kept until the next write on the catalogue
+    (see CatalogueCache). The conditional GET is supported: header ETag in the response,
+    status 304 for a request with header If-None-Match matching the current export.
+
+    :param http_request: request http
+    :type http_request: django.http.HttpRequest
+    :return: json export
+    :rtype: HttpResponse
+    """
+    response_builder = DjangoHttpResponseFactory()
+    etag, content = CatalogueCache.get(dao_class=ImplementationDao,
+                                       key_name='json_export',
+                                       key_value=None,
+                                       loader=__encode_export)
+    return response_builder.get_json_response_with_etag(http_request, etag, content)
+
+
+def __encode_export():
     data_family = serializers.serialize("json", FunctionalFamilyDao.objects.all())
     data_algo = serializers.serialize("json", AlgorithmDao.objects.all())
     data_impl = serializers.serialize("json", ImplementationDao.objects.all())
@@ -47,7 +69,7 @@ def export_all_implementations(http_request):
             'implementations': json.loads(data_impl),
             'profile_items': json.loads(data_profileitem)}
 
-    return JsonResponse(data, safe=False)
+    return DjangoHttpResponseFactory.encode_json_with_etag(data)
 
 
 def get_family_list(http_request):
@@ -288,11 +310,18 @@ def __get_json_list(http_request, dao_class, business_class, webservice_class, d
                     return response_builder.get_json_response_bad_request(
                         ikats_error="Bad value of query param named 'info_level' in %s" % method_name,
                         exception=err_query)
-            serializable_list = [webservice_class(x.build_business()).to_dict(
-                level=info_level) for x in dao_class.find_all_orm()]
-
-            # save = False because serializable_list is not a dict
-            return JsonResponse(serializable_list, safe=False)
+            def encode_list():
+                # the related elements are loaded with a constant number of queries
+                serializable_list = [webservice_class(x.build_business()).to_dict(
+                    level=info_level) for x in dao_class.find_all_orm_with_related()]
+                return DjangoHttpResponseFactory.encode_json_with_etag(serializable_list)
+
+            # the encoded list is computed once by info_level, until the next write on the catalogue
+            etag, content = CatalogueCache.get(dao_class=dao_class,
+                                               key_name='json_list',
+                                               key_value=info_level,
+                                               loader=encode_list)
+            return response_builder.get_json_response_with_etag(http_request, etag, content)
         else:
             return response_builder.get_json_response_bad_request(
                 ikats_error="Bad http method: service %s expects GET" % method_name)
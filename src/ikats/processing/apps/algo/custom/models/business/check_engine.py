@@ -16,6 +16,10 @@ limitations under the License.
 """
 import json
 import logging
+import numbers
+import threading
+
+import numpy as np
 
 from apps.algo.catalogue.models.business.factory import FactoryCatalogue
 from apps.algo.catalogue.models.business.implem import Implementation
@@ -172,6 +176,197 @@ class CheckError(IkatsException):
         self._msg = value
 
 
+class DomainValidator(object):
+    """
+    Validator compiled from a domain_of_values: the JSON domain is parsed once, then the validator is cached
+    by domain (see get()).
+
+    Supported domains:
+      - JSON list: enumeration of the accepted values, checked with a hash set
+      - JSON object with keys "min" and/or "max": numeric interval, bounds included
+      - any other domain (ex: "*"): every value is accepted
+
+    A list or a numpy array is accepted when each of its elements is accepted: the numpy arrays, and the
+    numeric lists checked against an interval, are checked in a vectorized way.
+    """
+
+    __cache = {}
+    __lock = threading.Lock()
+
+    def __init__(self, domain_of_values):
+        """
+        Constructor: compiles the domain
+        :param domain_of_values: the JSON domain
+        :type domain_of_values: str
+        """
+        self.__enumeration = None
+        self.__unhashable = []
+        self.__numeric_enumeration = None
+        self.__min = None
+        self.__max = None
+        self.__is_interval = False
+
+        try:
+            domain_obj = json.loads(domain_of_values)
+        except (TypeError, ValueError):
+            LOGGER.debug("domain_of_values=%s is not JSON: no check", domain_of_values)
+            domain_obj = None
+
+        if type(domain_obj) is list:
+            self.__enumeration = set()
+            for value in domain_obj:
+                try:
+                    self.__enumeration.add(value)
+                except TypeError:
+                    self.__unhashable.append(value)
+            numbers_only = [x for x in domain_obj if self.__is_number(x)]
+            if len(numbers_only) == len(domain_obj):
+                self.__numeric_enumeration = np.array(numbers_only, dtype=np.float64)
+
+        elif type(domain_obj) is dict and ('min' in domain_obj or 'max' in domain_obj):
+            self.__is_interval = True
+            self.__min = domain_obj.get('min', None)
+            self.__max = domain_obj.get('max', None)
+
+    @classmethod
+    def get(cls, domain_of_values):
+        """
+        Get the validator of the domain, compiled on the first call
+
+        :param domain_of_values: the JSON domain
+        :type domain_of_values: str
+        :return: the validator
+        :rtype: DomainValidator
+        """
+        try:
+            return cls.__cache[domain_of_values]
+        except KeyError:
+            pass
+
+        with cls.__lock:
+            if domain_of_values not in cls.__cache:
+                cls.__cache[domain_of_values] = DomainValidator(domain_of_values)
+            return cls.__cache[domain_of_values]
+
+    @staticmethod
+    def __is_number(value):
+        return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+    def __contains(self, value):
+        """
+        Enumeration: checks one value
+        """
+        try:
+            return value in self.__enumeration
+        except TypeError:
+            # unhashable value
+            return value in self.__unhashable
+
+    def __in_interval(self, value):
+        """
+        Interval: checks one value
+        """
+        if not self.__is_number(value):
+            return False
+        return (self.__min is None or value >= self.__min) and (self.__max is None or value <= self.__max)
+
+    def __is_valid_array(self, values):
+        """
+        Checks a numpy array of numbers, in a vectorized way
+        """
+        if self.__is_interval:
+            valid = np.ones(values.shape, dtype=bool)
+            if self.__min is not None:
+                valid &= values >= self.__min
+            if self.__max is not None:
+                valid &= values <= self.__max
+            return bool(valid.all())
+
+        # enumeration: np.in1d rather than np.isin, available with numpy < 1.13
+        return bool(np.in1d(values.ravel(), self.__numeric_enumeration).all())
+
+    def is_valid(self, checked_value):
+        """
+        Checks the value
+
+        :param checked_value: the value: a list or a numpy array is checked element-wise
+        :type checked_value: object
+        :return: True if the value belongs to the domain
+        :rtype: bool
+        """
+        if self.__enumeration is None and not self.__is_interval:
+            return True
+
+        if isinstance(checked_value, np.ndarray):
+            if checked_value.dtype.kind in 'iuf' and (self.__is_interval or self.__numeric_enumeration is not None):
+                return self.__is_valid_array(checked_value)
+            checked_value = checked_value.ravel().tolist()
+
+        elif type(checked_value) is list and self.__is_interval and \
+                all(self.__is_number(x) for x in checked_value):
+            return self.__is_valid_array(np.asarray(checked_value, dtype=np.float64))
+
+        check = self.__in_interval if self.__is_interval else self.__contains
+        if type(checked_value) is list:
+            return all(check(value) for value in checked_value)
+        return check(checked_value)
+
+
+class CheckCache(object):
+    """
+    Results of the checks made during one execution: each value is checked at most once by each rule,
+    even when it is checked by several CheckEngine instances (ex: by execalgo.run, then by the engine).
+
+    The values are identified by their id(): the cache keeps a reference on each checked value, so that
+    its id cannot be reused by another value during the execution.
+
+    Note: the cache is not shared with other processes: it is empty once unpickled.
+    """
+
+    def __init__(self):
+        # (rule, id(value)) => (value, result)
+        self.__results = {}
+
+    def get(self, rule, value):
+        """
+        Get the result of the rule previously applied on the value
+
+        :param rule: identifier of the rule: any hashable object
+        :type rule: tuple
+        :param value: the checked value
+        :type value: object
+        :return: the result, or None when the rule has not been applied on the value
+        :rtype: bool or None
+        """
+        entry = self.__results.get((rule, id(value)), None)
+        if entry is not None and entry[0] is value:
+            return entry[1]
+        return None
+
+    def put(self, rule, value, result):
+        """
+        Record the result of the rule applied on the value
+
+        :param rule: identifier of the rule: any hashable object
+        :type rule: tuple
+        :param value: the checked value
+        :type value: object
+        :param result: the result of the check
+        :type result: bool
+        """
+        self.__results[(rule, id(value))] = (value, result)
+
+    def __len__(self):
+        return len(self.__results)
+
+    def __getstate__(self):
+        # the ids are not valid in another process
+        return {}
+
+    def __setstate__(self, state):
+        self.__results = {}
+
+
 class CheckEngine(object):
     """
     The Checkengine is computing the checking rules applicable to types and values of argument/parameters
@@ -212,7 +407,21 @@ class CheckEngine(object):
         """
         cls._checking_rules = new_rules
 
-    def __init__(self, checked_resource, checked_value_context, check_status=None):
+    def __init__(self, checked_resource, checked_value_context, check_status=None, check_cache=None):
+        """
+        Constructor
+        :param checked_resource: the checked resource
+        :type checked_resource: CustomizedAlgo or Implementation
+        :param checked_value_context: information about the context of the checks
+        :type checked_value_context: str
+        :param check_status: optional, default None: the status completed by the checks, created when None
+        :type check_status: CheckStatus or None
+        :param check_cache: optional, default None: the results of the checks already made during the same
+          execution, created when None: see CheckCache
+        :type check_cache: CheckCache or None
+        """
+        self._check_cache = check_cache if check_cache is not None else CheckCache()
+
         if check_status is not None:
             self._check_status = check_status
         else:
@@ -239,6 +448,15 @@ class CheckEngine(object):
         """
         return self._check_status
 
+    def get_check_cache(self):
+        """
+        Get the results of the checks: can be passed to the CheckEngine checking the same values later
+        in the execution
+        :return: the cache
+        :rtype: CheckCache
+        """
+        return self._check_cache
+
     def has_errors(self):
         """
         Return True if there is errors, False otherwise
@@ -265,8 +483,12 @@ class CheckEngine(object):
             if my_checked_type is not None:
                 my_eval = True
                 if my_checked_type in CheckEngine.get_checking_rules():
-                    my_func = CheckEngine.get_checking_rules()[my_checked_type]
-                    my_eval = my_func(checked_value)
+                    my_rule = ("type", my_checked_type)
+                    my_eval = self._check_cache.get(my_rule, checked_value)
+                    if my_eval is None:
+                        my_func = CheckEngine.get_checking_rules()[my_checked_type]
+                        my_eval = bool(my_func(checked_value))
+                        self._check_cache.put(my_rule, checked_value, my_eval)
 
                 if not my_eval:
                     target_info = "{} {}".format(type(profile_item).__name__, profile_item.name)
@@ -297,18 +519,12 @@ class CheckEngine(object):
         if my_checked_domain is not None:
 
             try:
-                my_domain_obj = json.loads(my_checked_domain)
-                if type(my_domain_obj) is list:
-                    if type(checked_value) is list:
-                        my_eval = True
-                        for value in checked_value:
-                            my_eval = my_eval and (value in my_domain_obj)
-                    else:
-                        my_eval = (checked_value in my_domain_obj)
-                else:
-                    # try to execute a function check_<function>( name, value)
-                    # provided with the algo <function>
-                    my_eval = True
+                # the domain is compiled once: see DomainValidator
+                my_rule = ("domain", my_checked_domain)
+                my_eval = self._check_cache.get(my_rule, checked_value)
+                if my_eval is None:
+                    my_eval = DomainValidator.get(my_checked_domain).is_valid(checked_value)
+                    self._check_cache.put(my_rule, checked_value, my_eval)
 
                 if not my_eval:
                     self._check_status.add_error(check_type="domain",
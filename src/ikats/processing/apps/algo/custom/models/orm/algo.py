@@ -19,6 +19,7 @@ import json
 
 from django.db import models
 
+from apps.algo.catalogue.models.business.cache import CatalogueCache
 from apps.algo.catalogue.models.orm.element import ElementDao
 from apps.algo.catalogue.models.orm.implem import ImplementationDao
 from apps.algo.catalogue.models.orm.profile import ProfileItemDao
@@ -101,6 +102,17 @@ class CustomizedAlgoDao(ElementDao):
 
         return business_obj
 
+    @classmethod
+    def query_set_with_related(cls):
+        """
+        See ElementDao.query_set_with_related(): the implementation with its algorithm and family are joined,
+        the profile items of the implementation and the customized parameters are prefetched
+        """
+        return cls.objects.select_related('ref_implementation__algo__family').prefetch_related(
+            'ref_implementation__input_desc_items',
+            'ref_implementation__output_desc_items',
+            'custom_parameters_set__ref_profile_item')
+
     def __create_linked_custom_params(self, specified_business_custo_algo, returned_business_obj, save_now=True):
         """
         Evaluates and creates the list of CustomizedParameters specified by specified_business_custo_algo:
@@ -241,6 +253,7 @@ class CustomizedAlgoDao(ElementDao):
         returned_business_obj = orm_obj.__create_linked_custom_params(specified_business_custo_algo=business_custo_algo,
                                                                       returned_business_obj=returned_business_obj,
                                                                       save_now=True)
+        CatalogueCache.invalidate()
 
         return returned_business_obj
 
@@ -303,6 +316,7 @@ class CustomizedAlgoDao(ElementDao):
         returned_business_obj = orm_obj.__create_linked_custom_params(specified_business_custo_algo=business_custo_algo,
                                                                       returned_business_obj=returned_business_obj,
                                                                       save_now=True)
+        CatalogueCache.invalidate()
 
         return returned_business_obj
 
@@ -339,6 +353,7 @@ class CustomizedAlgoDao(ElementDao):
                 cust_param.delete()
 
             orm_obj.delete()
+            CatalogueCache.invalidate()
 
         else:
             my_mess = "{} Undefined db_id: the delete is impossible and is cancelled for {}"
@@ -383,7 +398,7 @@ class CustomizedAlgoDao(ElementDao):
         :rtype: list of CustomizedAlgo
         """
         # See doc: https://docs.djangoproject.com/fr/1.8/topics/db/queries/#lookups-that-span-relationships
-        orm_query_set = cls.objects.filter(ref_implementation__id=primary_key)
+        orm_query_set = cls.query_set_with_related().filter(ref_implementation__id=primary_key)
         res = []
         for orm_object_found in orm_query_set:
             res.append(orm_object_found.build_business())
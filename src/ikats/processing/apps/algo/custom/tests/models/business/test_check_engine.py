@@ -0,0 +1,144 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import json
+import pickle
+import time
+from unittest import TestCase, mock
+
+import numpy as np
+
+from apps.algo.catalogue.models.business.implem import Implementation
+from apps.algo.catalogue.models.business.profile import Parameter, ProfileItem
+from apps.algo.catalogue.models.business.factory import FactoryCatalogue
+from apps.algo.custom.models.business.check_engine import CheckEngine, DomainValidator
+
+
+class TestDomainValidator(TestCase):
+    """
+    Tests the domain_of_values checks
+    """
+
+    def test_enumeration(self):
+        """
+        Tests the enumerations: values, lists and numpy arrays
+        """
+        validator = DomainValidator.get("[0, 1.1, 2 ]")
+        self.assertIs(validator, DomainValidator.get("[0, 1.1, 2 ]"))
+
+        self.assertTrue(validator.is_valid(1.1))
+        self.assertFalse(validator.is_valid(3))
+        self.assertTrue(validator.is_valid([0, 2, 2]))
+        self.assertFalse(validator.is_valid([0, 3]))
+        self.assertTrue(validator.is_valid(np.array([0, 1.1, 2])))
+        self.assertFalse(validator.is_valid(np.array([[0, 1], [2, 3]])))
+
+        validator = DomainValidator.get('["a", "b", [1, 2]]')
+        self.assertTrue(validator.is_valid("a"))
+        self.assertTrue(validator.is_valid(["b", [1, 2]]))
+        self.assertFalse(validator.is_valid({"a": 1}))
+        self.assertTrue(validator.is_valid(np.array(["a", "b"])))
+
+    def test_interval(self):
+        """
+        Tests the numeric intervals
+        """
+        validator = DomainValidator.get('{"min": 0, "max": 10}')
+        self.assertTrue(validator.is_valid(0))
+        self.assertTrue(validator.is_valid(10.0))
+        self.assertFalse(validator.is_valid(-1))
+        self.assertFalse(validator.is_valid("5"))
+        self.assertTrue(validator.is_valid([1, 2.5, 10]))
+        self.assertFalse(validator.is_valid([1, 11]))
+        self.assertTrue(validator.is_valid(np.arange(11)))
+        self.assertFalse(validator.is_valid(np.array([1.0, np.nan])))
+
+        self.assertTrue(DomainValidator.get('{"min": 0}').is_valid(1e30))
+        self.assertFalse(DomainValidator.get('{"max": 0}').is_valid(1))
+
+    def test_no_check(self):
+        """
+        Tests the domains without check
+        """
+        for domain in ["*", '{"other": 1}', '"text"']:
+            self.assertTrue(DomainValidator.get(domain).is_valid("any value"))
+
+    def test_large_list(self):
+        """
+        Tests that the check of a large list is fast
+        """
+        tsuids = ["TS%06d" % index for index in range(100000)]
+        domain = json.dumps(tsuids)
+
+        validator = DomainValidator.get(domain)
+        start = time.time()
+        self.assertTrue(validator.is_valid(tsuids))
+        self.assertFalse(validator.is_valid(tsuids + ["unknown"]))
+        self.assertLess(time.time() - start, 1.0)
+
+
+class TestCheckEngine(TestCase):
+    """
+    Tests the domain checks of CheckEngine
+    """
+
+    def test_check_domain(self):
+        """
+        Tests that the values outside the domain are reported in the status
+        """
+        param = Parameter(name="factor", description="factor", direction=ProfileItem.DIR.INPUT, order_index=0,
+                          data_format="number", domain_of_values='{"min": 0, "max": 1}')
+        implementation = Implementation(name="TU check", description="TU check",
+                                        execution_plugin="TU fake", library_address="math::cos",
+                                        input_profile=[param], output_profile=[])
+
+        engine = CheckEngine(checked_resource=implementation, checked_value_context="TU")
+        engine.check_domain(param, 0.5)
+        self.assertFalse(engine.has_errors())
+
+        engine.check_domain(param, np.array([0.5, 2]))
+        self.assertTrue(engine.has_errors())
+        self.assertEqual(engine.get_check_status().to_dict()['errors'][0]['check_rule'], "domain")
+
+    def test_check_cache(self):
+        """
+        Tests that a value is checked once by the engines sharing the same CheckCache
+        """
+        param = Parameter(name="tsuids", description="tsuids", direction=ProfileItem.DIR.INPUT, order_index=0,
+                          data_format=FactoryCatalogue.TSUID_LIST_ARGTYPE, domain_of_values="*")
+        implementation = Implementation(name="TU check", description="TU check",
+                                        execution_plugin="TU fake", library_address="math::cos",
+                                        input_profile=[param], output_profile=[])
+        rule = mock.Mock(return_value=False)
+        rules = {FactoryCatalogue.TSUID_LIST_ARGTYPE: rule}
+        tsuids = ["TS1", "TS2"]
+
+        with mock.patch.object(CheckEngine, 'get_checking_rules', return_value=rules):
+            first_engine = CheckEngine(checked_resource=implementation, checked_value_context="TU")
+            first_engine.check_type(param, tsuids)
+            second_engine = CheckEngine(checked_resource=implementation, checked_value_context="TU",
+                                        check_cache=first_engine.get_check_cache())
+            second_engine.check_type(param, tsuids)
+
+            # equal value, but another object
+            second_engine.check_type(param, list(tsuids))
+
+        self.assertEqual(rule.call_count, 2)
+        self.assertTrue(first_engine.has_errors())
+        self.assertTrue(second_engine.has_errors())
+
+        # the ids are meaningless in another process
+        self.assertEqual(len(pickle.loads(pickle.dumps(first_engine.get_check_cache()))), 0)
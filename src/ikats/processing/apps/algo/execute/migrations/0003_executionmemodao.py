@@ -0,0 +1,45 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('execute', '0002_executablealgodao_state_queued'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExecutionMemoDao',
+            fields=[
+                ('id', models.AutoField(serialize=False, auto_created=True, primary_key=True, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True, help_text='hash of the executed definition')),
+                ('creation_date', models.DecimalField(
+                    max_digits=18,
+                    help_text='Creation EPOCH date of the memoized execution: decimal in secs',
+                    decimal_places=8)),
+                ('last_use_date', models.DecimalField(
+                    max_digits=18,
+                    help_text='Last EPOCH date of reuse: decimal in secs',
+                    decimal_places=8)),
+                ('exec_algo', models.ForeignKey(related_name='memo_set', to='execute.ExecutableAlgoDao')),
+            ],
+        ),
+    ]
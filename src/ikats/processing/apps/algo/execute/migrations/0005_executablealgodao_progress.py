@@ -0,0 +1,36 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('execute', '0004_executablealgodao_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='executablealgodao',
+            name='progress',
+            field=models.TextField(
+                null=True,
+                help_text='JSON last progress event reported by the execution (see ProgressChannel)'),
+        ),
+    ]
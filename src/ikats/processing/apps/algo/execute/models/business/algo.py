@@ -19,6 +19,7 @@ import decimal
 from apps.algo.custom.models.business.algo import CustomizedAlgo
 from apps.algo.execute.models.business.data_receiver import AbstractDataReceiver
 from apps.algo.execute.models.business.data_source import AbstractDataSource, SimpleValueDataSource
+from apps.algo.execute.models.business.progress import ProgressRegistry
 from ikats.core.library.status import State as EnumState
 from ikats_processing.core.time import time_utils
 
@@ -82,6 +83,12 @@ class ExecutableAlgo(object):
         self.__start_execution_date = None
         self.__end_execution_date = None
 
+        # optional results of the checks already made on the input values: see CheckCache
+        self.__check_cache = None
+
+        # optional profile of the execution: see ExecProfile
+        self.__profile = None
+
     def get_state(self):
         return self.__state
 
@@ -232,6 +239,29 @@ class ExecutableAlgo(object):
             assert (isinstance(custom_algo, CustomizedAlgo))
         self.__custom_algo = custom_algo
 
+    def get_check_cache(self):
+        return self.__check_cache
+
+    def set_check_cache(self, check_cache):
+        """
+        Defining ExecutableAlgo before Runtime: the results of the checks already made on the input values,
+        reused by the engine (see apps.algo.custom.models.business.check_engine.CheckCache)
+        :param check_cache: the cache, or None
+        :type check_cache: CheckCache or None
+        """
+        self.__check_cache = check_cache
+
+    def get_profile(self):
+        return self.__profile
+
+    def set_profile(self, profile):
+        """
+        Sets the profile of the execution: timings of the phases and used resources
+        :param profile: the profile, or None
+        :type profile: apps.algo.execute.models.business.exec_profile.ExecProfile or None
+        """
+        self.__profile = profile
+
     def get_execution_plugin(self):
         return self.__custom_algo.implementation.execution_plugin
 
@@ -382,18 +412,21 @@ class ExecutableAlgo(object):
     def produce_value(self, arg_name, value, progress_status=None):
         """
         At runtime: send a new couple (value, status) to the data receiver of one specific output argument
-        TODO [story barre progression] finaliser usage de status
         :param arg_name: name specifying one argument from   self.custom_algo.implementation
         :type arg_name: str
         :param value: produced value
         :type value: object
-        :param progress_status: optional information about running status / progress information
-        :type progress_status: object  TODO [story barre progression]  classe specifique a definir
-            (differente de ExecStatus ...)
+        :param progress_status: optional information about running status / progress information:
+            see ProgressRegistry.publish_status()
+        :type progress_status: number, dict or object
         """
         my_receiver = self.get_data_receiver(arg_name)
         my_receiver.send_value(value, progress_status)
 
+        # the progress is also published for the clients, when the execution is running: see ProgressRegistry
+        if progress_status is not None:
+            ProgressRegistry.publish_status(self.__process_id, progress_status)
+
     # custom_algo: instance of CustomizedAlgo set by constructor
     custom_algo = property(get_custom_algo, set_custom_algo, None, "")
 
@@ -409,3 +442,5 @@ class ExecutableAlgo(object):
     start_execution_date = property(get_start_execution_date, set_start_execution_date, None, "")
     end_execution_date = property(get_end_execution_date, set_end_execution_date, None, "")
     state = property(get_state, set_state, None, "")
+    check_cache = property(get_check_cache, set_check_cache, None, "")
+    profile = property(get_profile, set_profile, None, "")
@@ -0,0 +1,190 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import logging
+import os
+import threading
+import time
+
+from ikats.core.library.cancellation import CancelToken
+
+LOGGER = logging.getLogger(__name__)
+
+# Delay in seconds after which a token cancelled before the start of its execution is forgotten:
+# see CancelRegistry.cancel()
+PENDING_RETENTION = 3600
+
+# Minimum interval in seconds between two reads of the cancel request saved in database, and between two
+# measures of the memory used by an in-thread execution: see CancelToken.add_poll()
+CANCEL_POLL_INTERVAL = 2.0
+
+
+def get_budget_config():
+    """
+    Get the django setting IKATS_EXEC_BUDGET
+    :return: the budgets of the executions: keys TIMEOUT, MEMORY_LIMIT, IMPLEM_BUDGETS
+    :rtype: dict
+    """
+    from django.conf import settings
+    return getattr(settings, 'IKATS_EXEC_BUDGET', {})
+
+
+def get_exec_budget(implem_name):
+    """
+    Get the budget of one execution of the implementation: the default budget of IKATS_EXEC_BUDGET,
+    overridden by the one of IKATS_EXEC_BUDGET['IMPLEM_BUDGETS'][implem_name]
+
+    :param implem_name: name of the executed implementation
+    :type implem_name: str
+    :return: dict with keys TIMEOUT (wall-clock duration in seconds) and MEMORY_LIMIT (in bytes: see MemoryWatch),
+      valued None when unlimited
+    :rtype: dict
+    """
+    config = get_budget_config()
+    budget = {'TIMEOUT': config.get('TIMEOUT', None),
+              'MEMORY_LIMIT': config.get('MEMORY_LIMIT', None)}
+    budget.update(config.get('IMPLEM_BUDGETS', {}).get(implem_name, {}))
+    return budget
+
+
+def get_rss():
+    """
+    Get the resident memory of the current process, read from /proc/self/statm
+
+    :return: the resident set size in bytes, or None when it cannot be read (ex: not on linux)
+    :rtype: int or None
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryWatch(object):
+    """
+    Poll of the memory budget of an execution running in a thread of the server process (see CancelToken.add_poll()):
+    the growth of the resident memory of the process since the start of the execution is compared to the limit.
+
+    Note: the memory is not allocated per thread: the growth includes the allocations of the other executions
+    running in the process meanwhile.
+    """
+
+    def __init__(self, memory_limit):
+        """
+        Constructor: the resident memory of the process is measured at once
+        :param memory_limit: the budget in bytes
+        :type memory_limit: int
+        """
+        self.__memory_limit = memory_limit
+        self.__initial_rss = get_rss()
+
+    def __call__(self):
+        """
+        :return: the reason of the cancellation when the budget is exceeded, or None
+        :rtype: str or None
+        """
+        rss = get_rss()
+        if rss is None or self.__initial_rss is None or rss - self.__initial_rss <= self.__memory_limit:
+            return None
+        return "exceeded the memory limit of %s bytes" % self.__memory_limit
+
+
+class CancelRegistry(object):
+    """
+    Registry of the cancel tokens of the executions running in this process (see ikats.core.library.cancellation):
+    the token is opened by the engine when the execution starts, and closed when it ends.
+
+    A token may be cancelled before its execution starts (ex: the job was leaving the queue of the scheduler):
+    the execution is then cancelled as soon as it starts.
+
+    Note: the tokens are in memory: an execution is cancelled from the process running it. The requests
+    received by the other processes are saved in database (see ExecutableAlgoDao.request_cancel()),
+    and polled by the token of the execution: see ExecEngine.execute().
+    """
+
+    __tokens = {}
+    __pending_dates = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def open(cls, process_id):
+        """
+        Open the token of the execution: the token already cancelled before the start is returned
+
+        :param process_id: the process_id of the execution
+        :type process_id: str
+        :return: the token
+        :rtype: CancelToken
+        """
+        with cls.__lock:
+            cls.__pending_dates.pop(str(process_id), None)
+            return cls.__tokens.setdefault(str(process_id), CancelToken(str(process_id)))
+
+    @classmethod
+    def get(cls, process_id):
+        """
+        Get the token of the execution
+
+        :param process_id: the process_id of the execution
+        :type process_id: str
+        :return: the token, or None if the execution is not running in this process
+        :rtype: CancelToken or None
+        """
+        return cls.__tokens.get(str(process_id), None)
+
+    @classmethod
+    def cancel(cls, process_id, reason="cancelled by request"):
+        """
+        Cancel the execution: when it is not yet running, its token is created cancelled, and kept during
+        PENDING_RETENTION seconds
+
+        :param process_id: the process_id of the execution
+        :type process_id: str
+        :param reason: optional, default "cancelled by request": the reason of the cancellation
+        :type reason: str
+        :return: True when the execution was running in this process
+        :rtype: bool
+        """
+        with cls.__lock:
+            limit = time.time() - PENDING_RETENTION
+            for key in [key for key, date in cls.__pending_dates.items() if date < limit]:
+                del cls.__pending_dates[key]
+                del cls.__tokens[key]
+
+            token = cls.__tokens.get(str(process_id), None)
+            running = token is not None and str(process_id) not in cls.__pending_dates
+            if token is None:
+                token = CancelToken(str(process_id))
+                cls.__tokens[str(process_id)] = token
+                cls.__pending_dates[str(process_id)] = time.time()
+
+        token.cancel(reason)
+        return running
+
+    @classmethod
+    def close(cls, process_id):
+        """
+        Close the token at the end of the execution
+
+        :param process_id: the process_id of the execution
+        :type process_id: str
+        """
+        with cls.__lock:
+            token = cls.__tokens.pop(str(process_id), None)
+            cls.__pending_dates.pop(str(process_id), None)
+        if token is not None:
+            token.stop_timer()
@@ -34,6 +34,16 @@ class AbstractDataSource(object):
     def set_process_id(self, process_id):
         pass
 
+    def is_remote(self):
+        """
+        Tells if get_value() reads the value from a remote resource (ex: download): the engine may then
+        read it in advance, concurrently with the other inputs (see prefetch.InputPrefetcher)
+
+        :return: False by default
+        :rtype: bool
+        """
+        return False
+
 
 class SimpleValueDataSource(AbstractDataSource):
     """
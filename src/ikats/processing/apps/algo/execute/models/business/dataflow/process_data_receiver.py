@@ -14,14 +14,13 @@ See the License for the specific language governing permissions and
 limitations under the License.
 
 """
-import codecs
 import json
 import logging
-import pickle
 
 import numpy as np
 
 from apps.algo.execute.models.business.data_receiver import AbstractDataReceiver
+from ikats.core.library.blob import DEFAULT_CHUNK_SIZE, encode_base64, encode_blob
 from ikats.core.library.exception import IkatsException, IkatsInputTypeError
 from ikats.core.resource.api import IkatsApi
 from ikats_processing.core.resource_config import ResourceClientSingleton
@@ -29,6 +28,16 @@ from ikats_processing.core.resource_config import ResourceClientSingleton
 LOGGER = logging.getLogger(__name__)
 
 
+def get_blob_config():
+    """
+    Get the django setting IKATS_PROCESS_DATA_BLOB
+    :return: the configuration of the blobs: keys COMPRESSION, CHUNK_SIZE
+    :rtype: dict
+    """
+    from django.conf import settings
+    return getattr(settings, 'IKATS_PROCESS_DATA_BLOB', {})
+
+
 class ProcessDataDbWriter(AbstractDataReceiver):
     """
     This receiver redefines class AbstractDataReceiver for a processed data:
@@ -99,13 +108,8 @@ class ProcessDataDbWriter(AbstractDataReceiver):
                 # convert list to string
                 data_to_store = json.dumps(value)
             elif self.data_type == 'CSV':
-
-                # save result into csv file
-                file_path = '/tmp/%s_%s.csv' % (self.output_name, self.process_id)
-
-                # expecting array-like value
-                np.savetxt(file_path, value, delimiter=';', fmt="%s")
-                data_to_store = file_path
+                # expecting array-like value: encoded in memory by the client, without temporary file
+                data_to_store = np.asarray(value)
 
             # add result to non temporal database
             ntdm.add_data(
@@ -311,13 +315,19 @@ class ProcessDataPickleWriter(ProcessDataWriter):
 
     def encode_content(self, value):
         """
-        Encodes the binary data to pickle then to string
+        Encodes the value with ikats.core.library.blob: pickled then compressed, according to
+        the django setting IKATS_PROCESS_DATA_BLOB, then encoded in base64 as expected by the process
+        data API. The encoded blob is streamed by chunks: see encode_blob() about the memory used
+        by the pickling.
 
         :param value: data to encode
         :type value: any
-        :return: encoded string
-        :rtype: str
+        :return: the base64 chunks of the blob
+        :rtype: generator of bytes
         """
-        my_str_pickle = codecs.encode(pickle.dumps(value), "base64").decode()
-
-        return my_str_pickle
+        config = get_blob_config()
+        chunk_size = config.get('CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+        return encode_base64(encode_blob(value,
+                                         compression=config.get('COMPRESSION', 'zlib'),
+                                         chunk_size=chunk_size),
+                             chunk_size=chunk_size)
@@ -14,9 +14,11 @@ See the License for the specific language governing permissions and
 limitations under the License.
 
 """
+import itertools
 import logging
 import pickle
 from apps.algo.execute.models.business.data_source import AbstractDataSource
+from ikats.core.library.blob import MAGIC, DEFAULT_CHUNK_SIZE, decode_blob, is_encoded_blob
 from ikats.core.library.exception import IkatsException
 
 from ikats.core.resource.api import IkatsApi
@@ -48,7 +50,8 @@ class ProcessDataReader(AbstractDataSource):
         """
         Reads the value as the BLOB content in the process_data row identified by self.id.
 
-        The decoding process is made by decode() method, which may be overridden.
+        The reading is made by read_content() method, and the decoding process is made by decode_content() method:
+        both may be overridden.
 
         :raises IkatsException: error with its cause:
           - missing process_id: request is cancelled
@@ -60,7 +63,7 @@ class ProcessDataReader(AbstractDataSource):
             if self.get_process_id() is None:
                 raise IkatsException("Unexpected: process_id is None")
 
-            content = IkatsApi.pd.read(process_data_id=self.__id)
+            content = self.read_content()
 
             LOG_PROCESS_DATA_READER.debug("Content has been read. Context=%s", str(self))
 
@@ -89,6 +92,15 @@ class ProcessDataReader(AbstractDataSource):
         """
         self.__execalgo_id = process_id
 
+    def is_remote(self):
+        """
+        The process_data blob is downloaded by get_value()
+
+        :return: True
+        :rtype: bool
+        """
+        return True
+
     @property
     def identifier(self):
         """
@@ -110,6 +122,16 @@ class ProcessDataReader(AbstractDataSource):
         """
         return self.__reader_id
 
+    def read_content(self):
+        """
+        Reads the raw content of the blob.
+        By default the whole blob is read at once.
+
+        :return: the raw content
+        :rtype: bytes or str or object
+        """
+        return IkatsApi.pd.read(process_data_id=self.__id)
+
     @staticmethod
     def decode_content(raw_content):
         """
@@ -128,7 +150,7 @@ class ProcessDataReader(AbstractDataSource):
         msg = "{}: reading input named={} from data id={}. Defined from execalgo_id={} with reader_id={}."
         return msg.format(self.__class__.__name__,
                           self.input_name,
-                          self.id,
+                          self.identifier,
                           self.get_process_id(),
                           self.reader_id)
 
@@ -189,17 +211,44 @@ class ProcessDataPickleReader(ProcessDataReader):
         """
         super(ProcessDataPickleReader, self).__init__(identifier, catalog_input_name, reader_id)
 
+    def read_content(self):
+        """
+        Reads the blob by chunks: the whole blob is never loaded in memory
+
+        :return: the chunks of the blob
+        :rtype: generator of bytes
+        """
+        return IkatsApi.pd.read_chunks(process_data_id=self.identifier, chunk_size=DEFAULT_CHUNK_SIZE)
+
     def decode_content(self, raw_content):
         """
-        Decodes the raw_content as a python object, unpicking the raw content.
+        Decodes the raw_content as a python object:
+          - blob encoded by ikats.core.library.blob: decompressed and unpickled by chunks
+          - otherwise: blob written by the previous versions, unpickled at once
+
         :param raw_content: the raw content
-        :type raw_content: pickle bytes
+        :type raw_content: bytes or iterable of bytes chunks
         :return: the unpicked object
         :rtype: any
         :raises IkatsException: error occurred while loading the object from the pickled content
         """
         try:
-            obj = pickle.loads(raw_content)
+            if isinstance(raw_content, (bytes, bytearray)):
+                chunks = iter([raw_content])
+            else:
+                chunks = iter(raw_content)
+
+            # the chunks are split by the transport: the head is completed to be compared to MAGIC
+            head = b""
+            for chunk in chunks:
+                head += chunk
+                if len(head) >= len(MAGIC):
+                    break
+
+            if is_encoded_blob(head):
+                return decode_blob(itertools.chain([head], chunks))
+
+            obj = pickle.loads(head + b"".join(chunks))
             return obj
         except Exception:
             raise IkatsException("Failed to load picked object. Context={}".format(str(self)))
@@ -15,13 +15,19 @@ limitations under the License.
 
 """
 from abc import ABCMeta, abstractmethod
+import functools
 import logging
 import sys
 import traceback
 
 from apps.algo.execute.models.business.algo import ExecutableAlgo
+from apps.algo.execute.models.business.cancellation import CANCEL_POLL_INTERVAL, CancelRegistry, get_exec_budget
+from apps.algo.execute.models.business.exec_profile import ExecProfile
+from apps.algo.execute.models.business.progress import ProgressRegistry
 from apps.algo.execute.models.orm.algo import ExecutableAlgoDao
+from ikats.core.library.cancellation import CancelToken, CancelledError, set_cancel_token
 from ikats.core.library.exception import IkatsException
+from ikats.core.library.progress import set_progress_sink
 from ikats.core.library.status import State as EnumState
 
 LOGGER = logging.getLogger(__name__)
@@ -128,12 +134,16 @@ class ExecEngine(object):
         # create exec algo in database, if required
         #
         self.__executable_algo = executable_algo
+        if executable_algo.profile is None:
+            executable_algo.profile = ExecProfile()
+
         if dao_managed:
 
             if executable_algo.process_id is None:
                 # Not yet save !
-                self.__executable_algo = ExecutableAlgoDao.create(
-                    original_business_obj=executable_algo, merge_with_unsaved_data=True)
+                with executable_algo.profile.phase(ExecProfile.DAO_WRITE):
+                    self.__executable_algo = ExecutableAlgoDao.create(
+                        original_business_obj=executable_algo, merge_with_unsaved_data=True)
 
         self.__status = ExecStatus(debug=debug)
 
@@ -152,7 +162,31 @@ class ExecEngine(object):
         it internally call run_command and updates finally the returned self.status
         :return: self.status
         """
+        profile = self.__executable_algo.profile
+        profile.start()
+
+        # the progress reported by the algorithm is published in the channel of the execution,
+        # and its last event is saved in database for the other server processes
+        process_id = self.__executable_algo.process_id
+        channel = None
+        if process_id is not None:
+            channel = ProgressRegistry.open(process_id,
+                                            persist=functools.partial(ExecutableAlgoDao.update_progress, process_id))
+        previous_sink = set_progress_sink(channel.publish if channel is not None else None)
+
+        # the execution is cancelled on request (see CancelRegistry), or when its time budget is exceeded
+        token = CancelRegistry.open(process_id) if process_id is not None else CancelToken("local-%s" % id(self))
+        token.start_timer(get_exec_budget(self.__executable_algo.custom_algo.implementation.name)['TIMEOUT'])
+        if process_id is not None and self.__dao_managed:
+            # the requests received by the other server processes are saved in database
+            token.add_poll('request',
+                           functools.partial(self.__get_cancel_request, process_id),
+                           CANCEL_POLL_INTERVAL)
+        previous_token = set_cancel_token(token)
         try:
+            # cancelled before the start: ex: while it was queued
+            token.check()
+
             LOGGER.info("ExecEngine::execute update process_id on each data sources and data receivers")
             self.__status.add_msg("update process_id on each data sources and data receivers")
             self.__executable_algo.update_connectors_with_pid()
@@ -165,8 +199,9 @@ class ExecEngine(object):
             self.__executable_algo.state = EnumState.RUN
 
             if self.__dao_managed:
-                self.__executable_algo = ExecutableAlgoDao.update(self.__executable_algo,
-                                                                  merge_with_unsaved_data=True)
+                with profile.phase(ExecProfile.DAO_WRITE):
+                    ExecutableAlgoDao.update_transition(self.__executable_algo,
+                                                        update_fields=['state', 'start_execution_date'])
 
             LOGGER.debug("ExecEngine::run_command() ... ")
             self.__status.add_msg("run_command ...")
@@ -175,11 +210,17 @@ class ExecEngine(object):
 
             self.__status.add_msg("sets on exec algo: state=OK")
 
+            # the final state is written with the end date: see finally
             self.__executable_algo.state = EnumState.ALGO_OK
 
-            if self.__dao_managed:
-                self.__executable_algo = ExecutableAlgoDao.update(self.__executable_algo,
-                                                                  merge_with_unsaved_data=True)
+        except CancelledError as err_cancel:
+            LOGGER.warning("ExecEngine::execute cancelled: %s", err_cancel)
+
+            self.status.error = err_cancel
+            self.status.add_msg("Execution cancelled => ExecutableAlgo.state == CANCELLED")
+            self.status.add_msg(str(err_cancel))
+
+            self.__executable_algo.state = EnumState.CANCELLED
 
         except AlgoException as err_alg:
             trace_back = sys.exc_info()[2]
@@ -195,7 +236,8 @@ class ExecEngine(object):
                 for line_error in stack_list:
                     self.status.add_msg(line_error)
 
-            self.__executable_algo.state = EnumState.ALGO_KO
+            # the error may result from the cancellation: ex: cancelled Spark jobs
+            self.__executable_algo.state = EnumState.CANCELLED if token.is_cancelled() else EnumState.ALGO_KO
 
         except EngineException as err_engine:
             LOGGER.error("EngineException: ")
@@ -211,7 +253,15 @@ class ExecEngine(object):
             LOGGER.exception(e)
 
         finally:
+            set_progress_sink(previous_sink)
+            set_cancel_token(previous_token)
+            token.stop_timer()
+            if process_id is not None:
+                CancelRegistry.close(process_id)
             self.__executable_algo.trigger_end_execution_date()
+
+            # the profile is written with the final state: the duration of this last write is not measured
+            profile.stop()
             if (not ((self.__executable_algo.end_execution_date is None) or
                      (self.__executable_algo.start_execution_date is None))):
                 LOGGER.info("- execute() handled in  %s sec.",
@@ -221,22 +271,31 @@ class ExecEngine(object):
 
             if self.__dao_managed:
                 try:
-                    self.__executable_algo = ExecutableAlgoDao.update(self.__executable_algo,
-                                                                      merge_with_unsaved_data=True)
+                    ExecutableAlgoDao.update_transition(self.__executable_algo)
                 except Exception as save_err:
                     LOGGER.error("EngineException: saving the ExecutableAlgo in DB")
                     LOGGER.exception(save_err)
 
-                    if self.__executable_algo.state == EnumState.RUN:
+                    if self.__executable_algo.state in [EnumState.RUN, EnumState.ALGO_OK]:
                         my_msg = "Algo has been run with success, producing results; \
-                                but the ExecutableAlgoDao.update(...) failed. Please contact administrator."
+                                but the ExecutableAlgoDao.update_transition(...) failed. Please contact administrator."
                         self.status.add_msg(my_msg)
                         LOGGER.error(my_msg)
                         self.status.error = save_err
                         self.__executable_algo.state = EnumState.ENGINE_KO
 
+            if channel is not None:
+                ProgressRegistry.close(process_id, self.__executable_algo.state)
+
         return self.status
 
+    @staticmethod
+    def __get_cancel_request(process_id):
+        """
+        Poll of the cancel request saved in database: see CancelToken.add_poll()
+        """
+        return "cancelled by request" if ExecutableAlgoDao.is_cancel_requested(process_id) else None
+
     @abstractmethod
     def run_command(self):
         """
@@ -0,0 +1,169 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import logging
+import time
+from contextlib import contextmanager
+
+from ikats.core.resource.client.io_counter import IoCounter
+
+try:
+    import resource
+except ImportError:
+    # not available on every platform: the peak RSS is not measured
+    resource = None
+
+LOGGER = logging.getLogger(__name__)
+
+# CPU time of the current thread, when available (python >= 3.7): else CPU time of the process
+_cpu_time = getattr(time, 'thread_time', time.process_time)
+
+
+class ExecProfile(object):
+    """
+    Profile of one execution of an algorithm, saved with the ExecutableAlgo:
+      - the duration of each phase (catalogue lookup, checks, each consumed input, call of the algorithm,
+        each produced output, database writes ...) in seconds,
+      - the resources used by the execution: CPU time of the executing thread, peak RSS of the process,
+        bytes read and written through the IKATS API (see IoCounter).
+
+    The phases may be measured by several threads (ex: the checks before an asynchronous execution),
+    but the resources are measured by the thread calling start() and stop().
+    """
+
+    # Phase names
+    CATALOGUE = "catalogue"
+    CHECK = "check"
+    CONSUME = "consume_value"
+    ALGORITHM = "algorithm"
+    PRODUCE = "produce_value"
+    DAO_WRITE = "dao_write"
+
+    def __init__(self, phases=None, resources=None):
+        """
+        Constructor
+        :param phases: optional, default None: the phases already measured, see to_dict()
+        :type phases: list of dict or None
+        :param resources: optional, default None: the resources already measured, see to_dict()
+        :type resources: dict or None
+        """
+        self.__phases = list(phases or [])
+        self.__resources = dict(resources or {})
+        self.__start_snapshot = None
+
+    def add_phase(self, name, duration, target=None):
+        """
+        Record a measured phase
+
+        :param name: name of the phase: see class constants
+        :type name: str
+        :param duration: duration in seconds
+        :type duration: float
+        :param target: optional, default None: the name of the input/output concerned by the phase
+        :type target: str or None
+        """
+        phase = {'phase': name, 'duration': duration}
+        if target is not None:
+            phase['target'] = target
+        self.__phases.append(phase)
+
+    @contextmanager
+    def phase(self, name, target=None):
+        """
+        Context manager measuring a phase: see add_phase()
+
+        :param name: name of the phase: see class constants
+        :type name: str
+        :param target: optional, default None: the name of the input/output concerned by the phase
+        :type target: str or None
+        """
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.time() - start, target)
+
+    def start(self):
+        """
+        Start the measure of the resources used by the current thread
+        """
+        self.__start_snapshot = (_cpu_time(), IoCounter.get_counts())
+
+    def stop(self):
+        """
+        Stop the measure of the resources started by start(): the resources are then available in to_dict()
+        """
+        if self.__start_snapshot is None:
+            LOGGER.warning("ExecProfile: stop() called before start(): no resource measured")
+            return
+
+        start_cpu, (start_read, start_written) = self.__start_snapshot
+        read, written = IoCounter.get_counts()
+        self.__resources['cpu_time'] = _cpu_time() - start_cpu
+        self.__resources['bytes_read'] = read - start_read
+        self.__resources['bytes_written'] = written - start_written
+        if resource is not None:
+            # kilobytes on linux
+            self.__resources['peak_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        self.__start_snapshot = None
+
+    def get_phases(self):
+        """
+        Get the measured phases
+        :return: the phases: dict with keys 'phase', 'duration' and optionally 'target'
+        :rtype: list of dict
+        """
+        return self.__phases
+
+    def get_total(self, name):
+        """
+        Get the total duration of one phase
+
+        :param name: name of the phase
+        :type name: str
+        :return: the sum of the durations, in seconds
+        :rtype: float
+        """
+        return sum(x['duration'] for x in self.__phases if x['phase'] == name)
+
+    def get_resources(self):
+        """
+        Get the measured resources
+        :return: dict with keys 'cpu_time' (seconds), 'bytes_read', 'bytes_written' and 'peak_rss' (bytes),
+          empty before stop()
+        :rtype: dict
+        """
+        return self.__resources
+
+    def to_dict(self):
+        """
+        Get the JSON-serializable profile
+        :return: dict with keys 'phases' and 'resources'
+        :rtype: dict
+        """
+        return {'phases': self.__phases, 'resources': self.__resources}
+
+    @classmethod
+    def from_dict(cls, profile_dict):
+        """
+        Build the profile from its JSON-serializable form: see to_dict()
+
+        :param profile_dict: the profile
+        :type profile_dict: dict
+        :return: the profile
+        :rtype: ExecProfile
+        """
+        return ExecProfile(phases=profile_dict.get('phases', None), resources=profile_dict.get('resources', None))
@@ -14,10 +14,10 @@ See the License for the specific language governing permissions and
 limitations under the License.
 
 """
-import importlib
-
 from apps.algo.catalogue.models.orm.implem import ImplementationDao
 from apps.algo.execute.models.business.factory import FactoryExecAlgo
+from apps.algo.execute.models.business.memo import ExecMemo
+from ikats_processing.core.registry import CallableRegistry
 
 
 class FacadeExecution(object):
@@ -62,16 +62,9 @@ class FacadeExecution(object):
         :type str_plugin:
         :return: subclass of ExecEngine (!!! not an instance !!!)
         """
-        my_module_path = str_plugin_path
-        my_plugin = str_plugin
-
         try:
-
-            my_module = importlib.import_module(my_module_path)
-
-            evaluated_plugin_str = "my_module.%s" % my_plugin
-
-            my_class = eval(evaluated_plugin_str)
+            # resolved once by the process: see CallableRegistry
+            my_class = CallableRegistry.resolve("%s::%s" % (str_plugin_path, str_plugin))
         except Exception:
             raise Exception(
                 "Failed to evaluate ExecEngine plugin %s.%s" % (str_plugin_path, str_plugin))
@@ -82,7 +75,8 @@ class FacadeExecution(object):
     @staticmethod
     def execute_algo_without_custom(implem, input_arg_names, input_data_sources, output_arg_names,
                                     output_data_receivers,
-                                    exec_algo_db_id=None, run_debug=False, dao_managed=True):
+                                    exec_algo_db_id=None, run_debug=False, dao_managed=True, memo_key=None,
+                                    check_cache=None, profile=None):
         """
         Firstly build the ExecutableAlgo: initialized without customized parameters in database (Custom DB is ignored)
 
@@ -106,6 +100,15 @@ class FacadeExecution(object):
         :type run_debug: bool
         :param dao_managed: optional flag: True when executable algorithm is managed in DB. Default is True
         :type dao_managed: bool
+        :param memo_key: optional, default None: when defined, the successful execution is memoized with this key:
+            see ExecMemo
+        :type memo_key: str or None
+        :param check_cache: optional, default None: results of the checks already made on the inputs:
+            the engine does not check them again
+        :type check_cache: apps.algo.custom.models.business.check_engine.CheckCache or None
+        :param profile: optional, default None: the profile of the execution, completed by the engine:
+            when None, the engine creates a new one
+        :type profile: apps.algo.execute.models.business.exec_profile.ExecProfile or None
         :return: exec_algo, exec_status tuple: exec_algo is the initialized algorithm; exec_status is
                 the execution status
         :rtype:  exec_algo is apps.algo.execute.models.business.algo.ExecutableAlgo
@@ -113,7 +116,7 @@ class FacadeExecution(object):
         """
         # executable algo building
         if isinstance(implem, str):
-            my_implementation = ImplementationDao.find_business_elem_with_key(implem)
+            my_implementation = ImplementationDao.find_cached_business_elem_with_key(implem)
         else:
             my_implementation = implem
         my_exec_algo = FacadeExecution.factory.build_exec_algo_without_custom(
@@ -122,15 +125,21 @@ class FacadeExecution(object):
             input_values_or_sources=input_data_sources,
             output_names=output_arg_names,
             output_receivers=output_data_receivers)
+        my_exec_algo.check_cache = check_cache
+        my_exec_algo.profile = profile
 
         # in case exec algo already defined in DB (asynchronous execution)
         if exec_algo_db_id is not None:
             # set algorithm db id
             my_exec_algo.set_process_id(exec_algo_db_id)
 
-        return FacadeExecution.execute_algo(executable_algo=my_exec_algo,
-                                            debug=run_debug,
-                                            dao_managed=dao_managed)
+        exec_algo, exec_status = FacadeExecution.execute_algo(executable_algo=my_exec_algo,
+                                                              debug=run_debug,
+                                                              dao_managed=dao_managed)
+        if memo_key is not None:
+            ExecMemo.record(memo_key, exec_algo)
+
+        return exec_algo, exec_status
 
     @staticmethod
     def execute_algo(executable_algo, debug=False, dao_managed=False):
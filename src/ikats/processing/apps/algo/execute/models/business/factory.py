@@ -26,6 +26,7 @@ from apps.algo.execute.models.business.data_source import AbstractDataSource
 from apps.algo.execute.models.business.dataflow.process_data_receiver import \
     ProcessDataDbWriter, ProcessDataPickleWriter, ProcessDataPlainTextWriter
 from apps.algo.execute.models.business.dataflow.process_data_sources import ProcessDataPlainTextReader
+from ikats.core.library.blob import decode_blob, is_encoded_blob
 
 
 class FactoryExecAlgo(object):
@@ -136,9 +137,13 @@ class FactoryExecAlgo(object):
                                               catalog_input_name=input_def.name,
                                               reader_id=reader_id)
 
-        # Here: client provides the pickled model formatted as a string.
+        # Here: client provides the pickled model formatted as a base64 string:
+        # blob written by ProcessDataPickleWriter (see ikats.core.library.blob), or plain pickle
         elif input_def.data_format in [FactoryCatalogue.SK_MODEL_ARGTYPE]:
-            return pickle.loads(codecs.decode(client_value.encode(), 'base64'))
+            content = codecs.decode(client_value.encode(), 'base64')
+            if is_encoded_blob(content):
+                return decode_blob([content])
+            return pickle.loads(content)
 
         # else: any other values are explicitly defined...
         else:
@@ -0,0 +1,173 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import hashlib
+import json
+import logging
+
+from apps.algo.execute.models.orm.algo import ExecutableAlgoDao
+from apps.algo.execute.models.orm.memo import ExecutionMemoDao
+from ikats.core.library.status import State as EnumState
+from ikats.core.resource.api import IkatsApi
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_memo_config():
+    """
+    Get the django setting IKATS_EXEC_MEMO
+    :return: the configuration of the memoization: keys ENABLED, MAX_AGE, MAX_ENTRIES
+    :rtype: dict
+    """
+    from django.conf import settings
+    return getattr(settings, 'IKATS_EXEC_MEMO', {})
+
+
+class ExecMemo(object):
+    """
+    Memoization of the successful executions: a run with the same definition as a previous successful run
+    (same implementation definition, same resolved input values) returns the previous ExecutableAlgo,
+    whose process_id identifies the results already produced (process data, TSUID lists ...),
+    instead of executing again.
+
+    Activated by the setting IKATS_EXEC_MEMO['ENABLED'], and bypassed by the run option 'bypass_memo'.
+
+    Limits:
+      - the temporal data referenced by the inputs (TSUID, dataset names) are not versioned: a memoized run is
+        reused until it is evicted (setting MAX_AGE in seconds, MAX_ENTRIES), or until it is bypassed.
+      - the algorithm is expected to be deterministic.
+    """
+
+    @staticmethod
+    def is_enabled():
+        """
+        :return: True if the memoization is activated by the setting IKATS_EXEC_MEMO
+        :rtype: bool
+        """
+        return bool(get_memo_config().get('ENABLED', False))
+
+    @staticmethod
+    def compute_key(implementation, resolved_inputs):
+        """
+        Compute the memoization key: hash of the implementation definition and of the resolved input values.
+
+        :param implementation: the executed implementation
+        :type implementation: apps.algo.catalogue.models.business.implem.Implementation
+        :param resolved_inputs: the public input values, by input name, once completed by the customized values and
+          the default values: the values provided by the client (TSUID, process data id, ... are references)
+        :type resolved_inputs: dict
+        :return: the key, or None when the inputs are not json-friendly: the run cannot be memoized
+        :rtype: str or None
+        """
+        definition = {
+            'implementation': [implementation.db_id,
+                               implementation.name,
+                               implementation.execution_plugin,
+                               implementation.library_address,
+                               [ExecMemo.__profile_item_definition(x) for x in implementation.input_profile],
+                               [ExecMemo.__profile_item_definition(x) for x in implementation.output_profile]],
+            'inputs': resolved_inputs
+        }
+        try:
+            encoded = json.dumps(definition, sort_keys=True, separators=(',', ':'))
+        except (TypeError, ValueError) as error:
+            LOGGER.debug("ExecMemo: run of %s not memoized: %s", implementation.name, error)
+            return None
+
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def __profile_item_definition(profile_item):
+        """
+        The definition of a profile item taken into account by the key: the checked domain and the default value
+        change the resolved inputs, or their validity
+        """
+        domain = profile_item.domain_of_values
+        return [profile_item.name,
+                profile_item.data_format,
+                profile_item.order_index,
+                profile_item.default_value,
+                domain if domain is None or isinstance(domain, str) else repr(domain)]
+
+    @staticmethod
+    def find(key, implementation):
+        """
+        Find the successful ExecutableAlgo memoized with the key, whose results still exist: the memoized run
+        is forgotten when one of the process data of its outputs has been deleted
+
+        :param key: the memoization key, see compute_key()
+        :type key: str
+        :param implementation: the executed implementation, defining the expected outputs
+        :type implementation: apps.algo.catalogue.models.business.implem.Implementation
+        :return: the ExecutableAlgo, or None
+        :rtype: apps.algo.execute.models.business.algo.ExecutableAlgo or None
+        """
+        process_id = ExecutionMemoDao.find_process_id(key, max_age=get_memo_config().get('MAX_AGE', None))
+        if process_id is None:
+            return None
+
+        exec_algo = ExecutableAlgoDao.find_from_key(process_id)
+        if exec_algo is None or exec_algo.state != EnumState.ALGO_OK:
+            return None
+
+        if not ExecMemo.__has_results(process_id, implementation):
+            LOGGER.info("ExecMemo: results of process_id=%s deleted: memoized run forgotten", process_id)
+            ExecutionMemoDao.forget(key)
+            return None
+
+        LOGGER.info("ExecMemo: reusing the results of process_id=%s", process_id)
+        return exec_algo
+
+    @staticmethod
+    def __has_results(process_id, implementation):
+        """
+        Check that the process data produced by the memoized run still exist: one by output
+        (the outputs of a run are written as process data named by the output, see ProcessDataWriter)
+
+        :return: True if the process data of all the outputs exist
+        :rtype: bool
+        """
+        output_names = set(x.name for x in implementation.output_profile)
+        if not output_names:
+            return True
+        try:
+            process_data = IkatsApi.pd.list(process_id=str(process_id))
+        except Exception as error:
+            LOGGER.warning("ExecMemo: failed to check the results of process_id=%s: %s", process_id, error)
+            return False
+        return output_names.issubset(set(x.get('name') for x in process_data))
+
+    @staticmethod
+    def record(key, executable_algo):
+        """
+        Record the ExecutableAlgo for the key, when it is successful, and evict the obsolete records
+
+        :param key: the memoization key, see compute_key()
+        :type key: str or None
+        :param executable_algo: the executed algorithm
+        :type executable_algo: apps.algo.execute.models.business.algo.ExecutableAlgo
+        """
+        if key is None or executable_algo.state != EnumState.ALGO_OK or not executable_algo.is_db_id_defined():
+            return
+
+        config = get_memo_config()
+        try:
+            ExecutionMemoDao.record(key, executable_algo.get_process_id())
+            ExecutionMemoDao.evict(max_age=config.get('MAX_AGE', None),
+                                   max_entries=config.get('MAX_ENTRIES', None))
+        except Exception as error:
+            # the memoization must not fail the execution
+            LOGGER.warning("ExecMemo: failed to record process_id=%s: %s", executable_algo.get_process_id(), error)
@@ -0,0 +1,192 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+from ikats.core.library.lazy import LazyValue
+from ikats.core.resource.client.io_counter import IoCounter
+
+"""
+Module resolving the inputs of an execution before the call of the algorithm: the remote inputs
+(see AbstractDataSource.is_remote()) are read concurrently, or lazily when configured so.
+"""
+
+LOGGER = logging.getLogger(__name__)
+
+# Lock protecting the creation of the executor shared by the process
+PREFETCH_LOCK = threading.Lock()
+
+# Executor shared by the process: see get_prefetch_executor()
+PREFETCH_EXECUTOR = None
+
+
+def get_prefetch_config():
+    """
+    Get the django setting IKATS_EXEC_PREFETCH
+    :return: the configuration of the prefetch: keys WORKERS, LAZY_INPUTS
+    :rtype: dict
+    """
+    from django.conf import settings
+    return getattr(settings, 'IKATS_EXEC_PREFETCH', {})
+
+
+def get_prefetch_executor():
+    """
+    Get the executor reading the remote inputs, shared by the process, created on first call
+    with IKATS_EXEC_PREFETCH['WORKERS'] threads
+
+    :return: the executor, or None when WORKERS is 0: the inputs are read one after the other
+    :rtype: concurrent.futures.ThreadPoolExecutor or None
+    """
+    global PREFETCH_EXECUTOR
+    with PREFETCH_LOCK:
+        if PREFETCH_EXECUTOR is None:
+            workers = get_prefetch_config().get('WORKERS', 4)
+            if workers < 1:
+                return None
+            PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=workers)
+            LOGGER.info("Prefetch executor created with %s workers", workers)
+        return PREFETCH_EXECUTOR
+
+
+def get_lazy_inputs(implem_name):
+    """
+    Get the inputs of the implementation which are passed as LazyValue (see ikats.core.library.lazy):
+    setting IKATS_EXEC_PREFETCH['LAZY_INPUTS'][implem_name]
+
+    :param implem_name: name of the implementation
+    :type implem_name: str
+    :return: the names of the lazy inputs
+    :rtype: list of str
+    """
+    return get_prefetch_config().get('LAZY_INPUTS', {}).get(implem_name, [])
+
+
+def _read_value(data_source):
+    """
+    Task of the executor: read the value, and measure the bytes transferred by this thread
+    """
+    before = IoCounter.get_counts()
+    value = data_source.get_value()
+    after = IoCounter.get_counts()
+    return value, after[0] - before[0], after[1] - before[1]
+
+
+class InputPrefetcher(object):
+    """
+    Resolution of the inputs of an ExecutableAlgo:
+      - start(): the remote inputs are submitted to the executor, when at least two of them can be read
+        concurrently
+      - consume(): the value of one input is returned: waiting for its reading when prefetched.
+        The bytes transferred by the executor are counted in the calling thread (see IoCounter)
+      - the lazy inputs are neither read by start(), nor by consume(), which returns a LazyValue
+      - cancel(): the readings not yet started are cancelled, ex: when an input is rejected
+
+    The other inputs are consumed as usual: see ExecutableAlgo.consume_value()
+    """
+
+    def __init__(self, executable_algo, executor=None, lazy_inputs=None):
+        """
+        Constructor
+        :param executable_algo: the executed algorithm
+        :type executable_algo: apps.algo.execute.models.business.algo.ExecutableAlgo
+        :param executor: optional, default None: executor of the readings, None to read the inputs
+          one after the other
+        :type executor: concurrent.futures.Executor or None
+        :param lazy_inputs: optional, default None: names of the inputs passed as LazyValue
+        :type lazy_inputs: list of str or None
+        """
+        self.__executable_algo = executable_algo
+        self.__executor = executor
+        self.__lazy_inputs = set(lazy_inputs or [])
+        self.__futures = {}
+
+    def __get_remote_source(self, input_name):
+        """
+        :return: the remote data source of the input, or None when the input is consumed as usual
+        :rtype: AbstractDataSource or None
+        """
+        custom_params = self.__executable_algo.custom_algo.custom_params
+        if custom_params is not None and input_name in custom_params:
+            return None
+        try:
+            data_source = self.__executable_algo.get_data_source(input_name)
+        except Exception:
+            # reported by consume_value()
+            return None
+        return data_source if data_source is not None and data_source.is_remote() else None
+
+    def is_lazy(self, input_name):
+        """
+        :param input_name: name of the input
+        :type input_name: str
+        :return: True when consume() returns a LazyValue for this input
+        :rtype: bool
+        """
+        return input_name in self.__lazy_inputs and self.__get_remote_source(input_name) is not None
+
+    def start(self, input_names):
+        """
+        Start reading the remote inputs which are not lazy
+
+        :param input_names: names of the inputs
+        :type input_names: list of str
+        """
+        remote_sources = {}
+        for input_name in input_names:
+            data_source = self.__get_remote_source(input_name)
+            if data_source is not None and input_name not in self.__lazy_inputs:
+                remote_sources[input_name] = data_source
+
+        if self.__executor is None or len(remote_sources) < 2:
+            # nothing to overlap
+            return
+
+        LOGGER.debug("Prefetching inputs %s", list(remote_sources))
+        for input_name, data_source in remote_sources.items():
+            self.__futures[input_name] = self.__executor.submit(_read_value, data_source)
+
+    def consume(self, input_name):
+        """
+        Get the value of the input
+
+        :param input_name: name of the input
+        :type input_name: str
+        :return: the value, or a LazyValue for a lazy input
+        :rtype: any
+        :raises Exception: the error raised by the data source
+        """
+        future = self.__futures.pop(input_name, None)
+        if future is not None:
+            value, read, written = future.result()
+            IoCounter.add_read(read)
+            IoCounter.add_written(written)
+            return value
+
+        if self.is_lazy(input_name):
+            return LazyValue(self.__get_remote_source(input_name).get_value, name=input_name)
+
+        return self.__executable_algo.consume_value(input_name)
+
+    def cancel(self):
+        """
+        Cancel the readings not yet started: the values of the started ones are dropped
+        """
+        for future in self.__futures.values():
+            future.cancel()
+        self.__futures.clear()
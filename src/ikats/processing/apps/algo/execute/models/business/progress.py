@@ -0,0 +1,324 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import json
+import logging
+import numbers
+import threading
+import time
+from collections import deque
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_progress_config():
+    """
+    Get the django setting IKATS_EXEC_PROGRESS
+    :return: the configuration of the progress channels: keys MIN_INTERVAL, MAX_EVENTS, RETENTION, MAX_WAIT,
+      PERSIST_INTERVAL
+    :rtype: dict
+    """
+    from django.conf import settings
+    return getattr(settings, 'IKATS_EXEC_PROGRESS', {})
+
+
+class ProgressChannel(object):
+    """
+    In-memory channel of the progress reported by one execution (see ikats.core.library.progress), read by
+    polling or long-polling (see get_events()).
+
+    The channel is rate-limited: a report received less than min_interval seconds after the last published
+    event is kept pending, and replaced by the next report: it is published once the interval has elapsed,
+    or when the channel is closed. Only the max_events last events are kept.
+
+    The last event can be saved by the persist callback, so that it can be read from any server process:
+    at most once every persist_interval seconds, and when the channel is closed.
+    """
+
+    def __init__(self, process_id, min_interval=0.5, max_events=100, persist=None, persist_interval=5.0):
+        """
+        Constructor
+        :param process_id: the process_id of the execution
+        :type process_id: str
+        :param min_interval: optional, default 0.5: minimum interval between two published events, in seconds
+        :type min_interval: float
+        :param max_events: optional, default 100: maximum number of kept events
+        :type max_events: int
+        :param persist: optional, default None: function saving the last event, called with the event
+        :type persist: function or None
+        :param persist_interval: optional, default 5.0: minimum interval between two saved events, in seconds
+        :type persist_interval: float
+        """
+        self.__process_id = process_id
+        self.__min_interval = min_interval
+        self.__condition = threading.Condition()
+        self.__events = deque(maxlen=max_events)
+        self.__seq = 0
+        self.__last_publish_date = None
+        self.__pending = None
+        self.__state = None
+        self.__close_date = None
+        self.__persist = persist
+        self.__persist_interval = persist_interval
+        self.__persisted_seq = 0
+        self.__persist_date = None
+
+    @property
+    def process_id(self):
+        """
+        :return: the process_id of the execution
+        :rtype: str
+        """
+        return self.__process_id
+
+    @property
+    def close_date(self):
+        """
+        :return: the EPOCH date of close() in seconds, or None while the execution is running
+        :rtype: float or None
+        """
+        return self.__close_date
+
+    @staticmethod
+    def __encodable(partial_result):
+        try:
+            json.dumps(partial_result)
+            return partial_result
+        except (TypeError, ValueError):
+            return str(partial_result)
+
+    def __append(self, event):
+        """
+        Publish the event: the lock is already acquired
+        """
+        self.__seq += 1
+        event['seq'] = self.__seq
+        event['partial_result'] = self.__encodable(event['partial_result'])
+        self.__events.append(event)
+        self.__last_publish_date = event['date']
+        self.__pending = None
+        self.__condition.notify_all()
+
+    def __get_pending_delay(self):
+        """
+        Get the delay before the pending event can be published: the lock is already acquired
+
+        :return: the delay in seconds (<= 0 when due), or None without pending event
+        :rtype: float or None
+        """
+        if self.__pending is None:
+            return None
+        return self.__last_publish_date + self.__min_interval - time.time()
+
+    def __save_last_event(self, force=False):
+        """
+        Save the last event with the persist callback, when the persist interval has elapsed, or when forced.
+        The callback is called outside the lock: errors are logged
+        """
+        if self.__persist is None:
+            return
+        with self.__condition:
+            if not self.__events or self.__events[-1]['seq'] == self.__persisted_seq:
+                return
+            now = time.time()
+            if not force and self.__persist_date is not None and \
+                    now - self.__persist_date < self.__persist_interval:
+                return
+            event = dict(self.__events[-1])
+            self.__persisted_seq = event['seq']
+            self.__persist_date = now
+        try:
+            self.__persist(event)
+        except Exception as error:
+            LOGGER.warning("Failed to save the progress of the execution process_id=%s", self.__process_id)
+            LOGGER.exception(error)
+
+    def publish(self, progress=None, message=None, partial_result=None):
+        """
+        Publish a report of the execution: see ikats.core.library.progress.report_progress()
+
+        :param progress: optional, default None: the progress, from 0.0 to 1.0
+        :type progress: float or None
+        :param message: optional, default None: information about the current step
+        :type message: str or None
+        :param partial_result: optional, default None: partial result, which can be encoded in JSON
+        :type partial_result: object
+        :return: True when published at once, False when pending (rate limitation) or ignored (channel closed)
+        :rtype: bool
+        """
+        event = {'date': time.time(),
+                 'progress': None if progress is None else float(progress),
+                 'message': None if message is None else str(message),
+                 'partial_result': partial_result}
+        with self.__condition:
+            if self.__state is not None:
+                return False
+            if self.__last_publish_date is not None and \
+                    event['date'] - self.__last_publish_date < self.__min_interval:
+                self.__pending = event
+                return False
+            self.__append(event)
+        self.__save_last_event()
+        return True
+
+    def close(self, state):
+        """
+        Close the channel at the end of the execution: the pending event is published
+
+        :param state: the final state of the execution
+        :type state: ikats.core.library.status.State
+        """
+        with self.__condition:
+            if self.__pending is not None:
+                self.__append(self.__pending)
+            self.__state = state
+            self.__close_date = time.time()
+            self.__condition.notify_all()
+        self.__save_last_event(force=True)
+
+    def get_events(self, since=0, timeout=None):
+        """
+        Get the events published after the event numbered since: long-polling when timeout is defined,
+        the call returns when a new event is published, when the channel is closed, or after timeout seconds.
+
+        :param since: optional, default 0: the seq of the last event already read
+        :type since: int
+        :param timeout: optional, default None: maximum waiting time in seconds, None for no waiting
+        :type timeout: float or None
+        :return: dict with keys:
+          - 'seq': the seq of the last published event,
+          - 'done': True when the channel is closed,
+          - 'state': the name of the final state, or None,
+          - 'events': the published events after since, each one a dict with keys seq, date, progress, message
+            and partial_result
+        :rtype: dict
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self.__condition:
+            while True:
+                delay = self.__get_pending_delay()
+                if delay is not None and delay <= 0:
+                    self.__append(self.__pending)
+
+                events = [dict(x) for x in self.__events if x['seq'] > since]
+                remaining = None if deadline is None else deadline - time.time()
+                if events or self.__state is not None or remaining is None or remaining <= 0:
+                    break
+
+                self.__condition.wait(remaining if delay is None else min(remaining, delay))
+
+            return {'seq': self.__seq,
+                    'done': self.__state is not None,
+                    'state': None if self.__state is None else self.__state.name,
+                    'events': events}
+
+
+class ProgressRegistry(object):
+    """
+    Registry of the progress channels of the executions handled by this process: a channel is opened by the
+    engine when the execution starts, closed when it ends, and kept during the retention delay
+    (setting IKATS_EXEC_PROGRESS['RETENTION'] in seconds) in order to be read by the clients.
+
+    Note: the channels are in memory: they are read from the process running the execution. The other
+    processes read the last event saved by the persist callback, see ProgressChannel.
+    """
+
+    __channels = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def __evict(cls, retention):
+        """
+        Remove the channels closed for more than retention seconds: the lock is already acquired
+        """
+        limit = time.time() - retention
+        for process_id in [key for key, channel in cls.__channels.items()
+                           if channel.close_date is not None and channel.close_date < limit]:
+            del cls.__channels[process_id]
+
+    @classmethod
+    def open(cls, process_id, persist=None):
+        """
+        Open the channel of the execution
+
+        :param process_id: the process_id of the execution
+        :type process_id: str
+        :param persist: optional, default None: function saving the last event: see ProgressChannel
+        :type persist: function or None
+        :return: the opened channel
+        :rtype: ProgressChannel
+        """
+        config = get_progress_config()
+        channel = ProgressChannel(process_id,
+                                  min_interval=config.get('MIN_INTERVAL', 0.5),
+                                  max_events=config.get('MAX_EVENTS', 100),
+                                  persist=persist,
+                                  persist_interval=config.get('PERSIST_INTERVAL', 5.0))
+        with cls.__lock:
+            cls.__evict(config.get('RETENTION', 600))
+            cls.__channels[str(process_id)] = channel
+        return channel
+
+    @classmethod
+    def get(cls, process_id):
+        """
+        Get the channel of the execution
+
+        :param process_id: the process_id of the execution
+        :type process_id: str
+        :return: the channel, or None if it is not handled by this process
+        :rtype: ProgressChannel or None
+        """
+        return cls.__channels.get(str(process_id), None)
+
+    @classmethod
+    def close(cls, process_id, state):
+        """
+        Close the channel of the execution, if opened
+
+        :param process_id: the process_id of the execution
+        :type process_id: str
+        :param state: the final state of the execution
+        :type state: ikats.core.library.status.State
+        """
+        channel = cls.get(process_id)
+        if channel is not None:
+            channel.close(state)
+
+    @classmethod
+    def publish_status(cls, process_id, progress_status):
+        """
+        Publish a progress status of the execution, if its channel is opened
+
+        :param process_id: the process_id of the execution
+        :type process_id: str
+        :param progress_status: the status: a number (the progress), a dict with optional keys progress,
+          message and partial_result, or any other object (the message)
+        :type progress_status: object
+        :return: True when published at once
+        :rtype: bool
+        """
+        channel = cls.get(process_id)
+        if channel is None or progress_status is None:
+            return False
+
+        if isinstance(progress_status, dict):
+            return channel.publish(progress=progress_status.get('progress', None),
+                                   message=progress_status.get('message', None),
+                                   partial_result=progress_status.get('partial_result', None))
+        elif isinstance(progress_status, numbers.Number):
+            return channel.publish(progress=progress_status)
+        return channel.publish(message=str(progress_status))
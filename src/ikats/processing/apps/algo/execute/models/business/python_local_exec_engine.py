@@ -15,13 +15,17 @@ limitations under the License.
 
 """
 
-import importlib
 import json
 import logging
 import sys
 
 from apps.algo.custom.models.business.check_engine import CheckEngine, CheckError
+from apps.algo.execute.models.business.cancellation import CANCEL_POLL_INTERVAL, MemoryWatch, get_exec_budget
 from apps.algo.execute.models.business.exec_engine import ExecEngine, EngineException, AlgoException
+from apps.algo.execute.models.business.exec_profile import ExecProfile
+from apps.algo.execute.models.business.prefetch import InputPrefetcher, get_lazy_inputs, get_prefetch_executor
+from ikats.core.library.cancellation import CancelledError, check_cancelled, get_cancel_token
+from ikats_processing.core.registry import CallableRegistry
 
 LOGGER = logging.getLogger(__name__)
 
@@ -66,8 +70,10 @@ class PythonLocalExecEngine(ExecEngine):
         # internal use: evaluated python function definition
         self.__evaluated_python_function = None
 
+        # the values already checked before the execution (ex: by execalgo.run) are not checked again
         self.__checker = CheckEngine(checked_resource=self.executable_algo.custom_algo,
-                                     checked_value_context="Running custom algo from " + self.__class__.__name__)
+                                     checked_value_context="Running custom algo from " + self.__class__.__name__,
+                                     check_cache=self.executable_algo.check_cache)
 
     def __evaluate_python_function(self):
         """
@@ -90,13 +96,9 @@ class PythonLocalExecEngine(ExecEngine):
             my_function = my_parsed_lib_path[1]
             self.add_msg("function name=%s" % my_function)
 
-            # !!! keep this variable my_module declared !!!
-            my_module = importlib.import_module(my_module_path)
-
-            evaluated_function_str = "my_module.%s" % my_function
-            self.add_msg('evaluating "%s"' % evaluated_function_str)
-
-            self.__evaluated_python_function = eval(evaluated_function_str)
+            # resolved once by the process: see CallableRegistry
+            self.add_msg('evaluating "%s"' % self.__lib_path)
+            self.__evaluated_python_function = CallableRegistry.resolve(self.__lib_path)
 
         except Exception as err:
             trace_back = sys.exc_info()[2]
@@ -110,6 +112,35 @@ class PythonLocalExecEngine(ExecEngine):
         split_after_module = lib_path.split("::")
         return split_after_module
 
+    def _load_python_function(self):
+        """
+        Hook called once by run_command, before consuming the inputs: evaluates the python function.
+        Subclasses may override it, with _call_python_function, in order to call the function elsewhere.
+
+        :raises EngineException: if the function cannot be evaluated
+        """
+        if self.__evaluated_python_function is None:
+            self.__evaluate_python_function()
+
+    def _get_lazy_inputs(self):
+        """
+        Hook giving the inputs passed as LazyValue to the python function: see prefetch.get_lazy_inputs()
+
+        :return: the names of the lazy inputs
+        :rtype: list of str
+        """
+        return get_lazy_inputs(self.executable_algo.custom_algo.implementation.name)
+
+    def _call_python_function(self, args):
+        """
+        Hook calling the python function with the consumed inputs
+
+        :param args: the input values, ordered according to the input profile
+        :type args: list
+        :return: the result of the function
+        """
+        return self.__evaluated_python_function(*args)
+
     def run_command(self):
         """
          Implements the calling of python function defined by self.executable_algo:
@@ -122,28 +153,54 @@ class PythonLocalExecEngine(ExecEngine):
                 - output result(s) are produced on self.executable_algo: using ExecutableAlgo::produce(...)
                 and  ExecutableAlgo::get_ordered_output_names(...)
         """
-        if self.__evaluated_python_function is None:
-            self.__evaluate_python_function()
+        self.__lib_path = self.executable_algo.custom_algo.implementation.library_address
+        self._load_python_function()
+
+        # timings of the phases: see ExecEngine.execute()
+        profile = self.executable_algo.profile
+
+        # the remote inputs are read concurrently, or lazily: the consume phases measure the waiting time
+        implem = self.executable_algo.custom_algo.implementation
+
+        # the memory budget is checked with the cancellation: see MemoryWatch
+        memory_limit = get_exec_budget(implem.name)['MEMORY_LIMIT']
+        token = get_cancel_token()
+        if memory_limit is not None and token is not None:
+            token.add_poll('memory', MemoryWatch(memory_limit), CANCEL_POLL_INTERVAL)
+        prefetcher = InputPrefetcher(self.executable_algo,
+                                     executor=get_prefetch_executor(),
+                                     lazy_inputs=self._get_lazy_inputs())
 
         args = []
         try:
             LOGGER.debug("self.executable_algo.get_ordered_input_names() : %s",
                          str(self.executable_algo.get_ordered_input_names()))
-            implem = self.executable_algo.custom_algo.implementation
+            prefetcher.start(self.executable_algo.get_ordered_input_names())
             for input_name in self.executable_algo.get_ordered_input_names():
 
+                check_cancelled()
                 profile_item = implem.find_by_name_input_item(input_name)
 
-                value_consumed = self.executable_algo.consume_value(input_name)
+                with profile.phase(ExecProfile.CONSUME, input_name):
+                    value_consumed = prefetcher.consume(input_name)
+
+                if prefetcher.is_lazy(input_name):
+                    # not read: not checked
+                    args.append(value_consumed)
+                    continue
 
-                self.__checker.check_type(profile_item, value_consumed)
-                status = self.__checker.check_domain(profile_item, value_consumed)
+                with profile.phase(ExecProfile.CHECK, input_name):
+                    self.__checker.check_type(profile_item, value_consumed)
+                    status = self.__checker.check_domain(profile_item, value_consumed)
 
                 if status.has_errors():
                     raise CheckError("CheckEngine has detected errors.", status)
 
                 args.append(value_consumed)
 
+        except CancelledError:
+            raise
+
         except CheckError as error:
             trace_back = sys.exc_info()[2]
             msg = "PythonLocalExecEngine aborted run: incorrect inputs " + \
@@ -165,10 +222,19 @@ class PythonLocalExecEngine(ExecEngine):
                 "PythonLocalExecEngine failed to consume inputs from executable algo [%s]" %
                 self.executable_algo, err_pre).with_traceback(trace_back)
 
+        finally:
+            # the readings of the inputs not consumed, after an error
+            prefetcher.cancel()
+
         result = tuple()
 
         try:
-            result = self.__evaluated_python_function(*args)
+            check_cancelled()
+            with profile.phase(ExecProfile.ALGORITHM):
+                result = self._call_python_function(args)
+
+        except CancelledError:
+            raise
 
         except Exception as err:
             trace_back = sys.exc_info()[2]
@@ -176,6 +242,9 @@ class PythonLocalExecEngine(ExecEngine):
                 "PythonLocalExecEngine received error from executed python function [%s] for algo [%s]" %
                 (self.__lib_path, self.executable_algo), err).with_traceback(trace_back)
 
+        # the results of an execution cancelled during the algorithm are not produced
+        check_cancelled()
+
         try:
 
             res_names = self.executable_algo.get_ordered_output_names()
@@ -185,8 +254,9 @@ class PythonLocalExecEngine(ExecEngine):
                 assert (len(result) == len(res_names))
 
                 for output_name, output_value in zip(res_names, result):
-                    self.executable_algo.produce_value(
-                        output_name, output_value)
+                    with profile.phase(ExecProfile.PRODUCE, output_name):
+                        self.executable_algo.produce_value(
+                            output_name, output_value)
 
             elif len(res_names) == 1:
                 LOGGER.info("Expected unique result, with name=" + res_names[0])
@@ -196,7 +266,8 @@ class PythonLocalExecEngine(ExecEngine):
                         "for implementation")
                     LOGGER.warning(str(self.executable_algo.get_custom_algo().get_implementation()))
                 else:
-                    self.executable_algo.produce_value(res_names[0], result)
+                    with profile.phase(ExecProfile.PRODUCE, res_names[0]):
+                        self.executable_algo.produce_value(res_names[0], result)
             else:
                 # void functions : like statistics builders ...
                 LOGGER.info(
@@ -0,0 +1,127 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import logging
+import threading
+
+from apps.algo.execute.models.business.cancellation import get_exec_budget
+from apps.algo.execute.models.business.exec_engine import EngineException
+from apps.algo.execute.models.business.python_local_exec_engine import PythonLocalExecEngine
+from ikats.core.library.cancellation import get_cancel_token
+from ikats.core.library.process_pool import ProcessPool
+
+LOGGER = logging.getLogger(__name__)
+
+# Lock protecting the creation of the pool shared by the process
+POOL_LOCK = threading.Lock()
+
+# Pool shared by the process: see get_process_pool()
+PROCESS_POOL = None
+
+
+def get_process_pool():
+    """
+    Get the pool of worker processes shared by the process, created on first call
+    from the django setting IKATS_EXEC_PROCESS_POOL (dict: optional keys WORKERS, PRELOAD)
+
+    :return: the pool
+    :rtype: ikats.core.library.process_pool.ProcessPool
+    """
+    global PROCESS_POOL
+    with POOL_LOCK:
+        if PROCESS_POOL is None:
+            config = get_pool_config()
+            PROCESS_POOL = ProcessPool(workers=config.get('WORKERS', 2),
+                                       preload=config.get('PRELOAD', ['numpy']))
+        return PROCESS_POOL
+
+
+def get_pool_config():
+    """
+    Get the django setting IKATS_EXEC_PROCESS_POOL
+    :return: the configuration of the pool and of the jobs limits
+    :rtype: dict
+    """
+    from django.conf import settings
+    return getattr(settings, 'IKATS_EXEC_PROCESS_POOL', {})
+
+
+class PythonPoolExecEngine(PythonLocalExecEngine):
+    """
+    This Engine executes the python function like PythonLocalExecEngine, except that the function is called
+    in a pre-forked worker process (see ikats.core.library.process_pool.ProcessPool), instead of the
+    django process:
+      - CPU-bound algorithms don't hold the GIL of the process handling the http requests
+      - a crash or a memory blowup of the algorithm only kills the worker process, which is replaced
+      - each call is limited in time (setting TIMEOUT in seconds) and memory (setting MEMORY_LIMIT in bytes,
+        or the MEMORY_LIMIT of the execution budget: see cancellation.get_exec_budget())
+      - the worker process is killed when the execution is cancelled (see ikats.core.library.cancellation)
+
+    The inputs are consumed, checked, and the outputs are produced, in the django process:
+    the input values and the results must be picklable.
+
+    Required on executable_algo.custom_algo.implementation:
+      - implementation.execution_plugin is
+        "apps.algo.execute.models.business.python_pool_exec_engine::PythonPoolExecEngine"
+      - implementation.library_address must respect syntax: <function module>::<function name>
+    """
+
+    def _load_python_function(self):
+        """
+        The function is evaluated in the worker process: only its path is checked here
+
+        :raises EngineException: if the path is not well formed
+        """
+        lib_path = self.executable_algo.custom_algo.implementation.library_address
+        if lib_path is None or len(lib_path.split("::")) != 2:
+            raise EngineException("PythonPoolExecEngine: unexpected python function [%s] from executable algo [%s]"
+                                  % (lib_path, self.executable_algo))
+        self.add_msg("lib_path=%s" % lib_path)
+
+    def _get_lazy_inputs(self):
+        """
+        The input values are sent to the worker process: no lazy input
+
+        :return: empty list
+        :rtype: list
+        """
+        return []
+
+    def _call_python_function(self, args):
+        """
+        Call the python function in a worker process, with the configured limits
+
+        :param args: the input values, ordered according to the input profile
+        :type args: list
+        :return: the result of the function
+        :raises WorkerTimeoutError: if the call exceeds the time limit
+        :raises WorkerCrashError: if the worker died during the call
+        :raises CancelledError: if the execution is cancelled during the call
+        """
+        config = get_pool_config()
+        implem = self.executable_algo.custom_algo.implementation
+        lib_path = implem.library_address
+
+        # the lowest defined memory limit applies
+        memory_limits = [x for x in [config.get('MEMORY_LIMIT', None), get_exec_budget(implem.name)['MEMORY_LIMIT']]
+                         if x is not None]
+
+        self.add_msg("calling %s in worker process" % lib_path)
+        return get_process_pool().run(function_path=lib_path,
+                                      args=tuple(args),
+                                      timeout=config.get('TIMEOUT', None),
+                                      memory_limit=min(memory_limits) if memory_limits else None,
+                                      cancel_token=get_cancel_token())
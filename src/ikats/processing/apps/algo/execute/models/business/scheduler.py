@@ -0,0 +1,398 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import os
+import threading
+
+from ikats.core.library.exception import IkatsException
+
+"""
+Module providing the scheduler of the asynchronous executions: bounded job queue and pool of workers
+"""
+
+LOGGER = logging.getLogger(__name__)
+
+# Lock protecting the creation of the scheduler shared by the process
+SCHEDULER_LOCK = threading.Lock()
+
+
+class QueueFullError(IkatsException):
+    """
+    Error raised when a job is submitted whereas the queue of the scheduler is full
+    """
+
+    def __init__(self, msg, cause=None):
+        """
+        Constructor
+        :param msg: error message
+        :type msg: str
+        """
+        super(QueueFullError, self).__init__(msg, cause)
+
+
+# Process having initialized its database connections: see init_worker_process()
+_INITIALIZED_PID = None
+
+
+def init_worker_process():
+    """
+    Initialization of a worker process (ExecScheduler.PROCESS_MODE), called once by process before its
+    first job: the database connections inherited from the parent process are closed,
+    each worker process opens its own connections.
+    """
+    global _INITIALIZED_PID
+    if _INITIALIZED_PID == os.getpid():
+        return
+    _INITIALIZED_PID = os.getpid()
+    try:
+        from django.db import connections
+    except ImportError:
+        return
+    connections.close_all()
+
+
+def run_in_worker_process(target, *args):
+    """
+    Function executed by the worker processes (ExecScheduler.PROCESS_MODE): call target(*args)
+    after the initialization of the process (the initializer argument of ProcessPoolExecutor
+    is not available before python 3.7)
+    """
+    init_worker_process()
+    return target(*args)
+
+
+def close_old_connections():
+    """
+    Close the database connections of the current thread which are broken or exceeded their maximum age
+    (django.db.close_old_connections), like django does around each request: called by the worker threads
+    around each job
+    """
+    try:
+        from django.db import close_old_connections as django_close_old_connections
+    except ImportError:
+        return
+    django_close_old_connections()
+
+
+class ExecJob(object):
+    """
+    Job handled by the ExecScheduler: call of target(*args), with the implementation name used by
+    the concurrency limits
+    """
+
+    def __init__(self, implem_name, target, args=(), job_id=None, on_cancel=None):
+        """
+        Constructor
+        :param implem_name: name of the executed implementation
+        :type implem_name: str
+        :param target: function called by the worker
+        :type target: callable
+        :param args: positional arguments of target
+        :type args: tuple
+        :param job_id: optional, default None: identifier of the job, used by logs (ex: the process_id)
+        :type job_id: str or None
+        :param on_cancel: optional, default None: function called without argument when the job is removed
+          from the queue by ExecScheduler.cancel()
+        :type on_cancel: callable or None
+        """
+        self.implem_name = implem_name
+        self.target = target
+        self.args = args
+        self.job_id = job_id
+        self.on_cancel = on_cancel
+
+    def __str__(self):
+        return "ExecJob id=%s implem=%s" % (self.job_id, self.implem_name)
+
+
+class ExecScheduler(object):
+    """
+    Scheduler of the asynchronous executions, replacing one thread started per request:
+      - the submitted jobs are queued: the queue is bounded by max_queued,
+        QueueFullError is raised when it is full
+      - the jobs are executed by a fixed pool of worker threads, or worker processes
+        (see THREAD_MODE and PROCESS_MODE)
+      - the number of jobs running at the same time for one implementation can be limited,
+        globally with implem_limit, or specifically with implem_limits
+      - fair ordering: the implementations having queued jobs are served in round-robin,
+        the jobs of one implementation are served in submission order
+
+    Scope: the scheduler lives in the memory of one process.
+      - with several server processes (ex: gunicorn workers), each process has its own scheduler:
+        workers, max_queued and the implementation limits apply by process, there is no global limit
+      - the queued jobs, and their inputs, are not persisted: they are lost when the process stops
+        (the QUEUED executions are switched to ENGINE_KO on next deployment, like the RUNNING ones)
+      - cancel() only reaches the jobs queued in this process
+    """
+
+    THREAD_MODE = 'thread'
+    PROCESS_MODE = 'process'
+
+    def __init__(self, workers=4, mode=THREAD_MODE, max_queued=200, implem_limit=None, implem_limits=None):
+        """
+        Constructor
+        :param workers: optional, default 4: number of jobs running at the same time
+        :type workers: int
+        :param mode: optional, default THREAD_MODE: THREAD_MODE or PROCESS_MODE.
+          With PROCESS_MODE, the target and arguments of the jobs must be picklable
+        :type mode: str
+        :param max_queued: optional, default 200: maximum number of jobs waiting for a worker
+        :type max_queued: int
+        :param implem_limit: optional, default None: maximum number of running jobs of each implementation,
+          None: no limit other than workers
+        :type implem_limit: int or None
+        :param implem_limits: optional, default None: specific limits by implementation name,
+          overriding implem_limit
+        :type implem_limits: dict or None
+        :raises ValueError: if a parameter is not valid
+        """
+        if mode not in [self.THREAD_MODE, self.PROCESS_MODE]:
+            raise ValueError("Unexpected mode %s: expecting %s or %s" % (mode, self.THREAD_MODE, self.PROCESS_MODE))
+        if workers < 1:
+            raise ValueError("Unexpected workers=%s: at least one worker is expected" % workers)
+        if max_queued < 1:
+            raise ValueError("Unexpected max_queued=%s: at least one queued job is expected" % max_queued)
+
+        self.__workers = workers
+        self.__mode = mode
+        self.__max_queued = max_queued
+        self.__implem_limit = implem_limit
+        self.__implem_limits = implem_limits or {}
+
+        # queued jobs by implementation name: the order of the keys defines the round-robin
+        self.__queues = OrderedDict()
+        self.__queued_count = 0
+        # running jobs by implementation name
+        self.__running = {}
+
+        self.__condition = threading.Condition()
+        self.__threads = []
+        self.__process_pool = None
+        self.__shutdown = False
+
+    @property
+    def mode(self):
+        """
+        The mode of the workers: THREAD_MODE or PROCESS_MODE
+        """
+        return self.__mode
+
+    def get_implem_limit(self, implem_name):
+        """
+        Get the maximum number of running jobs of one implementation
+        :param implem_name: name of the implementation
+        :type implem_name: str
+        :return: the limit, or None if unlimited
+        :rtype: int or None
+        """
+        return self.__implem_limits.get(implem_name, self.__implem_limit)
+
+    def submit(self, implem_name, target, args=(), job_id=None, on_cancel=None):
+        """
+        Queue a job: target(*args) will be called by a worker
+
+        :param implem_name: name of the executed implementation
+        :type implem_name: str
+        :param target: function called by the worker
+        :type target: callable
+        :param args: positional arguments of target
+        :type args: tuple
+        :param job_id: optional, default None: identifier of the job, used by logs (ex: the process_id)
+          and by cancel()
+        :type job_id: str or None
+        :param on_cancel: optional, default None: function called without argument when the job is removed
+          from the queue by cancel()
+        :type on_cancel: callable or None
+        :return: the queued job
+        :rtype: ExecJob
+        :raises QueueFullError: if max_queued jobs are already waiting
+        :raises RuntimeError: if the scheduler has been shut down
+        """
+        job = ExecJob(implem_name=implem_name, target=target, args=args, job_id=job_id, on_cancel=on_cancel)
+        with self.__condition:
+            if self.__shutdown:
+                raise RuntimeError("ExecScheduler is shut down: cannot submit %s" % job)
+            if self.__queued_count >= self.__max_queued:
+                raise QueueFullError("Too many queued executions (%s): cannot submit %s" %
+                                     (self.__queued_count, job))
+
+            self.__start_workers()
+
+            self.__queues.setdefault(implem_name, deque()).append(job)
+            self.__queued_count += 1
+            LOGGER.debug("Queued %s (%s queued)", job, self.__queued_count)
+            self.__condition.notify()
+        return job
+
+    def cancel(self, job_id):
+        """
+        Remove the queued job from the queue, then call its on_cancel function: no effect once the job
+        is started by a worker
+
+        :param job_id: identifier of the job, see submit()
+        :type job_id: str
+        :return: the removed job, or None if the job is not queued
+        :rtype: ExecJob or None
+        """
+        with self.__condition:
+            job = self.__remove_queued_job(job_id)
+        if job is not None and job.on_cancel is not None:
+            job.on_cancel()
+        return job
+
+    def __remove_queued_job(self, job_id):
+        """
+        Remove the queued job (called with the lock acquired)
+        :return: the removed job, or None if the job is not queued
+        :rtype: ExecJob or None
+        """
+        for implem_name, queue in self.__queues.items():
+            for job in queue:
+                if job.job_id == job_id:
+                    queue.remove(job)
+                    if not queue:
+                        del self.__queues[implem_name]
+                    self.__queued_count -= 1
+                    LOGGER.debug("Cancelled %s (%s queued)", job, self.__queued_count)
+                    return job
+        return None
+
+    def get_stats(self):
+        """
+        Get the current load of the scheduler
+        :return: the numbers of queued and running jobs, and the numbers of running jobs by implementation
+        :rtype: dict
+        """
+        with self.__condition:
+            return {
+                'queued': self.__queued_count,
+                'running': sum(self.__running.values()),
+                'running_by_implem': dict(self.__running)
+            }
+
+    def shutdown(self, wait=True):
+        """
+        Stop the workers once the queued jobs are executed. No more job can be submitted.
+        :param wait: optional, default True: True to wait for the end of the workers
+        :type wait: bool
+        """
+        with self.__condition:
+            self.__shutdown = True
+            self.__condition.notify_all()
+        if wait:
+            for thread in self.__threads:
+                thread.join()
+        if self.__process_pool is not None:
+            self.__process_pool.shutdown(wait=wait)
+
+    def __start_workers(self):
+        """
+        Start the workers on first submit (called with the lock acquired)
+        """
+        if self.__threads:
+            return
+        if self.__mode == self.PROCESS_MODE:
+            self.__process_pool = ProcessPoolExecutor(max_workers=self.__workers)
+        for index in range(self.__workers):
+            thread = threading.Thread(target=self.__work, name="ExecScheduler-%s" % index)
+            thread.daemon = True
+            thread.start()
+            self.__threads.append(thread)
+
+    def __pop_next_job(self):
+        """
+        Pop the next job which can be started (called with the lock acquired):
+        the first implementation under its limit, in round-robin order
+        :return: the job, or None if no job can be started
+        :rtype: ExecJob or None
+        """
+        for implem_name in list(self.__queues.keys()):
+            limit = self.get_implem_limit(implem_name)
+            if limit is not None and self.__running.get(implem_name, 0) >= limit:
+                continue
+
+            queue = self.__queues.pop(implem_name)
+            job = queue.popleft()
+            if queue:
+                # The implementation is moved at the end of the round-robin
+                self.__queues[implem_name] = queue
+            self.__queued_count -= 1
+            self.__running[implem_name] = self.__running.get(implem_name, 0) + 1
+            return job
+        return None
+
+    def __work(self):
+        """
+        Loop of a worker thread
+        """
+        while True:
+            with self.__condition:
+                job = self.__pop_next_job()
+                while job is None:
+                    if self.__shutdown and self.__queued_count == 0:
+                        return
+                    self.__condition.wait()
+                    job = self.__pop_next_job()
+
+            try:
+                LOGGER.debug("Starting %s", job)
+                if self.__process_pool is not None:
+                    self.__process_pool.submit(run_in_worker_process, job.target, *job.args).result()
+                else:
+                    close_old_connections()
+                    try:
+                        job.target(*job.args)
+                    finally:
+                        close_old_connections()
+            except Exception as error:
+                LOGGER.error("Unexpected error running %s", job)
+                LOGGER.exception(error)
+            finally:
+                with self.__condition:
+                    self.__running[job.implem_name] -= 1
+                    if self.__running[job.implem_name] == 0:
+                        del self.__running[job.implem_name]
+                    # A job blocked by its implementation limit may be started now
+                    self.__condition.notify_all()
+
+
+def get_exec_scheduler():
+    """
+    Get the scheduler of asynchronous executions shared by the process, created on first call
+    from the django setting IKATS_EXEC_SCHEDULER (dict: optional keys WORKERS, MODE, MAX_QUEUED,
+    IMPLEM_LIMIT, IMPLEM_LIMITS: see ExecScheduler constructor)
+    :return: the scheduler
+    :rtype: ExecScheduler
+    """
+    global EXEC_SCHEDULER
+    with SCHEDULER_LOCK:
+        if EXEC_SCHEDULER is None:
+            from django.conf import settings
+            config = getattr(settings, 'IKATS_EXEC_SCHEDULER', {})
+            EXEC_SCHEDULER = ExecScheduler(workers=config.get('WORKERS', 4),
+                                           mode=config.get('MODE', ExecScheduler.THREAD_MODE),
+                                           max_queued=config.get('MAX_QUEUED', 200),
+                                           implem_limit=config.get('IMPLEM_LIMIT', None),
+                                           implem_limits=config.get('IMPLEM_LIMITS', None))
+            LOGGER.info("ExecScheduler created with config=%s", config)
+        return EXEC_SCHEDULER
+
+
+# Scheduler shared by the process: see get_exec_scheduler()
+EXEC_SCHEDULER = None
@@ -16,7 +16,6 @@ limitations under the License.
 """
 import json
 import logging
-import threading
 import time
 
 from apps.algo.catalogue.models.business.factory import FactoryCatalogue
@@ -26,11 +25,15 @@ from apps.algo.custom.models.business.check_engine import CheckEngine
 from apps.algo.custom.models.business.check_engine import CheckError
 from apps.algo.custom.models.orm.algo import CustomizedAlgoDao
 from apps.algo.execute.models.business.exec_engine import ExecStatus
+from apps.algo.execute.models.business.exec_profile import ExecProfile
 from apps.algo.execute.models.business.exec_status import ExecutionStatus
 from apps.algo.execute.models.business.facade import FacadeExecution
 from apps.algo.execute.models.business.factory import FactoryExecAlgo
+from apps.algo.execute.models.business.memo import ExecMemo
+from apps.algo.execute.models.business.scheduler import get_exec_scheduler, QueueFullError
 from apps.algo.execute.models.orm.algo import ExecutableAlgoDao
 from ikats.core.library.exception import IkatsInputError, IkatsNotFoundError, IkatsException
+from ikats.core.library.status import State as EnumState
 
 """
 Module grouping scripts which are only producing results into
@@ -41,7 +44,8 @@ Note: no result is produced in process data of Non Temporal Database.
 LOGGER = logging.getLogger(__name__)
 
 
-def run(algo_name, arg_names, arg_values, asynchro=False, is_customized_algo=False, run_debug=True):
+def run(algo_name, arg_names, arg_values, asynchro=False, is_customized_algo=False, run_debug=True,
+        bypass_memo=False):
     """
     Launch the algorithm for the specified Implementation/CustomizedAlgo
 
@@ -56,6 +60,9 @@ def run(algo_name, arg_names, arg_values, asynchro=False, is_customized_algo=Fal
     :type is_customized_algo: boolean
     :param run_debug: TODO
     :type run_debug: boolean
+    :param bypass_memo: optional, default False: True forces the execution, even if the memoization is enabled
+      and a previous successful run has the same definition (see ExecMemo)
+    :type bypass_memo: boolean
     :return: <status> sums up the execution status:
         | You can get from status the process ID, the (error) message etc. : see ExecutionStatus documentation.
     :rtype: apps.algo.execute.models.business.exec_status.ExecutionStatus
@@ -77,16 +84,19 @@ def run(algo_name, arg_names, arg_values, asynchro=False, is_customized_algo=Fal
 
     # CheckEngine status generated when check have been applied
     status = None
+    # timings of the phases, completed by the engine
+    profile = ExecProfile()
     try:
-        if is_customized_algo:
-            my_custom = CustomizedAlgoDao.find_business_elem_with_name(algo_name)[0]
-            # ... may raise CustomizedAlgoDao.DoesNotExist
-            my_implementation = my_custom.implementation
+        with profile.phase(ExecProfile.CATALOGUE):
+            if is_customized_algo:
+                my_custom = CustomizedAlgoDao.find_cached_business_elem_with_name(algo_name)[0]
+                # ... may raise CustomizedAlgoDao.DoesNotExist
+                my_implementation = my_custom.implementation
 
-        else:
-            my_custom = None
-            my_implementation = ImplementationDao.find_business_elem_with_name(algo_name)[0]
-            # ... may raise ImplementationDao.DoesNotExist
+            else:
+                my_custom = None
+                my_implementation = ImplementationDao.find_cached_business_elem_with_name(algo_name)[0]
+                # ... may raise ImplementationDao.DoesNotExist
 
         my_script_name = my_script_name + " on " + my_implementation.name
 
@@ -95,25 +105,43 @@ def run(algo_name, arg_names, arg_values, asynchro=False, is_customized_algo=Fal
                                                        def_resource)
         checker = CheckEngine(checked_resource=def_resource, checked_value_context=context, check_status=None)
 
-        completed_arg_names, completed_data_sources, output_names, receivers = __prepare_execution(
+        completed_arg_names, completed_data_sources, output_names, receivers, resolved_inputs = __prepare_execution(
             algo_name,
             arg_names,
             arg_values,
             execution_status,
             my_implementation,
             my_custom,
-            checker)
+            checker,
+            profile)
 
         if checker.has_errors():
             # ExecutableAlgo is not created, not executed
             raise CheckError(msg=context, status=checker.get_check_status())
 
-        if asynchro is True:
+        memo_key = None
+        if bypass_memo is False and ExecMemo.is_enabled():
+            memo_key = ExecMemo.compute_key(my_implementation, resolved_inputs)
+
+        memoized_algo = None
+        if memo_key is not None:
+            memoized_algo = ExecMemo.find(memo_key, my_implementation)
+        if memoized_algo is not None:
+            # the results of the previous successful run are reused: no execution
+            run_msg = "Reused results of process_id={0}: {1} with implementation={2}".format(
+                memoized_algo.get_process_id(), my_script_name, my_implementation.name)
+            LOGGER.info(run_msg)
+            execution_status.set_algo(memoized_algo)
+            execution_status.add_msg(run_msg)
+
+        elif asynchro is True:
             # asynchronous execution
 
-            # creation of an executable algorithm DAO in order to get an id
+            # creation of an executable algorithm DAO in order to get an id:
+            # its state is QUEUED until a worker of the scheduler starts the execution
             exec_algo = FacadeExecution.factory.build_exec_algo_without_custom_without_data_connectors(
                 my_implementation)
+            exec_algo.state = EnumState.QUEUED
 
             # business object is updated with db_id created by DAO
             exec_algo = ExecutableAlgoDao.create(exec_algo, False)
@@ -121,21 +149,33 @@ def run(algo_name, arg_names, arg_values, asynchro=False, is_customized_algo=Fal
 
             exec_algo_db_id = exec_algo.get_process_id()
 
-            # Create a thread for the algorithm execution itself
-            run_msg = "Running asynchronous: {0} with implementation={1}".format(my_script_name, my_implementation.name)
+            # Queue the algorithm execution itself
+            run_msg = "Queued asynchronous: {0} with implementation={1}".format(my_script_name, my_implementation.name)
             LOGGER.info(run_msg)
 
             execution_status.add_msg(run_msg)
 
-            threading.Thread(target=FacadeExecution.execute_algo_without_custom,
-                             args=(my_implementation,
-                                   completed_arg_names,
-                                   completed_data_sources,
-                                   output_names,
-                                   receivers,
-                                   "" + exec_algo_db_id,
-                                   run_debug,
-                                   True)).start()
+            try:
+                get_exec_scheduler().submit(implem_name=my_implementation.name,
+                                            target=FacadeExecution.execute_algo_without_custom,
+                                            args=(my_implementation,
+                                                  completed_arg_names,
+                                                  completed_data_sources,
+                                                  output_names,
+                                                  receivers,
+                                                  "" + exec_algo_db_id,
+                                                  run_debug,
+                                                  True,
+                                                  memo_key,
+                                                  checker.get_check_cache(),
+                                                  profile),
+                                            job_id=exec_algo_db_id)
+            except QueueFullError:
+                # The run is rejected: the created ExecutableAlgo is closed
+                ExecutableAlgoDao.update_state(process_id=exec_algo_db_id,
+                                               state=EnumState.ENGINE_KO,
+                                               end_execution_date=time.time())
+                raise
         else:
             # synchronous execution
             run_msg = "Running synchronous: {0} with implementation={1}".format(my_script_name, my_implementation.name)
@@ -151,7 +191,10 @@ def run(algo_name, arg_names, arg_values, asynchro=False, is_customized_algo=Fal
                 output_data_receivers=receivers,
                 exec_algo_db_id=None,
                 run_debug=run_debug,
-                dao_managed=True)
+                dao_managed=True,
+                memo_key=memo_key,
+                check_cache=checker.get_check_cache(),
+                profile=profile)
 
             execution_status.set_algo(exec_algo)
             # replace local internal status by the engine status: more interesting
@@ -218,10 +261,11 @@ def __get_init_context(implementation, customized_algo):
     return glob_msg
 
 
-def __check_value(profile_item, value, checker):
+def __check_value(profile_item, value, checker, profile):
     if isinstance(profile_item, Parameter):
-        checker.check_type(profile_item, value)
-        checker.check_domain(profile_item, value)
+        with profile.phase(ExecProfile.CHECK, profile_item.name):
+            checker.check_type(profile_item, value)
+            checker.check_domain(profile_item, value)
 
 
 def __prepare_execution(algo_name,
@@ -230,7 +274,8 @@ def __prepare_execution(algo_name,
                         execution_status,
                         implementation,
                         customized_algo,
-                        checker):
+                        checker,
+                        profile):
     # Init if possible: customized_alp identifier
     customized_algo_id = None
     if customized_algo is not None:
@@ -245,6 +290,8 @@ def __prepare_execution(algo_name,
     # Fulfill the argument lists with private arguments
     completed_arg_names = []
     completed_data_sources = []
+    # public input values, once resolved: definition of the run used by the memoization
+    resolved_inputs = {}
     # input_profile from catalogue is ordered by order_index
     for cat_input in implementation.input_profile:
         name_cat_input = cat_input.name
@@ -301,13 +348,15 @@ def __prepare_execution(algo_name,
             execution_status.set_error_with_msg(IkatsInputError(msg),
                                                 __get_init_context(implementation, customized_algo))
         else:
-            __check_value(cat_input, my_init, checker)
+            __check_value(cat_input, my_init, checker, profile)
 
         completed_arg_names.append(name_cat_input)
 
         if scope == "private":
             completed_data_sources.append(my_init)
         else:
+            resolved_inputs[name_cat_input] = my_init
+
             # required: transform the client value into the data_source
             #
             # specify a unique data receiver/source name
@@ -348,7 +397,7 @@ def __prepare_execution(algo_name,
                                                                   my_data_receiver_ref)
         receivers.append(process_data_receiver)
 
-    return completed_arg_names, completed_data_sources, output_names, receivers
+    return completed_arg_names, completed_data_sources, output_names, receivers, resolved_inputs
 
 
 def get_algo_db(process_id):
@@ -0,0 +1,531 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import functools
+import logging
+import threading
+import time
+
+from apps.algo.catalogue.models.business.factory import FactoryCatalogue
+from apps.algo.catalogue.models.business.profile import Parameter
+from apps.algo.custom.models.business.check_engine import CheckEngine, CheckError
+from apps.algo.execute.models.business.facade import FacadeExecution
+from apps.algo.execute.models.business.factory import FactoryExecAlgo
+from apps.algo.execute.models.business.scheduler import ExecScheduler, get_exec_scheduler
+from apps.algo.execute.models.orm.algo import ExecutableAlgoDao
+from ikats.core.library.exception import IkatsInputError
+from ikats.core.library.status import State as EnumState
+
+"""
+Module providing the execution of workflows: DAG of implementations whose intermediate values
+are passed in memory, without process data round trips.
+"""
+
+LOGGER = logging.getLogger(__name__)
+
+
+class NodeOutput(object):
+    """
+    Reference to one output of one node of a workflow
+    """
+
+    SEPARATOR = "/"
+
+    def __init__(self, node_id, output_name):
+        """
+        Constructor
+        :param node_id: identifier of the node
+        :type node_id: str
+        :param output_name: name of the output in the catalogue
+        :type output_name: str
+        """
+        self.node_id = node_id
+        self.output_name = output_name
+
+    @classmethod
+    def parse(cls, reference):
+        """
+        Parse the reference <node id>/<output name>
+        :param reference: the reference
+        :type reference: str
+        :return: the parsed reference
+        :rtype: NodeOutput
+        :raises IkatsInputError: if the reference is not well formed
+        """
+        parsed = str(reference).split(cls.SEPARATOR)
+        if len(parsed) != 2 or not parsed[0] or not parsed[1]:
+            raise IkatsInputError("Unexpected node output reference [%s]: expecting <node id>%s<output name>" %
+                                  (reference, cls.SEPARATOR))
+        return cls(parsed[0], parsed[1])
+
+    @property
+    def key(self):
+        """
+        Hashable identifier of the reference
+        """
+        return self.node_id, self.output_name
+
+    def __str__(self):
+        return "%s%s%s" % (self.node_id, self.SEPARATOR, self.output_name)
+
+
+class WorkflowNode(object):
+    """
+    Node of a workflow: execution of one implementation, whose inputs are either values, as defined by
+    the clients of execalgo.run, or NodeOutput references to the outputs of other nodes
+    """
+
+    def __init__(self, node_id, implementation, inputs=None):
+        """
+        Constructor
+        :param node_id: identifier of the node, unique in the workflow
+        :type node_id: str
+        :param implementation: the executed implementation
+        :type implementation: apps.algo.catalogue.models.business.implem.Implementation
+        :param inputs: optional, default None: values or NodeOutput references, by input name.
+          The missing public inputs are initialized from their default value, the private inputs
+          are initialized by the server.
+        :type inputs: dict or None
+        """
+        self.node_id = node_id
+        self.implementation = implementation
+        self.inputs = dict(inputs or {})
+
+    def get_references(self):
+        """
+        :return: the references to the outputs of other nodes
+        :rtype: list of NodeOutput
+        """
+        return [x for x in self.inputs.values() if isinstance(x, NodeOutput)]
+
+    def __str__(self):
+        return "WorkflowNode id=%s implementation=%s" % (self.node_id, self.implementation.name)
+
+
+class Workflow(object):
+    """
+    Workflow: directed acyclic graph of WorkflowNode.
+
+    The values produced by a node are passed in memory to the nodes consuming them: only the sinks,
+    outputs explicitly requested, are written as usual (process data ...), with the process_id of their node.
+    The value of an intermediate output is released as soon as its consumers have started.
+
+    Each node is executed as one ExecutableAlgo, created with state QUEUED when the workflow is started:
+    its state can be followed with its process_id. The nodes are executed by the workers of the
+    ExecScheduler (in THREAD_MODE: the values are shared in memory): the independent branches run in parallel.
+    When a node fails, the nodes depending on it are not executed: their state is ENGINE_KO.
+    """
+
+    def __init__(self, nodes, sinks):
+        """
+        Constructor: checks the workflow
+
+        :param nodes: the nodes
+        :type nodes: list of WorkflowNode
+        :param sinks: the outputs to write
+        :type sinks: list of NodeOutput
+        :raises IkatsInputError: if the workflow is not valid: duplicated node identifiers, unknown
+          inputs or outputs, undefined inputs, cycles
+        """
+        self.nodes = WorkflowNodes(nodes)
+        self.sinks = list(sinks)
+        self.__check()
+
+    def __check(self):
+        """
+        Check the references and the inputs, then the absence of cycle
+        """
+        for node in self.nodes.values():
+            implementation = node.implementation
+            input_names = [x.name for x in implementation.input_profile]
+            for input_name in node.inputs:
+                if input_name not in input_names:
+                    raise IkatsInputError("Workflow: no input named %s in %s" % (input_name, node))
+                if implementation.find_by_name_input_item(input_name).data_format in \
+                        FactoryCatalogue.IKATS_PRIVATE_ARGTYPES:
+                    raise IkatsInputError("Workflow: private input %s cannot be defined in %s" % (input_name, node))
+
+            for cat_input in implementation.input_profile:
+                if (cat_input.name not in node.inputs and
+                        cat_input.data_format not in FactoryCatalogue.IKATS_PRIVATE_ARGTYPES and
+                        cat_input.default_value is None):
+                    raise IkatsInputError("Workflow: undefined input %s in %s" % (cat_input.name, node))
+
+            for reference in node.get_references():
+                self.__check_reference(reference)
+
+        for reference in self.sinks:
+            self.__check_reference(reference)
+
+        # Kahn's algorithm: every node must be sorted
+        if len(self.get_sorted_node_ids()) != len(self.nodes):
+            raise IkatsInputError("Workflow: the graph of the nodes has a cycle")
+
+    def __check_reference(self, reference):
+        if reference.node_id not in self.nodes:
+            raise IkatsInputError("Workflow: unknown node in reference %s" % reference)
+        output_names = [x.name for x in self.nodes[reference.node_id].implementation.output_profile]
+        if reference.output_name not in output_names:
+            raise IkatsInputError("Workflow: unknown output in reference %s" % reference)
+
+    def __check_values(self):
+        """
+        Check the type and the domain of the parameters of every node, values defined by the client or
+        default values, as execalgo.run does before any execution: the values read from other nodes are
+        not known before the run
+        """
+        for node in self.nodes.values():
+            implementation = node.implementation
+            context = "Workflow: initial check failed on inputs of %s" % node
+            checker = CheckEngine(checked_resource=implementation, checked_value_context=context, check_status=None)
+            for cat_input in implementation.input_profile:
+                if not isinstance(cat_input, Parameter):
+                    continue
+                value = node.inputs.get(cat_input.name, cat_input.default_value)
+                if isinstance(value, NodeOutput):
+                    continue
+                checker.check_type(cat_input, value)
+                checker.check_domain(cat_input, value)
+            if checker.has_errors():
+                raise CheckError(msg=context, status=checker.get_check_status())
+
+    def get_dependencies(self, node_id):
+        """
+        :param node_id: identifier of the node
+        :type node_id: str
+        :return: the identifiers of the nodes whose outputs are consumed by the node
+        :rtype: set
+        """
+        return set(x.node_id for x in self.nodes[node_id].get_references())
+
+    def get_sorted_node_ids(self):
+        """
+        :return: the identifiers of the nodes in a topological order (cycles excluded)
+        :rtype: list
+        """
+        remaining = {node_id: self.get_dependencies(node_id) for node_id in self.nodes}
+        sorted_ids = []
+        ready = [node_id for node_id, dependencies in remaining.items() if not dependencies]
+        while ready:
+            node_id = ready.pop(0)
+            sorted_ids.append(node_id)
+            del remaining[node_id]
+            for other_id, dependencies in remaining.items():
+                if node_id in dependencies:
+                    dependencies.discard(node_id)
+                    if not dependencies:
+                        ready.append(other_id)
+        return sorted_ids
+
+    def start(self, scheduler=None):
+        """
+        Start the execution of the workflow
+
+        :param scheduler: optional, default None: the scheduler executing the nodes, in THREAD_MODE.
+          Default is the scheduler shared by the process, see get_exec_scheduler()
+        :type scheduler: ExecScheduler or None
+        :return: the started execution
+        :rtype: WorkflowRun
+        :raises ValueError: if the scheduler is in PROCESS_MODE: the values cannot be shared in memory
+        :raises CheckError: if the parameters of a node are not valid: no node is executed
+        """
+        my_scheduler = scheduler or get_exec_scheduler()
+        if my_scheduler.mode != ExecScheduler.THREAD_MODE:
+            raise ValueError("Workflow: the in-memory dataflow requires a scheduler in THREAD_MODE")
+
+        self.__check_values()
+
+        workflow_run = WorkflowRun(self, my_scheduler)
+        workflow_run.start()
+        return workflow_run
+
+    def run(self, scheduler=None, timeout=None):
+        """
+        Execute the workflow and wait for its end: see start()
+
+        :param scheduler: optional, default None: see start()
+        :type scheduler: ExecScheduler or None
+        :param timeout: optional, default None: maximum waiting time in seconds, None for no limit
+        :type timeout: float or None
+        :return: the execution, ended unless the timeout expired
+        :rtype: WorkflowRun
+        """
+        workflow_run = self.start(scheduler)
+        workflow_run.wait(timeout)
+        return workflow_run
+
+
+class WorkflowNodes(dict):
+    """
+    Nodes of a workflow by identifier
+    """
+
+    def __init__(self, nodes):
+        super(WorkflowNodes, self).__init__()
+        for node in nodes:
+            if node.node_id in self:
+                raise IkatsInputError("Workflow: duplicated node identifier %s" % node.node_id)
+            self[node.node_id] = node
+
+
+class WorkflowRun(object):
+    """
+    Execution of a Workflow: see Workflow.start()
+    """
+
+    def __init__(self, workflow, scheduler):
+        """
+        Constructor
+        :param workflow: the executed workflow
+        :type workflow: Workflow
+        :param scheduler: the scheduler, in THREAD_MODE
+        :type scheduler: ExecScheduler
+        """
+        self.__workflow = workflow
+        self.__scheduler = scheduler
+        self.__condition = threading.Condition()
+
+        self.__process_ids = {}
+        self.__states = {node_id: EnumState.QUEUED for node_id in workflow.nodes}
+        self.__unfinished_dependencies = {node_id: workflow.get_dependencies(node_id)
+                                          for node_id in workflow.nodes}
+
+        # values kept in memory: number of consumers not yet started, by NodeOutput key
+        self.__values = {}
+        self.__consumers = {}
+        for node in workflow.nodes.values():
+            for reference in node.get_references():
+                self.__consumers[reference.key] = self.__consumers.get(reference.key, 0) + 1
+
+        # written sinks: identifier of the written data, by NodeOutput reference
+        self.__sink_results = {}
+
+    def start(self):
+        """
+        Create the ExecutableAlgo of every node, then submit the nodes without dependency
+        """
+        for node_id in self.__workflow.get_sorted_node_ids():
+            exec_algo = FactoryExecAlgo.build_exec_algo_without_custom_without_data_connectors(
+                self.__workflow.nodes[node_id].implementation)
+            exec_algo.state = EnumState.QUEUED
+            self.__process_ids[node_id] = ExecutableAlgoDao.create(exec_algo, False).get_process_id()
+
+        with self.__condition:
+            ready = [x for x, dependencies in self.__unfinished_dependencies.items() if not dependencies]
+        for node_id in ready:
+            self.__submit(node_id)
+
+    def __submit(self, node_id):
+        try:
+            self.__scheduler.submit(implem_name=self.__workflow.nodes[node_id].implementation.name,
+                                    target=self.__run_node,
+                                    args=(node_id,),
+                                    job_id=self.__process_ids[node_id],
+                                    on_cancel=functools.partial(self.__end_node, node_id, EnumState.CANCELLED))
+        except Exception as error:
+            LOGGER.error("Workflow: failed to submit node %s", node_id)
+            LOGGER.exception(error)
+            ExecutableAlgoDao.update_state(process_id=self.__process_ids[node_id],
+                                           state=EnumState.ENGINE_KO,
+                                           end_execution_date=time.time())
+            self.__end_node(node_id, EnumState.ENGINE_KO)
+
+    def __get_input(self, node, cat_input, consumed_refs):
+        """
+        Evaluate one input of the node: value or data source.
+        The key of each NodeOutput read from memory is appended to consumed_refs
+        """
+        if cat_input.data_format in FactoryCatalogue.IKATS_PRIVATE_ARGTYPES:
+            return FactoryExecAlgo.init_private_arg_value(cat_input.data_format)
+
+        if cat_input.name not in node.inputs:
+            return cat_input.default_value
+
+        value = node.inputs[cat_input.name]
+        if isinstance(value, NodeOutput):
+            with self.__condition:
+                consumed = self.__values[value.key]
+                self.__consumers[value.key] -= 1
+                if self.__consumers[value.key] == 0:
+                    # the last consumer has the value: released
+                    del self.__values[value.key]
+                consumed_refs.append(value.key)
+            return consumed
+
+        return FactoryExecAlgo.get_data_source(implem=node.implementation,
+                                               input_def=cat_input,
+                                               client_value=value,
+                                               reference="in_wf_%s_%s" % (node.node_id, cat_input.name))
+
+    def __run_node(self, node_id):
+        """
+        Execute one node: target of the job submitted to the scheduler
+        """
+        node = self.__workflow.nodes[node_id]
+        implementation = node.implementation
+        state = EnumState.ENGINE_KO
+        consumed_refs = []
+        try:
+            input_names = [x.name for x in implementation.input_profile]
+            input_values = [self.__get_input(node, x, consumed_refs) for x in implementation.input_profile]
+            output_names = [x.name for x in implementation.output_profile]
+
+            # SimpleDataReceiver on each output: the values are kept in memory
+            exec_algo = FactoryExecAlgo.build_exec_algo_without_custom(implementation=implementation,
+                                                                       input_names=input_names,
+                                                                       input_values_or_sources=input_values,
+                                                                       output_names=output_names,
+                                                                       output_receivers=[None] * len(output_names))
+            exec_algo.set_process_id(self.__process_ids[node_id])
+
+            exec_algo, _ = FacadeExecution.execute_algo(executable_algo=exec_algo, dao_managed=True)
+            state = exec_algo.state
+
+            if state == EnumState.ALGO_OK:
+                self.__keep_outputs(node, exec_algo)
+
+        except Exception as error:
+            LOGGER.error("Workflow: failure of node %s", node)
+            LOGGER.exception(error)
+            ExecutableAlgoDao.update_state(process_id=self.__process_ids[node_id],
+                                           state=EnumState.ENGINE_KO,
+                                           end_execution_date=time.time())
+            state = EnumState.ENGINE_KO
+        finally:
+            # when the evaluation of the inputs failed partway: the unread values are released
+            self.__release_inputs(node_id, consumed_refs)
+            self.__end_node(node_id, state)
+
+    def __keep_outputs(self, node, exec_algo):
+        """
+        Keep in memory the outputs consumed by other nodes, and write the sinks of the node
+        """
+        implementation = node.implementation
+        for cat_output in implementation.output_profile:
+            reference = NodeOutput(node.node_id, cat_output.name)
+            value = exec_algo.get_data_receiver(cat_output.name).get_received_value()
+
+            with self.__condition:
+                if self.__consumers.get(reference.key, 0) > 0:
+                    self.__values[reference.key] = value
+
+            if any(x.key == reference.key for x in self.__workflow.sinks):
+                writer = FactoryExecAlgo.get_data_receiver(implementation, cat_output, cat_output.name)
+                writer.set_process_id(exec_algo.get_process_id())
+                writer.send_value(value)
+                written_id = writer.get_written_data_id() if hasattr(writer, 'get_written_data_id') else None
+                with self.__condition:
+                    self.__sink_results[str(reference)] = {'process_id': exec_algo.get_process_id(),
+                                                           'data_id': written_id}
+
+    def __end_node(self, node_id, state):
+        """
+        Record the end of the node, submit the nodes which are ready, or cancel the nodes depending on a failure
+        """
+        ready = []
+        cancelled = []
+        with self.__condition:
+            self.__states[node_id] = state
+            for other_id, dependencies in self.__unfinished_dependencies.items():
+                if node_id not in dependencies or self.__states[other_id] != EnumState.QUEUED:
+                    continue
+                if state == EnumState.ALGO_OK:
+                    dependencies.discard(node_id)
+                    if not dependencies:
+                        ready.append(other_id)
+                else:
+                    # ended at once: not cancelled twice when several dependencies fail
+                    self.__states[other_id] = EnumState.ENGINE_KO
+                    cancelled.append(other_id)
+            self.__condition.notify_all()
+
+        for other_id in cancelled:
+            LOGGER.warning("Workflow: node %s not executed: node %s failed", other_id, node_id)
+            ExecutableAlgoDao.update_state(process_id=self.__process_ids[other_id],
+                                           state=EnumState.ENGINE_KO,
+                                           end_execution_date=time.time())
+            self.__release_inputs(other_id)
+            self.__end_node(other_id, EnumState.ENGINE_KO)
+
+        for other_id in ready:
+            self.__submit(other_id)
+
+    def __release_inputs(self, node_id, consumed_refs=()):
+        """
+        Release the values which were kept for a node, except the values already read by the node:
+        consumed_refs, keys of NodeOutput
+        """
+        unread = list(consumed_refs)
+        with self.__condition:
+            for reference in self.__workflow.nodes[node_id].get_references():
+                if reference.key in unread:
+                    unread.remove(reference.key)
+                    continue
+                self.__consumers[reference.key] -= 1
+                if self.__consumers[reference.key] == 0:
+                    self.__values.pop(reference.key, None)
+
+    def is_done(self):
+        """
+        :return: True when every node is ended
+        :rtype: bool
+        """
+        with self.__condition:
+            return all(x != EnumState.QUEUED for x in self.__states.values())
+
+    def wait(self, timeout=None):
+        """
+        Wait for the end of every node
+        :param timeout: optional, default None: maximum waiting time in seconds, None for no limit
+        :type timeout: float or None
+        :return: True when every node is ended
+        :rtype: bool
+        """
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: all(x != EnumState.QUEUED for x in self.__states.values()), timeout)
+
+    def is_successful(self):
+        """
+        :return: True when every node is ended with state ALGO_OK
+        :rtype: bool
+        """
+        with self.__condition:
+            return all(x == EnumState.ALGO_OK for x in self.__states.values())
+
+    def get_process_ids(self):
+        """
+        :return: the process_id of the ExecutableAlgo of each node, by node identifier
+        :rtype: dict
+        """
+        return dict(self.__process_ids)
+
+    def get_states(self):
+        """
+        :return: the state of each node, by node identifier: QUEUED until the node is ended
+        :rtype: dict
+        """
+        with self.__condition:
+            return dict(self.__states)
+
+    def get_sink_results(self):
+        """
+        :return: the written sinks: dict with keys process_id and data_id (identifier of the written
+          process data, when available), by reference <node id>/<output name>
+        :rtype: dict
+        """
+        with self.__condition:
+            return dict(self.__sink_results)
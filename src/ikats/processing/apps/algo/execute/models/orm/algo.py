@@ -14,11 +14,13 @@ See the License for the specific language governing permissions and
 limitations under the License.
 
 """
+import json
 import logging
 
 from django.db import models as djmodels
 
 from apps.algo.execute.models.business.algo import ExecutableAlgo
+from apps.algo.execute.models.business.exec_profile import ExecProfile
 
 # For managed decimal numbers in seconds since EPOCH date: ex 1453974002.0023456
 # - EPOCH_SECOND_DECIMAL_PLACES defines precision after comma: 7 for 1453974002.0023456
@@ -33,6 +35,9 @@ EPOCH_SECOND_DECIMAL_DIGITS = EPOCH_SECOND_INTEGER_DIGITS + EPOCH_SECOND_DECIMAL
 
 LOGGER = logging.getLogger(__name__)
 
+# Fields written by the state transitions of an execution: see ExecutableAlgoDao.update_transition()
+TRANSITION_FIELDS = ['state', 'start_execution_date', 'end_execution_date', 'profile']
+
 
 class ExecutableAlgoDao(djmodels.Model):
     """
@@ -59,9 +64,22 @@ class ExecutableAlgoDao(djmodels.Model):
         decimal_places=EPOCH_SECOND_DECIMAL_PLACES)
 
     state = djmodels.IntegerField(
-        help_text="State: INIT, RUN, SUCCESS, ALGO_KO, ENGINE_KO, resp encoded by 0, 1, 2, 3, 4)",
+        help_text="State: INIT, RUN, SUCCESS, ALGO_KO, ENGINE_KO, QUEUED, CANCELLED, "
+                  "resp encoded by 0, 1, 2, 3, 4, 5, 6)",
         default=0)
 
+    cancel_requested = djmodels.BooleanField(
+        help_text="True when the cancellation of the execution has been requested: polled by the execution",
+        default=False)
+
+    profile = djmodels.TextField(
+        help_text="JSON profile of the execution: durations of the phases and used resources (see ExecProfile)",
+        null=True)
+
+    progress = djmodels.TextField(
+        help_text="JSON last progress event reported by the execution (see ProgressChannel)",
+        null=True)
+
     # implicit:
     #
     # id = <primary key> as int
@@ -93,6 +111,8 @@ class ExecutableAlgoDao(djmodels.Model):
         dest_obj.data_receivers = original_obj.data_receivers
 
         dest_obj.custom_algo = original_obj.custom_algo
+        dest_obj.check_cache = original_obj.check_cache
+        dest_obj.profile = original_obj.profile
 
         return dest_obj
 
@@ -113,8 +133,24 @@ class ExecutableAlgoDao(djmodels.Model):
         my_exec_algo.set_end_execution_date(self.end_execution_date)
         my_exec_algo.set_state(self.state)
 
+        if self.profile:
+            my_exec_algo.set_profile(ExecProfile.from_dict(json.loads(self.profile)))
+
         return my_exec_algo
 
+    @staticmethod
+    def encode_profile(business_obj):
+        """
+        Encode the profile of the business object, saved in the field profile
+        :param business_obj: the business object
+        :type business_obj: ExecutableAlgo
+        :return: the JSON profile, or None when undefined
+        :rtype: str or None
+        """
+        if business_obj.profile is None:
+            return None
+        return json.dumps(business_obj.profile.to_dict())
+
     @classmethod
     def find_from_key(cls, primary_key):
         """
@@ -168,6 +204,7 @@ class ExecutableAlgoDao(djmodels.Model):
         db_obj.start_execution_date = original_business_obj.start_execution_date
         db_obj.end_execution_date = original_business_obj.end_execution_date
         db_obj.state = original_business_obj.state
+        db_obj.profile = cls.encode_profile(original_business_obj)
 
         # Save object BEFORE updating the many to many relationship !!!
         db_obj.save()
@@ -202,6 +239,7 @@ class ExecutableAlgoDao(djmodels.Model):
         db_obj.start_execution_date = business_obj.start_execution_date
         db_obj.end_execution_date = business_obj.end_execution_date
         db_obj.state = business_obj.state
+        db_obj.profile = cls.encode_profile(business_obj)
 
         # Save object BEFORE updating the many to many relationship !!!
         db_obj.save()
@@ -216,3 +254,128 @@ class ExecutableAlgoDao(djmodels.Model):
         LOGGER.debug("updated business: %s", output_business_obj.as_detailed_string())
 
         return output_business_obj
+
+    @classmethod
+    def update_transition(cls, business_obj, update_fields=None):
+        """
+        Write a state transition of the ExecutableAlgo in database: a single UPDATE of the state, of the
+        execution dates and of the profile, without reading the row, and without building again the business
+        object (unlike update()).
+
+        :param cls: class param
+        :type cls: ExecutableAlgoDao
+        :param business_obj: the business object ExecutableAlgo, already created in database
+        :type business_obj: ExecutableAlgo
+        :param update_fields: optional, default None: the written fields, among TRANSITION_FIELDS.
+          All of them are written when None.
+        :type update_fields: list of str or None
+        :raises DatabaseError: the ExecutableAlgo does not exist in database
+        """
+        assert (business_obj.is_db_id_defined())
+
+        fields = update_fields or TRANSITION_FIELDS
+        db_obj = ExecutableAlgoDao(id=int(business_obj.process_id),
+                                   creation_date=business_obj.creation_date,
+                                   start_execution_date=business_obj.start_execution_date,
+                                   end_execution_date=business_obj.end_execution_date,
+                                   state=int(business_obj.state),
+                                   profile=cls.encode_profile(business_obj) if 'profile' in fields else None)
+        db_obj.save(update_fields=fields)
+
+        LOGGER.debug("updated transition %s", db_obj.__str__())
+
+    @classmethod
+    def update_state(cls, process_id, state, end_execution_date=None):
+        """
+        Update only the state (and optionally the end execution date) of an ExecutableAlgo in database,
+        without reading it: useful for the transitions handled outside of the ExecEngine
+        (ex: run rejected by the scheduler of asynchronous executions).
+
+        :param cls: class param
+        :type cls: ExecutableAlgoDao
+        :param process_id: the process_id of the ExecutableAlgo
+        :type process_id: str or int
+        :param state: the new state
+        :type state: ikats.core.library.status.State
+        :param end_execution_date: optional, default None: EPOCH date in seconds, unchanged when None
+        :type end_execution_date: float or Decimal or None
+        :return: True if the ExecutableAlgo has been updated, False if it does not exist
+        :rtype: bool
+        """
+        fields = {'state': int(state)}
+        if end_execution_date is not None:
+            fields['end_execution_date'] = end_execution_date
+
+        updated = ExecutableAlgoDao.objects.filter(pk=int(process_id)).update(**fields)
+
+        LOGGER.debug("updated state=%s on ExecutableAlgoDao id=%s", state, process_id)
+
+        return updated > 0
+
+    @classmethod
+    def update_progress(cls, process_id, event):
+        """
+        Update only the last progress event of an ExecutableAlgo in database, without reading it
+
+        :param cls: class param
+        :type cls: ExecutableAlgoDao
+        :param process_id: the process_id of the ExecutableAlgo
+        :type process_id: str or int
+        :param event: the event: see ProgressChannel.get_events()
+        :type event: dict
+        :return: True if the ExecutableAlgo has been updated, False if it does not exist
+        :rtype: bool
+        """
+        updated = ExecutableAlgoDao.objects.filter(pk=int(process_id)).update(progress=json.dumps(event))
+
+        LOGGER.debug("updated progress seq=%s on ExecutableAlgoDao id=%s", event.get('seq'), process_id)
+
+        return updated > 0
+
+    @classmethod
+    def find_progress(cls, process_id):
+        """
+        Read the last progress event saved by update_progress()
+
+        :param cls: class param
+        :type cls: ExecutableAlgoDao
+        :param process_id: the process_id of the ExecutableAlgo
+        :type process_id: str or int
+        :return: the event, or None when no event is saved
+        :rtype: dict or None
+        """
+        progress = ExecutableAlgoDao.objects.filter(pk=int(process_id)).values_list('progress', flat=True).first()
+        return json.loads(progress) if progress else None
+
+    @classmethod
+    def request_cancel(cls, process_id):
+        """
+        Save the cancel request of an ExecutableAlgo in database, without reading it: the request is polled
+        by the process running the execution (see ExecEngine.execute())
+
+        :param cls: class param
+        :type cls: ExecutableAlgoDao
+        :param process_id: the process_id of the ExecutableAlgo
+        :type process_id: str or int
+        :return: True if the ExecutableAlgo has been updated, False if it does not exist
+        :rtype: bool
+        """
+        updated = ExecutableAlgoDao.objects.filter(pk=int(process_id)).update(cancel_requested=True)
+
+        LOGGER.debug("requested cancel on ExecutableAlgoDao id=%s", process_id)
+
+        return updated > 0
+
+    @classmethod
+    def is_cancel_requested(cls, process_id):
+        """
+        Read the cancel request saved by request_cancel()
+
+        :param cls: class param
+        :type cls: ExecutableAlgoDao
+        :param process_id: the process_id of the ExecutableAlgo
+        :type process_id: str or int
+        :return: True when the cancellation has been requested
+        :rtype: bool
+        """
+        return ExecutableAlgoDao.objects.filter(pk=int(process_id), cancel_requested=True).exists()
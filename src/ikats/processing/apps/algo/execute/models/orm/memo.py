@@ -0,0 +1,145 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import logging
+import time
+
+from django.db import models as djmodels
+
+from apps.algo.execute.models.orm.algo import ExecutableAlgoDao, EPOCH_SECOND_DECIMAL_DIGITS, \
+    EPOCH_SECOND_DECIMAL_PLACES
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ExecutionMemoDao(djmodels.Model):
+    """
+    ExecutionMemoDao from the ORM layer: one memoized execution.
+
+    The memoization key is the hash of the executed definition (implementation, resolved input values):
+    it refers to the successful ExecutableAlgo whose process_id identifies the produced results.
+    The record is deleted with its ExecutableAlgo.
+    """
+
+    key = djmodels.CharField(help_text="hash of the executed definition", max_length=64, unique=True)
+
+    exec_algo = djmodels.ForeignKey(ExecutableAlgoDao, related_name='memo_set')
+
+    creation_date = djmodels.DecimalField(help_text="Creation EPOCH date of the memoized execution: decimal in secs",
+                                          null=False,
+                                          max_digits=EPOCH_SECOND_DECIMAL_DIGITS,
+                                          decimal_places=EPOCH_SECOND_DECIMAL_PLACES)
+
+    last_use_date = djmodels.DecimalField(help_text="Last EPOCH date of reuse: decimal in secs",
+                                          null=False,
+                                          max_digits=EPOCH_SECOND_DECIMAL_DIGITS,
+                                          decimal_places=EPOCH_SECOND_DECIMAL_PLACES)
+
+    def __str__(self):
+        return "ExecutionMemoDao key=%s exec_algo=%s creation_date=%s last_use_date=%s" % (self.key,
+                                                                                         self.exec_algo_id,
+                                                                                         self.creation_date,
+                                                                                         self.last_use_date)
+
+    @classmethod
+    def find_process_id(cls, key, max_age=None):
+        """
+        Find the process_id of the execution memoized with the key, and mark the record as used
+
+        :param cls: class param
+        :type cls: ExecutionMemoDao
+        :param key: the memoization key
+        :type key: str
+        :param max_age: optional, default None: maximum age in seconds of the memoized execution, None for no limit
+        :type max_age: float or None
+        :return: the process_id, or None when there is no valid record
+        :rtype: str or None
+        """
+        now = time.time()
+        query_set = cls.objects.filter(key=key)
+        if max_age is not None:
+            query_set = query_set.filter(creation_date__gte=now - max_age)
+
+        found = query_set.values_list('id', 'exec_algo_id').first()
+        if found is None:
+            return None
+
+        cls.objects.filter(id=found[0]).update(last_use_date=now)
+        return str(found[1])
+
+    @classmethod
+    def record(cls, key, process_id):
+        """
+        Record the memoized execution: replaces the previous record of the key
+
+        :param cls: class param
+        :type cls: ExecutionMemoDao
+        :param key: the memoization key
+        :type key: str
+        :param process_id: the process_id of the successful ExecutableAlgo
+        :type process_id: str or int
+        """
+        now = time.time()
+        cls.objects.update_or_create(key=key, defaults={'exec_algo_id': int(process_id),
+                                                        'creation_date': now,
+                                                        'last_use_date': now})
+        LOGGER.debug("recorded memoized execution key=%s process_id=%s", key, process_id)
+
+    @classmethod
+    def forget(cls, key):
+        """
+        Delete the record of the key: the ExecutableAlgo and its results are not deleted
+
+        :param cls: class param
+        :type cls: ExecutionMemoDao
+        :param key: the memoization key
+        :type key: str
+        """
+        cls.objects.filter(key=key).delete()
+        LOGGER.debug("forgotten memoized execution key=%s", key)
+
+    @classmethod
+    def evict(cls, max_age=None, max_entries=None):
+        """
+        Delete the records older than max_age, then the least recently used records beyond max_entries.
+        The ExecutableAlgo and their results are not deleted.
+
+        :param cls: class param
+        :type cls: ExecutionMemoDao
+        :param max_age: optional, default None: maximum age in seconds, None for no limit
+        :type max_age: float or None
+        :param max_entries: optional, default None: maximum number of records, None for no limit
+        :type max_entries: int or None
+        :return: the number of deleted records
+        :rtype: int
+        """
+        obsolete_ids = []
+        if max_age is not None:
+            obsolete_ids.extend(cls.objects.filter(creation_date__lt=time.time() - max_age).values_list('id',
+                                                                                                      flat=True))
+
+        if max_entries is not None:
+            obsolete_ids.extend(cls.objects.order_by('-last_use_date').values_list('id', flat=True)[max_entries:])
+
+        obsolete_ids = set(obsolete_ids)
+        if obsolete_ids:
+            cls.objects.filter(id__in=obsolete_ids).delete()
+
+        deleted = len(obsolete_ids)
+
+        if deleted:
+            LOGGER.info("evicted %s memoized executions", deleted)
+        return deleted
@@ -70,6 +70,10 @@ class ExecutableAlgoWs(object):
             status['end_date'] = end_execution_date
             status['duration'] = duration
 
+            # timings of the phases and used resources, when measured
+            profile = self.__mdl.get_profile()
+            status['profile'] = profile.to_dict() if profile is not None else None
+
         return status
 
     def to_json_response(self, http_code=200, http_msg="ok", error=None):
@@ -14,6 +14,9 @@ See the License for the specific language governing permissions and
 limitations under the License.
 
 """
+import time
+
+from ikats.core.library.cancellation import check_cancelled
 
 
 def method_test1():
@@ -67,3 +70,31 @@ def method_test5(a, b, c):
 
 def method_test6():
     raise Exception("Simulate error raised by method_test6()")
+
+
+def method_cancellable(duration):
+    """
+    Test method checking the cancellation while it sleeps during duration seconds
+    :param duration: the duration in seconds
+    :type duration: float
+    :return: the duration
+    """
+    end = time.time() + duration
+    while time.time() < end:
+        check_cancelled()
+        time.sleep(0.05)
+    return duration
+
+
+def method_allocating(size, duration):
+    """
+    Test method allocating size bytes, then checking the cancellation while it sleeps during duration seconds
+    :param size: the allocated bytes
+    :type size: int
+    :param duration: the duration in seconds
+    :type duration: float
+    :return: the duration
+    """
+    allocated = bytearray(b"x" * size)
+    method_cancellable(duration)
+    return len(allocated) and duration
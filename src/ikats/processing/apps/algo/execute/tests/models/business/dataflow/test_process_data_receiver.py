@@ -14,13 +14,22 @@ See the License for the specific language governing permissions and
 limitations under the License.
 
 """
+import codecs
 import os
+import pickle
 import unittest
 from unittest.case import skipIf
 
+import numpy as np
+from django.test.utils import override_settings
+
+from apps.algo.catalogue.models.business.factory import FactoryCatalogue
+from apps.algo.catalogue.models.business.implem import Implementation
+from apps.algo.catalogue.models.business.profile import Argument, ProfileItem
 from apps.algo.execute.models.business.dataflow.process_data_receiver import LOGGER, \
     ProcessDataPickleWriter, \
     ProcessDataPlainTextWriter
+from apps.algo.execute.models.business.factory import FactoryExecAlgo
 from ikats.core.resource.api import IkatsApi
 
 
@@ -63,6 +72,33 @@ class TestProcessDataPickleWriter(unittest.TestCase):
             # see also test: test_get_value_with_sk_model
 
 
+    def test_encoded_model_as_input(self):
+        """
+        Tests that the content encoded by the writer, or by the previous versions, is decoded as sk_model input
+        """
+        model = {'coefficients': np.arange(1000.0), 'name': "model"}
+        implem = Implementation(name="TU sk_model input", description="TU", execution_plugin="",
+                                library_address="math::cos")
+        input_def = Argument("model", "model", ProfileItem.DIR.INPUT, 0,
+                             data_format=FactoryCatalogue.SK_MODEL_ARGTYPE)
+
+        for compression in ['none', 'zlib', 'lzma']:
+            with override_settings(IKATS_PROCESS_DATA_BLOB={'COMPRESSION': compression, 'CHUNK_SIZE': 1000}):
+                writer = ProcessDataPickleWriter(catalog_output_name="model", writer_id="test_encoded_model")
+                client_value = b"".join(writer.encode_content(model)).decode()
+
+            decoded = FactoryExecAlgo.get_data_source(implem=implem, input_def=input_def,
+                                                      client_value=client_value, reference="ref")
+            np.testing.assert_array_equal(decoded['coefficients'], model['coefficients'])
+            self.assertEqual(decoded['name'], "model")
+
+        # previous versions: pickle encoded in base64
+        legacy_value = codecs.encode(pickle.dumps(model), "base64").decode()
+        decoded = FactoryExecAlgo.get_data_source(implem=implem, input_def=input_def,
+                                                  client_value=legacy_value, reference="ref")
+        np.testing.assert_array_equal(decoded['coefficients'], model['coefficients'])
+
+
 class TestProcessDataPlainTextWriter(unittest.TestCase):
     """
     Unittest class testing ProcessDataPlainTextWriter
@@ -30,8 +30,10 @@ from apps.algo.custom.models.ws.algo import CustomizedAlgoWs
 from apps.algo.custom.tests.tu_commons import CommonsCustomTest
 
 from apps.algo.execute.models.business.exec_engine import ExecStatus
+from apps.algo.execute.models.business.exec_profile import ExecProfile
 
 from apps.algo.execute.models.business.python_local_exec_engine import PythonLocalExecEngine
+from apps.algo.execute.models.orm.algo import ExecutableAlgoDao
 from apps.algo.execute.tests.models.business.test_python_local_exec_engine import init_basic_exec_algo
 from apps.algo.execute.views.algo import run as views_algo_run
 from ikats.core.library.status import State as EnumState
@@ -76,6 +78,16 @@ class TestExecEngineWithDao(TestCase):
         my_res = my_exec_algo.get_data_receiver("res").get_received_value()
         self.assertTrue((1.0 - my_res) < 0.1e-10, "cos(0.0) = 1.0")
 
+        # the profile is saved with the final state
+        my_profile = ExecutableAlgoDao.find_from_key(exec_engine.get_executable_algo().process_id).profile
+        my_phases = [(x['phase'], x.get('target', None)) for x in my_profile.get_phases()]
+        self.assertIn((ExecProfile.CONSUME, "angle"), my_phases)
+        self.assertIn((ExecProfile.CHECK, "angle"), my_phases)
+        self.assertIn((ExecProfile.ALGORITHM, None), my_phases)
+        self.assertIn((ExecProfile.PRODUCE, "res"), my_phases)
+        self.assertIn((ExecProfile.DAO_WRITE, None), my_phases)
+        self.assertIn('cpu_time', my_profile.get_resources())
+
 
 class TestExecEngineWithCheckEngine(TestCase, CommonsCustomTest):
     """
@@ -0,0 +1,67 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import json
+import time
+from unittest import TestCase
+
+from apps.algo.execute.models.business.exec_profile import ExecProfile
+from ikats.core.resource.client.io_counter import IoCounter
+
+
+class TestExecProfile(TestCase):
+    """
+    Tests the profile of the executions
+    """
+
+    def test_phases(self):
+        """
+        Tests the measure of the phases
+        """
+        profile = ExecProfile()
+        with profile.phase(ExecProfile.CONSUME, "angle"):
+            time.sleep(0.01)
+        with self.assertRaises(ValueError):
+            with profile.phase(ExecProfile.ALGORITHM):
+                raise ValueError("measured even if failed")
+        profile.add_phase(ExecProfile.CONSUME, 0.5, "other")
+
+        phases = profile.get_phases()
+        self.assertEqual([x['phase'] for x in phases],
+                         [ExecProfile.CONSUME, ExecProfile.ALGORITHM, ExecProfile.CONSUME])
+        self.assertEqual(phases[0]['target'], "angle")
+        self.assertNotIn('target', phases[1])
+        self.assertGreaterEqual(phases[0]['duration'], 0.01)
+        self.assertGreater(profile.get_total(ExecProfile.CONSUME), 0.51)
+
+    def test_resources(self):
+        """
+        Tests the measure of the resources, and the JSON encoding
+        """
+        profile = ExecProfile()
+        profile.start()
+        sum(x * x for x in range(100000))
+        IoCounter.add_read(100)
+        IoCounter.add_written(10)
+        profile.stop()
+
+        resources = profile.get_resources()
+        self.assertGreater(resources['cpu_time'], 0)
+        self.assertEqual(resources['bytes_read'], 100)
+        self.assertEqual(resources['bytes_written'], 10)
+
+        decoded = ExecProfile.from_dict(json.loads(json.dumps(profile.to_dict())))
+        self.assertEqual(decoded.to_dict(), profile.to_dict())
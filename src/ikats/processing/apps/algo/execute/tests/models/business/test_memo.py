@@ -0,0 +1,144 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+from unittest import mock
+
+from django.test import TestCase as DjTestCase
+from django.test.utils import override_settings
+
+from apps.algo.catalogue.models.business.implem import Implementation
+from apps.algo.catalogue.models.business.profile import Argument, Parameter, ProfileItem
+from apps.algo.custom.models.business.algo import CustomizedAlgo
+from apps.algo.execute.models.business.algo import ExecutableAlgo
+from apps.algo.execute.models.business.memo import ExecMemo
+from apps.algo.execute.models.orm.algo import ExecutableAlgoDao
+from apps.algo.execute.models.orm.memo import ExecutionMemoDao
+from ikats.core.library.status import State as EnumState
+
+
+def list_process_data_mock(process_id):
+    """
+    Mock of IkatsApi.pd.list: the process data of the output "result" exist, except for the process_id "0"
+    """
+    if process_id == "0":
+        return []
+    return [{'id': 1, 'processId': process_id, 'name': 'result', 'dataType': 'ANY'}]
+
+
+@override_settings(IKATS_EXEC_MEMO={'ENABLED': True, 'MAX_AGE': 3600, 'MAX_ENTRIES': 2})
+@mock.patch('ikats.core.resource.api.IkatsProcessData.list', list_process_data_mock)
+class TestExecMemo(DjTestCase):
+    """
+    Tests the memoization of the successful runs
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.implementation = Implementation(name="TU memo", description="TU memo",
+                                            execution_plugin="TU fake",
+                                            library_address="math::cos",
+                                            input_profile=[Argument("angle", "angle", ProfileItem.DIR.INPUT, 0)],
+                                            output_profile=[Argument("result", "cos", ProfileItem.DIR.OUTPUT, 0)],
+                                            db_id=1)
+
+    def create_exec_algo(self, state):
+        """
+        Create an ExecutableAlgo in database with the state
+        """
+        my_exec_algo = ExecutableAlgo(custom_algo=CustomizedAlgo(arg_implementation=self.implementation),
+                                      dict_data_sources={}, dict_data_receivers={}, arg_process_id=None)
+        my_exec_algo.state = state
+        return ExecutableAlgoDao.create(my_exec_algo, merge_with_unsaved_data=False)
+
+    def test_compute_key(self):
+        """
+        Tests that the key depends on the implementation and on the input values
+        """
+        key = ExecMemo.compute_key(self.implementation, {'angle': 0.5, 'ts': ['00001', '00002']})
+
+        self.assertEqual(key, ExecMemo.compute_key(self.implementation, {'ts': ['00001', '00002'], 'angle': 0.5}))
+        self.assertNotEqual(key, ExecMemo.compute_key(self.implementation, {'angle': 0.6, 'ts': ['00001', '00002']}))
+
+        other_implementation = Implementation(name="TU memo", description="TU memo",
+                                              execution_plugin="TU fake",
+                                              library_address="math::sin",
+                                              input_profile=self.implementation.input_profile,
+                                              output_profile=self.implementation.output_profile,
+                                              db_id=1)
+        self.assertNotEqual(key, ExecMemo.compute_key(other_implementation, {'angle': 0.5, 'ts': ['00001', '00002']}))
+
+        # not json-friendly: not memoized
+        self.assertIsNone(ExecMemo.compute_key(self.implementation, {'angle': object()}))
+
+        # the default values and the domains of the profile items are part of the definition
+        default_implementation = Implementation(name="TU memo", description="TU memo",
+                                                execution_plugin="TU fake",
+                                                library_address="math::cos",
+                                                input_profile=[Parameter("angle", "angle", ProfileItem.DIR.INPUT, 0,
+                                                                         default_value="0.5")],
+                                                output_profile=self.implementation.output_profile,
+                                                db_id=1)
+        self.assertNotEqual(key, ExecMemo.compute_key(default_implementation,
+                                                      {'angle': 0.5, 'ts': ['00001', '00002']}))
+        domain_implementation = Implementation(name="TU memo", description="TU memo",
+                                               execution_plugin="TU fake",
+                                               library_address="math::cos",
+                                               input_profile=[Argument("angle", "angle", ProfileItem.DIR.INPUT, 0,
+                                                                       domain_of_values="[0.5, 1.0]")],
+                                               output_profile=self.implementation.output_profile,
+                                               db_id=1)
+        self.assertNotEqual(key, ExecMemo.compute_key(domain_implementation,
+                                                      {'angle': 0.5, 'ts': ['00001', '00002']}))
+
+    def test_record_find(self):
+        """
+        Tests that only the successful runs are memoized
+        """
+        key = ExecMemo.compute_key(self.implementation, {'angle': 0.5})
+        self.assertIsNone(ExecMemo.find(key, self.implementation))
+
+        ExecMemo.record(key, self.create_exec_algo(EnumState.ALGO_KO))
+        self.assertIsNone(ExecMemo.find(key, self.implementation))
+
+        exec_algo = self.create_exec_algo(EnumState.ALGO_OK)
+        ExecMemo.record(key, exec_algo)
+        self.assertEqual(ExecMemo.find(key, self.implementation).get_process_id(), exec_algo.get_process_id())
+
+        # the memoized run is forgotten when its results are deleted
+        with mock.patch('ikats.core.resource.api.IkatsProcessData.list', return_value=[]):
+            self.assertIsNone(ExecMemo.find(key, self.implementation))
+        self.assertFalse(ExecutionMemoDao.objects.filter(key=key).exists())
+        ExecMemo.record(key, exec_algo)
+        self.assertIsNotNone(ExecMemo.find(key, self.implementation))
+
+        # the memoized run is forgotten with its ExecutableAlgo
+        ExecutableAlgoDao.objects.filter(id=int(exec_algo.get_process_id())).delete()
+        self.assertIsNone(ExecMemo.find(key, self.implementation))
+
+    def test_evict(self):
+        """
+        Tests the eviction of the least recently used runs
+        """
+        keys = [ExecMemo.compute_key(self.implementation, {'angle': angle}) for angle in range(3)]
+        ExecMemo.record(keys[0], self.create_exec_algo(EnumState.ALGO_OK))
+        ExecMemo.record(keys[1], self.create_exec_algo(EnumState.ALGO_OK))
+        ExecMemo.find(keys[0], self.implementation)
+        ExecMemo.record(keys[2], self.create_exec_algo(EnumState.ALGO_OK))
+
+        self.assertEqual(ExecutionMemoDao.objects.count(), 2)
+        self.assertIsNotNone(ExecMemo.find(keys[0], self.implementation))
+        self.assertIsNone(ExecMemo.find(keys[1], self.implementation))
+        self.assertIsNotNone(ExecMemo.find(keys[2], self.implementation))
@@ -0,0 +1,129 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+from concurrent.futures import ThreadPoolExecutor
+import time
+from unittest import TestCase
+
+from apps.algo.execute.models.business.data_source import AbstractDataSource
+from apps.algo.execute.models.business.prefetch import InputPrefetcher
+from apps.algo.execute.tests.models.business.test_python_local_exec_engine import init_basic_exec_algo
+from ikats.core.library.lazy import LazyValue
+from ikats.core.resource.client.io_counter import IoCounter
+
+
+class SlowRemoteSource(AbstractDataSource):
+    """
+    Remote data source simulating a download
+    """
+
+    def __init__(self, value, duration=0.2):
+        self.value = value
+        self.duration = duration
+        self.reads = 0
+
+    def get_value(self):
+        self.reads += 1
+        time.sleep(self.duration)
+        IoCounter.add_read(100)
+        return self.value
+
+    def get_process_id(self):
+        return None
+
+    def set_process_id(self, process_id):
+        pass
+
+    def is_remote(self):
+        return True
+
+
+def init_exec_algo(sources):
+    """
+    Build an ExecutableAlgo whose inputs are read from the sources
+    """
+    exec_algo = init_basic_exec_algo(lib_path="math::fsum",
+                                     in_argnames_list=list(sources),
+                                     input_arg_value_list=[],
+                                     out_argnames_list=["res"])
+    for name, source in sources.items():
+        exec_algo.set_data_source(name, source)
+    return exec_algo
+
+
+class TestInputPrefetcher(TestCase):
+    """
+    Tests the resolution of the inputs before the call of the algorithm
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ThreadPoolExecutor(max_workers=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def test_concurrent_reads(self):
+        """
+        Tests that the remote inputs are read concurrently, and that their reads are counted by the consumer
+        """
+        sources = {"a": SlowRemoteSource(1), "b": SlowRemoteSource(2), "c": SlowRemoteSource(3)}
+        prefetcher = InputPrefetcher(init_exec_algo(sources), executor=self.executor)
+
+        read_before = IoCounter.get_counts()[0]
+        start = time.time()
+        prefetcher.start(["a", "b", "c"])
+        values = [prefetcher.consume(x) for x in ["a", "b", "c"]]
+
+        self.assertEqual(values, [1, 2, 3])
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(IoCounter.get_counts()[0] - read_before, 300)
+        self.assertTrue(all(x.reads == 1 for x in sources.values()))
+
+    def test_lazy_inputs(self):
+        """
+        Tests that the lazy inputs are read when used
+        """
+        sources = {"model": SlowRemoteSource("model", 0), "data": SlowRemoteSource("data", 0)}
+        prefetcher = InputPrefetcher(init_exec_algo(sources), executor=self.executor, lazy_inputs=["data"])
+
+        prefetcher.start(["model", "data"])
+        self.assertEqual(prefetcher.consume("model"), "model")
+
+        lazy = prefetcher.consume("data")
+        self.assertTrue(prefetcher.is_lazy("data"))
+        self.assertIsInstance(lazy, LazyValue)
+        self.assertEqual(sources["data"].reads, 0)
+        self.assertEqual(lazy.get(), "data")
+        self.assertEqual(sources["data"].reads, 1)
+
+    def test_cancel(self):
+        """
+        Tests that the readings not yet started are cancelled
+        """
+        single_executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            sources = {"a": SlowRemoteSource(1), "b": SlowRemoteSource(2)}
+            prefetcher = InputPrefetcher(init_exec_algo(sources), executor=single_executor)
+            prefetcher.start(["a", "b"])
+            prefetcher.cancel()
+        finally:
+            single_executor.shutdown()
+
+        # "a" may be started before the cancellation, not "b"
+        self.assertLessEqual(sources["a"].reads, 1)
+        self.assertEqual(sources["b"].reads, 0)
@@ -0,0 +1,126 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import threading
+import time
+from unittest import TestCase
+
+from apps.algo.execute.models.business.progress import ProgressChannel, ProgressRegistry
+from ikats.core.library.status import State as EnumState
+
+
+class TestProgress(TestCase):
+    """
+    Tests the progress channels of the executions
+    """
+
+    def test_rate_limit(self):
+        """
+        Tests that the reports received within the interval are coalesced into the last one
+        """
+        channel = ProgressChannel("1", min_interval=0.2)
+        self.assertTrue(channel.publish(progress=0.1))
+        self.assertFalse(channel.publish(progress=0.2))
+        self.assertFalse(channel.publish(progress=0.3, message="last"))
+
+        read = channel.get_events()
+        self.assertEqual([x['progress'] for x in read['events']], [0.1])
+        self.assertFalse(read['done'])
+
+        # the pending event is published once the interval has elapsed
+        time.sleep(0.25)
+        read = channel.get_events(since=read['seq'])
+        self.assertEqual([(x['progress'], x['message']) for x in read['events']], [(0.3, "last")])
+        self.assertEqual(read['seq'], 2)
+
+    def test_close(self):
+        """
+        Tests that closing the channel publishes the pending event and ignores the next reports
+        """
+        channel = ProgressChannel("2", min_interval=10.0, max_events=2)
+        channel.publish(progress=0.1, partial_result={'count': 1})
+        channel.publish(progress=0.5, partial_result=object())
+        channel.close(EnumState.ALGO_OK)
+        self.assertFalse(channel.publish(progress=1.0))
+
+        read = channel.get_events(timeout=5)
+        self.assertTrue(read['done'])
+        self.assertEqual(read['state'], EnumState.ALGO_OK.name)
+        self.assertEqual([x['progress'] for x in read['events']], [0.1, 0.5])
+        self.assertEqual(read['events'][0]['partial_result'], {'count': 1})
+        self.assertIsInstance(read['events'][1]['partial_result'], str)
+
+    def test_long_polling(self):
+        """
+        Tests that a waiting reader is woken up by a new event
+        """
+        channel = ProgressChannel("3", min_interval=0.0)
+        timer = threading.Timer(0.1, channel.publish, kwargs={'message': "step"})
+        timer.start()
+
+        start = time.time()
+        read = channel.get_events(timeout=5)
+        timer.join()
+
+        self.assertLess(time.time() - start, 4)
+        self.assertEqual([x['message'] for x in read['events']], ["step"])
+
+        # without event: timeout
+        start = time.time()
+        self.assertEqual(channel.get_events(since=read['seq'], timeout=0.1)['events'], [])
+        self.assertGreaterEqual(time.time() - start, 0.1)
+
+    def test_persist(self):
+        """
+        Tests that the last event is saved at most once per interval, and when the channel is closed
+        """
+        saved = []
+        channel = ProgressChannel("5", min_interval=0.0, persist=saved.append, persist_interval=10.0)
+        channel.publish(progress=0.1)
+        channel.publish(progress=0.2)
+        channel.publish(progress=0.3)
+        self.assertEqual([x['progress'] for x in saved], [0.1])
+
+        channel.close(EnumState.ALGO_OK)
+        self.assertEqual([(x['seq'], x['progress']) for x in saved], [(1, 0.1), (3, 0.3)])
+
+        # the failures of the callback do not stop the execution
+        def failure(_):
+            raise IOError("database unavailable")
+
+        failing = ProgressChannel("6", min_interval=0.0, persist=failure)
+        self.assertTrue(failing.publish(progress=0.5))
+        failing.close(EnumState.ALGO_OK)
+
+    def test_registry(self):
+        """
+        Tests the progress status published through the registry
+        """
+        self.assertFalse(ProgressRegistry.publish_status("unknown", 0.5))
+
+        channel = ProgressRegistry.open("4")
+        try:
+            self.assertIs(ProgressRegistry.get(4), channel)
+            ProgressRegistry.publish_status("4", 0.5)
+            ProgressRegistry.publish_status("4", "message only")
+            ProgressRegistry.close("4", EnumState.ALGO_OK)
+
+            read = channel.get_events()
+            self.assertEqual([(x['progress'], x['message']) for x in read['events']],
+                             [(0.5, None), (None, "message only")])
+            self.assertTrue(read['done'])
+        finally:
+            ProgressRegistry.close("4", EnumState.ALGO_OK)
@@ -19,10 +19,13 @@ import importlib
 import logging
 from unittest import TestCase
 
+from django.test.utils import override_settings
+
 from apps.algo.catalogue.models.business.implem import Implementation
 from apps.algo.catalogue.models.business.profile import Argument, ProfileItem
 from apps.algo.custom.models.business.algo import CustomizedAlgo
 from apps.algo.execute.models.business.algo import ExecutableAlgo
+from apps.algo.execute.models.business.cancellation import CancelRegistry
 from apps.algo.execute.models.business.data_receiver import SimpleDataReceiver
 from apps.algo.execute.models.business.exec_engine import ExecStatus
 from apps.algo.execute.models.business.python_local_exec_engine import PythonLocalExecEngine
@@ -316,3 +319,46 @@ class TestPythonLocalExecEngine(TestCase):
             my_res = my_exec_algo.get_data_receiver(
                 my_res_name).get_received_value()
             self.assertEqual(my_res, expected_res[index])
+
+    @override_settings(IKATS_EXEC_BUDGET={'TIMEOUT': 0.2})
+    def test_execute_cancelled(self):
+        """
+        Tests the cancellation of the executions: by the time budget, or before the start
+        """
+        my_exec_algo = init_basic_exec_algo(
+            lib_path="apps.algo.execute.tests.models.business.assets_test_python_local_exec_engine::method_cancellable",
+            in_argnames_list=["duration"],
+            input_arg_value_list=[10.0],
+            out_argnames_list=["res"])
+
+        status = PythonLocalExecEngine(my_exec_algo).execute()
+        self.assertEqual(my_exec_algo.state, EnumState.CANCELLED)
+        self.assertIn("time limit", str(status.error))
+        self.assertIsNone(my_exec_algo.get_data_receiver("res").get_received_value())
+
+        # cancelled before the start
+        my_exec_algo = init_basic_exec_algo(lib_path="math::cos",
+                                            in_argnames_list=["x"],
+                                            input_arg_value_list=[0.0],
+                                            out_argnames_list=["res"])
+        my_exec_algo.set_process_id("999999")
+        CancelRegistry.cancel("999999")
+
+        PythonLocalExecEngine(my_exec_algo).execute()
+        self.assertEqual(my_exec_algo.state, EnumState.CANCELLED)
+        self.assertIsNone(CancelRegistry.get("999999"))
+
+    @override_settings(IKATS_EXEC_BUDGET={'MEMORY_LIMIT': 10 * 1024 * 1024})
+    def test_execute_memory_budget(self):
+        """
+        Tests the cancellation of an execution exceeding its memory budget
+        """
+        my_exec_algo = init_basic_exec_algo(
+            lib_path="apps.algo.execute.tests.models.business.assets_test_python_local_exec_engine::method_allocating",
+            in_argnames_list=["size", "duration"],
+            input_arg_value_list=[100 * 1024 * 1024, 10.0],
+            out_argnames_list=["res"])
+
+        status = PythonLocalExecEngine(my_exec_algo).execute()
+        self.assertEqual(my_exec_algo.state, EnumState.CANCELLED)
+        self.assertIn("memory limit", str(status.error))
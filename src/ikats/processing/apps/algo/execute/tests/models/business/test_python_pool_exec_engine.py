@@ -0,0 +1,78 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import os
+from unittest import TestCase
+
+from django.test.utils import override_settings
+
+from apps.algo.execute.models.business.exec_engine import ExecStatus
+from apps.algo.execute.models.business.python_pool_exec_engine import PythonPoolExecEngine
+from apps.algo.execute.tests.models.business.test_python_local_exec_engine import init_basic_exec_algo
+from ikats.core.library.status import State as EnumState
+
+
+class TestPythonPoolExecEngine(TestCase):
+    """
+    Tests the engine calling the python functions in worker processes
+    """
+
+    def test_execute_nominal(self):
+        """
+        Tests the function called in a worker process
+        """
+        my_exec_algo = init_basic_exec_algo(lib_path="os::getpid",
+                                            in_argnames_list=[],
+                                            input_arg_value_list=[],
+                                            out_argnames_list=["res"])
+        exec_engine = PythonPoolExecEngine(my_exec_algo)
+
+        status = exec_engine.execute()
+        self.assertIsInstance(status, ExecStatus, "Failed to retrieve status")
+        self.assertEqual(my_exec_algo.state, EnumState.ALGO_OK)
+
+        my_res = my_exec_algo.get_data_receiver("res").get_received_value()
+        self.assertNotEqual(my_res, os.getpid())
+
+    @override_settings(IKATS_EXEC_PROCESS_POOL={'WORKERS': 1, 'TIMEOUT': 0.5})
+    def test_execute_timeout(self):
+        """
+        Tests that the execution exceeding the time limit is in error
+        """
+        my_exec_algo = init_basic_exec_algo(lib_path="time::sleep",
+                                            in_argnames_list=["secs"],
+                                            input_arg_value_list=[10],
+                                            out_argnames_list=["res"])
+        exec_engine = PythonPoolExecEngine(my_exec_algo)
+
+        status = exec_engine.execute()
+        self.assertEqual(my_exec_algo.state, EnumState.ALGO_KO)
+        self.assertIn("exceeded the time limit", str(status.error))
+
+    @override_settings(IKATS_EXEC_PROCESS_POOL={'WORKERS': 1}, IKATS_EXEC_BUDGET={'TIMEOUT': 0.5})
+    def test_execute_cancelled(self):
+        """
+        Tests that the worker process is killed when the execution exceeds its time budget
+        """
+        my_exec_algo = init_basic_exec_algo(lib_path="time::sleep",
+                                            in_argnames_list=["secs"],
+                                            input_arg_value_list=[10],
+                                            out_argnames_list=["res"])
+        exec_engine = PythonPoolExecEngine(my_exec_algo)
+
+        status = exec_engine.execute()
+        self.assertEqual(my_exec_algo.state, EnumState.CANCELLED)
+        self.assertIn("worker killed", str(status.error))
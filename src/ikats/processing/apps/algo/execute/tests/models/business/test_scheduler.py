@@ -0,0 +1,179 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import os
+import tempfile
+import threading
+import unittest
+
+from apps.algo.execute.models.business.scheduler import ExecScheduler, QueueFullError
+
+
+def append_to_file(path, text):
+    """
+    Job used by the process mode test: shall be picklable
+    """
+    with open(path, 'a') as opened_file:
+        opened_file.write(text)
+
+
+class TestExecScheduler(unittest.TestCase):
+    """
+    Tests the scheduler of asynchronous executions
+    """
+
+    def test_implem_limit_and_fairness(self):
+        """
+        Tests that the running jobs respect the implementation limits, and that the implementations are served
+        in round-robin
+        """
+        scheduler = ExecScheduler(workers=1, implem_limits={'slow': 1})
+        started = []
+        blocked = threading.Event()
+        release = threading.Event()
+
+        def job(name):
+            started.append(name)
+            if name == 'blocking':
+                blocked.set()
+                release.wait(10)
+
+        # The single worker is blocked: the next jobs are queued
+        scheduler.submit('first', job, ('blocking',))
+        self.assertTrue(blocked.wait(10))
+        for index in range(3):
+            scheduler.submit('slow', job, ('slow%s' % index,))
+        scheduler.submit('fast', job, ('fast0',))
+        scheduler.submit('fast', job, ('fast1',))
+
+        self.assertEqual(scheduler.get_stats()['queued'], 5)
+        release.set()
+        scheduler.shutdown(wait=True)
+
+        self.assertEqual(started, ['blocking', 'slow0', 'fast0', 'slow1', 'fast1', 'slow2'])
+        self.assertEqual(scheduler.get_stats(), {'queued': 0, 'running': 0, 'running_by_implem': {}})
+
+    def test_implem_limit_with_workers(self):
+        """
+        Tests that an implementation at its limit doesn't prevent the other implementations to run
+        """
+        scheduler = ExecScheduler(workers=3, implem_limit=1)
+        release = threading.Event()
+        other_done = threading.Event()
+
+        scheduler.submit('slow', release.wait, (10,))
+        scheduler.submit('slow', release.wait, (10,))
+        scheduler.submit('other', other_done.set)
+
+        self.assertTrue(other_done.wait(10))
+        stats = scheduler.get_stats()
+        self.assertEqual(stats['running_by_implem']['slow'], 1)
+        self.assertEqual(stats['queued'], 1)
+
+        release.set()
+        scheduler.shutdown(wait=True)
+
+    def test_queue_full(self):
+        """
+        Tests the bounded queue
+        """
+        scheduler = ExecScheduler(workers=1, max_queued=2)
+        release = threading.Event()
+        started = threading.Event()
+
+        def job():
+            started.set()
+            release.wait(10)
+
+        scheduler.submit('implem', job)
+        self.assertTrue(started.wait(10))
+
+        scheduler.submit('implem', job)
+        scheduler.submit('implem', job)
+        with self.assertRaises(QueueFullError):
+            scheduler.submit('implem', job)
+
+        release.set()
+        scheduler.shutdown(wait=True)
+        with self.assertRaises(RuntimeError):
+            scheduler.submit('implem', job)
+
+    def test_cancel(self):
+        """
+        Tests that a queued job can be removed from the queue, not a started one
+        """
+        scheduler = ExecScheduler(workers=1)
+        started = []
+        blocked = threading.Event()
+        release = threading.Event()
+
+        def job(name):
+            started.append(name)
+            if name == 'blocking':
+                blocked.set()
+                release.wait(10)
+
+        scheduler.submit('implem', job, ('blocking',), job_id="1")
+        self.assertTrue(blocked.wait(10))
+        on_cancel = []
+        scheduler.submit('implem', job, ('cancelled',), job_id="2", on_cancel=lambda: on_cancel.append("2"))
+        scheduler.submit('other', job, ('kept',), job_id="3")
+
+        self.assertIsNone(scheduler.cancel("1"))
+        self.assertEqual(scheduler.cancel("2").job_id, "2")
+        self.assertIsNone(scheduler.cancel("2"))
+        self.assertEqual(scheduler.get_stats()['queued'], 1)
+        self.assertEqual(on_cancel, ["2"])
+
+        release.set()
+        scheduler.shutdown()
+        self.assertEqual(started, ['blocking', 'kept'])
+
+    def test_failed_job(self):
+        """
+        Tests that a failed job doesn't stop the worker
+        """
+        scheduler = ExecScheduler(workers=1)
+        done = threading.Event()
+
+        scheduler.submit('implem', lambda: 1 / 0)
+        scheduler.submit('implem', done.set)
+
+        self.assertTrue(done.wait(10))
+        scheduler.shutdown(wait=True)
+
+    def test_process_mode(self):
+        """
+        Tests the jobs executed by worker processes
+        """
+        scheduler = ExecScheduler(workers=2, mode=ExecScheduler.PROCESS_MODE)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'out.txt')
+            for index in range(4):
+                scheduler.submit('implem', append_to_file, (path, str(index)))
+            scheduler.shutdown(wait=True)
+
+            with open(path) as opened_file:
+                self.assertEqual(sorted(opened_file.read()), ['0', '1', '2', '3'])
+
+    def test_bad_config(self):
+        """
+        Tests the errors raised by the constructor
+        """
+        with self.assertRaises(ValueError):
+            ExecScheduler(mode='unknown')
+        with self.assertRaises(ValueError):
+            ExecScheduler(workers=0)
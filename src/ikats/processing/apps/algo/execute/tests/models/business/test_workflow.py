@@ -0,0 +1,173 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+from unittest import mock
+
+from django.test import TransactionTestCase
+
+from apps.algo.catalogue.models.business.implem import Implementation
+from apps.algo.catalogue.models.business.profile import Argument, Parameter, ProfileItem
+from apps.algo.custom.models.business.check_engine import CheckError
+from apps.algo.execute.models.business.data_receiver import SimpleDataReceiver
+from apps.algo.execute.models.business.factory import FactoryExecAlgo
+from apps.algo.execute.models.business.scheduler import ExecScheduler
+from apps.algo.execute.models.business.workflow import NodeOutput, Workflow, WorkflowNode
+from apps.algo.execute.models.orm.algo import ExecutableAlgoDao
+from ikats.core.library.exception import IkatsInputError
+from ikats.core.library.status import State as EnumState
+
+PLUGIN = "apps.algo.execute.models.business.python_local_exec_engine::PythonLocalExecEngine"
+
+
+def init_implementation(library_address, input_names):
+    """
+    Build an implementation of a function of the math module, with one output 'result'
+    """
+    return Implementation(name="TU workflow %s" % library_address,
+                          description="TU workflow",
+                          execution_plugin=PLUGIN,
+                          library_address=library_address,
+                          input_profile=[Argument(name, name, ProfileItem.DIR.INPUT, index)
+                                         for index, name in enumerate(input_names)],
+                          output_profile=[Argument("result", "result", ProfileItem.DIR.OUTPUT, 0)])
+
+
+class TestWorkflow(TransactionTestCase):
+    """
+    Tests the workflows: the nodes are executed by the workers of a scheduler, using their own
+    database connections: TransactionTestCase is required
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestWorkflow, cls).setUpClass()
+        cls.pow = init_implementation("math::pow", ["x", "y"])
+        cls.sqrt = init_implementation("math::sqrt", ["x"])
+        cls.scheduler = ExecScheduler(workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.scheduler.shutdown()
+        super(TestWorkflow, cls).tearDownClass()
+
+    def test_run_chain(self):
+        """
+        Tests the execution of a diamond: the intermediate values are not written, only the sink is
+        """
+        workflow = Workflow(nodes=[WorkflowNode("square", self.pow, {"x": 3.0, "y": 2.0}),
+                                   WorkflowNode("root", self.sqrt, {"x": NodeOutput("square", "result")}),
+                                   WorkflowNode("final", self.pow, {"x": NodeOutput("square", "result"),
+                                                                    "y": NodeOutput("root", "result")})],
+                            sinks=[NodeOutput.parse("final/result")])
+
+        receivers = []
+
+        def get_receiver(*_):
+            receivers.append(SimpleDataReceiver())
+            return receivers[-1]
+
+        with mock.patch.object(FactoryExecAlgo, 'get_data_receiver', side_effect=get_receiver):
+            workflow_run = workflow.run(scheduler=self.scheduler, timeout=30)
+
+        self.assertTrue(workflow_run.is_done())
+        self.assertTrue(workflow_run.is_successful())
+
+        # only the sink is written
+        self.assertEqual(len(receivers), 1)
+        self.assertEqual(receivers[0].get_received_value(), 729.0)
+
+        process_ids = workflow_run.get_process_ids()
+        self.assertEqual(workflow_run.get_sink_results()["final/result"]['process_id'], process_ids["final"])
+        for node_id in ["square", "root", "final"]:
+            self.assertEqual(ExecutableAlgoDao.find_from_key(process_ids[node_id]).state, EnumState.ALGO_OK)
+
+    def test_failed_node(self):
+        """
+        Tests that the nodes depending on a failed node are not executed
+        """
+        workflow = Workflow(nodes=[WorkflowNode("root", self.sqrt, {"x": -1.0}),
+                                   WorkflowNode("square", self.pow, {"x": NodeOutput("root", "result"), "y": 2.0}),
+                                   WorkflowNode("other", self.pow, {"x": 2.0, "y": 3.0})],
+                            sinks=[])
+
+        workflow_run = workflow.run(scheduler=self.scheduler, timeout=30)
+
+        self.assertTrue(workflow_run.is_done())
+        self.assertFalse(workflow_run.is_successful())
+        states = workflow_run.get_states()
+        self.assertEqual(states["root"], EnumState.ALGO_KO)
+        self.assertEqual(states["square"], EnumState.ENGINE_KO)
+        self.assertEqual(states["other"], EnumState.ALGO_OK)
+        self.assertEqual(ExecutableAlgoDao.find_from_key(workflow_run.get_process_ids()["square"]).state,
+                         EnumState.ENGINE_KO)
+
+    def test_invalid_workflow(self):
+        """
+        Tests the checks of the workflow
+        """
+        # cycle
+        with self.assertRaises(IkatsInputError):
+            Workflow(nodes=[WorkflowNode("a", self.sqrt, {"x": NodeOutput("b", "result")}),
+                            WorkflowNode("b", self.sqrt, {"x": NodeOutput("a", "result")})],
+                     sinks=[])
+
+        # duplicated identifiers
+        with self.assertRaises(IkatsInputError):
+            Workflow(nodes=[WorkflowNode("a", self.sqrt, {"x": 1.0}),
+                            WorkflowNode("a", self.sqrt, {"x": 4.0})],
+                     sinks=[])
+
+        # undefined input
+        with self.assertRaises(IkatsInputError):
+            Workflow(nodes=[WorkflowNode("a", self.pow, {"x": 1.0})], sinks=[])
+
+        # unknown output
+        with self.assertRaises(IkatsInputError):
+            Workflow(nodes=[WorkflowNode("a", self.sqrt, {"x": 1.0})], sinks=[NodeOutput("a", "unknown")])
+
+        with self.assertRaises(IkatsInputError):
+            NodeOutput.parse("no_separator")
+
+        # the values cannot be shared with worker processes
+        process_scheduler = ExecScheduler(workers=1, mode=ExecScheduler.PROCESS_MODE)
+        try:
+            with self.assertRaises(ValueError):
+                Workflow(nodes=[WorkflowNode("a", self.sqrt, {"x": 1.0})], sinks=[]).start(scheduler=process_scheduler)
+        finally:
+            process_scheduler.shutdown()
+
+    def test_invalid_parameter(self):
+        """
+        Tests that the parameters of the nodes are checked before any execution
+        """
+        implementation = Implementation(name="TU workflow checked pow",
+                                        description="TU workflow",
+                                        execution_plugin=PLUGIN,
+                                        library_address="math::pow",
+                                        input_profile=[Argument("x", "x", ProfileItem.DIR.INPUT, 0),
+                                                       Parameter("y", "y", ProfileItem.DIR.INPUT, 1,
+                                                                 domain_of_values="[2.0, 3.0]")],
+                                        output_profile=[Argument("result", "result", ProfileItem.DIR.OUTPUT, 0)])
+
+        workflow = Workflow(nodes=[WorkflowNode("root", self.sqrt, {"x": 4.0}),
+                                   WorkflowNode("power", implementation, {"x": NodeOutput("root", "result"),
+                                                                          "y": 4.0})],
+                            sinks=[])
+
+        with mock.patch.object(ExecutableAlgoDao, 'create') as mock_create:
+            with self.assertRaises(CheckError):
+                workflow.start(scheduler=self.scheduler)
+            mock_create.assert_not_called()
@@ -17,6 +17,7 @@ limitations under the License.
 import logging
 import time
 
+from django.db import DatabaseError
 from django.test import TestCase as DjTestCase
 
 from apps.algo.catalogue.models.business.implem import Implementation
@@ -165,3 +166,43 @@ class TestExecutableAlgoDaoCRUD(DjTestCase):
         string_db_read = my_exec_algo_read.as_detailed_string()
 
         LOGGER.info("DB after read   : %s", string_db_read)
+
+    def test_seq4_update_transition(self):
+        """
+        Tests the state transitions: written by one UPDATE, without reading the row
+        """
+        my_impl_fake = Implementation(name="TU Fake Impl", description="TU fake",
+                                      execution_plugin="TU fake",
+                                      library_address="TU Fake",
+                                      input_profile=None,
+                                      output_profile=None,
+                                      db_id=None)
+        my_custom_algo_fake = CustomizedAlgo(arg_implementation=my_impl_fake, custom_params=None)
+        my_exec_algo = ExecutableAlgo(
+            custom_algo=my_custom_algo_fake, dict_data_sources={}, dict_data_receivers={}, arg_process_id=None)
+
+        my_exec_algo_created = ExecutableAlgoDao.create(my_exec_algo, merge_with_unsaved_data=True)
+
+        my_exec_algo_created.trigger_start_execution_date()
+        my_exec_algo_created.state = EnumState.RUN
+        with self.assertNumQueries(1):
+            ExecutableAlgoDao.update_transition(my_exec_algo_created, update_fields=['state', 'start_execution_date'])
+
+        my_exec_algo_read = ExecutableAlgoDao.find_from_key(my_exec_algo_created.process_id)
+        self.assertEqual(my_exec_algo_read.state, EnumState.RUN)
+        self.assertIsNotNone(my_exec_algo_read.start_execution_date)
+        self.assertIsNone(my_exec_algo_read.end_execution_date)
+
+        my_exec_algo_created.trigger_end_execution_date()
+        my_exec_algo_created.state = EnumState.ALGO_OK
+        with self.assertNumQueries(1):
+            ExecutableAlgoDao.update_transition(my_exec_algo_created)
+
+        my_exec_algo_read = ExecutableAlgoDao.find_from_key(my_exec_algo_created.process_id)
+        self.assertEqual(my_exec_algo_read.state, EnumState.ALGO_OK)
+        self.assertIsNotNone(my_exec_algo_read.end_execution_date)
+
+        # unknown process_id
+        my_exec_algo_created.process_id = str(int(my_exec_algo_created.process_id) + 1000)
+        with self.assertRaises(DatabaseError):
+            ExecutableAlgoDao.update_transition(my_exec_algo_created)
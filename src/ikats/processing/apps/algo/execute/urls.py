@@ -34,5 +34,27 @@ urlpatterns = patterns(
     #   output Json { ... }
     # See doc: IKATS_Spec_ModulesSpecifiques part. Executer
     #
-    url(r'^getstatus/(\d+)$', 'algo.getstatus', name="algo_getstatus")
+    url(r'^getstatus/(\d+)$', 'algo.getstatus', name="algo_getstatus"),
+
+    # cancel: cancels a queued or running execution, for a given processid
+    # - url = ".../ikats/algo/execute/cancel/-processid-"
+    # - web service with POST http request
+    #   output Json { ... }
+    #
+    url(r'^cancel/(\d+)$', 'algo.cancel', name="algo_cancel"),
+
+    # getprogress: retrieves the progress reported by a running execution, for a given processid
+    # - url = ".../ikats/algo/execute/getprogress/-processid-?since=-seq-&wait=-seconds-"
+    # - web service with GET http request: long-polling when wait is defined
+    #   output Json { ... }
+    #
+    url(r'^getprogress/(\d+)$', 'algo.getprogress', name="algo_getprogress"),
+
+    # runworkflow: launches the execution of chained algorithms, passing the intermediate values in memory
+    # - url = ".../ikats/algo/execute/runworkflow"
+    # - web service with POST http request with parameters:
+    #   input Json parameter { "opts": ..., "nodes": [ ... ], "sinks": [ ... ] }
+    #   output Json { ... }
+    #
+    url(r'^runworkflow$', 'algo.run_workflow', name="algo_run_workflow")
 )
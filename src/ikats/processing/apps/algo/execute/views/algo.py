@@ -16,19 +16,29 @@ limitations under the License.
 """
 import json
 import logging
+import time
 
 import ikats_processing.core.json.decode as json_utils
+from apps.algo.catalogue.models.orm.implem import ImplementationDao
 from apps.algo.custom.models.business.check_engine import CheckError
+from apps.algo.execute.models.business.cancellation import CancelRegistry
+from apps.algo.execute.models.business.progress import ProgressRegistry, get_progress_config
+from apps.algo.execute.models.business.scheduler import QueueFullError, get_exec_scheduler
 from apps.algo.execute.models.business.scripts import execalgo
+from apps.algo.execute.models.business.workflow import NodeOutput, Workflow, WorkflowNode
 from apps.algo.execute.models.orm.algo import ExecutableAlgoDao
 from apps.algo.execute.models.ws.algo import ExecutableAlgoWs
 from apps.algo.execute.models.ws.exec_status import ExecutionStatusWs
 from ikats.core.library.exception import IkatsInputError, IkatsNotFoundError, IkatsException
+from ikats.core.library.status import State as EnumState
 from ikats.core.resource.client.exceptions import ServerError
 from ikats_processing.core.json.http_response import DjangoHttpResponseFactory
 
 LOGGER = logging.getLogger(__name__)
 
+# States of the ended executions
+ENDED_STATES = [EnumState.ALGO_OK, EnumState.ALGO_KO, EnumState.ENGINE_KO, EnumState.CANCELLED]
+
 
 def get_json_error_data(code, exception):
     """
@@ -65,9 +75,11 @@ def run(http_request, algo_name):
      * where <id> is a path parameter:
       * either the id of the Implementation, when json option 'custo_algo' is set to False
       * or the id of the CustomizedAlgo, when json option 'custo_algo' is set to True
+    * optional json option 'bypass_memo': True forces the execution, when the memoization of the runs is enabled:
+      otherwise a run having the same definition than a previous successful run returns the previous results
     * request content type is 'application/json_util'
     * request json content:
-          { 'opts': { 'async': ..., 'custo_algo': ..., 'debug': ... },
+          { 'opts': { 'async': ..., 'custo_algo': ..., 'debug': ..., 'bypass_memo': ... },
             'args': { <name1>: <value1>, ... <nameN>: <valueN> }
           }
     -------------
@@ -77,6 +89,7 @@ def run(http_request, algo_name):
      * 200: OK: see Nominal Response below
      * 400: bad request from client: not processed: see Error response below
      * 500: error occurred computing statistics: see Error response below
+     * 503: asynchronous run rejected: too many queued executions, retry later
     ^^^^^^^^^^^^^^^^
     Nominal Response
     ^^^^^^^^^^^^^^^^
@@ -98,7 +111,7 @@ def run(http_request, algo_name):
 
       * where <process id> is the reference of <execution_algo>
 
-      * where <execution_algo_state> is internal status INIT|RUN|OK|ALGO_KO|ENGINE_KO
+      * where <execution_algo_state> is internal status INIT|QUEUED|RUN|OK|ALGO_KO|ENGINE_KO
 
       * where dates may be optional: undefined in asynchronous mode
 
@@ -141,7 +154,7 @@ def run(http_request, algo_name):
         input_args_list = []
         input_args_values_list = []
 
-        in_options = {'async': False, 'custo_algo': False, 'debug': False}
+        in_options = {'async': False, 'custo_algo': False, 'debug': False, 'bypass_memo': False}
 
         for param in input_json:
             # if input options exist
@@ -172,7 +185,8 @@ def run(http_request, algo_name):
                                       arg_values=input_args_values_list,
                                       asynchro=in_options['async'],
                                       is_customized_algo=in_options['custo_algo'],
-                                      run_debug=in_options['debug'])
+                                      run_debug=in_options['debug'],
+                                      bypass_memo=in_options['bypass_memo'])
 
         LOGGER.info(my_exec_status.__str__())
 
@@ -201,6 +215,14 @@ def run(http_request, algo_name):
         context = "Bad Request in views.algo.run"
         return factory_response.get_json_response_bad_request(ikats_error=context, exception=exception)
 
+    except QueueFullError as exception:
+        LOGGER.exception(exception)
+        context = "Service unavailable in views.algo.run: too many queued executions, retry later"
+        return factory_response.get_json_response_error(
+            http_status_code=factory_response.SERVICE_UNAVAILABLE_HTTP_STATUS,
+            ikats_error=context,
+            exception=exception)
+
     except IkatsNotFoundError as exception:
         LOGGER.exception(exception)
         factory_response = DjangoHttpResponseFactory()
@@ -214,6 +236,163 @@ def run(http_request, algo_name):
         return factory_response.get_json_response_internal_server_error(ikats_error=context, exception=exception)
 
 
+def __parse_workflow_arg(value):
+    """
+    Parse one argument of a workflow node: {"$ref": "<node id>/<output name>"} refers to the output of a node
+    :param value: the json value
+    :return: the value, or the NodeOutput reference
+    """
+    if isinstance(value, dict) and list(value.keys()) == ['$ref']:
+        return NodeOutput.parse(value['$ref'])
+    return value
+
+
+def __parse_workflow(input_json):
+    """
+    Parse the json content of the request runworkflow
+    :param input_json: the decoded json content
+    :type input_json: dict
+    :return: the workflow and the options
+    :rtype: Workflow, dict
+    :raises IkatsInputError: unexpected content
+    :raises IkatsNotFoundError: unknown implementation
+    """
+    options = {'async': False}
+    nodes = []
+    sinks = []
+    for param in input_json:
+        if param == 'opts':
+            for opt in input_json['opts']:
+                if opt not in options:
+                    raise IkatsInputError("option %s not expected" % opt)
+                options[opt] = input_json['opts'][opt]
+
+        elif param == 'nodes':
+            for json_node in input_json['nodes']:
+                if 'id' not in json_node or 'implementation' not in json_node:
+                    raise IkatsInputError("node %s: expecting properties id and implementation" % json_node)
+
+                implementations = ImplementationDao.find_cached_business_elem_with_name(json_node['implementation'])
+                if len(implementations) == 0:
+                    raise IkatsNotFoundError("Implementation with name=%s not found" % json_node['implementation'])
+
+                args = {name: __parse_workflow_arg(value) for name, value in json_node.get('args', {}).items()}
+                nodes.append(WorkflowNode(str(json_node['id']), implementations[0], args))
+
+        elif param == 'sinks':
+            sinks = [NodeOutput.parse(x) for x in input_json['sinks']]
+
+        else:
+            raise IkatsInputError("parameter %s not expected" % param)
+
+    return Workflow(nodes, sinks), options
+
+
+def run_workflow(http_request):
+    """
+    =======
+    Summary
+    =======
+    Web service implementation of 'ikats/algo/execute/runworkflow'
+    This service executes a workflow: several implementations, chained without writing the intermediate results.
+    The outputs of a node are passed in memory to the nodes consuming them: only the sinks are written
+    (process data ...), as if their node was run by 'runalgo'.
+
+    ===================
+    Technical interface
+    ===================
+
+    ------------
+    Http Request:
+    ------------
+    * service method is POST
+    * request content type is 'application/json_util'
+    * request json content:
+          { 'opts': { 'async': ... },
+            'nodes': [ { 'id': <node id>,
+                         'implementation': <implementation name>,
+                         'args': { <name1>: <value1>, ... <nameN>: {'$ref': '<node id>/<output name>'} } },
+                       ... ],
+            'sinks': [ '<node id>/<output name>', ... ]
+          }
+    * where an argument is either a value, as defined for 'runalgo', or a reference to the output of another node
+    * the undefined arguments take their default value
+    -------------
+    Http Response
+    -------------
+     * Http response status:
+     * 200: OK: see Nominal Response below
+     * 400: bad request from client: not processed: unknown arguments, cycle ...
+     * 404: unknown implementation
+     * 500: error occurred
+     * 503: too many queued executions, retry later
+    ^^^^^^^^^^^^^^^^
+    Nominal Response
+    ^^^^^^^^^^^^^^^^
+            | { 'http_code' : <http code>
+            |   'http_msg' : <http message>
+            |   'nodes' : { <node id>: { 'process_id': <process id>, 'exec_state': <state> }, ... }
+            |   'sinks' : { '<node id>/<output name>': { 'process_id': <process id>, 'data_id': <written id> }, ... }
+            | }
+     * where the state of each node is QUEUED until its end, when the option async is True:
+       the nodes are followed with 'getstatus'
+     * where the sinks are defined once their node is ended
+
+    :param http_request: http request
+    :type http_request:
+    """
+    factory_response = DjangoHttpResponseFactory()
+    try:
+        if http_request.method != 'POST':
+            return factory_response.get_json_response_bad_request(ikats_error="Expecting POST http method")
+
+        input_json = json_utils.decode_json_from_http_request(http_request)
+        workflow, options = __parse_workflow(input_json)
+
+        if options['async']:
+            workflow_run = workflow.start()
+        else:
+            workflow_run = workflow.run()
+
+        process_ids = workflow_run.get_process_ids()
+        states = workflow_run.get_states()
+        data = {'nodes': {node_id: {'process_id': process_ids[node_id], 'exec_state': states[node_id].name}
+                          for node_id in process_ids},
+                'sinks': workflow_run.get_sink_results()}
+
+        if not options['async'] and not workflow_run.is_successful():
+            return factory_response.get_json_response_error_with_data(
+                http_status_code=factory_response.SERVER_ERROR_HTTP_STATUS,
+                http_msg="Server error in views.algo.run_workflow: failed nodes",
+                data_name="workflow",
+                data=data)
+
+        return factory_response.get_json_response_nominal(data)
+
+    except IkatsInputError as exception:
+        LOGGER.exception(exception)
+        context = "Bad Request in views.algo.run_workflow"
+        return factory_response.get_json_response_bad_request(ikats_error=context, exception=exception)
+
+    except QueueFullError as exception:
+        LOGGER.exception(exception)
+        context = "Service unavailable in views.algo.run_workflow: too many queued executions, retry later"
+        return factory_response.get_json_response_error(
+            http_status_code=factory_response.SERVICE_UNAVAILABLE_HTTP_STATUS,
+            ikats_error=context,
+            exception=exception)
+
+    except IkatsNotFoundError as exception:
+        LOGGER.exception(exception)
+        context = "Resource not found in views.algo.run_workflow"
+        return factory_response.get_json_response_not_found(ikats_error=context, exception=exception)
+
+    except (IkatsException, ServerError, BaseException) as exception:
+        LOGGER.exception(exception)
+        context = "Server error in views.algo.run_workflow"
+        return factory_response.get_json_response_internal_server_error(ikats_error=context, exception=exception)
+
+
 def getstatus(http_request, process_id):
     """
     =======
@@ -225,6 +404,7 @@ def getstatus(http_request, process_id):
         -start date of execution (float EPOCH time in second)
         -end date of execution (float EPOCH time in second)
         -execution duration (time in second)
+        -execution profile: durations of the phases, and used resources
     of any previously launched algorithm
     ===================
     Technical interface
@@ -251,7 +431,8 @@ def getstatus(http_request, process_id):
         |   'exec_state': <execution_algo_state>,
         |   'start_date': start date of execution,
         |   'end_date': end date of execution,
-        |   'duration': execution duration
+        |   'duration': execution duration,
+        |   'profile': <execution profile>
         | }
         where <http code> is a integer: the http service status
         (see https://www.w3.org/Protocols/rfc2616/rfc2616-sec10.html)
@@ -259,10 +440,17 @@ def getstatus(http_request, process_id):
         where <http message> is a string: the high level message associated to <http code>
 
         where <process id> is the reference of <execution_algo>
-        where 'exec_state' defines internal status INIT|RUN|OK|ALGO_KO|ENGINE_KO
+        where 'exec_state' defines internal status INIT|QUEUED|RUN|OK|ALGO_KO|ENGINE_KO|CANCELLED
 
         where 'start_date', 'end_date', 'duration' defines the running period
 
+        where <execution profile> is null before the execution, or
+        | { 'phases': [ { 'phase': <phase name>, 'duration': <seconds>, 'target': <input/output name> }, ...],
+        |   'resources': { 'cpu_time': <seconds>, 'peak_rss': <bytes>,
+        |                  'bytes_read': <bytes>, 'bytes_written': <bytes> } }
+        with <phase name> among catalogue, check, consume_value, algorithm, produce_value, dao_write:
+        'target' is only defined for the phases concerning one input/output
+
     ^^^^^^^^^^^^^^^^
     Error Response
     ^^^^^^^^^^^^^^^^
@@ -299,3 +487,172 @@ def getstatus(http_request, process_id):
         LOGGER.error(msg)
         LOGGER.exception(err)
         return response_factory.get_json_response_internal_server_error(msg, err)
+
+
+def getprogress(http_request, process_id):
+    """
+    =======
+    Summary
+    =======
+    Web service implementation of 'ikats/algo/execute/getprogress'
+    This service returns the progress reported by a running algorithm (see ikats.core.library.progress):
+    the events published after the last read event, optionally waiting for a new event (long-polling).
+
+    The progress is read from the server process running the execution, until the retention delay after its
+    end (see ProgressRegistry). Otherwise, the last event saved in database is returned, without waiting:
+    it is saved at most every IKATS_EXEC_PROGRESS['PERSIST_INTERVAL'] seconds, and 'done' is deduced from
+    the execution state.
+
+    ===================
+    Technical interface
+    ===================
+    ------------
+    Http Request
+    ------------
+      * service method is GET
+      * optional query parameters:
+        * since: the seq of the last event already read: default 0
+        * wait: maximum waiting time in seconds for a new event: default 0 (no waiting), bounded by the setting
+          IKATS_EXEC_PROGRESS['MAX_WAIT']
+    -------------
+    Http Response
+    -------------
+      * Http response status:
+        * 200: OK: see Nominal Response below
+        * 400: wrong query parameters
+        * 404: unknown process_id
+    ^^^^^^^^^^^^^^^^
+    Nominal Response
+    ^^^^^^^^^^^^^^^^
+      * service produces the following json structure:
+        | { 'process_id': <process id>,
+        |   'seq': <seq of the last published event>,
+        |   'done': <true when the execution is ended>,
+        |   'state': <final state name, or null>,
+        |   'events': [ { 'seq': <seq>, 'date': <EPOCH date in seconds>, 'progress': <from 0.0 to 1.0, or null>,
+        |                 'message': <str or null>, 'partial_result': <JSON content or null> }, ... ]
+        | }
+
+    :param http_request:
+    :param process_id: process identifier
+    :type process_id : str
+    """
+    response_factory = DjangoHttpResponseFactory()
+    try:
+        try:
+            since = int(http_request.GET.get('since', 0))
+            wait = float(http_request.GET.get('wait', 0))
+        except ValueError as err:
+            return response_factory.get_json_response_bad_request(
+                ikats_error="Bad query parameters in views.algo.getprogress: expecting int since, float wait",
+                exception=err)
+
+        wait = max(0.0, min(wait, get_progress_config().get('MAX_WAIT', 30)))
+
+        channel = ProgressRegistry.get(process_id)
+        if channel is not None:
+            progress = channel.get_events(since=since, timeout=wait or None)
+        else:
+            # no channel in this process: the last event saved in database is returned at once, without waiting
+            exec_algo = ExecutableAlgoDao.find_from_key(process_id)
+            if exec_algo is None:
+                my_error = IkatsNotFoundError("ExecutableAlgorithm with process id %s not found." % process_id)
+                return response_factory.get_json_response_not_found(
+                    ikats_error="Resource not found in views.algo.getprogress", exception=my_error)
+
+            done = exec_algo.state in ENDED_STATES
+            last_event = ExecutableAlgoDao.find_progress(process_id)
+            events = [last_event] if last_event is not None and last_event['seq'] > since else []
+            progress = {'seq': max(since, last_event['seq']) if last_event is not None else since,
+                        'done': done,
+                        'state': exec_algo.state.name if done else None,
+                        'events': events}
+
+        progress['process_id'] = process_id
+        return response_factory.get_json_response_nominal(progress)
+
+    except Exception as err:
+        msg = "Unexpected error reading the progress of ExecutableAlgorithm with process id %s" % process_id
+        LOGGER.error(msg)
+        LOGGER.exception(err)
+        return response_factory.get_json_response_internal_server_error(msg, err)
+
+
+def cancel(http_request, process_id):
+    """
+    =======
+    Summary
+    =======
+    Web service implementation of 'ikats/algo/execute/cancel'
+    This service cancels a previously launched algorithm (see ikats.core.library.cancellation):
+      - a queued execution is removed from the queue of the scheduler: its state is CANCELLED at once
+      - a running execution is cancelled cooperatively: the engine checks the cancellation between the
+        phases of the execution, the worker process of PythonPoolExecEngine is killed, the Spark jobs are
+        cancelled, and the algorithm may check it (see check_cancelled()).
+        Its state becomes CANCELLED at the end of the execution: see getstatus
+      - the request is saved in database: an execution queued or running in another server process polls it,
+        at most every CANCEL_POLL_INTERVAL seconds (see apps.algo.execute.models.business.cancellation)
+
+    ===================
+    Technical interface
+    ===================
+    ------------
+    Http Request
+    ------------
+      * service method is POST
+    -------------
+    Http Response
+    -------------
+      * Http response status:
+        * 200: OK: see Nominal Response below
+        * 400: wrong http method
+        * 404: unknown process_id
+    ^^^^^^^^^^^^^^^^
+    Nominal Response
+    ^^^^^^^^^^^^^^^^
+      * service produces the following json structure:
+        | { 'process_id': <process id>,
+        |   'cancelled': <false when the execution was already ended>,
+        |   'exec_state': <execution state after the request>
+        | }
+
+    :param http_request:
+    :param process_id: process identifier
+    :type process_id : str
+    """
+    response_factory = DjangoHttpResponseFactory()
+    try:
+        if http_request.method != 'POST':
+            return response_factory.get_json_response_bad_request(ikats_error="Expecting POST http method")
+
+        exec_algo = ExecutableAlgoDao.find_from_key(process_id)
+        if exec_algo is None:
+            my_error = IkatsNotFoundError("ExecutableAlgorithm with process id %s not found." % process_id)
+            return response_factory.get_json_response_not_found(
+                ikats_error="Resource not found in views.algo.cancel", exception=my_error)
+
+        state = exec_algo.state
+        cancelled = state not in ENDED_STATES
+        if cancelled:
+            if state == EnumState.QUEUED and get_exec_scheduler().cancel(process_id) is not None:
+                # never started: closed at once
+                state = EnumState.CANCELLED
+                ExecutableAlgoDao.update_state(process_id=process_id,
+                                               state=state,
+                                               end_execution_date=time.time())
+            else:
+                # started, or about to start: the engine ends the execution. The request is saved in database
+                # for the execution handled by another server process, which polls it
+                ExecutableAlgoDao.request_cancel(process_id)
+                CancelRegistry.cancel(process_id)
+            LOGGER.info("Cancelled ExecutableAlgorithm with process id %s in state %s", process_id, state.name)
+
+        return response_factory.get_json_response_nominal({'process_id': process_id,
+                                                           'cancelled': cancelled,
+                                                           'exec_state': state.name})
+
+    except Exception as err:
+        msg = "Unexpected error cancelling ExecutableAlgorithm with process id %s" % process_id
+        LOGGER.error(msg)
+        LOGGER.exception(err)
+        return response_factory.get_json_response_internal_server_error(msg, err)
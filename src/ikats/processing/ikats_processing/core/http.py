@@ -129,11 +129,13 @@ class HttpResponseFactory(object):
     OK_HTTP_STATUS = 200
     CREATED_HTTP_STATUS = 201
     NO_CONTENT_HTTP_STATUS = 204
+    NOT_MODIFIED_HTTP_STATUS = 304
     BAD_REQUEST_HTTP_STATUS = 400
     NOT_ALLOWED_METHOD_HTTP_STATUS = 405
     NOT_FOUND_HTTP_STATUS = 404
     CONFLICT_HTTP_STATUS = 409
     SERVER_ERROR_HTTP_STATUS = 500
+    SERVICE_UNAVAILABLE_HTTP_STATUS = 503
 
     @classmethod
     def response_empty_ok(cls):
@@ -14,8 +14,13 @@ See the License for the specific language governing permissions and
 limitations under the License.
 
 """
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http.response import HttpResponse, JsonResponse
+
 from ikats_processing.core.http import HttpResponseFactory
-from django.http.response import JsonResponse
 
 """
 Module grouping JSON http response services
@@ -195,3 +200,51 @@ class DjangoHttpResponseFactory(HttpResponseFactory):
         response = JsonResponse(content)
         response.status_code = self.OK_HTTP_STATUS
         return response
+
+    @staticmethod
+    def encode_json_with_etag(data):
+        """
+        Encode the json content once, with its entity tag, in order to serve it later with
+        get_json_response_with_etag(): the content encoded once can be served many times.
+
+        The entity tag is computed from the encoded content: it is the same in every server process.
+
+        :param data: the json-friendly python object defining the content
+        :type data: dict or list
+        :return: etag, content: the entity tag (quoted string) and the encoded content
+        :rtype: tuple (str, bytes)
+        """
+        content = json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8')
+        etag = '"%s"' % hashlib.md5(content).hexdigest()
+        return etag, content
+
+    def get_json_response_with_etag(self, http_request, etag, content):
+        """
+        Returns the response for an encoded json content, supporting the conditional GET:
+          - status NOT_MODIFIED_HTTP_STATUS, without content, when the header If-None-Match of http_request
+            is matching etag: the client already has the content,
+          - otherwise status OK_HTTP_STATUS with content.
+        The header ETag is defined in both cases.
+
+        :param http_request: the request
+        :type http_request: django.http.HttpRequest
+        :param etag: the entity tag of the content, see encode_json_with_etag()
+        :type etag: str
+        :param content: the encoded json content, see encode_json_with_etag()
+        :type content: bytes
+        :return: the response
+        :rtype: HttpResponse
+        """
+        if_none_match = http_request.META.get('HTTP_IF_NONE_MATCH', None)
+        if if_none_match is not None:
+            # weak comparison: see RFC 7232
+            matched_tags = [tag.strip() for tag in if_none_match.split(',')]
+            if '*' in matched_tags or etag in matched_tags or 'W/' + etag in matched_tags:
+                response = HttpResponse(status=self.NOT_MODIFIED_HTTP_STATUS)
+                response['ETag'] = etag
+                return response
+
+        response = HttpResponse(content, content_type='application/json')
+        response.status_code = self.OK_HTTP_STATUS
+        response['ETag'] = etag
+        return response
@@ -0,0 +1,101 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import logging
+import threading
+
+from ikats.core.library.process_pool import resolve_function
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CallableRegistry(object):
+    """
+    Process-wide cache of the python objects referenced by the catalogue with the syntax
+    <module path>::<attribute>: the library_address of the implementations (python functions), and their
+    execution_plugin (ExecEngine subclasses).
+
+    Each path is resolved once (import of the module + evaluation of the attribute), then the cached object
+    is returned. The cache is keyed by path: a modified library_address or execution_plugin is resolved again.
+    """
+
+    __cache = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def resolve(cls, path):
+        """
+        Get the python object referenced by path, resolved on the first call
+
+        :param path: <module path>::<attribute>, ex: "math::cos"
+        :type path: str
+        :return: the referenced object (function, class ...)
+        :raises ValueError: if the path is not well formed
+        :raises ImportError: if the module cannot be imported
+        :raises AttributeError: if the attribute is not defined by the module
+        """
+        try:
+            return cls.__cache[path]
+        except KeyError:
+            pass
+
+        with cls.__lock:
+            if path not in cls.__cache:
+                cls.__cache[path] = resolve_function(path)
+                LOGGER.debug("CallableRegistry: resolved %s", path)
+            return cls.__cache[path]
+
+    @classmethod
+    def validate(cls, path):
+        """
+        Check that path can be resolved, and keep the resolved object in cache.
+        Does not raise any error: the failure is logged.
+
+        :param path: <module path>::<attribute>, ex: "math::cos"
+        :type path: str
+        :return: True if the path is resolved
+        :rtype: bool
+        """
+        try:
+            cls.resolve(path)
+            return True
+        except Exception as error:
+            LOGGER.warning("CallableRegistry: cannot resolve [%s]: %s", path, error)
+            return False
+
+    @classmethod
+    def invalidate(cls, path=None):
+        """
+        Remove one path, or all paths, from the cache
+
+        :param path: optional, default None: the path to remove, None for all paths
+        :type path: str or None
+        """
+        with cls.__lock:
+            if path is None:
+                cls.__cache.clear()
+            else:
+                cls.__cache.pop(path, None)
+
+    @classmethod
+    def is_cached(cls, path):
+        """
+        :param path: <module path>::<attribute>
+        :type path: str
+        :return: True if the path is already resolved
+        :rtype: bool
+        """
+        return path in cls.__cache
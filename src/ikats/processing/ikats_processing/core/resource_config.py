@@ -17,8 +17,7 @@ limitations under the License.
 
 import logging
 
-from ikats.core.resource.client import NonTemporalDataMgr
-from ikats.core.resource.client import TemporalDataMgr
+from ikats.core.resource.client import ClientRegistry
 
 LOGGER = logging.getLogger(__name__)
 
@@ -82,13 +81,13 @@ class ResourceClientSingleton(object):
     def get_temporal_manager(self):
         """
         Gets the temporal manager from the singleton configuration
-        Note: new instance is created each time this method is called
+        Note: the instance is shared by the process, see ClientRegistry: do not change its host or port
         """
-        return TemporalDataMgr(self.host, self.port)
+        return ClientRegistry.get_tdm(self.host, self.port)
 
     def get_non_temporal_manager(self):
         """
         Gets the non temporal manager from the singleton configuration
-        Note: new instance is created each time this method is called
+        Note: the instance is shared by the process, see ClientRegistry: do not change its host or port
         """
-        return NonTemporalDataMgr(self.host, self.port)
+        return ClientRegistry.get_ntdm(self.host, self.port)
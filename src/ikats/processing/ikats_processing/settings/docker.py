@@ -143,6 +143,89 @@ IKATS_RESOURCE_SERVER = {
 
 USE_X_FORWARDED_HOST = True
 
+# Scheduler of the asynchronous executions: bounded queue and pool of workers
+# (see apps.algo.execute.models.business.scheduler.ExecScheduler)
+# Note: one scheduler by server process, the limits below apply to each gunicorn worker
+IKATS_EXEC_SCHEDULER = {
+    # 'thread' or 'process'
+    'MODE': os.environ.get('EXEC_SCHEDULER_MODE', 'thread'),
+    'WORKERS': int(os.environ.get('EXEC_SCHEDULER_WORKERS', 4)),
+    'MAX_QUEUED': int(os.environ.get('EXEC_SCHEDULER_MAX_QUEUED', 200)),
+    # Maximum number of running executions of one implementation (None: unlimited)
+    'IMPLEM_LIMIT': None,
+    # Specific limits by implementation name
+    'IMPLEM_LIMITS': {},
+}
+
+# Pool of worker processes used by the engine PythonPoolExecEngine
+# (see apps.algo.execute.models.business.python_pool_exec_engine)
+IKATS_EXEC_PROCESS_POOL = {
+    'WORKERS': int(os.environ.get('EXEC_PROCESS_POOL_WORKERS', 2)),
+    # Modules imported by the workers before any execution
+    'PRELOAD': ['numpy'],
+    # Limits of one execution: duration in seconds, address space in bytes (None: unlimited)
+    'TIMEOUT': None,
+    'MEMORY_LIMIT': None,
+}
+
+# Budgets of the executions (see apps.algo.execute.models.business.cancellation): the execution is cancelled
+# when its duration exceeds TIMEOUT in seconds; MEMORY_LIMIT in bytes limits the address space of the worker
+# process of PythonPoolExecEngine, and the growth of the memory of the server process during an execution of
+# PythonLocalExecEngine, checked with the cancellation (None: unlimited). IMPLEM_BUDGETS overrides them by
+# implementation name: ex: {'my_implem': {'TIMEOUT': 3600}}
+IKATS_EXEC_BUDGET = {
+    'TIMEOUT': None,
+    'MEMORY_LIMIT': None,
+    'IMPLEM_BUDGETS': {},
+}
+
+# Resolution of the remote inputs (see apps.algo.execute.models.business.prefetch): number of threads reading
+# them concurrently before the start of the algorithm (0: read one after the other), and the inputs passed as
+# ikats.core.library.lazy.LazyValue, read when the algorithm uses them: ex: {'my_implem': ['my_input']}
+IKATS_EXEC_PREFETCH = {
+    'WORKERS': 4,
+    'LAZY_INPUTS': {},
+}
+
+# Memoization of the successful runs (see apps.algo.execute.models.business.memo)
+IKATS_EXEC_MEMO = {
+    'ENABLED': os.environ.get('EXEC_MEMO_ENABLED', 'false').lower() == 'true',
+    # Eviction: maximum age in seconds and maximum number of memoized runs (None: unlimited)
+    'MAX_AGE': 7 * 24 * 3600,
+    'MAX_ENTRIES': 10000,
+}
+
+# Cache of the catalogue resources read by the executions
+# (see apps.algo.catalogue.models.business.cache)
+IKATS_CATALOGUE_CACHE = {
+    # Expiration delay of the cached resources in seconds, bounding the delay before the updates handled by
+    # another process are seen (None: no expiration, 0: cache disabled)
+    'TIMEOUT': int(os.environ.get('CATALOGUE_CACHE_TIMEOUT', 60)),
+}
+
+# Channels of the progress reported by the running algorithms, read by the service getprogress
+# (see apps.algo.execute.models.business.progress)
+IKATS_EXEC_PROGRESS = {
+    # Rate limitation: minimum interval between two published events in seconds, number of kept events
+    'MIN_INTERVAL': 0.5,
+    'MAX_EVENTS': 100,
+    # Delay in seconds during which the channel of an ended execution can be read
+    'RETENTION': 600,
+    # Maximum waiting time of a long-polling request in seconds
+    'MAX_WAIT': 30,
+    # Minimum interval in seconds between two saves of the last event in database, read by the other processes
+    'PERSIST_INTERVAL': 5.0,
+}
+
+# Encoding of the python objects written in the process data blobs
+# (see ikats.core.library.blob)
+IKATS_PROCESS_DATA_BLOB = {
+    # 'none', 'zlib' or 'lzma'
+    'COMPRESSION': os.environ.get('PROCESS_DATA_COMPRESSION', 'zlib'),
+    # Size of the streamed chunks in bytes: bounds the memory used by the encoding and the decoding
+    'CHUNK_SIZE': int(os.environ.get('PROCESS_DATA_CHUNK_SIZE', 1024 * 1024)),
+}
+
 # -----------------------
 # LOGGING initialization
 # -----------------------
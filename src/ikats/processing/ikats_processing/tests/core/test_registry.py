@@ -0,0 +1,69 @@
+"""
+Copyright 2018-2019 CS Systèmes d'Information
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+"""
+import collections
+import math
+import unittest
+
+import mock
+
+from ikats_processing.core.registry import CallableRegistry
+
+
+class TestCallableRegistry(unittest.TestCase):
+    """
+    Tests the cache of resolved python objects
+    """
+
+    def setUp(self):
+        CallableRegistry.invalidate()
+
+    def test_resolve_once(self):
+        """
+        Tests that the path is resolved once
+        """
+        with mock.patch('ikats_processing.core.registry.resolve_function', return_value=math.cos) as resolver:
+            self.assertIs(CallableRegistry.resolve("math::cos"), math.cos)
+            self.assertIs(CallableRegistry.resolve("math::cos"), math.cos)
+            self.assertEqual(resolver.call_count, 1)
+
+            CallableRegistry.invalidate("math::cos")
+            self.assertFalse(CallableRegistry.is_cached("math::cos"))
+            CallableRegistry.resolve("math::cos")
+            self.assertEqual(resolver.call_count, 2)
+
+    def test_resolve_attributes(self):
+        """
+        Tests the resolution of functions, classes, and nested attributes
+        """
+        self.assertIs(CallableRegistry.resolve("math::sqrt"), math.sqrt)
+        self.assertIs(CallableRegistry.resolve("collections::OrderedDict"), collections.OrderedDict)
+        self.assertEqual(CallableRegistry.resolve("collections::OrderedDict.fromkeys")("a"), {"a": None})
+
+    def test_validate(self):
+        """
+        Tests the validation of paths, without error raised
+        """
+        self.assertTrue(CallableRegistry.validate("math::cos"))
+        self.assertTrue(CallableRegistry.is_cached("math::cos"))
+
+        self.assertFalse(CallableRegistry.validate("math::unknown_function"))
+        self.assertFalse(CallableRegistry.validate("unknown_module::function"))
+        self.assertFalse(CallableRegistry.validate("math.cos"))
+        self.assertFalse(CallableRegistry.is_cached("math::unknown_function"))
+
+        with self.assertRaises(AttributeError):
+            CallableRegistry.resolve("math::unknown_function")